@@ -3278,10 +3278,12 @@ class RBDDRDeployOps(object):
             resource_name = constants.CEPHBLOCKPOOL
             expected_state = "true"
 
+        # read-only check of the clusters, safe to run at once
         out_list = run_cmd_multicluster(
             cmd,
             skip_index=get_all_acm_and_recovery_indexes()
             + config.get_consumer_indexes_list(raise_exception=False),
+            parallel=True,
         )
         index = 0
         for out in out_list:
@@ -9,12 +9,13 @@ under section PYTEST_DONT_REWRITE
 
 # Use the new python 3.7 dataclass decorator, which provides an object similar
 # to a namedtuple, but allows type enforcement and defining methods.
+import contextvars
 import functools
 import os
 import yaml
 import logging
 from collections.abc import Mapping
-from contextlib import nullcontext
+from contextlib import contextmanager, nullcontext
 from dataclasses import dataclass, field, fields
 from ocs_ci.ocs import constants
 from ocs_ci.ocs.exceptions import ClusterNotFoundException
@@ -29,6 +30,9 @@ DEFAULT_CONFIG_PATH = os.path.join(THIS_DIR, "conf/default_config.yaml")
 logger = logging.getLogger(__name__)
 
 config_lock = RLock()
+# Config index bound to the current thread or asyncio task by
+# MultiClusterConfig.bind_ctx, it has priority over the global context
+_bound_config_index = contextvars.ContextVar("config_index", default=None)
 
 
 @dataclass
@@ -162,15 +166,60 @@ class MultiClusterConfig:
 
     def __getattr__(self, attr):
         with config_lock:
-            config_index = getattr(
-                self.thread_local_data, "config_index", self.cur_index
-            )
-            return getattr(self.clusters[config_index], attr)
+            return getattr(self.clusters[self._get_config_index()], attr)
+
+    def _get_config_index(self):
+        bound_index = _bound_config_index.get()
+        if bound_index is not None:
+            return bound_index
+        return getattr(self.thread_local_data, "config_index", self._cur_index)
+
+    @property
+    def cur_index(self):
+        """
+        Index of the current cluster, the index bound by bind_ctx has priority
+        over the global one
+        """
+        bound_index = _bound_config_index.get()
+        if bound_index is not None:
+            return bound_index
+        return self._cur_index
+
+    @cur_index.setter
+    def cur_index(self, index):
+        if _bound_config_index.get() is not None:
+            # switch only the bound context, not the other threads
+            _bound_config_index.set(index)
+        else:
+            self._cur_index = index
 
     @property
     def cluster_ctx(self):
-        config_index = getattr(self.thread_local_data, "config_index", self.cur_index)
-        return self.clusters[config_index]
+        return self.clusters[self._get_config_index()]
+
+    @contextmanager
+    def bind_ctx(self, index):
+        """
+        Bind the cluster context to the current thread or asyncio task without
+        changing the global context used by the other threads. switch_ctx
+        called inside the block switches only the bound context, which is
+        restored at the end of the block.
+
+        Args:
+            index (int): Index of the cluster, None keeps the current binding
+
+        Yields:
+            Config: config of the bound cluster
+
+        """
+        if index is None:
+            yield self.cluster_ctx
+            return
+        token = _bound_config_index.set(index)
+        try:
+            yield self.clusters[index]
+        finally:
+            _bound_config_index.reset(token)
 
     @property
     def default_cluster_ctx(self):
@@ -23,7 +23,6 @@ from ocs_ci.framework.exceptions import (
     ClusterNameNotProvidedError,
     ClusterPathNotProvidedError,
 )
-from ocs_ci.ocs import defaults
 from ocs_ci.ocs.constants import (
     CLUSTER_NAME_MAX_CHARACTERS,
     CLUSTER_NAME_MIN_CHARACTERS,
@@ -35,6 +34,11 @@ from ocs_ci.ocs.exceptions import (
     ResourceNotFoundError,
 )
 from ocs_ci.ocs.cluster import check_clusters
+from ocs_ci.ocs.must_gather.mg_scheduler import (
+    flush_mg_scheduler,
+    get_mg_scheduler,
+    get_mg_timeout,
+)
 from ocs_ci.ocs.resources.ocs import get_version_info
 from ocs_ci.ocs import utils
 from ocs_ci.utility.utils import (
@@ -972,12 +976,6 @@ def pytest_runtest_makereport(item, call):
             "mcg",
             "purple_squad",
         }
-        # For every failure in MG we are trying to extend next attempt by 20 minutes
-        adjusted_timeout = utils.mg_fail_count * 1200
-        timeout = ocsci_config.REPORTING.get(
-            "must_gather_timeout", defaults.MUST_GATHER_TIMEOUT + adjusted_timeout
-        )
-        log.info(f"Adjusted timeout for MG is {timeout} seconds")
         mcg_logs_collection = bool(mcg_markers_to_collect & item_markers)
         try:
             if not ocsci_config.RUN.get("is_ocp_deployment_failed"):
@@ -985,6 +983,7 @@ def pytest_runtest_makereport(item, call):
                 # Subtract 5 minutes buffer to capture events before test started
                 global test_start_time
                 since_time_str = None
+                time_with_buffer = None
                 if test_start_time:
                     # Add 5 minute buffer before test start time
                     time_with_buffer = test_start_time - datetime.timedelta(minutes=5)
@@ -994,17 +993,28 @@ def pytest_runtest_makereport(item, call):
                         f"Collecting logs since: {since_time_str} (5 min buffer before test start)"
                     )
 
-                utils.collect_ocs_logs(
-                    dir_name=test_case_name,
-                    ocp=ocp_logs_collection,
-                    ocs=ocs_logs_collection,
-                    mcg=mcg_logs_collection,
-                    silent=True,
-                    output_file=True,
-                    skip_after_max_fail=True,
-                    timeout=timeout,
-                    since_time=since_time_str,
-                )
+                if ocsci_config.REPORTING.get("async_mg_collection"):
+                    get_mg_scheduler().submit(
+                        test_case_name,
+                        since=time_with_buffer,
+                        ocp=ocp_logs_collection,
+                        ocs=ocs_logs_collection,
+                        mcg=mcg_logs_collection,
+                    )
+                else:
+                    timeout = get_mg_timeout()
+                    log.info(f"Adjusted timeout for MG is {timeout} seconds")
+                    utils.collect_ocs_logs(
+                        dir_name=test_case_name,
+                        ocp=ocp_logs_collection,
+                        ocs=ocs_logs_collection,
+                        mcg=mcg_logs_collection,
+                        silent=True,
+                        output_file=True,
+                        skip_after_max_fail=True,
+                        timeout=timeout,
+                        since_time=since_time_str,
+                    )
         except Exception:
             log.exception("Failed to collect OCS logs")
 
@@ -1042,6 +1052,21 @@ def pytest_runtest_makereport(item, call):
             log.exception("Failed to collect performance stats")
 
 
+@pytest.hookimpl(tryfirst=True)
+def pytest_sessionfinish(session, exitstatus):
+    """
+    Wait for the background must-gather collections before the reports are
+    generated
+    """
+    if not ocsci_config.REPORTING.get("async_mg_collection"):
+        return
+    # the pending collections are dropped when stopped by the .stop file
+    stop_requested = ocsci_config.RUN.get("stop_requested", False)
+    graceful_stop = ocsci_config.RUN.get("graceful_stop", True)
+    log.info("Waiting for the background MG collections to finish")
+    flush_mg_scheduler(cancel_pending=stop_requested and not graceful_stop)
+
+
 def set_log_level(config):
     """
     Set the log level of this module based on the pytest.ini log_cli_level
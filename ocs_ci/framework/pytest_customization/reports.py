@@ -9,6 +9,7 @@ from ocs_ci.utility.utils import (
     ocsci_log_path,
 )
 from ocs_ci.framework import config as ocsci_config
+from ocs_ci.utility import call_profiler
 from ocs_ci.framework import GlobalVariables as GV
 
 
@@ -87,6 +88,13 @@ def pytest_sessionfinish(session, exitstatus):
 
     if ocsci_config.REPORTING.get("save_mem_report"):
         save_reports()
+    if call_profiler.is_call_profiler_enabled():
+        try:
+            call_profiler.dump_summary(
+                os.path.join(ocsci_log_path(), "session_call_profile.json")
+            )
+        except Exception as e:
+            log.warning(f"Failed to save the call profile to logs directory: {e}")
     if ocsci_config.RUN["cli_params"].get("email"):
         email_reports(session)
 
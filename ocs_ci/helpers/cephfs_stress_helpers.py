@@ -44,6 +44,7 @@ from ocs_ci.ocs.resources.pod import (
 )
 from ocs_ci.utility.prometheus import PrometheusAPI
 from ocs_ci.utility.utils import ceph_health_check
+from ocs_ci.ocs.ceph_snapshot import get_ceph_snapshot
 from ocs_ci.ocs.cluster import (
     get_osd_utilization,
     get_percent_used_capacity,
@@ -916,6 +917,7 @@ def get_osd_disk_utilization():
     Gets disk utilization for individual OSDs and the total used capacity in the cluster.
 
     """
+    get_ceph_snapshot().prefetch(["osd_df", "df"])
     osd_filled_dict = get_osd_utilization()
     logger.info(f"OSD Utilization: {osd_filled_dict}")
     total_used_capacity = get_percent_used_capacity()
@@ -0,0 +1,253 @@
+"""
+Index of the CSI driver, provisioner and snapshot controller logs
+
+The latency measurements of performance_lib used to scan every line of every
+CSI log for every measured PVC, so a bulk measurement cost PVCs x log lines
+string searches. CsiLogIndex parses each line once into its timestamp, the
+GRPC request id and call or response, and the PVC / PV / snapshot name of the
+provisioner and snapshot controller events, and keeps them in dictionaries,
+so every latency query is a lookup.
+
+The timestamps are kept as the klog header of the line, e.g.
+'I0115 10:30:00.123456', the conversions are done by performance_lib.
+
+Usage:
+    index = CsiLogIndex(read_csi_logs(log_names, "csi-rbdplugin", start_time))
+    calls = index.grpc_times(pv_name, "call")
+"""
+
+import collections
+import logging
+import re
+import time
+
+logger = logging.getLogger(__name__)
+
+CREATE_START = "create_start"
+CREATE_END = "create_end"
+DELETE_START = "delete_start"
+DELETE_END = "delete_end"
+SNAPSHOT_START = "start"
+SNAPSHOT_END = "end"
+
+_HEADER_RE = re.compile(r"^[IWEF]\d{4} \d{2}:\d{2}:\d{2}\.\d+")
+_GRPC_RE = re.compile(r"\bID: (\S+) (?:Req-ID: (\S+) )?GRPC (call|response):\s*(\S*)")
+_VOLUME_ID_RE = re.compile(r"generated volume id \(([^)]*)\)", re.IGNORECASE)
+_PV_NAME_RE = re.compile(r"pvc-[0-9a-f]{8}(?:-[0-9a-f]{4}){3}-[0-9a-f]{12}")
+_PVC_FIELD_RE = re.compile(r'PVC="(?:[^"/]*/)?([^"]*)"')
+_PV_FIELD_RE = re.compile(r'PV="([^"]*)"')
+# external-provisioner messages of the releases without structured logging
+_LEGACY_RE = re.compile(
+    r'\b(provision|delete) "(?:[^"/]*/)?([^"]+)"(?: class "[^"]*")?: '
+    r"(started|succeeded)"
+)
+_LEGACY_EVENTS = {
+    ("provision", "started"): CREATE_START,
+    ("provision", "succeeded"): CREATE_END,
+    ("delete", "started"): DELETE_START,
+    ("delete", "succeeded"): DELETE_END,
+}
+_SNAPSHOT_PATTERNS = {
+    "Creating content for snapshot": SNAPSHOT_START,
+    "ready to use": SNAPSHOT_END,
+}
+
+GrpcEvent = collections.namedtuple(
+    "GrpcEvent", ["time", "source", "grpc_id", "req_id", "kind", "method"]
+)
+ProvisionerEvent = collections.namedtuple("ProvisionerEvent", ["time", "legacy"])
+
+
+class CsiLogIndex(object):
+    """
+    Lookup tables of the events of the CSI logs
+    """
+
+    def __init__(self, logs):
+        """
+        Initializer function, the logs are parsed at once
+
+        Args:
+            logs (list): list of the logs, each of them a list of lines (or a
+                string), as returned by read_csi_logs
+
+        """
+        self.created = time.monotonic()
+        self.lines = 0
+        # req id -> GRPC calls and responses in the order of the logs
+        self._grpc = {}
+        # (log index, GRPC id) -> GRPC responses
+        self._responses = {}
+        # PV name -> volume id generated by the CSI driver
+        self._volume_ids = {}
+        # (PVC or PV name, event) -> provisioner events
+        self._provisioner = {}
+        # snapshot event -> (time, line) of the snapshot controller
+        self._snapshot = {SNAPSHOT_START: [], SNAPSHOT_END: []}
+        for source, sublog in enumerate(logs):
+            if isinstance(sublog, str):
+                sublog = sublog.split("\n")
+            for line in sublog:
+                self._parse(source, line)
+        logger.info(
+            f"Indexed {self.lines} CSI log lines: {len(self._grpc)} request ids, "
+            f"{len(self._provisioner)} provisioner events"
+        )
+
+    def _parse(self, source, line):
+        header = _HEADER_RE.match(line)
+        if header is None:
+            return
+        self.lines += 1
+        log_time = header.group(0)
+        if "GRPC " in line:
+            match = _GRPC_RE.search(line)
+            if match:
+                grpc_id, req_id, kind, method = match.groups()
+                event = GrpcEvent(
+                    log_time,
+                    source,
+                    grpc_id,
+                    req_id,
+                    kind,
+                    method if kind == "call" else None,
+                )
+                if req_id:
+                    self._grpc.setdefault(req_id, []).append(event)
+                if kind == "response":
+                    self._responses.setdefault((source, grpc_id), []).append(event)
+            return
+        match = _VOLUME_ID_RE.search(line)
+        if match:
+            for pv_name in _PV_NAME_RE.findall(line):
+                self._volume_ids[pv_name] = match.group(1)
+            return
+        match = _PVC_FIELD_RE.search(line) if 'PVC="' in line else None
+        if match:
+            if "Started" in line:
+                self._add_provisioner(match.group(1), CREATE_START, log_time, False)
+            if "succeeded" in line.lower():
+                self._add_provisioner(match.group(1), CREATE_END, log_time, False)
+        match = _PV_FIELD_RE.search(line) if 'PV="' in line else None
+        if match:
+            if '"shouldDelete is true"' in line:
+                self._add_provisioner(match.group(1), DELETE_START, log_time, False)
+            if "deleted succeeded" in line:
+                self._add_provisioner(match.group(1), DELETE_END, log_time, False)
+        match = _LEGACY_RE.search(line)
+        if match:
+            operation, name, status = match.groups()
+            event = _LEGACY_EVENTS[(operation, status)]
+            self._add_provisioner(name, event, log_time, True)
+        for pattern, event in _SNAPSHOT_PATTERNS.items():
+            if pattern in line:
+                self._snapshot[event].append((log_time, line))
+
+    def _add_provisioner(self, name, event, log_time, legacy):
+        self._provisioner.setdefault((name, event), []).append(
+            ProvisionerEvent(log_time, legacy)
+        )
+
+    def grpc_events(self, req_id, kind=None, method=None):
+        """
+        Args:
+            req_id (str): request id of the GRPC calls, e.g. the PV name or the
+                volume handle
+            kind (str): 'call' or 'response', both by default
+            method (str): only the calls of the method, e.g.
+                '/csi.v1.Node/NodeStageVolume'
+
+        Returns:
+            list: GrpcEvent tuples in the order of the logs
+
+        """
+        return [
+            event
+            for event in self._grpc.get(req_id, [])
+            if (kind is None or event.kind == kind)
+            and (method is None or event.method == method)
+        ]
+
+    def grpc_times(self, req_id, kind, method=None):
+        """
+        Args:
+            req_id (str): request id of the GRPC calls
+            kind (str): 'call' or 'response'
+            method (str): only the calls of the method
+
+        Returns:
+            list: times of the events in the order of the logs
+
+        """
+        return [event.time for event in self.grpc_events(req_id, kind, method)]
+
+    def response_times(self, call):
+        """
+        Args:
+            call (GrpcEvent): the GRPC call
+
+        Returns:
+            list: times of the responses to the call
+
+        """
+        return [
+            event.time
+            for event in self._responses.get((call.source, call.grpc_id), [])
+            if event.req_id == call.req_id
+        ]
+
+    def req_ids(self, substring):
+        """
+        Args:
+            substring (str): part of the request id, e.g. the snapshot uid
+
+        Returns:
+            list: the request ids containing the substring
+
+        """
+        return [req_id for req_id in self._grpc if substring in req_id]
+
+    def volume_id(self, pv_name):
+        """
+        Args:
+            pv_name (str): name of the PV
+
+        Returns:
+            str: volume id generated for the PV by the CSI driver, None if it
+                isn't in the logs
+
+        """
+        return self._volume_ids.get(pv_name)
+
+    def provisioner_times(self, name, event, legacy=True):
+        """
+        Args:
+            name (str): PVC name for the create events, PV name for the delete
+                events
+            event (str): CREATE_START, CREATE_END, DELETE_START or DELETE_END
+            legacy (bool): include the messages of the provisioner releases
+                without structured logging
+
+        Returns:
+            list: times of the events in the order of the logs
+
+        """
+        return [
+            entry.time
+            for entry in self._provisioner.get((name, event), [])
+            if legacy or not entry.legacy
+        ]
+
+    def snapshot_times(self, snap_name, event):
+        """
+        Args:
+            snap_name (str): name of the volume snapshot
+            event (str): SNAPSHOT_START or SNAPSHOT_END
+
+        Returns:
+            list: times of the snapshot controller events of the snapshot
+
+        """
+        return [
+            log_time for log_time, line in self._snapshot[event] if snap_name in line
+        ]
@@ -20,6 +20,7 @@ from ocs_ci.deployment.fusion_data_foundation import FusionDataFoundationDeploym
 from ocs_ci.framework import config
 from ocs_ci.ocs import constants, ocp
 from ocs_ci.ocs.cluster import is_hci_cluster
+from ocs_ci.ocs.cluster_context import run_on_clusters
 from ocs_ci.ocs.defaults import RBD_NAME
 from ocs_ci.ocs.exceptions import (
     TimeoutExpiredError,
@@ -601,17 +602,14 @@ def wait_for_mirroring_status_ok(
         TimeoutExpiredError: In case of unexpected mirroring status
 
     """
-    restore_index = config.cur_index
     dr_cluster_relations = config.MULTICLUSTER.get("dr_cluster_relations", [])
     if dr_cluster_relations:
         non_acm_cluster_config = get_non_acm_cluster_and_non_provider_cluster_config()
     else:
         non_acm_cluster_config = get_non_acm_cluster_config()
-    for cluster in non_acm_cluster_config:
-        config.switch_ctx(cluster.MULTICLUSTER["multicluster_index"])
-        logger.info(
-            f"Validating mirroring status on cluster {cluster.ENV_DATA['cluster_name']}"
-        )
+
+    def validate_mirroring_status(cluster_context):
+        logger.info(f"Validating mirroring status on cluster {cluster_context.name}")
         sample = TimeoutSampler(
             timeout=timeout,
             sleep=5,
@@ -622,12 +620,19 @@ def wait_for_mirroring_status_ok(
         if not sample.wait_for_func_status(result=True):
             error_msg = (
                 "The mirroring status does not have expected values within the time"
-                f" limit on cluster {cluster.ENV_DATA['cluster_name']}"
+                f" limit on cluster {cluster_context.name}"
             )
             logger.error(error_msg)
             raise TimeoutExpiredError(error_msg)
 
-    config.switch_ctx(restore_index)
+    # the clusters are validated at once, each in its own bound context
+    run_on_clusters(
+        validate_mirroring_status,
+        indexes=[
+            cluster.MULTICLUSTER["multicluster_index"]
+            for cluster in non_acm_cluster_config
+        ],
+    )
     return True
 
 
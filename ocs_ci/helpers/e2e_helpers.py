@@ -18,6 +18,7 @@ from ocs_ci.ocs.bucket_utils import (
 )
 from ocs_ci.ocs.resources.pod import get_rgw_pods, get_pod_logs
 from ocs_ci.utility.utils import exec_cmd, run_cmd
+from ocs_ci.ocs.ceph_snapshot import get_ceph_snapshot
 from ocs_ci.ocs.cluster import (
     get_percent_used_capacity,
     get_osd_utilization,
@@ -413,6 +414,7 @@ def verify_osd_used_capacity_greater_than_expected(expected_used_capacity):
          bool: True if used_capacity greater than expected_used_capacity, False otherwise
 
     """
+    get_ceph_snapshot().prefetch(["df", "df_detail", "osd_df"])
     used_capacity = get_percent_used_capacity()
     logger.info(f"Used Capacity is {used_capacity}%")
     ceph_df_detail = get_ceph_df_detail()
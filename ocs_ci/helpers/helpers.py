@@ -3,6 +3,7 @@ Helper functions file for OCS QE
 """
 
 import base64
+import copy
 import random
 import datetime
 import hashlib
@@ -40,7 +41,7 @@ from ocs_ci.ocs.utils import (
     get_nb_db_psql_version_from_image,
     query_nb_db_psql_version,
 )
-from ocs_ci.ocs import constants, defaults, node, ocp, exceptions
+from ocs_ci.ocs import constants, defaults, log_harvester, node, ocp, exceptions
 from ocs_ci.ocs.exceptions import (
     CommandFailed,
     NoRunningCephToolBoxException,
@@ -52,6 +53,7 @@ from ocs_ci.ocs.exceptions import (
 )
 from ocs_ci.ocs.ocp import OCP
 from ocs_ci.ocs.resources import pod, pvc
+from ocs_ci.ocs.resources.bulk_apply import BulkApply, latency_summary, track_resources
 from ocs_ci.ocs.resources.ocs import OCS
 from ocs_ci.utility import templating, version
 from ocs_ci.utility.vsphere import VSPHERE
@@ -1194,26 +1196,22 @@ def create_multiple_pvcs(
     tmpdir = tempfile.mkdtemp()
     logger.info("Creating the PVC yaml files for creation in bulk")
     ocs_objs = []
+    pvc_dict_list = []
     for _ in range(number_of_pvc):
         name = create_unique_resource_name("test", "pvc")
         logger.info(f"Adding PVC with name {name}")
         pvc_data["metadata"]["name"] = name
         templating.dump_data_to_temp_yaml(pvc_data, f"{tmpdir}/{name}.yaml")
         ocs_objs.append(pvc.PVC(**pvc_data))
+        pvc_dict_list.append(copy.deepcopy(pvc_data))
 
     logger.info("Creating all PVCs as bulk")
-    oc = OCP(kind="pod", namespace=namespace)
-    cmd = f"create -f {tmpdir}/"
-    oc.exec_oc_cmd(command=cmd, out_yaml_format=False)
+    bulk = BulkApply(pvc_dict_list, namespace=namespace)
+    bulk.submit()
 
-    # Letting the system 1 sec for each PVC to create.
-    # this will prevent any other command from running in the system in this
-    # period of time.
-    logger.info(
-        f"Going to sleep for {number_of_pvc} sec. "
-        "until starting verify that PVCs was created."
-    )
-    time.sleep(number_of_pvc)
+    # Wait until all the PVCs are created, so no other command is running in
+    # the system before the bulk creation is finished
+    bulk.wait_for(timeout=max(number_of_pvc * 2, 120))
 
     return ocs_objs, tmpdir
 
@@ -1229,7 +1227,14 @@ def delete_bulk_pvcs(pvc_yaml_dir, pv_names_list, namespace):
     cmd = f"delete -f {pvc_yaml_dir}/"
     oc.exec_oc_cmd(command=cmd, out_yaml_format=False)
 
-    time.sleep(len(pv_names_list) * 5)  # previously was len(pv_names_list) / 2
+    # wait for the PVs to be released and deleted by the provisioner
+    latencies = track_resources(
+        constants.PV,
+        pv_names_list,
+        deleted=True,
+        timeout=max(len(pv_names_list) * 5, 120),
+    )
+    logger.info(f"Latencies of PV deletion: {latency_summary(latencies)}")
 
     for pv_name in pv_names_list:
         validate_pv_delete(pv_name)
@@ -3077,30 +3082,45 @@ def remove_label_from_worker_node(node_list, label_key):
     logger.info(out)
 
 
-def get_pods_nodes_logs():
+def get_pods_nodes_log_files(log_dir):
     """
-    Get logs from all pods and nodes
+    Save logs of all pods and nodes to the compressed files of the directory,
+    the logs are collected in parallel by the log harvester of the run
+
+    Args:
+        log_dir (str): directory of the log files
 
     Returns:
-        dict: node/pod name as key, logs content as value (string)
+        dict: node name or <namespace>_<pod name> as key, path of the
+            compressed log file as value
+
     """
-    all_logs = {}
-    all_pods = pod.get_all_pods()
-    all_nodes = node.get_node_objs()
+    jobs = [
+        log_harvester.node_logs_job(node_obj.name, log_dir)
+        for node_obj in node.get_node_objs()
+    ]
+    jobs.extend(
+        log_harvester.pod_logs_job(pod_obj.name, log_dir, namespace=pod_obj.namespace)
+        for pod_obj in pod.get_all_pods()
+    )
+    return log_harvester.get_log_harvester().harvest(jobs)
 
-    for node_obj in all_nodes:
-        node_name = node_obj.name
-        log_content = node.get_node_logs(node_name)
-        all_logs.update({node_name: log_content})
 
-    for pod_obj in all_pods:
-        try:
-            pod_name = pod_obj.name
-            log_content = pod.get_pod_logs(pod_name)
-            all_logs.update({pod_name: log_content})
-        except CommandFailed:
-            pass
+def get_pods_nodes_logs():
+    """
+    Get logs from all pods and nodes
 
+    Returns:
+        dict: node name or <namespace>_<pod name> as key, logs content as
+            value (string)
+    """
+    all_logs = {}
+    with tempfile.TemporaryDirectory() as log_dir:
+        for name, file_path in get_pods_nodes_log_files(log_dir).items():
+            try:
+                all_logs[name] = log_harvester.read_log_file(file_path)
+            except (OSError, EOFError) as err:
+                logger.error(f"Failed to read log of {name} from {file_path}: {err}")
     return all_logs
 
 
@@ -3113,9 +3133,9 @@ def get_logs_with_errors(errors=None):
         errors (list): List of errors to look for
 
     Returns:
-        dict: node/pod name as key, logs content as value; may be empty
+        dict: node name or <namespace>_<pod name> as key, logs content as
+            value; may be empty
     """
-    all_logs = get_pods_nodes_logs()
     output_logs = {}
 
     errors_list = constants.CRITICAL_ERRORS
@@ -3123,15 +3143,33 @@ def get_logs_with_errors(errors=None):
     if errors:
         errors_list = errors_list + errors
 
-    for name, log_content in all_logs.items():
-        for error_msg in errors_list:
-            if error_msg in log_content:
-                logger.debug(f"Found '{error_msg}' in log of {name}")
-                output_logs.update({name: log_content})
+    with tempfile.TemporaryDirectory() as log_dir:
+        log_files = get_pods_nodes_log_files(log_dir)
+        for name, file_path in log_files.items():
+            # the logs are scanned line by line, only the matching ones are
+            # loaded to memory
+            try:
+                error_msg = next(
+                    (
+                        error_msg
+                        for line in log_harvester.iter_log_file(file_path)
+                        for error_msg in errors_list
+                        if error_msg in line
+                    ),
+                    None,
+                )
+                if error_msg is None:
+                    continue
+                log_content = log_harvester.read_log_file(file_path)
+            except (OSError, EOFError) as err:
+                logger.error(f"Failed to read log of {name} from {file_path}: {err}")
+                continue
+            logger.debug(f"Found '{error_msg}' in log of {name}")
+            output_logs.update({name: log_content})
 
-                log_path = f"{ocsci_log_path()}/{name}.log"
-                with open(log_path, "w") as fh:
-                    fh.write(log_content)
+            log_path = f"{ocsci_log_path()}/{name}.log"
+            with open(log_path, "w") as fh:
+                fh.write(log_content)
 
     return output_logs
 
@@ -3990,17 +4028,23 @@ def set_configmap_log_level_rook_ceph_operator(value):
         configmap_obj.patch(params=params, format_type="json")
 
 
-def get_logs_rook_ceph_operator():
+def get_logs_rook_ceph_operator(incremental=None):
     """
     Get logs from a rook_ceph_operator pod
 
+    Args:
+        incremental (bool): Download only the new lines of the logs, see
+            get_pod_logs
+
     Returns:
         str: Output from 'oc get logs rook-ceph-operator command
 
     """
     logger.info("Get logs from rook_ceph_operator pod")
     rook_ceph_operator_objs = pod.get_operator_pods()
-    return pod.get_pod_logs(pod_name=rook_ceph_operator_objs[0].name)
+    return pod.get_pod_logs(
+        pod_name=rook_ceph_operator_objs[0].name, incremental=incremental
+    )
 
 
 def check_osd_log_exist_on_rook_ceph_operator_pod(
@@ -5210,6 +5254,7 @@ def verify_log_exist_in_pods_logs(
     namespace=None,
     all_containers_flag=True,
     since=None,
+    incremental=None,
 ):
     """
     Verify log exist in pods logs.
@@ -5221,6 +5266,7 @@ def verify_log_exist_in_pods_logs(
         namespace (str): Namespace of the pod
         all_containers_flag (bool): fetch logs from all containers of the resource
         since (str): only return logs newer than a relative duration like 5s, 2m, or 3h.
+        incremental (bool): Download only the new lines of the logs, see get_pod_logs
 
     Returns:
         bool: return True if log exist otherwise False
@@ -5236,6 +5282,7 @@ def verify_log_exist_in_pods_logs(
             since=since,
             grep=expected_log,
             return_empty_string=True,
+            incremental=incremental,
         )
         if expected_log in pod_logs:
             return True
@@ -1,3 +1,4 @@
+import collections
 import json
 import os
 import logging
@@ -5,8 +6,9 @@ import subprocess
 import time
 from datetime import datetime
 
-import re
-
+from ocs_ci.helpers import csi_log_index
+from ocs_ci.helpers.csi_log_index import CsiLogIndex
+from ocs_ci.ocs.pod_log_tail import read_pod_logs
 from ocs_ci.ocs.resources import pod
 from ocs_ci.framework import config
 from ocs_ci.ocs import constants
@@ -29,6 +31,11 @@ interface_data = {
     },
 }
 
+SNAPSHOT_CONTROLLER_NAMESPACE = "openshift-cluster-storage-operator"
+# Number of the indexed log windows kept for the following measurements
+LOG_INDEX_CACHE_SIZE = 8
+_log_indexes = collections.OrderedDict()
+
 
 def write_fio_on_pod(pod_obj, file_size):
     """
@@ -197,7 +204,7 @@ def get_logfile_names(interface, provisioning=True):
     return log_names
 
 
-def read_csi_logs(log_names, container_name, start_time):
+def read_csi_logs(log_names, container_name, start_time, incremental=None):
     """
     Reading specific CSI logs starting on a specific time
 
@@ -205,12 +212,23 @@ def read_csi_logs(log_names, container_name, start_time):
         log_names (list): list of pods to read log from them
         container_name (str): the name of the specific container in the pod
         start_time (time): the time stamp which will use as starting point in the log
+        incremental (bool): download only the lines logged since the previous read of the
+            pod logs, see pod_log_tail. By default RUN['incremental_pod_logs'].
 
     Returns:
         list : list of lines from all logs
 
     """
     ns_name = config.ENV_DATA["cluster_namespace"]
+    if incremental is None:
+        incremental = config.RUN.get("incremental_pod_logs", False)
+    if incremental:
+        return [
+            read_pod_logs(
+                l, container=container_name, namespace=ns_name, since_time=start_time
+            )
+            for l in log_names
+        ]
     logs = []
     for l in log_names:
         logs.append(
@@ -222,6 +240,142 @@ def read_csi_logs(log_names, container_name, start_time):
     return logs
 
 
+def _get_log_index(key, read_logs, refresh=False):
+    """
+    Get the index of the logs from the cache, the logs are read and indexed
+    on a miss
+
+    Args:
+        key (tuple): key of the logs window in the cache
+        read_logs (callable): returns the logs to index
+        refresh (bool): read the logs again even if they are cached
+
+    Returns:
+        CsiLogIndex: the index
+
+    """
+    if not refresh and key in _log_indexes:
+        _log_indexes.move_to_end(key)
+        return _log_indexes[key]
+    index = CsiLogIndex(read_logs())
+    _log_indexes[key] = index
+    while len(_log_indexes) > LOG_INDEX_CACHE_SIZE:
+        _log_indexes.popitem(last=False)
+    return index
+
+
+def get_csi_log_index(
+    interface, container_name, start_time, provisioning=True, refresh=False
+):
+    """
+    Get the index of the CSI logs since the start time, the logs are read once
+    per measurement window and reused by the following measurements
+
+    Args:
+        interface (str): an interface (RBD or CephFS) to run on
+        container_name (str): the name of the specific container in the pods
+        start_time (str): the time stamp which will use as starting point in
+            the log
+        provisioning (bool): if True, read the provisioner pods, the CSI
+            plugin pods otherwise
+        refresh (bool): read the logs again even if they are cached
+
+    Returns:
+        CsiLogIndex: the index of the logs
+
+    """
+    key = (
+        config.ENV_DATA["cluster_namespace"],
+        interface,
+        container_name,
+        start_time,
+        provisioning,
+    )
+    return _get_log_index(
+        key,
+        lambda: read_csi_logs(
+            get_logfile_names(interface, provisioning), container_name, start_time
+        ),
+        refresh,
+    )
+
+
+def get_snapshot_controller_log_index(start_time, refresh=False):
+    """
+    Get the index of the snapshot controller logs since the start time
+
+    Args:
+        start_time (str): the time stamp which will use as starting point in
+            the log
+        refresh (bool): read the logs again even if they are cached
+
+    Returns:
+        CsiLogIndex: the index of the logs
+
+    """
+
+    def read_logs():
+        pods = run_oc_command(cmd="get pod", namespace=SNAPSHOT_CONTROLLER_NAMESPACE)
+        if "Error in command" in pods:
+            raise Exception("Cannot get csi controller pod")
+        return [
+            run_oc_command(
+                f"logs {line.split()[0]} --since-time={start_time}",
+                SNAPSHOT_CONTROLLER_NAMESPACE,
+            )
+            for line in pods
+            if "csi-snapshot-controller" in line
+            and "csi-snapshot-controller-operator" not in line
+        ]
+
+    return _get_log_index(
+        (SNAPSHOT_CONTROLLER_NAMESPACE, start_time), read_logs, refresh
+    )
+
+
+def query_log_index(get_index, query):
+    """
+    Run the query on the cached index of the logs, the query is repeated on
+    the re-read logs when it misses an event, which may have been logged
+    after the logs were cached
+
+    Args:
+        get_index (callable): get_csi_log_index or
+            get_snapshot_controller_log_index with the logs window bound,
+            called with the refresh argument
+        query (callable): gets the index, returns the result of the query,
+            None or a tuple containing None when an event is missing
+
+    Returns:
+        the result of the query
+
+    """
+    started = time.monotonic()
+    index = get_index(refresh=False)
+    result = query(index)
+    if _query_missed(result) and index.created < started:
+        result = query(get_index(refresh=True))
+    return result
+
+
+def _query_missed(result):
+    if result is None:
+        return True
+    if isinstance(result, tuple):
+        return None in result
+    if isinstance(result, dict):
+        return any(_query_missed(value) for value in result.values())
+    return False
+
+
+def _log_time(log_time):
+    """
+    Convert the klog header time (e.g. 'I0115 10:30:00.123456') to a time
+    object, the date is ignored
+    """
+    return string_to_time(log_time.split(" ")[1])
+
+
 # Sometimes, the logs are not available due to the connection issues, retry added
 @retry(Exception, tries=6, delay=5, backoff=2)
 def measure_pvc_creation_time(interface, pvc_name, start_time):
@@ -238,21 +392,22 @@ def measure_pvc_creation_time(interface, pvc_name, start_time):
         (float) creation time for PVC in seconds
 
     """
-    log_names = get_logfile_names(interface)
-    logs = read_csi_logs(log_names, "csi-provisioner", start_time)
-
-    st = None
-    et = None
-    # look for start time and end time of pvc creation. The start/end line may appear in log several times
-    # in order to be on the safe side and measure the longest time difference (which is the actual pvc creation
-    # time), the earliest start time and the latest end time are taken
-    for sublog in logs:
-        for line in sublog:
-            if st is None and "Started" in line and pvc_name in line:
-                st = string_to_time(line.split(" ")[1])
-            elif pvc_name in line and "Succeeded" in line:
-                et = string_to_time(line.split(" ")[1])
-    del logs
+
+    def query(index):
+        # The start/end line may appear in log several times in order to be on
+        # the safe side and measure the longest time difference (which is the
+        # actual pvc creation time), the earliest start time and the latest
+        # end time are taken
+        starts = index.provisioner_times(pvc_name, csi_log_index.CREATE_START)
+        ends = index.provisioner_times(pvc_name, csi_log_index.CREATE_END)
+        return (starts[0] if starts else None, ends[-1] if ends else None)
+
+    st, et = query_log_index(
+        lambda refresh: get_csi_log_index(
+            interface, "csi-provisioner", start_time, refresh=refresh
+        ),
+        query,
+    )
     if st is None:
         logger.error(f"Cannot find start time of {pvc_name}")
         raise Exception(f"Cannot find start time of {pvc_name}")
@@ -261,7 +416,7 @@ def measure_pvc_creation_time(interface, pvc_name, start_time):
         logger.error(f"Cannot find end time of {pvc_name}")
         raise Exception(f"Cannot find end time of {pvc_name}")
 
-    total_time = (et - st).total_seconds()
+    total_time = (_log_time(et) - _log_time(st)).total_seconds()
     if total_time < 0:
         # for start-time > end-time (before / after midnigth) adding 24H to the time.
         total_time += 24 * 60 * 60
@@ -270,6 +425,29 @@ def measure_pvc_creation_time(interface, pvc_name, start_time):
     return total_time
 
 
+def _csi_request_times(index, pv_name, operation):
+    """
+    Get the times of the GRPC call and response of the PV in the CSI logs
+
+    Args:
+        index (CsiLogIndex): index of the CSI logs
+        pv_name (str): name of the PV
+        operation (str): 'create' / 'delete', the delete requests use the
+            volume id generated by the CSI driver
+
+    Returns:
+        tuple: log times of the last call and of the last response, None if
+            not found
+
+    """
+    req_id = pv_name
+    if operation == "delete":
+        req_id = index.volume_id(pv_name) or pv_name
+    calls = index.grpc_times(req_id, "call")
+    responses = index.grpc_times(req_id, "response")
+    return (calls[-1] if calls else None, responses[-1] if responses else None)
+
+
 # Sometimes, the logs are not available due to the connection issues, retry added
 @retry(Exception, tries=6, delay=5, backoff=2)
 def csi_pvc_time_measure(interface, pvc_obj, operation, start_time):
@@ -288,27 +466,16 @@ def csi_pvc_time_measure(interface, pvc_obj, operation, start_time):
 
     """
 
-    pv_name = pvc_obj.backed_pv
-
     # Reading the CSI provisioner logs
-    log_names = get_logfile_names(interface)
-    logs = read_csi_logs(log_names, interface_data[interface]["csi_cnt"], start_time)
-
-    st = None
-    et = None
-    for sublog in logs:
-        for line in sublog:
-            if (
-                operation == "delete"
-                and "generated volume id" in line.lower()
-                and pv_name in line
-            ):
-                pv_name = line.split("(")[1].split(")")[0]
-            if f"Req-ID: {pv_name} GRPC call:" in line:
-                st = string_to_time(line.split(" ")[1])
-            if f"Req-ID: {pv_name} GRPC response:" in line:
-                et = string_to_time(line.split(" ")[1])
-    del logs
+    st, et = query_log_index(
+        lambda refresh: get_csi_log_index(
+            interface,
+            interface_data[interface]["csi_cnt"],
+            start_time,
+            refresh=refresh,
+        ),
+        lambda index: _csi_request_times(index, pvc_obj.backed_pv, operation),
+    )
     if st is None:
         err_msg = f"Cannot find CSI start time of {pvc_obj.name}"
         logger.error(err_msg)
@@ -319,7 +486,7 @@ def csi_pvc_time_measure(interface, pvc_obj, operation, start_time):
         logger.error(err_msg)
         raise Exception(err_msg)
 
-    total_time = (et - st).total_seconds()
+    total_time = (_log_time(et) - _log_time(st)).total_seconds()
     if total_time < 0:
         # for start-time > end-time (before / after midnigth) adding 24H to the time.
         total_time += 24 * 60 * 60
@@ -352,27 +519,19 @@ def csi_bulk_pvc_time_measure(interface, pvc_objs, operation, start_time):
         constants.CEPHBLOCKPOOL: "csi-rbdplugin",
     }
 
-    # Reading the CSI provisioner logs
-    log_names = get_logfile_names(interface)
-    logs = read_csi_logs(log_names, cnt_names[interface], start_time)
+    # Reading the CSI provisioner logs, once for all the PVCs
+    times = query_log_index(
+        lambda refresh: get_csi_log_index(
+            interface, cnt_names[interface], start_time, refresh=refresh
+        ),
+        lambda index: {
+            pvc.name: _csi_request_times(index, pvc.backed_pv, operation)
+            for pvc in pvc_objs
+        },
+    )
 
     for pvc in pvc_objs:
-        pv_name = pvc.backed_pv
-        single_st = None
-        single_et = None
-
-        for sublog in logs:
-            for line in sublog:
-                if (
-                    operation == "delete"
-                    and "generated volume id" in line.lower()
-                    and pv_name in line
-                ):
-                    pv_name = line.split("(")[1].split(")")[0]
-                if f"Req-ID: {pv_name} GRPC call:" in line:
-                    single_st = string_to_time(line.split(" ")[1])
-                if f"Req-ID: {pv_name} GRPC response:" in line:
-                    single_et = string_to_time(line.split(" ")[1])
+        single_st, single_et = times[pvc.name]
 
         if single_st is None:
             err_msg = f"Cannot find CSI start time of {pvc.name}"
@@ -384,8 +543,8 @@ def csi_bulk_pvc_time_measure(interface, pvc_objs, operation, start_time):
             logger.error(err_msg)
             raise Exception(err_msg)
 
-        st.append(single_st)
-        et.append(single_et)
+        st.append(_log_time(single_st))
+        et.append(_log_time(single_et))
 
     st.sort()
     et.sort()
@@ -478,59 +637,25 @@ def get_snapshot_time(snap_name, status, start_time):
 
     """
 
-    def get_pattern_time(log, snapname, pattern):
-        """
-        Get the time of pattern in the log
-
-        Args:
-            log (list): list of all lines in the log file
-            snapname (str): the name of the snapshot
-            pattern (str): the pattern that need to be found in the log (start / bound)
-
-        Returns:
-            str: string of the pattern timestamp in the log, if not found None
-
-        """
-        this_year = str(datetime.now().year)
-        for line in log:
-            if re.search(snapname, line) and re.search(pattern, line):
-                mon_day = " ".join(line.split(" ")[0:2])
-                return f"{this_year} {mon_day}"
-        return None
-
-    pods = run_oc_command(cmd="get pod", namespace="openshift-cluster-storage-operator")
-
-    if "Error in command" in pods:
-        raise Exception("Cannot get csi controller pod")
-
-    log_names = []
-    for line in pods:
-        if (
-            "csi-snapshot-controller" in line
-            and "csi-snapshot-controller-operator" not in line
-        ):
-            log_names.append(line.split()[0])
-
-    log_lines = []
-    for log in log_names:
-        sublog_lines = run_oc_command(
-            f"logs {log} --since-time={start_time}",
-            "openshift-cluster-storage-operator",
-        )
-        for l in sublog_lines:
-            log_lines.extend(l.split("\n"))
-
-    if status.lower() == "start":
-        pattern = "Creating content for snapshot"
-    elif status.lower() == "end":
-        pattern = "ready to use"
-    else:
+    events = {
+        "start": csi_log_index.SNAPSHOT_START,
+        "end": csi_log_index.SNAPSHOT_END,
+    }
+    if status.lower() not in events:
         logger.error(f"the status {status} is invalid.")
         return None
 
-    time = get_pattern_time(log_lines, snap_name, pattern)
-    if time:
-        return datetime.strptime(time, DATE_TIME_FORMAT)
+    def query(index):
+        times = index.snapshot_times(snap_name, events[status.lower()])
+        return times[0] if times else None
+
+    log_time = query_log_index(
+        lambda refresh: get_snapshot_controller_log_index(start_time, refresh),
+        query,
+    )
+    if log_time:
+        this_year = str(datetime.now().year)
+        return datetime.strptime(f"{this_year} {log_time}", DATE_TIME_FORMAT)
     else:
         return None
 
@@ -551,23 +676,30 @@ def measure_csi_snapshot_creation_time(interface, snapshot_id, start_time):
         (float) snapshot creation time in seconds
 
     """
-    log_names = get_logfile_names(interface)
-    logs = read_csi_logs(log_names, interface_data[interface]["csi_cnt"], start_time)
-
-    st = None
-    et = None
-    time_format = "%H:%M:%S.%f"
-    for sublog in logs:
-        for line in sublog:
-            if (
-                "GRPC call: /csi.v1.Controller/CreateSnapshot" in line
-                and snapshot_id in line
-            ):
-                st = line.split(" ")[1]
-                st = datetime.strptime(st, time_format)
-            elif "GRPC response" in line and snapshot_id in line:
-                et = line.split(" ")[1]
-                et = datetime.strptime(et, time_format)
+
+    def query(index):
+        st = et = None
+        # the request id of the snapshot is snapshot-<snapshot uid>
+        for req_id in index.req_ids(snapshot_id):
+            calls = index.grpc_events(
+                req_id, "call", "/csi.v1.Controller/CreateSnapshot"
+            )
+            responses = index.grpc_times(req_id, "response")
+            if calls:
+                st = calls[-1].time
+            if responses:
+                et = responses[-1]
+        return st, et
+
+    st, et = query_log_index(
+        lambda refresh: get_csi_log_index(
+            interface,
+            interface_data[interface]["csi_cnt"],
+            start_time,
+            refresh=refresh,
+        ),
+        query,
+    )
     if st is None:
         logger.error(f"Cannot find csi start time of snapshot {snapshot_id}")
         raise Exception(f"Cannot find csi start time of snapshot {snapshot_id}")
@@ -576,7 +708,7 @@ def measure_csi_snapshot_creation_time(interface, snapshot_id, start_time):
         logger.error(f"Cannot find csi end time of snapshot {snapshot_id}")
         raise Exception(f"Cannot find csi end time of snapshot {snapshot_id}")
 
-    total_time = (et - st).total_seconds()
+    total_time = (_log_time(et) - _log_time(st)).total_seconds()
     if total_time < 0:
         # for start-time > end-time (before / after midnigth) adding 24H to the time.
         total_time += 24 * 60 * 60
@@ -629,17 +761,6 @@ def get_pvc_provision_times(interface, pvc_name, start_time, time_type="all", op
 
     """
 
-    log_names = get_logfile_names(interface)
-
-    if time_type.lower() in ["all", "total"]:
-        logger.info("Reading the Provisioner logs")
-        prov_logs = read_csi_logs(log_names, "csi-provisioner", start_time)
-    if time_type.lower() in ["all", "csi"]:
-        logger.info("Reading the CSI only logs")
-        csi_logs = read_csi_logs(
-            log_names, interface_data[interface]["csi_cnt"], start_time
-        )
-
     # Initializing the results dictionary
     results = {}
     for i in range(0, len(pvc_name)):
@@ -649,123 +770,81 @@ def get_pvc_provision_times(interface, pvc_name, start_time, time_type="all", op
             "csi_create": {"start": None, "end": None, "time": None},
             "csi_delete": {"start": None, "end": None, "time": None},
         }
+
+    def set_times(name, operation, start_times, end_times):
+        # the first start and the first end of the operation are taken
+        if start_times:
+            results[name][operation]["start"] = extruct_timestamp_from_log(
+                start_times[0]
+            )
+        if end_times:
+            results[name][operation]["end"] = extruct_timestamp_from_log(end_times[0])
+            results[name][operation]["time"] = calculate_operation_time(
+                name, results[name][operation]
+            )
+
     # Getting times from Provisioner log - if needed
-    if prov_logs:
-        for sublog in prov_logs:
-            for line in sublog:
-                for i in range(0, len(pvc_name)):
-                    name = pvc_name[i].name
-                    pv_name = pvc_name[i].backed_pv
-                    if op in ["all", "create"]:
-                        if (
-                            re.search(f"provision.*{name}.*started", line)
-                            and (
-                                version.get_semantic_ocs_version_from_config()
-                                <= version.VERSION_4_16
-                            )
-                        ) or re.search(f'Started.*PVC="[^"]*/{re.escape(name)}"', line):
-                            if results[name]["create"]["start"] is None:
-                                results[name]["create"]["start"] = (
-                                    extruct_timestamp_from_log(line)
-                                )
-                        if (
-                            re.search(f"provision.*{name}.*succeeded", line)
-                            and (
-                                version.get_semantic_ocs_version_from_config()
-                                <= version.VERSION_4_16
-                            )
-                        ) or re.search(
-                            f"Succeeded.*{re.escape(name)}", line, re.IGNORECASE
-                        ):
-                            if results[name]["create"]["end"] is None:
-                                results[name]["create"]["end"] = (
-                                    extruct_timestamp_from_log(line)
-                                )
-                                results[name]["create"]["time"] = (
-                                    calculate_operation_time(
-                                        name, results[name]["create"]
-                                    )
-                                )
-                    if op in ["all", "delete"]:
-                        if (
-                            re.search(f'delete "{pv_name}": started', line)
-                            and (
-                                version.get_semantic_ocs_version_from_config()
-                                <= version.VERSION_4_16
-                            )
-                        ) or re.search(
-                            f'"shouldDelete is true".*PV="{re.escape(pv_name)}"', line
-                        ):
-                            if results[name]["delete"]["start"] is None:
-                                results[name]["delete"]["start"] = (
-                                    extruct_timestamp_from_log(line)
-                                )
-                        if (
-                            re.search(f'delete "{pv_name}": succeeded', line)
-                            and (
-                                version.get_semantic_ocs_version_from_config()
-                                <= version.VERSION_4_13
-                            )
-                        ) or re.search(
-                            f'deleted succeeded.*PV="{re.escape(pv_name)}"', line
-                        ):
-                            if results[name]["delete"]["end"] is None:
-                                results[name]["delete"]["end"] = (
-                                    extruct_timestamp_from_log(line)
-                                )
-                                results[name]["delete"]["time"] = (
-                                    calculate_operation_time(
-                                        name, results[name]["delete"]
-                                    )
-                                )
+    if time_type.lower() in ["all", "total"]:
+        logger.info("Reading the Provisioner logs")
+        # the logs are read again, the times of all the PVCs are read from the
+        # logs at once after the operations
+        prov_index = get_csi_log_index(
+            interface, "csi-provisioner", start_time, refresh=True
+        )
+        ocs_version = version.get_semantic_ocs_version_from_config()
+        # messages of the provisioner releases without structured logging
+        legacy_start = ocs_version <= version.VERSION_4_16
+        legacy_delete_end = ocs_version <= version.VERSION_4_13
+        for pvc in pvc_name:
+            name = pvc.name
+            pv_name = pvc.backed_pv
+            if op in ["all", "create"]:
+                set_times(
+                    name,
+                    "create",
+                    prov_index.provisioner_times(
+                        name, csi_log_index.CREATE_START, legacy_start
+                    ),
+                    prov_index.provisioner_times(
+                        name, csi_log_index.CREATE_END, legacy_start
+                    ),
+                )
+            if op in ["all", "delete"]:
+                set_times(
+                    name,
+                    "delete",
+                    prov_index.provisioner_times(
+                        pv_name, csi_log_index.DELETE_START, legacy_start
+                    ),
+                    prov_index.provisioner_times(
+                        pv_name, csi_log_index.DELETE_END, legacy_delete_end
+                    ),
+                )
 
     # Getting times from CSI log - if needed
-    del_pv_names = []
-    for i in range(0, len(pvc_name)):
-        del_pv_names.append("")
-
-    if csi_logs:
-        for sublog in csi_logs:
-            for line in sublog:
-                for i in range(0, len(pvc_name)):
-                    name = pvc_name[i].name
-                    pv_name = pvc_name[i].backed_pv
-
-                    if "generated volume id" in line.lower() and pv_name in line:
-                        del_pv_names[i] = line.split("(")[1].split(")")[0]
-                    if op in ["all", "create"]:
-                        if f"Req-ID: {pv_name} GRPC call:" in line:
-                            if results[name]["csi_create"]["start"] is None:
-                                results[name]["csi_create"]["start"] = (
-                                    extruct_timestamp_from_log(line)
-                                )
-                        if f"Req-ID: {pv_name} GRPC response:" in line:
-                            if results[name]["csi_create"]["end"] is None:
-                                results[name]["csi_create"]["end"] = (
-                                    extruct_timestamp_from_log(line)
-                                )
-                                results[name]["csi_create"]["time"] = (
-                                    calculate_operation_time(
-                                        name, results[name]["csi_create"]
-                                    )
-                                )
-                    if op in ["all", "delete"]:
-                        if del_pv_names[i]:
-                            if f"Req-ID: {del_pv_names[i]} GRPC call:" in line:
-                                if results[name]["csi_delete"]["start"] is None:
-                                    results[name]["csi_delete"]["start"] = (
-                                        extruct_timestamp_from_log(line)
-                                    )
-                            if f"Req-ID: {del_pv_names[i]} GRPC response:" in line:
-                                if results[name]["csi_delete"]["end"] is None:
-                                    results[name]["csi_delete"]["end"] = (
-                                        extruct_timestamp_from_log(line)
-                                    )
-                                    results[name]["csi_delete"]["time"] = (
-                                        calculate_operation_time(
-                                            name, results[name]["csi_delete"]
-                                        )
-                                    )
+    if time_type.lower() in ["all", "csi"]:
+        logger.info("Reading the CSI only logs")
+        csi_index = get_csi_log_index(
+            interface, interface_data[interface]["csi_cnt"], start_time, refresh=True
+        )
+        for pvc in pvc_name:
+            name = pvc.name
+            pv_name = pvc.backed_pv
+            if op in ["all", "create"]:
+                set_times(
+                    name,
+                    "csi_create",
+                    csi_index.grpc_times(pv_name, "call"),
+                    csi_index.grpc_times(pv_name, "response"),
+                )
+            volume_id = csi_index.volume_id(pv_name)
+            if op in ["all", "delete"] and volume_id:
+                set_times(
+                    name,
+                    "csi_delete",
+                    csi_index.grpc_times(volume_id, "call"),
+                    csi_index.grpc_times(volume_id, "response"),
+                )
 
     logger.debug(f"All results are : {json.dumps(results, indent=3)}")
     return results
@@ -813,6 +892,38 @@ def wait_for_resource_bulk_status(
     raise Exception(err_msg)
 
 
+def _node_attach_events(index, volume_handle):
+    """
+    Get the node stage and node publish GRPC calls of the volume in the CSI
+    plugin logs and the times of their responses
+
+    Args:
+        index (CsiLogIndex): index of the CSI plugin logs
+        volume_handle (str): volume handle of the PV
+
+    Returns:
+        tuple: the last node stage call, the time of its response, the last
+            node publish call and the time of its response, None if not found
+
+    """
+    stage_calls = index.grpc_events(
+        volume_handle, "call", "/csi.v1.Node/NodeStageVolume"
+    )
+    publish_calls = index.grpc_events(
+        volume_handle, "call", "/csi.v1.Node/NodePublishVolume"
+    )
+    stage_call = stage_calls[-1] if stage_calls else None
+    publish_call = publish_calls[-1] if publish_calls else None
+    stage_responses = index.response_times(stage_call) if stage_call else []
+    publish_responses = index.response_times(publish_call) if publish_call else []
+    return (
+        stage_call,
+        stage_responses[-1] if stage_responses else None,
+        publish_call,
+        publish_responses[-1] if publish_responses else None,
+    )
+
+
 def pod_attach_csi_time(
     interface, pv_name, start_time, namespace=config.ENV_DATA["cluster_namespace"]
 ):
@@ -842,50 +953,35 @@ def pod_attach_csi_time(
         logger.error(f"Cannot get volume handle for pv {pv_name}")
         raise Exception("Cannot get volume handle")
 
-    log_names = get_logfile_names(interface, provisioning=False)
-    logs = read_csi_logs(log_names, interface_data[interface]["csi_cnt"], start_time)
-
     logger.info(
         f"Looking for pod attach time for pv {pv_name} and volume handle {volume_handle}"
     )
+    node_stage_call, node_stage_et, node_publish_call, node_publish_et = (
+        query_log_index(
+            lambda refresh: get_csi_log_index(
+                interface,
+                interface_data[interface]["csi_cnt"],
+                start_time,
+                provisioning=False,
+                refresh=refresh,
+            ),
+            lambda index: _node_attach_events(index, volume_handle),
+        )
+    )
 
-    node_stage_st = None
-    node_publish_st = None
-
-    for sublog in logs:
-        for line in sublog:
-            if f"{volume_handle} GRPC call: /csi.v1.Node/NodeStageVolume" in line:
-                node_stage_st = string_to_time(line.split()[1])
-                node_stage_id = line.split()[5]
-            if f"{volume_handle} GRPC call: /csi.v1.Node/NodePublishVolume" in line:
-                node_publish_st = string_to_time(line.split()[1])
-                node_publish_id = line.split()[5]
-                node_publish_req_id = line.split()[7]
-
-    if node_stage_st is None:
+    if node_stage_call is None:
         logger.error("Cannot find node stage GRPC call")
         raise Exception("Cannot find node stage GRPC call")
 
-    if node_publish_st is None:
+    if node_publish_call is None:
         logger.error("Cannot find node publish GRPC call")
         raise Exception("Cannot find node publish GRPC call")
 
+    node_stage_st = _log_time(node_stage_call.time)
+    node_publish_st = _log_time(node_publish_call.time)
     logger.info(f"Node stage GRPC call start time is: {node_stage_st.time()}")
     logger.info(f"Node publish GRPC call start time is: {node_publish_st.time()}")
 
-    node_stage_et = None
-    node_publish_et = None
-    for sublog in logs:
-        for line in sublog:
-            if "GRPC response:" in line and f"ID: {node_stage_id}" in line:
-                node_stage_et = string_to_time(line.split(" ")[1])
-            if (
-                "GRPC response:" in line
-                and f"ID: {node_publish_id}" in line
-                and f"Req-ID: {node_publish_req_id}" in line
-            ):
-                node_publish_et = string_to_time(line.split(" ")[1])
-
     if node_stage_et is None:
         logger.error("Cannot find node stage GRPC response")
         raise Exception("Cannot find node stage GRPC response")
@@ -894,6 +990,8 @@ def pod_attach_csi_time(
         logger.error("Cannot find node publish GRPC response")
         raise Exception("Cannot find node publish GRPC response")
 
+    node_stage_et = _log_time(node_stage_et)
+    node_publish_et = _log_time(node_publish_et)
     logger.info(f"Node stage GRPC response time is: {node_stage_et.time()}")
     logger.info(f"Node publish GRPC response time is: {node_publish_et.time()}")
 
@@ -950,57 +1048,54 @@ def pod_bulk_attach_csi_time(interface, pvc_objs, csi_start_time, namespace):
                 "pv": pv_name,
                 "volume_handle": volume_handle,
                 "node_stage_st": None,
-                "node_publish_id": None,
-                "node_publish_req_id": None,
                 "node_publish_et": None,
             }
         )
 
-    log_names = get_logfile_names(interface, provisioning=False)
-    logs = read_csi_logs(
-        log_names, interface_data[interface]["csi_cnt"], csi_start_time
+    def query(index):
+        events = {}
+        for pod_info in pods_info:
+            stage_call, _, _, publish_et = _node_attach_events(
+                index, pod_info["volume_handle"]
+            )
+            events[pod_info["pv"]] = (
+                stage_call.time if stage_call else None,
+                publish_et,
+            )
+        return events
+
+    events = query_log_index(
+        lambda refresh: get_csi_log_index(
+            interface,
+            interface_data[interface]["csi_cnt"],
+            csi_start_time,
+            provisioning=False,
+            refresh=refresh,
+        ),
+        query,
     )
 
-    for sublog in logs:
-        for line in sublog:
-            for pod_info in pods_info:
-                if (
-                    f"{pod_info['volume_handle']} GRPC call: /csi.v1.Node/NodeStageVolume"
-                    in line
-                ):
-                    pod_info["node_stage_st"] = string_to_time(line.split()[1])
-                if (
-                    f"{pod_info['volume_handle']} GRPC call: /csi.v1.Node/NodePublishVolume"
-                    in line
-                ):
-                    pod_info["node_publish_id"] = line.split()[5]
-                    pod_info["node_publish_req_id"] = line.split()[7]
-                if (
-                    pod_info["node_publish_id"] is not None
-                    and "GRPC response:" in line
-                    and f"ID: {pod_info['node_publish_id']}" in line
-                    and f"Req-ID: {pod_info['node_publish_req_id']}" in line
-                ):
-                    pod_info["node_publish_et"] = string_to_time(line.split(" ")[1])
-
     for pod_info in pods_info:
-        if pod_info["node_stage_st"] is None:
+        node_stage_st, node_publish_et = events[pod_info["pv"]]
+        if node_stage_st is None:
             msg = (
                 f"Cannot find node stage GRPC call for pv = {pod_info['pv']} "
-                f"and volume handle = {pod_info['node_stage_st']}"
+                f"and volume handle = {pod_info['volume_handle']}"
             )
             logger.error(msg)
-            raise Exception("msg")
-        if pod_info["node_publish_et"] is None:
+            raise Exception(msg)
+        if node_publish_et is None:
             msg = (
                 f"Cannot find node publish GRPC response for pv = {pod_info['pv']} "
-                f"and volume handle = {pod_info['node_stage_st']}"
+                f"and volume handle = {pod_info['volume_handle']}"
             )
             logger.error(msg)
-            raise Exception("msg")
+            raise Exception(msg)
+        pod_info["node_stage_st"] = _log_time(node_stage_st)
+        pod_info["node_publish_et"] = _log_time(node_publish_et)
 
         logger.info(
-            f"For pv {pv_name} : CSI start time = {pod_info['node_stage_st'].time()}, "
+            f"For pv {pod_info['pv']} : CSI start time = {pod_info['node_stage_st'].time()}, "
             f"csi end time = {pod_info['node_publish_et'].time()}"
         )
 
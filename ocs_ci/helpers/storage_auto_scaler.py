@@ -5,6 +5,7 @@ from ocs_ci.ocs.exceptions import ResourceWrongStatusException, TimeoutExpiredEr
 from ocs_ci.ocs import constants
 from ocs_ci.ocs.ocp import OCP
 from ocs_ci.framework import config
+from ocs_ci.ocs.ceph_snapshot import get_ceph_snapshot
 from ocs_ci.ocs.cluster import (
     get_percent_used_capacity,
     get_osd_utilization,
@@ -160,6 +161,7 @@ def generate_default_scaling_threshold(default_threshold=None, min_diff=7):
     if not default_threshold:
         default_threshold = generate_fixed_scaling_threshold()
 
+    get_ceph_snapshot().prefetch(["df", "osd_df"])
     ceph_used_capacity = get_percent_used_capacity()
     osds_per_used_capacity = get_osd_utilization()
     logger.info(
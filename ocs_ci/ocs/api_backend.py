@@ -0,0 +1,785 @@
+"""
+In-process Kubernetes API backend for the OCP object
+
+Every OCP verb is by default executed by forking the ``oc`` binary, which
+re-reads the kubeconfig, does a new TLS handshake and prints YAML which we
+parse again. For the most common verbs (get/list/create/apply/patch/delete/
+wait/logs) this module serves the same request with a long-lived, pooled
+``openshift.dynamic`` client, one per kubeconfig, and returns the same dict
+shapes as the ``oc`` CLI would.
+
+The backend is selected with ``RUN['oc_backend']`` ("cli" or "api"). Verbs
+listed in ``RUN['api_backend_cli_verbs']`` are always served by the CLI, and
+any request the backend can't serve raises :class:`APIBackendNotSupported`
+so the caller falls back to the CLI.
+"""
+
+import json
+import logging
+import re
+import threading
+import time
+
+import yaml
+from kubernetes import client as k8s_client
+from kubernetes import config as k8s_config
+from kubernetes import watch as k8s_watch
+from kubernetes.client.rest import ApiException
+from openshift.dynamic import DynamicClient
+from openshift.dynamic.exceptions import DynamicApiError, ResourceNotFoundError
+
+from ocs_ci.framework import config
+from ocs_ci.ocs.exceptions import (
+    APIBackendNotSupported,
+    CommandFailed,
+)
+from ocs_ci.utility.templating import load_yaml
+
+log = logging.getLogger(__name__)
+
+API_BACKEND = "api"
+CLI_BACKEND = "cli"
+FIELD_MANAGER = "ocs-ci"
+
+PATCH_CONTENT_TYPES = {
+    "": "application/strategic-merge-patch+json",
+    "strategic": "application/strategic-merge-patch+json",
+    "merge": "application/merge-patch+json",
+    "json": "application/json-patch+json",
+}
+
+# kinds which oc spells differently than the API discovery does
+KIND_ALIASES = {
+    "network-attachment-definition": "network-attachment-definitions",
+}
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def is_api_backend_enabled(verb):
+    """
+    Check whether the given verb should be served by the API backend
+
+    Args:
+        verb (str): OCP verb (get, create, apply, patch, delete, wait, logs)
+
+    Returns:
+        bool: True if the API backend is selected for the verb
+
+    """
+    if config.RUN.get("oc_backend", CLI_BACKEND) != API_BACKEND:
+        return False
+    return verb not in (config.RUN.get("api_backend_cli_verbs") or [])
+
+
+def get_api_backend(kubeconfig, skip_tls_verify=False):
+    """
+    Get the shared API backend for the kubeconfig, create one if needed
+
+    Args:
+        kubeconfig (str): Path to the kubeconfig of the cluster
+        skip_tls_verify (bool): Don't verify the API server certificate
+
+    Returns:
+        KubeAPIBackend: backend bound to the kubeconfig
+
+    """
+    key = (kubeconfig, skip_tls_verify)
+    with _backends_lock:
+        backend = _backends.get(key)
+        if backend is None:
+            backend = KubeAPIBackend(kubeconfig, skip_tls_verify=skip_tls_verify)
+            _backends[key] = backend
+        return backend
+
+
+def reset_api_backends():
+    """
+    Drop all cached API clients, e.g. after the kubeconfig was regenerated
+    """
+    with _backends_lock:
+        _backends.clear()
+
+
+def api_error_to_command_failed(ex, description):
+    """
+    Convert API exception to CommandFailed with an error message formatted
+    the same way as the error printed by the oc client, so callers matching
+    e.g. 'NotFound' or 'AlreadyExists' in the message keep working.
+
+    Args:
+        ex (Exception): DynamicApiError or ApiException raised by the client
+        description (str): Description of the request for the log message
+
+    Returns:
+        CommandFailed: exception to be raised by the caller
+
+    """
+    reason = getattr(ex, "reason", "") or ""
+    message = str(ex)
+    body = getattr(ex, "body", None)
+    if body:
+        try:
+            status = json.loads(body)
+            reason = status.get("reason") or reason
+            message = status.get("message") or message
+        except (TypeError, ValueError):
+            message = body if isinstance(body, str) else message
+    return CommandFailed(
+        f"Error during execution of API request: {description}."
+        f"\nError is Error from server ({reason}): {message}"
+    )
+
+
+def parse_jsonpath(expression):
+    """
+    Parse simple jsonpath expression as used by 'oc wait --for=jsonpath' and
+    'oc get -o jsonpath' into the list of keys.
+
+    Only dotted paths with optional list indexes are supported, for example
+    '{.status.phase}' or '{.status.conditions[0].type}'.
+
+    Args:
+        expression (str): jsonpath expression
+
+    Returns:
+        list: list of keys (str) and indexes (int)
+
+    Raises:
+        APIBackendNotSupported: In case of filters, wildcards and ranges
+
+    """
+    expression = expression.strip().strip("'\"")
+    if expression.startswith("{") and expression.endswith("}"):
+        expression = expression[1:-1]
+    if not expression.startswith("."):
+        raise APIBackendNotSupported(f"Unsupported jsonpath: {expression}")
+    keys = []
+    for part in re.findall(r"\.([^.\[]+)|\[([^\]]*)\]", expression):
+        key, index = part
+        if key:
+            keys.append(key)
+        elif re.fullmatch(r"-?\d+", index):
+            keys.append(int(index))
+        else:
+            raise APIBackendNotSupported(f"Unsupported jsonpath: {expression}")
+    return keys
+
+
+def get_jsonpath_value(data, keys):
+    """
+    Get value from the resource dict based on the parsed jsonpath
+
+    Args:
+        data (dict): resource data
+        keys (list): output of :func:`parse_jsonpath`
+
+    Returns:
+        object: value or None if the path doesn't exist
+
+    """
+    value = data
+    for key in keys:
+        try:
+            value = value[key]
+        except (KeyError, IndexError, TypeError):
+            return None
+    return value
+
+
+def jsonpath_value_to_str(value):
+    """
+    Format value the way 'oc' prints jsonpath output
+
+    Args:
+        value (object): value found by the jsonpath
+
+    Returns:
+        str: string representation of the value
+
+    """
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return str(value).lower()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return str(value)
+
+
+class KubeAPIBackend(object):
+    """
+    Pooled dynamic client serving the common OCP verbs for one kubeconfig
+    """
+
+    def __init__(self, kubeconfig, skip_tls_verify=False):
+        """
+        Initializer function
+
+        Args:
+            kubeconfig (str): Path to the kubeconfig of the cluster
+            skip_tls_verify (bool): Don't verify the API server certificate
+
+        """
+        self.kubeconfig = kubeconfig
+        self.skip_tls_verify = skip_tls_verify
+        self._client = None
+        self._dynamic_client = None
+        self._default_namespace = None
+        self._resource_index = None
+        self._lock = threading.RLock()
+
+    @property
+    def api_client(self):
+        """
+        kubernetes.client.ApiClient: lazily created, pooled API client
+        """
+        with self._lock:
+            if self._client is None:
+                configuration = k8s_client.Configuration()
+                k8s_config.load_kube_config(
+                    config_file=self.kubeconfig,
+                    client_configuration=configuration,
+                )
+                configuration.connection_pool_maxsize = config.RUN.get(
+                    "api_backend_pool_size", 10
+                )
+                if self.skip_tls_verify:
+                    configuration.verify_ssl = False
+                self._client = k8s_client.ApiClient(configuration)
+            return self._client
+
+    @property
+    def dynamic_client(self):
+        """
+        openshift.dynamic.DynamicClient: dynamic client sharing the pool
+        """
+        with self._lock:
+            if self._dynamic_client is None:
+                self._dynamic_client = DynamicClient(self.api_client)
+            return self._dynamic_client
+
+    @property
+    def default_namespace(self):
+        """
+        str: namespace of the current kubeconfig context, used by oc when no
+            namespace is provided
+        """
+        if self._default_namespace is None:
+            _, active_context = k8s_config.list_kube_config_contexts(
+                config_file=self.kubeconfig
+            )
+            self._default_namespace = (
+                active_context.get("context", {}).get("namespace") or "default"
+            )
+        return self._default_namespace
+
+    @property
+    def core_v1(self):
+        """
+        kubernetes.client.CoreV1Api: core API sharing the pool
+        """
+        return k8s_client.CoreV1Api(self.api_client)
+
+    def _build_resource_index(self):
+        """
+        Build the lookup of all names the oc client accepts for a kind
+        (kind, plural, singular, short names, and their group qualified
+        variants) to the discovered resource.
+
+        Returns:
+            dict: lowercase name -> openshift.dynamic.Resource
+
+        """
+        index = {}
+        for resource in self.dynamic_client.resources.search():
+            kind = getattr(resource, "kind", None)
+            if not kind or kind.endswith("List") or "/" in resource.name:
+                continue
+            names = {kind, resource.name, resource.singular_name}
+            names.update(resource.short_names or [])
+            names = {name.lower() for name in names if name}
+            if resource.group:
+                names.update({f"{name}.{resource.group}" for name in set(names)})
+            for name in names:
+                current = index.get(name)
+                # prefer core group and preferred versions same as oc does
+                if (
+                    current is None
+                    or (resource.group == "" and current.group != "")
+                    or (resource.preferred and not current.preferred)
+                ):
+                    index[name] = resource
+        return index
+
+    def resolve(self, kind, api_version=None):
+        """
+        Resolve the kind as accepted by the oc client to the API resource
+
+        Args:
+            kind (str): kind, plural, singular or short name of the resource
+            api_version (str): apiVersion, used only if it has a group
+
+        Returns:
+            openshift.dynamic.Resource: discovered resource
+
+        Raises:
+            APIBackendNotSupported: if the kind can't be resolved
+
+        """
+        if api_version and "/" in api_version:
+            try:
+                return self.dynamic_client.resources.get(
+                    api_version=api_version, kind=kind
+                )
+            except ResourceNotFoundError:
+                pass
+        name = KIND_ALIASES.get(kind.lower(), kind.lower())
+        with self._lock:
+            if self._resource_index is None:
+                self._resource_index = self._build_resource_index()
+            resource = self._resource_index.get(name)
+            if resource is None:
+                # CRD might have been installed after the index was built
+                self._resource_index = self._build_resource_index()
+                resource = self._resource_index.get(name)
+        if resource is None:
+            raise APIBackendNotSupported(f"Unknown resource kind: {kind}")
+        return resource
+
+    def _request(self, description, func, *args, **kwargs):
+        """
+        Execute API request and translate errors to CommandFailed
+
+        Args:
+            description (str): Description of the request for the log message
+            func (function): Dynamic client method to call
+
+        Returns:
+            object: response of the func
+
+        Raises:
+            CommandFailed: In case the request fails
+
+        """
+        log.info(f"Executing API request: {description}")
+        try:
+            return func(*args, **kwargs)
+        except (DynamicApiError, ApiException) as ex:
+            raise api_error_to_command_failed(ex, description)
+
+    @staticmethod
+    def _to_dict(resource, response):
+        """
+        Convert API response to the dict printed by 'oc ... -o yaml'
+
+        Args:
+            resource (openshift.dynamic.Resource): requested resource
+            response (ResourceInstance): API response
+
+        Returns:
+            dict: resource or List of resources
+
+        """
+        data = response.to_dict()
+        if data.get("kind", "").endswith("List") and "items" in data:
+            for item in data["items"]:
+                item.setdefault("apiVersion", resource.group_version)
+                item.setdefault("kind", resource.kind)
+            return {
+                "apiVersion": "v1",
+                "items": data["items"],
+                "kind": "List",
+                "metadata": {"resourceVersion": ""},
+            }
+        return data
+
+    @staticmethod
+    def _list(items):
+        """
+        Wrap items to the List dict printed by oc for multi-document requests
+        """
+        if len(items) == 1:
+            return items[0]
+        return {
+            "apiVersion": "v1",
+            "items": items,
+            "kind": "List",
+            "metadata": {"resourceVersion": ""},
+        }
+
+    @staticmethod
+    def _check_name(resource_name):
+        if resource_name and (" " in resource_name.strip() or "/" in resource_name):
+            raise APIBackendNotSupported(
+                f"Multiple or kind qualified names are not supported: {resource_name}"
+            )
+
+    def get(
+        self,
+        kind,
+        resource_name="",
+        namespace=None,
+        selector=None,
+        field_selector=None,
+        all_namespaces=False,
+        api_version=None,
+    ):
+        """
+        Equivalent of 'oc get <kind> [<name>] -o yaml'
+
+        Args:
+            kind (str): Kind of the resource
+            resource_name (str): The resource name to fetch
+            namespace (str): Namespace of the resource
+            selector (str): The label selector to look for
+            field_selector (str): Selector (field query) to filter on
+            all_namespaces (bool): Equal to oc get <resource> -A
+            api_version (str): apiVersion of the resource
+
+        Returns:
+            dict: resource, or List of resources if no name was provided
+
+        """
+        self._check_name(resource_name)
+        resource = self.resolve(kind, api_version)
+        if not resource.namespaced:
+            namespace = None
+        elif not (namespace or all_namespaces):
+            namespace = self.default_namespace
+        description = f"get {kind} {resource_name or ''} -n {namespace}"
+        kwargs = {}
+        if selector:
+            kwargs["label_selector"] = selector
+        if field_selector:
+            kwargs["field_selector"] = field_selector
+        if resource_name:
+            response = self._request(
+                description,
+                resource.get,
+                name=resource_name.strip(),
+                namespace=namespace,
+            )
+        else:
+            response = self._request(
+                description, resource.get, namespace=namespace, **kwargs
+            )
+        return self._to_dict(resource, response)
+
+    def _load_documents(self, yaml_file):
+        return [doc for doc in load_yaml(yaml_file, multi_document=True) if doc]
+
+    def create(self, yaml_file, namespace=None):
+        """
+        Equivalent of 'oc create -f <yaml_file> -o yaml'
+
+        Args:
+            yaml_file (str): Path to a yaml file with one or more documents
+            namespace (str): Default namespace of the objects
+
+        Returns:
+            dict: created resource, or List for multi-document files
+
+        """
+        created = []
+        for body in self._load_documents(yaml_file):
+            resource = self.resolve(body["kind"], body.get("apiVersion"))
+            ns = body.get("metadata", {}).get("namespace") or namespace
+            response = self._request(
+                f"create {body['kind']} {body['metadata'].get('name')} -n {ns}",
+                resource.create,
+                body=body,
+                namespace=ns if resource.namespaced else None,
+            )
+            created.append(self._to_dict(resource, response))
+        return self._list(created)
+
+    def apply(self, yaml_file, namespace=None):
+        """
+        Equivalent of 'oc apply -f <yaml_file>', done as server side apply
+
+        Args:
+            yaml_file (str): Path to a yaml file with one or more documents
+            namespace (str): Default namespace of the objects
+
+        Returns:
+            dict: applied resource, or List for multi-document files
+
+        """
+        applied = []
+        for body in self._load_documents(yaml_file):
+            if "generateName" in body.get("metadata", {}):
+                raise APIBackendNotSupported("Apply of generateName is not supported")
+            body["metadata"].pop("managedFields", None)
+            resource = self.resolve(body["kind"], body.get("apiVersion"))
+            ns = body["metadata"].get("namespace") or namespace
+            response = self._request(
+                f"apply {body['kind']} {body['metadata'].get('name')} -n {ns}",
+                self.dynamic_client.server_side_apply,
+                resource,
+                body=body,
+                namespace=ns if resource.namespaced else None,
+                field_manager=FIELD_MANAGER,
+                force_conflicts=True,
+            )
+            applied.append(self._to_dict(resource, response))
+        return self._list(applied)
+
+    def patch(self, kind, resource_name, params, namespace=None, format_type=""):
+        """
+        Equivalent of 'oc patch <kind> <name> -p <params> --type <format_type>'
+
+        Args:
+            kind (str): Kind of the resource
+            resource_name (str): Name of the resource
+            params (str or dict or list): JSON/YAML patch
+            namespace (str): Namespace of the resource
+            format_type (str): strategic (default), merge or json
+
+        Returns:
+            dict: patched resource
+
+        """
+        self._check_name(resource_name)
+        if format_type not in PATCH_CONTENT_TYPES:
+            raise APIBackendNotSupported(f"Unsupported patch type: {format_type}")
+        if isinstance(params, str):
+            try:
+                params = json.loads(params)
+            except ValueError:
+                params = yaml.safe_load(params)
+        resource = self.resolve(kind)
+        response = self._request(
+            f"patch {kind} {resource_name} -n {namespace} --type {format_type}",
+            resource.patch,
+            body=params,
+            name=resource_name,
+            namespace=namespace if resource.namespaced else None,
+            content_type=PATCH_CONTENT_TYPES[format_type],
+        )
+        return self._to_dict(resource, response)
+
+    def delete(
+        self,
+        kind=None,
+        resource_name="",
+        yaml_file=None,
+        namespace=None,
+        wait=True,
+        force=False,
+        timeout=600,
+    ):
+        """
+        Equivalent of 'oc delete <kind> <name>' or 'oc delete -f <yaml_file>'
+
+        Args:
+            kind (str): Kind of the resource
+            resource_name (str): Name of the resource
+            yaml_file (str): Path to a yaml file to delete objects from
+            namespace (str): Namespace of the resource
+            wait (bool): Wait for the objects to be gone
+            force (bool): Delete with grace period 0
+            timeout (int): Timeout in seconds for waiting
+
+        Returns:
+            str: output in the same format as printed by oc
+
+        """
+        if resource_name:
+            self._check_name(resource_name)
+            targets = [(self.resolve(kind), resource_name, namespace)]
+        else:
+            targets = []
+            for body in self._load_documents(yaml_file):
+                targets.append(
+                    (
+                        self.resolve(body["kind"], body.get("apiVersion")),
+                        body["metadata"]["name"],
+                        body["metadata"].get("namespace") or namespace,
+                    )
+                )
+        kwargs = {}
+        if force:
+            kwargs["grace_period_seconds"] = 0
+        output = []
+        for resource, name, ns in targets:
+            ns = ns if resource.namespaced else None
+            self._request(
+                f"delete {resource.kind} {name} -n {ns}",
+                resource.delete,
+                name=name,
+                namespace=ns,
+                **kwargs,
+            )
+            output.append(f'{resource.kind.lower()} "{name}" deleted')
+        if wait:
+            for resource, name, ns in targets:
+                ns = ns if resource.namespaced else None
+                if not self._wait_for(
+                    resource, name, ns, None, lambda item: False, timeout, delete=True
+                ):
+                    raise CommandFailed(
+                        f"Timed out after {timeout}s waiting for deletion of "
+                        f"{resource.kind} {name}"
+                    )
+        return "\n".join(output)
+
+    def _wait_for(
+        self, resource, name, namespace, selector, predicate, timeout, delete=False
+    ):
+        """
+        Wait until predicate is True for all the matching objects, or until
+        they are deleted, using a single LIST + WATCH.
+
+        Args:
+            resource (openshift.dynamic.Resource): resource to wait for
+            name (str): name of the object, or empty when selector is used
+            namespace (str): namespace of the object(s)
+            selector (str): label selector
+            predicate (function): called with the object dict
+            timeout (int): timeout in seconds
+            delete (bool): wait for the object(s) to be deleted
+
+        Returns:
+            bool: True if the condition was met in time, False otherwise
+
+        """
+        field_selector = f"metadata.name={name}" if name else None
+        deadline = time.time() + timeout
+        objects = {}
+
+        def done():
+            if delete:
+                return not objects
+            return bool(objects) and all(predicate(obj) for obj in objects.values())
+
+        while time.time() < deadline:
+            response = self._request(
+                f"list {resource.kind} {name or ''} -n {namespace}",
+                resource.get,
+                namespace=namespace,
+                label_selector=selector,
+                field_selector=field_selector,
+            ).to_dict()
+            objects = {
+                item["metadata"]["uid"]: item for item in response.get("items", [])
+            }
+            if done():
+                return True
+            watcher = k8s_watch.Watch()
+            remaining = max(1, int(deadline - time.time()))
+            try:
+                for event in self.dynamic_client.watch(
+                    resource,
+                    namespace=namespace,
+                    label_selector=selector,
+                    field_selector=field_selector,
+                    resource_version=response["metadata"]["resourceVersion"],
+                    timeout=remaining,
+                    watcher=watcher,
+                ):
+                    obj = event["raw_object"]
+                    if event["type"] == "DELETED":
+                        objects.pop(obj["metadata"]["uid"], None)
+                    elif event["type"] in ("ADDED", "MODIFIED"):
+                        objects[obj["metadata"]["uid"]] = obj
+                    if done():
+                        watcher.stop()
+                        return True
+            except (DynamicApiError, ApiException) as ex:
+                # e.g. 410 Gone when the resource version is too old, relist
+                log.debug(f"Watch of {resource.kind} interrupted: {ex}")
+        return False
+
+    def wait(
+        self,
+        kind,
+        resource_name="",
+        namespace=None,
+        condition=None,
+        jsonpath=None,
+        delete=False,
+        selector=None,
+        timeout=300,
+    ):
+        """
+        Equivalent of 'oc wait <kind> <name> --for=...'
+
+        Args:
+            kind (str): Kind of the resource
+            resource_name (str): Name of the resource
+            namespace (str): Namespace of the resource
+            condition (str): Condition type which has to be True
+            jsonpath (str): "jsonpath_expression=expected_value" or just
+                "jsonpath_expression" to wait for the value to be non-empty
+            delete (bool): Wait for the resource to be deleted
+            selector (str): The label selector to look for
+            timeout (int): Timeout in seconds
+
+        Returns:
+            bool: True if the condition was met in time, False otherwise
+
+        """
+        self._check_name(resource_name)
+        resource = self.resolve(kind)
+        namespace = namespace if resource.namespaced else None
+        if jsonpath is not None:
+            expression, _, expected = jsonpath.partition("=")
+            keys = parse_jsonpath(expression)
+            expected = expected.strip("'\"")
+
+            def predicate(item):
+                value = jsonpath_value_to_str(get_jsonpath_value(item, keys))
+                return value == expected if expected else bool(value)
+
+        else:
+
+            def predicate(item):
+                conditions = item.get("status", {}).get("conditions") or []
+                return any(
+                    cond.get("type", "").lower() == condition.lower()
+                    and cond.get("status") == "True"
+                    for cond in conditions
+                )
+
+        return self._wait_for(
+            resource,
+            resource_name,
+            namespace,
+            selector,
+            predicate,
+            timeout,
+            delete=delete,
+        )
+
+    def logs(self, kind, name, namespace, container_name=None, timeout=None):
+        """
+        Equivalent of 'oc logs <kind>/<name> [--container=<container_name>]'
+
+        Args:
+            kind (str): Kind of the resource, only pods are supported
+            name (str): Name of the pod
+            namespace (str): Namespace of the pod
+            container_name (str): Name of the container
+            timeout (int): Request timeout in seconds
+
+        Returns:
+            str: container logs
+
+        """
+        if kind.lower() not in ("pod", "pods", "po"):
+            raise APIBackendNotSupported(f"Logs of {kind} are not supported")
+        kwargs = {"_preload_content": False}
+        if container_name:
+            kwargs["container"] = container_name.strip("'\"")
+        if timeout:
+            kwargs["_request_timeout"] = timeout
+        response = self._request(
+            f"logs pod/{name} -n {namespace}",
+            self.core_v1.read_namespaced_pod_log,
+            name,
+            namespace,
+            **kwargs,
+        )
+        return response.data.decode(errors="replace")
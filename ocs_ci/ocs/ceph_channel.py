@@ -0,0 +1,275 @@
+"""
+Batched execution of ceph commands on the toolbox pod
+
+Every exec_ceph_cmd is a separate 'oc rsh' (or a separate command in a pooled
+exec session) with its own round trip to the API server. Health checks and
+other helpers which need several ceph commands at once can send them as one
+batch: the commands are wrapped into a single shell script run in the toolbox,
+the output of the commands is separated by unique markers which also carry the
+exit code and the stderr of each command. With ``RUN['exec_session_pool']``
+enabled the batch runs in the long-lived exec session of the toolbox.
+
+Usage:
+    status, health = get_ceph_command_channel().run(["ceph status", "ceph health"])
+"""
+
+import logging
+import shlex
+import uuid
+
+from ocs_ci.framework import config
+from ocs_ci.ocs.exceptions import CommandFailed
+from ocs_ci.ocs.output_format import json_loads
+
+log = logging.getLogger(__name__)
+
+BEGIN = "begin"
+END = "end"
+ERR = "err"
+
+
+def _normalize_command(command):
+    """
+    Split the ceph command to the arguments, without the output format
+
+    Args:
+        command (str): ceph command, the leading 'ceph' is optional
+
+    Returns:
+        list: arguments of the command starting with 'ceph'
+
+    """
+    argv = shlex.split(command)
+    if not argv or argv[0] != "ceph":
+        argv.insert(0, "ceph")
+    return argv
+
+
+def build_argv_batch_script(argvs, marker):
+    """
+    Build the shell script running the commands one by one, the output of
+    each command is enclosed by the markers
+
+    Args:
+        argvs (list): arguments of each command
+        marker (str): unique marker separating the outputs of the commands
+
+    Returns:
+        str: the shell script
+
+    """
+    lines = ["_err=$(mktemp) || _err=/tmp/ocs-ci-ceph-batch-$$"]
+    for index, argv in enumerate(argvs):
+        lines.extend(
+            [
+                f"printf '%s\\n' '{marker} {index} {BEGIN}'",
+                f'{shlex.join(argv)} 2>"$_err"; _rc=$?',
+                f"printf '\\n%s %s\\n' '{marker} {index} {END}' \"$_rc\"",
+                f"sed 's/^/{marker} {index} {ERR} /' \"$_err\"",
+            ]
+        )
+    lines.append('rm -f "$_err"')
+    return "\n".join(lines)
+
+
+def build_batch_script(commands, marker):
+    """
+    Build the shell script running the ceph commands one by one with json
+    output
+
+    Args:
+        commands (list): ceph commands
+        marker (str): unique marker separating the outputs of the commands
+
+    Returns:
+        str: the shell script
+
+    """
+    return build_argv_batch_script(
+        [_normalize_command(command) + ["--format", "json"] for command in commands],
+        marker,
+    )
+
+
+def parse_batch_output(output, marker, count):
+    """
+    Split the output of the batch script to the outputs of the commands
+
+    Args:
+        output (str): stdout of the batch script
+        marker (str): unique marker separating the outputs of the commands
+        count (int): number of commands in the batch
+
+    Returns:
+        list: tuples (stdout, stderr, return code) per command, return code is
+            None if the command didn't finish
+
+    """
+    results = [[[], [], None] for _ in range(count)]
+    current = None
+    for line in output.splitlines():
+        if not line.startswith(marker):
+            if current is not None:
+                results[current][0].append(line)
+            continue
+        parts = line[len(marker) + 1 :].split(" ", 2)
+        index, kind = int(parts[0]), parts[1]
+        if kind == BEGIN:
+            current = index
+        elif kind == END:
+            current = None
+            results[index][2] = int(parts[2])
+        elif kind == ERR:
+            results[index][1].append(parts[2] if len(parts) > 2 else "")
+    return [
+        ("\n".join(stdout).strip(), "\n".join(stderr), return_code)
+        for stdout, stderr, return_code in results
+    ]
+
+
+class CephCommandChannel(object):
+    """
+    Channel running batches of ceph commands on the toolbox pod in a single
+    round trip
+    """
+
+    def __init__(self, namespace=None, tools_pod=None):
+        """
+        Initializer function
+
+        Args:
+            namespace (str): Namespace of OCS, used to look up the toolbox
+            tools_pod (Pod): Toolbox pod to use, by default the cached toolbox
+                handle of get_ceph_tools_pod is used
+
+        """
+        self.namespace = namespace
+        self._tools_pod = tools_pod
+
+    @property
+    def tools_pod(self):
+        """
+        Returns:
+            Pod: the toolbox pod the commands run on
+
+        """
+        if self._tools_pod is not None:
+            return self._tools_pod
+        # Importing here to avoid circular dependency
+        from ocs_ci.ocs.resources.pod import get_ceph_tools_pod
+
+        return get_ceph_tools_pod(namespace=self.namespace)
+
+    def _exec_batch(self, commands, timeout):
+        tools_pod = self.tools_pod
+        marker = f"OCS-CI-CEPH-{uuid.uuid4().hex}"
+        script = build_batch_script(commands, marker)
+        try:
+            out = tools_pod.exec_cmd_on_pod(
+                f"sh -c {shlex.quote(script)}",
+                out_yaml_format=False,
+                timeout=timeout,
+            )
+        except CommandFailed:
+            if self._tools_pod is None:
+                # the toolbox could be gone, don't use the cached handle again
+                # Importing here to avoid circular dependency
+                from ocs_ci.ocs.resources.pod import invalidate_ceph_tools_pod_cache
+
+                invalidate_ceph_tools_pod_cache()
+            raise
+        return parse_batch_output(out, marker, len(commands))
+
+    def run(self, commands, timeout=600, ignore_error=False):
+        """
+        Run the ceph commands in one round trip and parse their json output
+
+        Args:
+            commands (list): ceph commands without the output format, e.g.
+                ["ceph status", "ceph osd df"], the leading 'ceph' is optional
+            timeout (int): Timeout of the whole batch in seconds
+            ignore_error (bool): If True, failed commands don't raise and their
+                result is the CommandFailed exception
+
+        Returns:
+            list: parsed output of each command in the order of the commands,
+                None for commands with empty output and the raw output for
+                commands which don't print json
+
+        Raises:
+            CommandFailed: If a command failed and ignore_error is False
+
+        """
+        commands = list(commands)
+        if not commands:
+            return []
+        log.info(f"Executing batch of {len(commands)} ceph commands: {commands}")
+        # Importing here to avoid circular dependency
+        from ocs_ci.ocs.ceph_snapshot import (
+            invalidate_ceph_snapshot,
+            is_ceph_state_changed_by,
+        )
+
+        try:
+            outputs = self._exec_batch(commands, timeout)
+        finally:
+            if any(
+                is_ceph_state_changed_by(" ".join(_normalize_command(command)))
+                for command in commands
+            ):
+                invalidate_ceph_snapshot()
+        results = []
+        first_error = None
+        for command, (stdout, stderr, return_code) in zip(commands, outputs):
+            if return_code != 0:
+                error = CommandFailed(
+                    f"Error during execution of command: {command} --format json."
+                    f"\nError is {stderr or 'the command did not finish'}"
+                )
+                first_error = first_error or error
+                results.append(error)
+                continue
+            try:
+                result = json_loads(stdout) if stdout else None
+            except ValueError:
+                # a few commands ignore the format and print plain text
+                result = stdout
+            # For some commands, like "ceph fs ls", the output is a list
+            if isinstance(result, list):
+                result = [item for item in result if item]
+            results.append(result)
+        if first_error and not ignore_error:
+            raise first_error
+        return results
+
+    def run_one(self, command, timeout=600):
+        """
+        Run a single ceph command through the channel
+
+        Args:
+            command (str): ceph command without the output format
+            timeout (int): Timeout in seconds
+
+        Returns:
+            dict or list: parsed output of the command
+
+        """
+        return self.run([command], timeout=timeout)[0]
+
+
+def get_ceph_command_channel(namespace=None):
+    """
+    Get the channel running ceph commands on the toolbox of the cluster in the
+    current context
+
+    Args:
+        namespace (str): Namespace of OCS
+            (default: config.ENV_DATA['cluster_namespace'])
+
+    Returns:
+        CephCommandChannel: the channel
+
+    """
+    return CephCommandChannel(
+        namespace=namespace or config.ENV_DATA["cluster_namespace"]
+    )
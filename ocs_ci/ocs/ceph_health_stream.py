@@ -0,0 +1,466 @@
+"""
+Streaming Ceph health monitoring
+
+Polling 'ceph health detail' every few seconds costs a round trip to the
+toolbox per sample and misses short HEALTH_ERR windows between the samples.
+CephHealthStream keeps one 'ceph -w' session on the toolbox open: the initial
+status gives the current health and every health transition is then reported
+by the monitors to the cluster log ('Health check failed/update/cleared',
+'overall HEALTH_*'). The transitions are parsed incrementally to a bounded
+CephHealthTimeline with the timestamps of the monitors and the test which was
+running at the time.
+
+Usage:
+    with CephHealthStream() as stream:
+        with stream.timeline.window() as window:
+            ...
+        assert not window.was_in(HEALTH_ERR), window.intervals(HEALTH_ERR)
+"""
+
+import collections
+import json
+import logging
+import re
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from ocs_ci.framework import config
+from ocs_ci.utility.call_profiler import get_current_test_id
+
+log = logging.getLogger(__name__)
+
+HEALTH_OK = "HEALTH_OK"
+HEALTH_WARN = "HEALTH_WARN"
+HEALTH_ERR = "HEALTH_ERR"
+# Events kept in the timeline
+DEFAULT_MAX_EVENTS = 10000
+# Seconds to wait before the watch is started again after it ended
+RECONNECT_DELAY = 5
+
+HealthEvent = collections.namedtuple(
+    "HealthEvent",
+    ["timestamp", "status", "previous_status", "check", "message", "test"],
+)
+
+# e.g. '2024-05-01T10:00:00.123456+0000 mon.a [WRN] Health check failed: ...'
+PLAIN_LOG_LINE = re.compile(
+    r"^(?P<stamp>\d{4}-\d\d-\d\d[T ][\d:.]+[+-]?\d*)\s+\S+\s+"
+    r"(?:\S+\s+)?\[(?P<level>[A-Z]+)\]\s+(?P<message>.*)$"
+)
+CHECK_RAISED = re.compile(
+    r"Health check (?:failed|update): .*\((?P<check>[A-Z_0-9]+)\)"
+)
+CHECK_CLEARED = re.compile(r"Health check cleared: (?P<check>[A-Z_0-9]+)")
+OVERALL_STATUS = re.compile(r"(?:overall|Health detail:) (?P<status>HEALTH_[A-Z]+)")
+CLUSTER_HEALTHY = "Cluster is now healthy"
+
+
+def parse_timestamp(stamp):
+    """
+    Parse the timestamp of the cluster log
+
+    Args:
+        stamp (str): e.g. '2024-05-01T10:00:00.123456+0000'
+
+    Returns:
+        datetime: timezone aware timestamp, the current time if the stamp
+            can't be parsed
+
+    """
+    if stamp:
+        stamp = stamp.replace(" ", "T")
+        for stamp_format in ("%Y-%m-%dT%H:%M:%S.%f%z", "%Y-%m-%dT%H:%M:%S%z"):
+            try:
+                return datetime.strptime(stamp, stamp_format)
+            except ValueError:
+                continue
+        try:
+            timestamp = datetime.fromisoformat(stamp)
+            if timestamp.tzinfo is None:
+                timestamp = timestamp.replace(tzinfo=timezone.utc)
+            return timestamp
+        except ValueError:
+            pass
+    return datetime.now(timezone.utc)
+
+
+def parse_watch_line(line):
+    """
+    Parse a line of the 'ceph -w' output
+
+    Args:
+        line (str): the line, the initial status in json, a cluster log entry
+            in json or in the plain format
+
+    Returns:
+        tuple: ('status', dict) for the status, ('log', timestamp, level,
+            message) for a cluster log entry, None for other lines
+
+    """
+    line = line.strip()
+    if not line:
+        return None
+    if line.startswith("{"):
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            return None
+        if "health" in entry:
+            return ("status", entry)
+        message = entry.get("message", entry.get("msg"))
+        if message is None:
+            return None
+        level = entry.get("priority", entry.get("level", ""))
+        return (
+            "log",
+            parse_timestamp(entry.get("stamp", entry.get("timestamp"))),
+            str(level).strip("[]").upper(),
+            message,
+        )
+    match = PLAIN_LOG_LINE.match(line)
+    if match:
+        return (
+            "log",
+            parse_timestamp(match.group("stamp")),
+            match.group("level"),
+            match.group("message"),
+        )
+    return None
+
+
+class HealthWindow(object):
+    """
+    Time window of the timeline, e.g. the duration of a block of a test
+    """
+
+    def __init__(self, timeline, since, until=None):
+        self.timeline = timeline
+        self.since = since
+        self.until = until
+
+    def intervals(self, status):
+        """
+        Args:
+            status (str): e.g. HEALTH_ERR
+
+        Returns:
+            list: (start, end) timestamps of the periods in the status
+
+        """
+        return self.timeline.intervals(status, self.since, self.until)
+
+    def was_in(self, status):
+        """
+        Args:
+            status (str): e.g. HEALTH_ERR
+
+        Returns:
+            bool: True if the cluster was in the status during the window
+
+        """
+        return bool(self.intervals(status))
+
+    def events(self):
+        """
+        Returns:
+            list: HealthEvent objects of the window
+
+        """
+        return self.timeline.events(self.since, self.until)
+
+
+class CephHealthTimeline(object):
+    """
+    Bounded timeline of the Ceph health transitions
+    """
+
+    def __init__(self, max_events=DEFAULT_MAX_EVENTS):
+        """
+        Initializer function
+
+        Args:
+            max_events (int): Number of the newest events kept
+
+        """
+        self.status = None
+        self.checks = {}
+        self._events = collections.deque(maxlen=max_events)
+        self._lock = threading.Lock()
+        self._listeners = []
+
+    def add_listener(self, callback):
+        """
+        Args:
+            callback (callable): called with each new HealthEvent
+
+        """
+        self._listeners.append(callback)
+
+    def _record(self, timestamp, status, check, message):
+        event = HealthEvent(
+            timestamp, status, self.status, check, message, get_current_test_id()
+        )
+        self.status = status
+        self._events.append(event)
+        if event.previous_status != status:
+            log.info(
+                f"Ceph health changed {event.previous_status} -> {status} at "
+                f"{timestamp.isoformat()}: {message}"
+            )
+        for callback in list(self._listeners):
+            callback(event)
+        return event
+
+    def _status_from_checks(self):
+        if HEALTH_ERR in self.checks.values():
+            return HEALTH_ERR
+        if self.checks:
+            return HEALTH_WARN
+        return HEALTH_OK
+
+    def update_from_status(self, status, timestamp=None):
+        """
+        Reset the state by the output of 'ceph status'
+
+        Args:
+            status (dict): parsed 'ceph status' output
+            timestamp (datetime): time of the status, now by default
+
+        Returns:
+            HealthEvent: the recorded event
+
+        """
+        health = status.get("health", {})
+        with self._lock:
+            self.checks = {
+                check: details.get("severity", HEALTH_WARN)
+                for check, details in health.get("checks", {}).items()
+            }
+            return self._record(
+                timestamp or datetime.now(timezone.utc),
+                health.get("status") or self._status_from_checks(),
+                None,
+                "ceph status",
+            )
+
+    def update_from_log(self, timestamp, level, message):
+        """
+        Update the state by a cluster log entry
+
+        Args:
+            timestamp (datetime): timestamp of the entry
+            level (str): e.g. WRN or ERR
+            message (str): message of the entry
+
+        Returns:
+            HealthEvent: the recorded event, None if the entry isn't about
+                the health
+
+        """
+        with self._lock:
+            raised = CHECK_RAISED.search(message)
+            cleared = CHECK_CLEARED.search(message)
+            overall = OVERALL_STATUS.search(message)
+            if raised:
+                check = raised.group("check")
+                severity = HEALTH_ERR if level == "ERR" else HEALTH_WARN
+                self.checks[check] = severity
+                return self._record(
+                    timestamp, self._status_from_checks(), check, message
+                )
+            if cleared:
+                check = cleared.group("check")
+                self.checks.pop(check, None)
+                return self._record(
+                    timestamp, self._status_from_checks(), check, message
+                )
+            if CLUSTER_HEALTHY in message:
+                self.checks = {}
+                return self._record(timestamp, HEALTH_OK, None, message)
+            if overall:
+                status = overall.group("status")
+                if status == HEALTH_OK:
+                    self.checks = {}
+                if status != self.status:
+                    return self._record(timestamp, status, None, message)
+        return None
+
+    def events(self, since=None, until=None, test=None):
+        """
+        Args:
+            since (datetime): Only events at or after the time
+            until (datetime): Only events at or before the time
+            test (str): Only events recorded during the test (pytest node id)
+
+        Returns:
+            list: HealthEvent objects
+
+        """
+        with self._lock:
+            events = list(self._events)
+        return [
+            event
+            for event in events
+            if (since is None or event.timestamp >= since)
+            and (until is None or event.timestamp <= until)
+            and (test is None or event.test == test)
+        ]
+
+    def intervals(self, status, since=None, until=None):
+        """
+        Periods in which the cluster was in the status, clipped to the window
+
+        Args:
+            status (str): e.g. HEALTH_ERR
+            since (datetime): Start of the window
+            until (datetime): End of the window, None for open window
+
+        Returns:
+            list: (start, end) timestamps, end is None if the cluster is still
+                in the status
+
+        """
+        with self._lock:
+            events = list(self._events)
+        intervals = []
+        start = None
+        for event in events:
+            if until is not None and event.timestamp > until:
+                break
+            if event.status == status and start is None:
+                start = event.timestamp
+            elif event.status != status and start is not None:
+                intervals.append((start, event.timestamp))
+                start = None
+        if start is not None:
+            intervals.append((start, None))
+        if since is None:
+            return intervals
+        return [
+            (max(start, since), end)
+            for start, end in intervals
+            if end is None or end >= since
+        ]
+
+    def was_in(self, status, since=None, until=None):
+        """
+        Returns:
+            bool: True if the cluster was in the status in the window
+
+        """
+        return bool(self.intervals(status, since, until))
+
+    @contextmanager
+    def window(self):
+        """
+        Track the health during a block
+
+        Yields:
+            HealthWindow: window which ends with the block
+
+        """
+        window = HealthWindow(self, datetime.now(timezone.utc))
+        try:
+            yield window
+        finally:
+            window.until = datetime.now(timezone.utc)
+
+
+class CephHealthStream(object):
+    """
+    Single long running 'ceph -w' session on the toolbox feeding the health
+    timeline
+    """
+
+    def __init__(self, namespace=None, tools_pod=None, timeline=None):
+        """
+        Initializer function
+
+        Args:
+            namespace (str): Namespace of OCS
+            tools_pod (Pod): Toolbox pod, get_ceph_tools_pod() by default
+            timeline (CephHealthTimeline): timeline to feed, new by default
+
+        """
+        self.namespace = namespace or config.ENV_DATA["cluster_namespace"]
+        self._tools_pod = tools_pod
+        self.timeline = timeline or CephHealthTimeline()
+        self._process = None
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.stop()
+
+    def _start_process(self):
+        # Importing here to avoid circular dependency
+        from ocs_ci.ocs.resources.pod import get_ceph_tools_pod
+
+        tools_pod = self._tools_pod or get_ceph_tools_pod(namespace=self.namespace)
+        return tools_pod.ocp.popen_oc_cmd(f"rsh {tools_pod.name} ceph -w --format json")
+
+    def feed(self, line):
+        """
+        Process a line of the 'ceph -w' output
+
+        Args:
+            line (str): the line
+
+        """
+        parsed = parse_watch_line(line)
+        if parsed is None:
+            if line.strip():
+                log.debug(f"ceph -w: {line.rstrip()}")
+            return
+        if parsed[0] == "status":
+            self.timeline.update_from_status(parsed[1])
+        else:
+            self.timeline.update_from_log(*parsed[1:])
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                self._process = self._start_process()
+                if self._stop_event.is_set():
+                    # stopped while the watch was starting
+                    self._process.terminate()
+                for line in self._process.stdout:
+                    self.feed(line)
+                self._process.wait()
+            except Exception as ex:
+                log.warning(f"Ceph health watch failed: {ex}")
+            if not self._stop_event.is_set():
+                log.warning(
+                    f"Ceph health watch ended, starting it again in {RECONNECT_DELAY}s"
+                )
+                self._stop_event.wait(RECONNECT_DELAY)
+
+    def start(self):
+        """
+        Start the watch in a daemon thread
+        """
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="ceph-health-stream", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout=30):
+        """
+        Stop the watch
+
+        Args:
+            timeout (int): Seconds to wait for the thread to end
+
+        """
+        self._stop_event.set()
+        process = self._process
+        if process and process.poll() is None:
+            process.terminate()
+        if self._thread:
+            self._thread.join(timeout)
@@ -0,0 +1,403 @@
+"""
+Shared snapshot of the Ceph cluster state
+
+Many helpers of ocs_ci.ocs.cluster fetch their own copy of the same state
+(ceph df, ceph osd df, ceph osd tree, ...) and validation sequences call them
+within seconds of each other, each call being a round trip to the toolbox.
+CephStateSnapshot keeps the parsed outputs of these commands per cluster for a
+short TTL (``RUN['ceph_snapshot_ttl']``, 0 by default, which fetches the
+current state on every call). get refreshes only the requested
+section when it's stale, the callers which need several sections prefetch
+them together in one batch on the toolbox, see CephCommandChannel.
+
+The snapshot is invalidated explicitly after operations which change the
+cluster state: ceph commands which aren't read-only run on the toolbox
+invalidate it automatically, other operations (e.g. adding capacity) call
+invalidate_ceph_snapshot(). Pod deletion, node drains or IO don't invalidate
+it, so only the suites which tolerate state that old should enable the TTL.
+
+Usage:
+    osd_tree = get_ceph_snapshot().get("osd_tree")
+
+    snapshot = get_ceph_snapshot()
+    snapshot.prefetch(["df", "osd_df"])
+    df, osd_df = snapshot.get("df"), snapshot.get("osd_df")
+"""
+
+import copy
+import logging
+import shlex
+import threading
+import time
+
+from ocs_ci.framework import config
+from ocs_ci.ocs.ceph_channel import get_ceph_command_channel
+
+log = logging.getLogger(__name__)
+
+# Sections of the snapshot and the ceph commands they are built from
+SECTIONS = {
+    "status": "ceph status",
+    "df": "ceph df",
+    "df_detail": "ceph df detail",
+    "osd_df": "ceph osd df",
+    "osd_tree": "ceph osd tree",
+    "osd_dump": "ceph osd dump",
+    "pg_dump": "ceph pg dump pgs_brief",
+}
+# Sections refreshed by refresh() by default, the big pg dump is fetched only
+# on demand
+DEFAULT_SECTIONS = ("status", "df", "df_detail", "osd_df", "osd_tree", "osd_dump")
+DEFAULT_TTL = 0
+
+# Leading subcommands of the ceph commands which only read the cluster state,
+# a command is read-only when its subcommand words start with one of them and
+# not with a longer prefix of MUTATING_PREFIXES. Unknown commands are treated
+# as mutating.
+READ_ONLY_PREFIXES = {
+    ("status",),
+    ("health",),
+    ("df",),
+    ("report",),
+    ("version",),
+    ("versions",),
+    ("fsid",),
+    ("quorum_status",),
+    ("mon_status",),
+    ("time-sync-status",),
+    ("features",),
+    ("log", "last"),
+    ("mon", "dump"),
+    ("mon", "stat"),
+    ("mon", "metadata"),
+    ("mon", "versions"),
+    ("mon", "feature", "ls"),
+    ("mgr", "dump"),
+    ("mgr", "stat"),
+    ("mgr", "metadata"),
+    ("mgr", "services"),
+    ("mgr", "versions"),
+    ("mgr", "module", "ls"),
+    ("osd", "tree"),
+    ("osd", "df"),
+    ("osd", "dump"),
+    ("osd", "stat"),
+    ("osd", "ls"),
+    ("osd", "find"),
+    ("osd", "map"),
+    ("osd", "metadata"),
+    ("osd", "perf"),
+    ("osd", "versions"),
+    ("osd", "getmap"),
+    ("osd", "getcrushmap"),
+    ("osd", "utilization"),
+    ("osd", "blocked-by"),
+    ("osd", "ok-to-stop"),
+    ("osd", "safe-to-destroy"),
+    ("osd", "count-metadata"),
+    ("osd", "numa-status"),
+    ("osd", "blocklist", "ls"),
+    ("osd", "blacklist", "ls"),
+    ("osd", "pool", "ls"),
+    ("osd", "pool", "get"),
+    ("osd", "pool", "get-quota"),
+    ("osd", "pool", "stats"),
+    ("osd", "pool", "autoscale-status"),
+    ("osd", "pool", "application", "get"),
+    ("osd", "crush", "dump"),
+    ("osd", "crush", "tree"),
+    ("osd", "crush", "ls"),
+    ("osd", "crush", "class", "ls"),
+    ("osd", "crush", "rule", "ls"),
+    ("osd", "crush", "rule", "dump"),
+    ("osd", "crush", "show-tunables"),
+    ("osd", "erasure-code-profile", "ls"),
+    ("osd", "erasure-code-profile", "get"),
+    ("pg", "dump"),
+    ("pg", "dump_json"),
+    ("pg", "dump_stuck"),
+    ("pg", "stat"),
+    ("pg", "ls"),
+    ("pg", "ls-by-pool"),
+    ("pg", "ls-by-osd"),
+    ("pg", "ls-by-primary"),
+    ("pg", "map"),
+    ("fs", "ls"),
+    ("fs", "dump"),
+    ("fs", "get"),
+    ("fs", "status"),
+    ("fs", "volume", "ls"),
+    ("fs", "volume", "info"),
+    ("fs", "subvolume", "ls"),
+    ("fs", "subvolume", "info"),
+    ("fs", "subvolume", "getpath"),
+    ("fs", "subvolume", "snapshot", "ls"),
+    ("fs", "subvolume", "snapshot", "info"),
+    ("fs", "subvolumegroup", "ls"),
+    ("fs", "subvolumegroup", "getpath"),
+    ("mds", "stat"),
+    ("mds", "metadata"),
+    ("mds", "versions"),
+    ("auth", "get"),
+    ("auth", "get-key"),
+    ("auth", "print-key"),
+    ("auth", "ls"),
+    ("auth", "list"),
+    ("auth", "export"),
+    ("config", "get"),
+    ("config", "dump"),
+    ("config", "show"),
+    ("config", "ls"),
+    ("config", "help"),
+    ("config", "log"),
+    ("config-key", "get"),
+    ("config-key", "ls"),
+    ("config-key", "dump"),
+    ("config-key", "exists"),
+    ("crash", "ls"),
+    ("crash", "ls-new"),
+    ("crash", "info"),
+    ("crash", "stat"),
+    ("balancer", "status"),
+    ("balancer", "eval"),
+    ("balancer", "ls"),
+    ("orch", "ls"),
+    ("orch", "ps"),
+    ("orch", "status"),
+    ("orch", "host", "ls"),
+    ("orch", "device", "ls"),
+    ("device", "ls"),
+    ("device", "info"),
+}
+# Mutating commands under a read-only prefix
+MUTATING_PREFIXES = {
+    ("health", "mute"),
+    ("health", "unmute"),
+}
+# 'ceph pg <pgid> <command>' commands which only read the PG state
+READ_ONLY_PG_COMMANDS = {"query", "list_unfound"}
+# Options which make a command without a subcommand read-only, e.g. 'ceph -s'
+READ_ONLY_OPTIONS = {"-s", "--status", "-v", "--version"}
+# Options of the ceph CLI followed by a value
+OPTIONS_WITH_VALUE = {
+    "-c",
+    "--conf",
+    "--cluster",
+    "-f",
+    "--format",
+    "-i",
+    "--in-file",
+    "-o",
+    "--out-file",
+    "-n",
+    "--name",
+    "--id",
+    "--user",
+    "-k",
+    "--keyring",
+    "-m",
+    "--connect-timeout",
+    "--setuser",
+    "--setgroup",
+}
+
+_snapshots = {}
+_snapshots_lock = threading.Lock()
+
+
+def get_ceph_snapshot_ttl():
+    """
+    Returns:
+        float: Seconds for which the snapshot sections are reused, 0 if the
+            snapshot is disabled
+
+    """
+    return float(config.RUN.get("ceph_snapshot_ttl", DEFAULT_TTL))
+
+
+def is_read_only_ceph_command(command):
+    """
+    Check whether the ceph command only reads the cluster state
+
+    Args:
+        command (str): ceph command, e.g. 'ceph osd pool get rbd size'
+
+    Returns:
+        bool: True if the command doesn't change the cluster state
+
+    """
+    words = shlex.split(command)
+    if words and words[0] == "ceph":
+        words = words[1:]
+    if not words:
+        return True
+    subcommand = []
+    options = set()
+    skip_value = False
+    for word in words:
+        if skip_value:
+            skip_value = False
+        elif word.startswith("-"):
+            options.add(word)
+            skip_value = word in OPTIONS_WITH_VALUE
+        else:
+            subcommand.append(word)
+    if not subcommand:
+        return bool(options & READ_ONLY_OPTIONS)
+    if (
+        len(subcommand) >= 3
+        and subcommand[0] == "pg"
+        and subcommand[2] in READ_ONLY_PG_COMMANDS
+    ):
+        return True
+    prefixes = [tuple(subcommand[:length]) for length in range(1, len(subcommand) + 1)]
+    if any(prefix in MUTATING_PREFIXES for prefix in prefixes):
+        return False
+    return any(prefix in READ_ONLY_PREFIXES for prefix in prefixes)
+
+
+def is_ceph_state_changed_by(command):
+    """
+    Check whether the command run on a pod changes the ceph cluster state
+
+    Args:
+        command (str): command run on a pod
+
+    Returns:
+        bool: True if it's a ceph command which isn't read-only
+
+    """
+    if not command.lstrip().startswith("ceph "):
+        return False
+    try:
+        return not is_read_only_ceph_command(command)
+    except ValueError:
+        return True
+
+
+class CephStateSnapshot(object):
+    """
+    Parsed outputs of the ceph commands describing the cluster state, reused
+    for the TTL
+    """
+
+    def __init__(self, namespace=None, ttl=None):
+        """
+        Initializer function
+
+        Args:
+            namespace (str): Namespace of OCS
+            ttl (float): Seconds for which the sections are reused, default
+                RUN['ceph_snapshot_ttl']
+
+        """
+        self.namespace = namespace
+        self._ttl = ttl
+        self._sections = {}
+        self._lock = threading.Lock()
+
+    @property
+    def ttl(self):
+        return get_ceph_snapshot_ttl() if self._ttl is None else self._ttl
+
+    def _is_fresh(self, section, now):
+        fetched = self._sections.get(section)
+        return fetched is not None and now - fetched[1] < self.ttl
+
+    def refresh(self, sections=DEFAULT_SECTIONS):
+        """
+        Fetch the sections from the toolbox in one round trip
+
+        Args:
+            sections (iterable): Names of the sections, see SECTIONS
+
+        """
+        sections = list(sections)
+        log.info(f"Refreshing ceph state snapshot: {sections}")
+        results = get_ceph_command_channel(self.namespace).run(
+            [SECTIONS[section] for section in sections]
+        )
+        now = time.monotonic()
+        for section, result in zip(sections, results):
+            self._sections[section] = (result, now)
+
+    def get(self, section):
+        """
+        Get the section of the snapshot, the section is refreshed if it's
+        stale
+
+        Args:
+            section (str): Name of the section, see SECTIONS
+
+        Returns:
+            dict: parsed output of the ceph command of the section, a copy
+                which the caller can modify
+
+        """
+        if section not in SECTIONS:
+            raise ValueError(
+                f"Unknown ceph snapshot section {section}, use one of {list(SECTIONS)}"
+            )
+        with self._lock:
+            if not self._is_fresh(section, time.monotonic()):
+                self.refresh([section])
+            result = self._sections[section][0]
+        return copy.deepcopy(result)
+
+    def prefetch(self, sections=DEFAULT_SECTIONS):
+        """
+        Refresh the stale sections in one round trip, for the callers which
+        read several sections. Nothing is fetched if the snapshot is disabled,
+        get fetches the sections then.
+
+        Args:
+            sections (iterable): Names of the sections, see SECTIONS
+
+        """
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            stale = [name for name in sections if not self._is_fresh(name, now)]
+            if stale:
+                self.refresh(stale)
+
+    def invalidate(self):
+        """
+        Drop all the sections, the next get fetches the current state
+        """
+        with self._lock:
+            self._sections.clear()
+
+
+def get_ceph_snapshot(namespace=None):
+    """
+    Get the shared snapshot of the cluster in the current context
+
+    Args:
+        namespace (str): Namespace of OCS
+            (default: config.ENV_DATA['cluster_namespace'])
+
+    Returns:
+        CephStateSnapshot: the snapshot of the cluster
+
+    """
+    namespace = namespace or config.ENV_DATA["cluster_namespace"]
+    key = (config.cur_index, namespace)
+    with _snapshots_lock:
+        snapshot = _snapshots.get(key)
+        if snapshot is None:
+            snapshot = _snapshots[key] = CephStateSnapshot(namespace)
+    return snapshot
+
+
+def invalidate_ceph_snapshot():
+    """
+    Invalidate the snapshots after an operation which changes the cluster
+    state. The snapshots of all the clusters are dropped, the toolbox of a
+    consumer cluster runs on the provider.
+    """
+    with _snapshots_lock:
+        snapshots = list(_snapshots.values())
+    for snapshot in snapshots:
+        snapshot.invalidate()
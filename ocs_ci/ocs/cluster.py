@@ -39,6 +39,15 @@ from ocs_ci.ocs.exceptions import (
     ActiveMdsValueNotMatch,
     TemporaryPodsDuringDeployment,
 )
+from ocs_ci.ocs.ceph_health_stream import (
+    HEALTH_ERR,
+    CephHealthStream,
+    CephHealthTimeline,
+)
+from ocs_ci.ocs.ceph_snapshot import get_ceph_snapshot
+from ocs_ci.ocs.cluster_context import run_on_clusters
+from ocs_ci.ocs.pg_analytics import PlacementModel
+from ocs_ci.ocs.rebalance_tracker import RebalanceTracker
 from ocs_ci.ocs.resources import ocs, storage_cluster
 import ocs_ci.ocs.constants as constant
 from ocs_ci.ocs.resources.mcg import MCG
@@ -67,7 +76,6 @@ from ocs_ci.utility.lvmo_utils import get_lvm_cluster_name
 from ocs_ci.ocs.resources.pod import (
     get_mds_pods,
     wait_for_pods_to_be_in_statuses,
-    get_ceph_tools_pod,
 )
 
 logger = logging.getLogger(__name__)
@@ -192,6 +200,8 @@ class CephCluster(object):
         logger.info(f"Number of mds = {self.mds_count}")
 
         self.used_space = 0
+        # RebalanceTracker of the last wait_for_rebalance
+        self.rebalance_tracker = None
 
     @property
     def mcg_obj(self):
@@ -676,8 +686,7 @@ class CephCluster(object):
             int : Total storage capacity in GiB (GiB is for development environment)
 
         """
-        ceph_pod = pod.get_ceph_tools_pod()
-        ceph_status = ceph_pod.exec_ceph_cmd(ceph_cmd="ceph df")
+        ceph_status = get_ceph_snapshot(self.namespace).get("df")
         if replica_divide:
             replica = int(self.get_ceph_default_replica())
             logger.info(f"Number of replica : {replica}")
@@ -699,8 +708,7 @@ class CephCluster(object):
         replica = int(self.get_ceph_default_replica())
         if replica > 0:
             logger.info(f"Number of replica : {replica}")
-            ct_pod = pod.get_ceph_tools_pod()
-            output = ct_pod.exec_ceph_cmd(ceph_cmd="ceph df")
+            output = get_ceph_snapshot(self.namespace).get("df")
             total_avail = output.get("stats").get("total_bytes")
             total_used = output.get("stats").get("total_used_raw_bytes")
             total_free = total_avail - total_used
@@ -815,8 +823,9 @@ class CephCluster(object):
         """
 
         ceph_pod = pod.get_ceph_tools_pod()
-        ceph_status = ceph_pod.exec_ceph_cmd(ceph_cmd="ceph status")
-        ceph_health = ceph_pod.exec_ceph_cmd(ceph_cmd="ceph health")
+        ceph_status, ceph_health = ceph_pod.exec_ceph_cmds(
+            ["ceph status", "ceph health"]
+        )
         total_pg_count = ceph_status["pgmap"]["num_pgs"]
         pg_states = ceph_status["pgmap"]["pgs_by_state"]
         logger.info(ceph_health)
@@ -832,47 +841,25 @@ class CephCluster(object):
         """
         Wait for re-balance to complete
 
+        The recovery counters are sampled by RebalanceTracker, the tracker of
+        the last wait is kept in self.rebalance_tracker for the reporting of
+        the rebalance timeline.
+
         Args:
             timeout (int): Time to wait for the completion of re-balance
-            repeat (int): How many times to repeat the check to make sure, it's
-                really completed.
+            repeat (int): How many consecutive clean samples are needed to
+                make sure, it's really completed.
 
         Returns:
             bool: True if re-balance completed, False otherwise
 
         """
-        try:
-            sleep_time = 10
-            start_time = time.time()
-            for attempt in range(1, repeat + 1):
-                new_timeout = timeout - int(time.time() - start_time)
-                if new_timeout < sleep_time:
-                    new_timeout = sleep_time + 5
-                logger.debug(f"Attempt {attempt} out of {repeat} repeats.")
-                for rebalance in TimeoutSampler(
-                    timeout=new_timeout,
-                    sleep=sleep_time,
-                    func=self.get_rebalance_status,
-                ):
-                    if rebalance:
-                        logger.info(
-                            f"Re-balance completed! This is attempt {attempt} out of {repeat} repeats. "
-                            f"This rebalance check needs to prove it {repeat} times in row."
-                        )
-                        if repeat == attempt:
-                            return True
-                        else:
-                            logger.debug(
-                                f"Wait {sleep_time} seconds before next attempt to check re-balance has completed."
-                            )
-                            time.sleep(sleep_time)
-                            break
-        except exceptions.TimeoutExpiredError:
-            logger.error(
-                f"Data re-balance failed to complete within the given "
-                f"timeout of {timeout} seconds"
-            )
-            return False
+        self.rebalance_tracker = RebalanceTracker(namespace=self.namespace)
+        completed = self.rebalance_tracker.wait(
+            timeout=timeout, sleep=10, stable_samples=repeat
+        )
+        logger.info(f"Re-balance summary: {self.rebalance_tracker.summary()}")
+        return completed
 
     def time_taken_to_complete_rebalance(self, timeout=600):
         """
@@ -886,13 +873,11 @@ class CephCluster(object):
             int : Time taken in minutes for the completion of rebalance
 
         """
-        start_time = time.time()
         assert self.wait_for_rebalance(timeout=timeout), (
             f"Data re-balance failed to complete within the given "
             f"timeout of {timeout} seconds"
         )
-        time_taken = time.time() - start_time
-        return time_taken / 60
+        return self.rebalance_tracker.duration / 60
 
     def set_pgs(self, poolname, pgs):
         """
@@ -1081,28 +1066,39 @@ class CephHealthMonitor(threading.Thread):
     If CephCluster will get to HEALTH_ERROR state it will save the ceph status
     to health_error_status variable and will stop monitoring.
 
+    In the 'stream' mode the health isn't polled, one 'ceph -w' session
+    reports all the health transitions to the timeline, see CephHealthStream.
+
     """
 
-    def __init__(self, ceph_cluster, sleep=5):
+    def __init__(self, ceph_cluster, sleep=5, mode=None):
         """
         Constructor for ceph health status thread.
 
         Args:
             ceph_cluster (CephCluster): Reference to CephCluster object.
             sleep (int): Number of seconds to sleep between health checks.
+            mode (str): 'poll' or 'stream', default
+                RUN['ceph_health_monitor_mode']
 
         """
         if isinstance(ceph_cluster, CephClusterMultiCluster):
             return MulticlusterCephHealthMonitor()
         self.ceph_cluster = ceph_cluster
         self.sleep = sleep
+        self.mode = mode or config.RUN.get("ceph_health_monitor_mode", "poll")
         self.health_error_status = None
         self.health_monitor_enabled = False
         self.latest_health_status = None
+        self.timeline = CephHealthTimeline()
+        self._stopped = threading.Event()
         super(CephHealthMonitor, self).__init__()
 
     def run(self):
         self.health_monitor_enabled = True
+        if self.mode == "stream":
+            self.run_stream()
+            return
         while self.health_monitor_enabled and (not self.health_error_status):
             time.sleep(self.sleep)
             self.latest_health_status = self.ceph_cluster.get_ceph_health(detail=True)
@@ -1110,6 +1106,31 @@ class CephHealthMonitor(threading.Thread):
                 self.health_error_status = self.ceph_cluster.get_ceph_status()
                 self.log_error_status()
 
+    def run_stream(self):
+        """
+        Follow the health transitions by the ceph watch till the monitoring
+        is stopped
+        """
+        self.timeline.add_listener(self.on_health_event)
+        with CephHealthStream(
+            namespace=self.ceph_cluster.namespace, timeline=self.timeline
+        ):
+            self._stopped.wait()
+
+    def on_health_event(self, event):
+        """
+        Args:
+            event (HealthEvent): health event reported by the ceph watch
+
+        """
+        self.latest_health_status = event.status
+        if event.status == HEALTH_ERR and not self.health_error_status:
+            self.health_error_status = (
+                f"{HEALTH_ERR} since {event.timestamp.isoformat()}: "
+                f"{event.message}, health checks: {self.timeline.checks}"
+            )
+            self.log_error_status()
+
     def __enter__(self):
         self.start()
 
@@ -1126,6 +1147,9 @@ class CephHealthMonitor(threading.Thread):
 
         """
         self.health_monitor_enabled = False
+        self._stopped.set()
+        if self.mode == "stream" and self.is_alive():
+            self.join(60)
         if self.health_error_status:
             self.log_error_status()
         if exception_type:
@@ -1458,9 +1482,7 @@ def get_osd_utilization():
 
     """
     osd_filled = {}
-    ceph_cmd = "ceph osd df"
-    ct_pod = pod.get_ceph_tools_pod()
-    output = ct_pod.exec_ceph_cmd(ceph_cmd=ceph_cmd)
+    output = get_ceph_snapshot().get("osd_df")
     for osd in output.get("nodes"):
         osd_filled[osd["name"]] = osd["utilization"]
 
@@ -1469,12 +1491,15 @@ def get_osd_utilization():
 
 def get_ceph_df_detail(format="json-pretty", out_yaml_format=True):
     """
-    Get ceph osd df detail
+    Get ceph osd df detail, the parsed json output is served from the shared
+    ceph state snapshot
 
     Returns:
          dict: 'ceph df details' command output
 
     """
+    if format in ("json", "json-pretty") and out_yaml_format:
+        return get_ceph_snapshot().get("df_detail")
     ceph_cmd = "ceph df detail"
     ct_pod = pod.get_ceph_tools_pod()
     return ct_pod.exec_ceph_cmd(
@@ -1779,16 +1804,15 @@ def validate_osd_utilization(osd_used=80):
               False Otherwise.
 
     """
-    _rc = True
-    osd_filled = get_osd_utilization()
-    for osd, value in osd_filled.items():
-        if int(value) >= osd_used:
+    osds = PlacementModel.from_snapshot(include_pgs=False).osds
+    filled = osds["utilization"].astype(int) >= osd_used
+    for osd, value, is_filled in zip(osds["name"], osds["utilization"], filled):
+        if is_filled:
             logger.info(f"{osd} used value {value}")
         else:
-            _rc = False
             logger.warning(f"{osd} used value {value}")
 
-    return _rc
+    return bool(filled.all())
 
 
 def get_pgs_per_osd():
@@ -1800,14 +1824,7 @@ def get_pgs_per_osd():
         i.e {'osd.0': 136, 'osd.2': 136, 'osd.1': 136}
 
     """
-    osd_dict = {}
-    ceph_cmd = "ceph osd df"
-    ct_pod = pod.get_ceph_tools_pod()
-    output = ct_pod.exec_ceph_cmd(ceph_cmd=ceph_cmd)
-    for osd in output.get("nodes"):
-        osd_dict[osd["name"]] = osd["pgs"]
-
-    return osd_dict
+    return PlacementModel.from_snapshot(include_pgs=False).osd_column("pgs")
 
 
 def get_balancer_eval():
@@ -1860,16 +1877,15 @@ def validate_pg_balancer():
     # TODO: Revisit eval value if pg balancer mode changes from 'upmap'
     if get_pg_balancer_status():
         eval = get_balancer_eval()
-        osd_dict = get_pgs_per_osd()
-        osd_avg_pg_value = round(sum(osd_dict.values()) / len(osd_dict))
-        osd_pg_value_flag = True
-        for key, value in osd_dict.items():
-            diff = abs(value - osd_avg_pg_value)
-            if diff <= 10:
+        model = PlacementModel.from_snapshot(include_pgs=False)
+        pg_diff = model.pg_count_deviation()
+        acceptable = pg_diff <= 10
+        for key, diff, is_acceptable in zip(model.osds["name"], pg_diff, acceptable):
+            if is_acceptable:
                 logger.info(f"{key} PG difference {diff} is acceptable")
             else:
                 logger.error(f"{key} PG difference {diff} is not acceptable")
-                osd_pg_value_flag = False
+        osd_pg_value_flag = bool(acceptable.all())
         if osd_pg_value_flag and eval <= 0.025:
             logger.info(
                 f"Eval value is {eval} and pg distribution "
@@ -1894,9 +1910,7 @@ def get_ceph_df_stats() -> dict:
         dict: Ceph df stats.
 
     """
-    ct_pod = get_ceph_tools_pod()
-    output = ct_pod.exec_ceph_cmd(ceph_cmd="ceph df")
-    return output.get("stats")
+    return get_ceph_snapshot().get("df").get("stats")
 
 
 def get_ceph_used_capacity() -> float:
@@ -2215,8 +2229,7 @@ def exec_ceph_osd_tree_with_retry():
     Returns:
         dict: The output of ceph osd tree command
     """
-    ct_pod = pod.get_ceph_tools_pod()
-    return ct_pod.exec_ceph_cmd(ceph_cmd="ceph osd tree")
+    return get_ceph_snapshot().get("osd_tree")
 
 
 def check_ceph_osd_tree():
@@ -2734,7 +2747,7 @@ def get_osd_dump(pool_name):
         dict: pool information from osd dump
 
     """
-    osd_dump_dict = pod.get_ceph_tools_pod().exec_ceph_cmd("ceph osd dump")
+    osd_dump_dict = get_ceph_snapshot().get("osd_dump")
     for pool in osd_dump_dict["pools"]:
         if pool["pool_name"] == pool_name:
             return pool
@@ -2763,7 +2776,7 @@ def get_pgs_brief_dump():
         dict: pgs_brief dump output
 
     """
-    pgs_brief_dict = pod.get_ceph_tools_pod().exec_ceph_cmd("ceph pg dump pgs_brief")
+    pgs_brief_dict = get_ceph_snapshot().get("pg_dump")
 
     return pgs_brief_dict
 
@@ -2776,9 +2789,7 @@ def get_all_pgid():
         list: List of all the pgid's in pgs_brief dump
 
     """
-    pg_dump_dict = get_pgs_brief_dump()
-
-    return [pgid["pgid"] for pgid in pg_dump_dict["pg_stats"]]
+    return PlacementModel(get_pgs_brief_dump()).get_pgids()
 
 
 def get_specific_pool_pgid(pool_name):
@@ -2793,9 +2804,8 @@ def get_specific_pool_pgid(pool_name):
 
     """
     pool_num = get_pool_num(pool_name)
-    all_pgid = get_all_pgid()
 
-    return list(filter(lambda x: x.startswith(f"{pool_num}."), all_pgid))
+    return PlacementModel(get_pgs_brief_dump()).get_pgids(pool=pool_num)
 
 
 def get_osd_pg_log_dups_tracked():
@@ -3722,9 +3732,14 @@ def client_clusters_health_check():
         CephHealthException: In case there are extra Ceph pods on the cluster
 
     """
-    for client_context in config.get_client_contexts_if_available():
-        with client_context:
-            client_cluster_health_check()
+    consumer_indexes = config.get_consumer_indexes_list(raise_exception=False)
+    if consumer_indexes:
+        # the clients are checked in parallel, each in its own bound context
+        run_on_clusters(
+            lambda context: client_cluster_health_check(), indexes=consumer_indexes
+        )
+    else:
+        client_cluster_health_check()
 
     logger.info("The client clusters health check passed successfully")
 
@@ -0,0 +1,220 @@
+"""
+Registry of per-cluster execution contexts
+
+Switching the global cluster context by config.switch_ctx serializes the work
+on multiple clusters and races with the other threads. A ClusterContext
+carries everything needed to talk to one cluster (kubeconfig, API client,
+default namespace), it can be passed explicitly or bound to the current thread
+or asyncio task by ``with cluster_context.bind():`` which leaves the global
+context untouched. run_on_clusters fans a function out to several clusters at
+once, each call running in its own bound context.
+
+Usage:
+    results = run_on_clusters(
+        lambda ctx: OCP(kind="Pod", namespace=ctx.namespace).get(),
+        indexes=config.get_consumer_indexes_list(),
+    )
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from ocs_ci.framework import config
+
+log = logging.getLogger(__name__)
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+class ClusterContext(object):
+    """
+    Execution context of one cluster of the run
+    """
+
+    def __init__(self, index):
+        """
+        Initializer function
+
+        Args:
+            index (int): Multicluster index of the cluster
+
+        """
+        self.index = index
+
+    def __repr__(self):
+        return f"ClusterContext({self.index}, {self.name})"
+
+    @property
+    def config(self):
+        """
+        Returns:
+            ocs_ci.framework.Config: config of the cluster
+
+        """
+        return config.clusters[self.index]
+
+    @property
+    def name(self):
+        return self.config.ENV_DATA.get("cluster_name")
+
+    @property
+    def namespace(self):
+        """
+        Returns:
+            str: default namespace of the storage cluster
+
+        """
+        return self.config.ENV_DATA.get("cluster_namespace")
+
+    @property
+    def kubeconfig(self):
+        """
+        Returns:
+            str: path to the kubeconfig of the cluster
+
+        """
+        kubeconfig = self.config.RUN.get("kubeconfig")
+        if kubeconfig:
+            return kubeconfig
+        return os.path.join(
+            self.config.ENV_DATA.get("cluster_path", ""),
+            self.config.RUN.get("kubeconfig_location", "auth/kubeconfig"),
+        )
+
+    @property
+    def api_backend(self):
+        """
+        Returns:
+            KubeAPIBackend: in-process API client of the cluster
+
+        """
+        # Importing here to avoid circular dependency
+        from ocs_ci.ocs.api_backend import get_api_backend
+
+        return get_api_backend(self.kubeconfig)
+
+    def bind(self):
+        """
+        Bind the cluster to the current thread or asyncio task, see
+        MultiClusterConfig.bind_ctx
+
+        Returns:
+            contextmanager: the binding
+
+        """
+        return config.bind_ctx(self.index)
+
+    def ocp(self, **kwargs):
+        """
+        Create OCP object of the cluster
+
+        Args:
+            **kwargs: arguments of OCP, namespace defaults to the namespace
+                of the storage cluster
+
+        Returns:
+            OCP: object which runs the commands on the cluster
+
+        """
+        # Importing here to avoid circular dependency
+        from ocs_ci.ocs.ocp import OCP
+
+        kwargs.setdefault("namespace", self.namespace)
+        with self.bind():
+            return OCP(**kwargs)
+
+
+def get_cluster_context(index=None):
+    """
+    Get the execution context of the cluster from the registry
+
+    Args:
+        index (int): Multicluster index of the cluster, None for the cluster
+            of the current context
+
+    Returns:
+        ClusterContext: context of the cluster
+
+    """
+    if index is None:
+        index = config.cur_index
+    with _registry_lock:
+        context = _registry.get(index)
+        if context is None:
+            context = _registry[index] = ClusterContext(index)
+    return context
+
+
+def get_cluster_contexts(indexes=None, skip_index=None):
+    """
+    Get the execution contexts of multiple clusters
+
+    Args:
+        indexes (list): Multicluster indexes, all the clusters if None
+        skip_index (list or int): indexes to skip
+
+    Returns:
+        list: ClusterContext objects
+
+    """
+    if indexes is None:
+        indexes = range(len(config.clusters))
+    if not isinstance(skip_index, (list, tuple, set)):
+        skip_index = [skip_index]
+    return [get_cluster_context(index) for index in indexes if index not in skip_index]
+
+
+def run_on_clusters(
+    func, indexes=None, skip_index=None, max_workers=None, args=(), kwargs=None
+):
+    """
+    Run the function for multiple clusters at once. Each call runs in its own
+    thread with the cluster context bound, so code using the global config or
+    OCP objects created in the call works on the cluster without switching the
+    global context.
+
+    Args:
+        func (callable): Function called with ClusterContext as the first
+            argument followed by args and kwargs
+        indexes (list): Multicluster indexes, all the clusters if None
+        skip_index (list or int): indexes to skip
+        max_workers (int): Maximum number of clusters processed in parallel,
+            default all of them
+        args (tuple): Additional positional arguments of the function
+        kwargs (dict): Keyword arguments of the function
+
+    Returns:
+        dict: result of the function per cluster index
+
+    Raises:
+        Exception: the first exception raised by the function, after all the
+            calls have finished
+
+    """
+    kwargs = kwargs or {}
+    contexts = get_cluster_contexts(indexes, skip_index)
+    if not contexts:
+        return {}
+
+    def run(context):
+        with context.bind():
+            return func(context, *args, **kwargs)
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(contexts)) as executor:
+        futures = {context.index: executor.submit(run, context) for context in contexts}
+    results = {}
+    first_exception = None
+    for index, future in futures.items():
+        exception = future.exception()
+        if exception is None:
+            results[index] = future.result()
+            continue
+        log.error(f"Failed on cluster {get_cluster_context(index).name}: {exception}")
+        if first_exception is None:
+            first_exception = exception
+    if first_exception is not None:
+        raise first_exception
+    return results
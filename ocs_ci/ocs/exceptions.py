@@ -842,3 +842,39 @@ class UnexpectedCatalogBuildException(Exception):
     """
 
     pass
+
+
+class APIBackendNotSupported(Exception):
+    """
+    Raised when the in-process API backend can't serve the request and the
+    'oc' CLI has to be used instead.
+    """
+
+    pass
+
+
+class UnsupportedPrinterColumn(Exception):
+    """
+    Raised when the value of a printer column or a jsonpath expression can't
+    be computed from the resource data and 'oc get' has to be used instead.
+    """
+
+    pass
+
+
+class ExecSessionClosed(Exception):
+    """
+    Raised when the persistent exec stream to a pod was closed before the
+    command was submitted, so it's safe to run the command again.
+    """
+
+    pass
+
+
+class ExecSessionUnavailable(Exception):
+    """
+    Raised when a persistent exec session can't be established to the
+    container (e.g. no shell in the image) and 'oc exec' has to be used.
+    """
+
+    pass
@@ -0,0 +1,406 @@
+"""
+Pool of persistent exec sessions to pods
+
+Every Pod.exec_cmd_on_pod used to spawn a new 'oc rsh'/'oc exec' process which
+sets up a new connection to the API server. Hot loops (ceph commands on the
+toolbox, md5 checks, fio status polling) pay a process fork plus connection
+setup per command. An ExecSession keeps one websocket exec stream with a shell
+in the container and runs the commands in it, separating the output of the
+commands by unique end markers which also carry the exit code.
+
+Sessions are pooled per (cluster, namespace, pod, container) and re-established
+automatically when the stream was closed, e.g. because the pod restarted.
+Enable with ``RUN['exec_session_pool']``.
+"""
+
+import logging
+import shlex
+import subprocess
+import threading
+import time
+import uuid
+
+from kubernetes.client.rest import ApiException
+from kubernetes.config import ConfigException
+from kubernetes.stream import stream
+from websocket import WebSocketException
+
+from ocs_ci.framework import config
+from ocs_ci.ocs.api_backend import get_api_backend
+from ocs_ci.ocs.exceptions import (
+    CommandFailed,
+    ExecSessionClosed,
+    ExecSessionUnavailable,
+)
+from ocs_ci.utility.utils import (
+    bin_xml_escape,
+    filter_out_emojis,
+    mask_secrets,
+    truncate_large_base64,
+    truncate_long_lines,
+)
+
+log = logging.getLogger(__name__)
+
+SHELL = "/bin/sh"
+# Timeout of the no-op command checking the shell of a new session
+PROBE_TIMEOUT = 30
+# Idle sessions kept in the pool per pod and container
+MAX_IDLE_SESSIONS = 4
+
+_pool = {}
+_pool_lock = threading.Lock()
+
+
+def is_exec_session_pool_enabled():
+    """
+    Returns:
+        bool: True if commands on pods should run in persistent sessions
+
+    """
+    return bool(config.RUN.get("exec_session_pool"))
+
+
+def get_default_container(pod_data):
+    """
+    Get the container 'oc exec' uses when no container is specified
+
+    Args:
+        pod_data (dict): Pod data
+
+    Returns:
+        str: name of the container, None if the pod data has no containers
+
+    """
+    annotations = pod_data.get("metadata", {}).get("annotations") or {}
+    default_container = annotations.get("kubectl.kubernetes.io/default-container")
+    if default_container:
+        return default_container
+    containers = pod_data.get("spec", {}).get("containers") or [{}]
+    return containers[0].get("name")
+
+
+class ExecSession(object):
+    """
+    Long-lived exec stream with a shell in the container of a pod
+    """
+
+    def __init__(self, kubeconfig, namespace, pod_name, container):
+        """
+        Initializer function
+
+        Args:
+            kubeconfig (str): Path to the kubeconfig of the cluster
+            namespace (str): Namespace of the pod
+            pod_name (str): Name of the pod
+            container (str): Name of the container
+
+        """
+        self.kubeconfig = kubeconfig
+        self.namespace = namespace
+        self.pod_name = pod_name
+        self.container = container
+        self.last_used = time.time()
+        self.commands_run = 0
+        self._ws = None
+
+    def __repr__(self):
+        return f"ExecSession({self.namespace}/{self.pod_name}:{self.container})"
+
+    @property
+    def is_open(self):
+        return self._ws is not None and self._ws.is_open()
+
+    def connect(self):
+        """
+        Open the exec stream with a shell in the container and check the
+        shell runs by a no-op command
+
+        Raises:
+            ExecSessionUnavailable: if the stream can't be opened or the
+                container can't run the shell
+
+        """
+        self.close()
+        log.debug(f"Opening {self}")
+        try:
+            core_v1 = get_api_backend(self.kubeconfig).core_v1
+            self._ws = stream(
+                core_v1.connect_get_namespaced_pod_exec,
+                self.pod_name,
+                self.namespace,
+                container=self.container,
+                command=[SHELL],
+                stdin=True,
+                stdout=True,
+                stderr=True,
+                tty=False,
+                _preload_content=False,
+            )
+        except (ApiException, ConfigException, WebSocketException, OSError) as ex:
+            raise ExecSessionUnavailable(f"Can't open {self}: {ex}")
+        # the stream is opened even if the container has no shell, the server
+        # closes it only when the shell should start
+        try:
+            self._read_output(["true"], self._submit(["true"]), PROBE_TIMEOUT)
+        except (ExecSessionClosed, subprocess.TimeoutExpired) as ex:
+            raise ExecSessionUnavailable(
+                f"The container {self.container} of pod {self.pod_name} can't "
+                f"run {SHELL}: {ex}"
+            )
+
+    def close(self):
+        """
+        Close the exec stream
+        """
+        if self._ws is not None:
+            try:
+                self._ws.close()
+            except Exception as ex:
+                log.debug(f"Failed to close {self}: {ex}")
+            self._ws = None
+
+    def _submit(self, argv):
+        """
+        Write the command to the shell
+
+        Args:
+            argv (list): Command and its arguments
+
+        Returns:
+            str: end marker of the output of the command
+
+        Raises:
+            ExecSessionClosed: if the stream is closed, the command wasn't
+                submitted
+
+        """
+        marker = f"__ocs_ci_exec_{uuid.uuid4().hex}__"
+        # stdin of the command is detached so that it can't consume the next
+        # command written to the shell
+        script = (
+            f"( {shlex.join(argv)} ) </dev/null; "
+            f"printf '\\n{marker}%d\\n' $?; printf '\\n{marker}\\n' >&2\n"
+        )
+        try:
+            self._ws.write_stdin(script)
+        except (WebSocketException, OSError) as ex:
+            self.close()
+            raise ExecSessionClosed(f"{self} is closed: {ex}")
+        return marker
+
+    def _read_output(self, argv, marker, timeout):
+        """
+        Read the output of the submitted command up to its end markers
+
+        Args:
+            argv (list): Command and its arguments
+            marker (str): end marker of the output of the command
+            timeout (int): Timeout of the command in seconds
+
+        Returns:
+            tuple: (stdout, stderr, return code)
+
+        Raises:
+            ExecSessionClosed: if the stream was closed or failed
+            subprocess.TimeoutExpired: if the command didn't finish in time,
+                the session is closed in such case
+
+        """
+        stdout, stderr = "", ""
+        stdout_end = stderr_end = -1
+        deadline = time.time() + timeout
+        try:
+            while stdout_end < 0 or stderr_end < 0:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    self.close()
+                    raise subprocess.TimeoutExpired(argv, timeout)
+                if not self._ws.is_open():
+                    self.close()
+                    raise ExecSessionClosed(f"{self} was closed")
+                self._ws.update(timeout=min(remaining, 1))
+                if stdout_end < 0 and self._ws.peek_stdout():
+                    start = len(stdout)
+                    stdout += self._ws.read_stdout()
+                    stdout_end = _find_marker(stdout, marker, start)
+                if stderr_end < 0 and self._ws.peek_stderr():
+                    start = len(stderr)
+                    stderr += self._ws.read_stderr()
+                    stderr_end = _find_marker(stderr, marker, start)
+        except (WebSocketException, OSError) as ex:
+            self.close()
+            raise ExecSessionClosed(f"{self} failed: {ex}")
+        return_code = int(stdout[stdout_end + len(marker) + 1 :].split()[0])
+        return stdout[:stdout_end], stderr[:stderr_end], return_code
+
+    def run(self, argv, timeout=600):
+        """
+        Run the command in the session
+
+        Args:
+            argv (list): Command and its arguments, run without shell
+                interpretation in the same way as 'oc exec' does
+            timeout (int): Timeout of the command in seconds
+
+        Returns:
+            tuple: (stdout, stderr, return code)
+
+        Raises:
+            ExecSessionClosed: if the stream was closed before the command
+                was submitted, it's safe to re-run the command
+            ExecSessionUnavailable: if the stream can't be opened or the
+                container can't run the shell, the command wasn't run
+            CommandFailed: if the stream was closed after the command was
+                submitted, the command may have run
+            subprocess.TimeoutExpired: if the command didn't finish in time,
+                the session is closed in such case
+
+        """
+        if self.is_open:
+            # process pending close frame of the stream closed by the server
+            self._ws.update(timeout=0)
+        if not self.is_open:
+            self.connect()
+        marker = self._submit(argv)
+        try:
+            stdout, stderr, return_code = self._read_output(argv, marker, timeout)
+        except ExecSessionClosed as ex:
+            raise CommandFailed(
+                f"Exec stream to pod {self.pod_name} was closed while "
+                f"running: {shlex.join(argv)}: {ex}"
+            )
+        self.last_used = time.time()
+        self.commands_run += 1
+        return stdout, stderr, return_code
+
+
+def _find_marker(output, marker, start):
+    """
+    Find the complete end marker line in the output
+
+    Args:
+        output (str): Output read so far
+        marker (str): The end marker
+        start (int): Length of the output already searched
+
+    Returns:
+        int: index of the newline before the marker, -1 if the marker line
+            wasn't read completely yet
+
+    """
+    # search only the new data and the length of the marker line
+    index = output.find(f"\n{marker}", max(0, start - len(marker) - 16))
+    if index < 0 or output.find("\n", index + 1) < 0:
+        return -1
+    return index
+
+
+def _acquire_session(key):
+    idle_timeout = config.RUN.get("exec_session_idle_timeout", 300)
+    with _pool_lock:
+        sessions = _pool.setdefault(key, [])
+        while sessions:
+            session = sessions.pop()
+            if session.is_open and time.time() - session.last_used < idle_timeout:
+                return session
+            session.close()
+    return ExecSession(*key)
+
+
+def _release_session(key, session):
+    with _pool_lock:
+        sessions = _pool.setdefault(key, [])
+        if session.is_open and len(sessions) < MAX_IDLE_SESSIONS:
+            sessions.append(session)
+            return
+    session.close()
+
+
+def close_exec_sessions():
+    """
+    Close all the pooled sessions, called at the end of the session
+    """
+    with _pool_lock:
+        sessions = [session for values in _pool.values() for session in values]
+        _pool.clear()
+    for session in sessions:
+        session.close()
+
+
+def exec_in_pod(
+    kubeconfig,
+    namespace,
+    pod_name,
+    container,
+    command,
+    secrets=None,
+    timeout=600,
+    ignore_error=False,
+    silent=False,
+):
+    """
+    Run the command in the pod by a pooled exec session. Logging, masking of
+    secrets and errors are the same as in exec_cmd with 'oc exec'.
+
+    Args:
+        kubeconfig (str): Path to the kubeconfig of the cluster
+        namespace (str): Namespace of the pod
+        pod_name (str): Name of the pod
+        container (str): Name of the container
+        command (str): The command to execute
+        secrets (list): A list of secrets to be masked with asterisks
+        timeout (int): Timeout of the command in seconds
+        ignore_error (bool): True if ignore non zero return code and do not
+            raise the exception
+        silent (bool): If True will silent errors of the command
+
+    Returns:
+        str: stdout of the command with masked secrets
+
+    Raises:
+        CommandFailed: In case the command execution fails
+        ExecSessionUnavailable: if the session can't be opened, the command
+            wasn't run
+
+    """
+    argv = shlex.split(command)
+    masked_cmd = mask_secrets(
+        f"exec {pod_name} -n {namespace} -c {container} -- {shlex.join(argv)}",
+        secrets,
+    )
+    log.info(f"Executing command in exec session: {masked_cmd}")
+    key = (kubeconfig, namespace, pod_name, container)
+    session = _acquire_session(key)
+    try:
+        try:
+            stdout, stderr, return_code = session.run(argv, timeout=timeout)
+        except ExecSessionClosed as ex:
+            log.debug(f"{ex}, reconnecting")
+            stdout, stderr, return_code = session.run(argv, timeout=timeout)
+    finally:
+        _release_session(key, session)
+
+    masked_stdout = mask_secrets(stdout, secrets)
+    if masked_stdout:
+        log.debug(
+            f"Command stdout: {truncate_large_base64(truncate_long_lines(masked_stdout))}"
+        )
+    else:
+        log.debug("Command stdout is empty")
+    masked_stderr = mask_secrets(stderr, secrets)
+    if return_code:
+        # keep the message oc prints for failed commands
+        masked_stderr += f"\ncommand terminated with exit code {return_code}"
+    if masked_stderr.strip() and not silent:
+        log.warning(f"Command stderr: {truncate_large_base64(masked_stderr)}")
+    log.debug(f"Command return code: {return_code}")
+    if return_code and not ignore_error:
+        if "grep" in masked_cmd and return_code == 1:
+            log.info(f"No results found for grep command: {masked_cmd}")
+        else:
+            raise CommandFailed(
+                f"Error during execution of command: {masked_cmd}."
+                f"\nError is {bin_xml_escape(filter_out_emojis(masked_stderr))}"
+            )
+    return masked_stdout
@@ -0,0 +1,450 @@
+"""
+Concurrent Ceph health checks of all the clusters of the run
+
+ceph_health_check checks one cluster with its own retries, so provider/client
+and DR setups pay the retries of each cluster one after another between the
+tests. check_clusters_health checks all the clusters with Ceph (and the
+external cluster of multi storagecluster deployments) at once, each cluster in
+its own thread with the cluster context bound, see cluster_context. The known
+issues are recovered by ceph_health_recover in the thread of the cluster, the
+recovery steps of different clusters (crash archive, restart of the mons with
+slow ops, mute of the netsplit warning) touch only their own cluster, so they
+run in parallel. All the checks share one deadline and the result is a
+structured verdict per cluster.
+
+Usage:
+    report = check_clusters_health(timeout=600, fix_ceph_health=True)
+    report.raise_for_health()
+
+The health_checker fixture uses ceph_health_check_clusters instead of
+ceph_health_check when is_clusters_health_check() is True.
+"""
+
+import collections
+import functools
+import logging
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ocs_ci.framework import config
+from ocs_ci.ocs import constants
+from ocs_ci.ocs.cluster_context import get_cluster_contexts
+from ocs_ci.ocs.exceptions import (
+    CephHealthException,
+    CephHealthNotRecoveredException,
+    CephHealthRecoveredException,
+    CommandFailed,
+    NoRunningCephToolBoxException,
+)
+from ocs_ci.utility.utils import (
+    ceph_health_multi_storagecluster_external_base,
+    ceph_health_recover,
+    run_ceph_health_cmd,
+)
+
+log = logging.getLogger(__name__)
+
+EXTERNAL_CLUSTER = "external multi-storagecluster"
+# Cluster types without own Ceph cluster
+CLIENT_CLUSTER_TYPES = ("consumer", "client", "hci_client")
+
+ClusterHealthVerdict = collections.namedtuple(
+    "ClusterHealthVerdict",
+    [
+        "cluster",
+        "index",
+        "healthy",
+        "health",
+        "recovered",
+        "error",
+        "attempts",
+        "duration",
+        "not_recovered",
+    ],
+    # True if the recovery of the known issue failed
+    defaults=[False],
+)
+
+
+class ClusterHealthReport(object):
+    """
+    Verdicts of the health checks of the clusters
+    """
+
+    def __init__(self, verdicts):
+        """
+        Initializer function
+
+        Args:
+            verdicts (list): ClusterHealthVerdict objects
+
+        """
+        self.verdicts = verdicts
+
+    def __iter__(self):
+        return iter(self.verdicts)
+
+    def __repr__(self):
+        return f"ClusterHealthReport({self.summary()})"
+
+    @property
+    def healthy(self):
+        """
+        Returns:
+            bool: True if all the clusters are healthy
+
+        """
+        return all(verdict.healthy for verdict in self.verdicts)
+
+    def unhealthy(self):
+        """
+        Returns:
+            list: verdicts of the clusters which aren't healthy
+
+        """
+        return [verdict for verdict in self.verdicts if not verdict.healthy]
+
+    def recovered(self):
+        """
+        Returns:
+            list: verdicts of the clusters whose health was recovered
+
+        """
+        return [verdict for verdict in self.verdicts if verdict.recovered]
+
+    def summary(self):
+        """
+        Returns:
+            dict: health (or the error) per cluster name
+
+        """
+        return {
+            verdict.cluster: (
+                verdict.health.strip() if verdict.health else verdict.error
+            )
+            for verdict in self.verdicts
+        }
+
+    def raise_for_health(self):
+        """
+        Raises:
+            CephHealthNotRecoveredException: If the recovery of a known issue
+                failed on any of the clusters, as ceph_health_recover raises it
+            CephHealthException: If any of the clusters isn't healthy
+            CephHealthRecoveredException: If all the clusters are healthy, but
+                the health of some of them had to be recovered
+
+        """
+        unhealthy = self.unhealthy()
+        if unhealthy:
+            message = "Ceph health is not OK on clusters: " + "; ".join(
+                f"{verdict.cluster}: {verdict.error or verdict.health}"
+                for verdict in unhealthy
+            )
+            if any(verdict.not_recovered for verdict in unhealthy):
+                raise CephHealthNotRecoveredException(message)
+            raise CephHealthException(message)
+        recovered = [verdict for verdict in self.recovered() if verdict.error]
+        if recovered:
+            raise CephHealthRecoveredException(
+                "; ".join(
+                    f"{verdict.cluster}: {verdict.error}" for verdict in recovered
+                )
+            )
+
+
+def get_ceph_cluster_indexes():
+    """
+    Returns:
+        list: indexes of the clusters of the run with own Ceph cluster, ACM
+            hubs, clients and MCG only clusters are skipped
+
+    """
+    return [
+        index
+        for index, cluster in enumerate(config.clusters)
+        if not cluster.MULTICLUSTER.get("acm_cluster")
+        and cluster.ENV_DATA.get("cluster_type", "").lower() not in CLIENT_CLUSTER_TYPES
+        and not cluster.ENV_DATA.get("mcg_only_deployment")
+    ]
+
+
+def _wait_for_health(
+    name, index, check, deadline, delay, recover=None, expected_errors=()
+):
+    """
+    Repeat the health check until it passes or the deadline is reached
+
+    Args:
+        name (str): name of the cluster for the verdict
+        index (int): multicluster index of the cluster
+        check (callable): returns the health string, raises expected_errors
+            when the health can't be read
+        deadline (float): time.monotonic() deadline of the checks
+        delay (int): seconds between the attempts
+        recover (callable): called with the health which isn't OK, returns
+            the message of the recovery, raises CephHealthNotRecoveredException
+
+    Returns:
+        ClusterHealthVerdict: verdict of the cluster
+
+    """
+    start = time.monotonic()
+    attempts = 0
+    health = None
+
+    def verdict(healthy, recovered=False, error=None, not_recovered=False):
+        return ClusterHealthVerdict(
+            cluster=name,
+            index=index,
+            healthy=healthy,
+            health=health,
+            recovered=recovered,
+            error=error,
+            attempts=attempts,
+            duration=time.monotonic() - start,
+            not_recovered=not_recovered,
+        )
+
+    while True:
+        attempts += 1
+        try:
+            health = check()
+        except expected_errors as ex:
+            error = f"{type(ex).__name__}: {ex}"
+        else:
+            if health.strip().startswith("HEALTH_OK"):
+                log.info(f"Ceph health of {name} is HEALTH_OK")
+                return verdict(True)
+            error = f"Ceph cluster health is not OK. Health: {health}"
+            if recover:
+                try:
+                    return verdict(True, recovered=True, error=recover(health))
+                except CephHealthNotRecoveredException as ex:
+                    log.error(f"Ceph health of {name} not recovered: {ex}")
+                    return verdict(False, error=str(ex), not_recovered=True)
+        log.warning(f"Ceph health check of {name}, attempt {attempts}: {error}")
+        if time.monotonic() + delay > deadline:
+            return verdict(False, error=error)
+        time.sleep(delay)
+
+
+def _recover_health(health, namespace, update_jira, no_exception_if_jira_issue_updated):
+    try:
+        ceph_health_recover(
+            health,
+            namespace,
+            update_jira=update_jira,
+            no_exception_if_jira_issue_updated=no_exception_if_jira_issue_updated,
+        )
+    except CephHealthRecoveredException as ex:
+        return str(ex)
+    # the known issue was reported to Jira and the health was recovered
+    return None
+
+
+def check_cluster_health(
+    context,
+    deadline,
+    delay=30,
+    fix_ceph_health=False,
+    update_jira=True,
+    no_exception_if_jira_issue_updated=False,
+):
+    """
+    Check the Ceph health of one cluster, the cluster context has to be bound
+    to the current thread
+
+    Args:
+        context (ClusterContext): context of the cluster
+        deadline (float): time.monotonic() deadline of the check
+        delay (int): seconds between the attempts
+        fix_ceph_health (bool): If True, try to recover the known issues
+        update_jira (bool): If True, update the Jira issue of a known issue
+        no_exception_if_jira_issue_updated (bool): see ceph_health_recover
+
+    Returns:
+        ClusterHealthVerdict: verdict of the cluster
+
+    """
+    namespace = context.namespace
+    recover = None
+    if fix_ceph_health:
+        recover = functools.partial(
+            _recover_health,
+            namespace=namespace,
+            update_jira=update_jira,
+            no_exception_if_jira_issue_updated=no_exception_if_jira_issue_updated,
+        )
+    return _wait_for_health(
+        context.name,
+        context.index,
+        lambda: run_ceph_health_cmd(namespace, detail=True),
+        deadline,
+        delay,
+        recover=recover,
+        expected_errors=(
+            CommandFailed,
+            subprocess.TimeoutExpired,
+            NoRunningCephToolBoxException,
+        ),
+    )
+
+
+def check_clusters_health(
+    indexes=None,
+    timeout=600,
+    delay=30,
+    fix_ceph_health=False,
+    update_jira=True,
+    no_exception_if_jira_issue_updated=False,
+    include_external=None,
+):
+    """
+    Check the Ceph health of the clusters concurrently
+
+    The timeout bounds the retries of all the clusters together, a single
+    attempt can still take up to the timeout of the ceph health command.
+
+    Args:
+        indexes (list): multicluster indexes of the clusters to check, all the
+            clusters with Ceph by default
+        timeout (int): seconds to wait for all the clusters to be healthy
+        delay (int): seconds between the attempts on a cluster
+        fix_ceph_health (bool): If True, try to recover the known issues
+        update_jira (bool): If True, update the Jira issue of a known issue
+        no_exception_if_jira_issue_updated (bool): see ceph_health_recover
+        include_external (bool): check also the external cluster of multi
+            storagecluster deployment, by default if it's deployed
+
+    Returns:
+        ClusterHealthReport: verdicts of the clusters
+
+    """
+    if indexes is None:
+        indexes = get_ceph_cluster_indexes()
+    if include_external is None:
+        include_external = bool(config.DEPLOYMENT.get("multi_storagecluster"))
+    contexts = get_cluster_contexts(indexes)
+    deadline = time.monotonic() + timeout
+    log.info(
+        f"Checking Ceph health of clusters {[context.name for context in contexts]}"
+        f"{' and the external cluster' if include_external else ''} in parallel"
+    )
+
+    def check_bound(context):
+        with context.bind():
+            try:
+                return check_cluster_health(
+                    context,
+                    deadline,
+                    delay,
+                    fix_ceph_health,
+                    update_jira,
+                    no_exception_if_jira_issue_updated,
+                )
+            except Exception as ex:
+                log.exception(f"Ceph health check of {context.name} failed")
+                return ClusterHealthVerdict(
+                    cluster=context.name,
+                    index=context.index,
+                    healthy=False,
+                    health=None,
+                    recovered=False,
+                    error=f"{type(ex).__name__}: {ex}",
+                    attempts=0,
+                    duration=0.0,
+                )
+
+    def check_external():
+        def read_health():
+            try:
+                ceph_health_multi_storagecluster_external_base()
+            except CephHealthException as ex:
+                return str(ex)
+            return "HEALTH_OK"
+
+        return _wait_for_health(
+            EXTERNAL_CLUSTER,
+            None,
+            read_health,
+            deadline,
+            delay,
+            expected_errors=(CommandFailed,),
+        )
+
+    workers = len(contexts) + int(include_external)
+    if not workers:
+        return ClusterHealthReport([])
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(check_bound, context) for context in contexts]
+        if include_external:
+            futures.append(executor.submit(check_external))
+        report = ClusterHealthReport([future.result() for future in futures])
+    log.info(f"Ceph health of the clusters: {report.summary()}")
+    return report
+
+
+def is_clusters_health_check():
+    """
+    Returns:
+        bool: True if the health of more than the current cluster has to be
+            checked, i.e. multicluster run (provider/client, DR) with Ceph or
+            multi storagecluster deployment with the external cluster
+
+    """
+    if config.DEPLOYMENT.get("multi_storagecluster"):
+        return True
+    return bool(config.multicluster and get_ceph_cluster_indexes())
+
+
+def ceph_health_check_clusters(
+    tries=20,
+    delay=30,
+    fix_ceph_health=False,
+    update_jira=True,
+    no_exception_if_jira_issue_updated=False,
+    indexes=None,
+    include_external=None,
+):
+    """
+    Check the Ceph health of all the clusters concurrently, the counterpart
+    of ceph_health_check for multicluster runs
+
+    Args:
+        tries (int): number of the attempts on every cluster, tries * delay
+            is the deadline of all the clusters
+        delay (int): seconds between the attempts on a cluster
+        fix_ceph_health (bool): If True, try to recover the known issues
+        update_jira (bool): If True, update the Jira issue of a known issue
+        no_exception_if_jira_issue_updated (bool): see ceph_health_recover
+        indexes (list): multicluster indexes of the clusters to check, all the
+            clusters with Ceph by default
+        include_external (bool): check also the external cluster of multi
+            storagecluster deployment, by default if it's deployed
+
+    Returns:
+        bool: True if all the clusters are healthy
+
+    Raises:
+        CephHealthNotRecoveredException: If the recovery of a known issue
+            failed on any of the clusters
+        CephHealthException: If any of the clusters isn't healthy
+        CephHealthRecoveredException: If the health of some of the clusters
+            had to be recovered
+
+    """
+    if config.ENV_DATA.get("platform", "").lower() == constants.IBM_POWER_PLATFORM:
+        delay = 60
+    report = check_clusters_health(
+        indexes=indexes,
+        timeout=tries * delay,
+        delay=delay,
+        fix_ceph_health=fix_ceph_health,
+        update_jira=update_jira,
+        no_exception_if_jira_issue_updated=no_exception_if_jira_issue_updated,
+        include_external=include_external,
+    )
+    report.raise_for_health()
+    return True
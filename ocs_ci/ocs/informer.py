@@ -0,0 +1,438 @@
+"""
+Watch-backed shared informer cache
+
+Waiting for resources used to re-list the whole kind with 'oc get' on every
+sleep tick, plus one more 'oc get' per item. A SharedInformer does a single
+LIST followed by a WATCH for a (cluster, kind, namespace) and keeps the objects
+in an in-memory store, so reads are served from memory and waiters are woken
+up by watch events instead of sleeping fixed intervals.
+
+Writes done through the OCP object invalidate the informers of the cluster,
+and the next read re-lists the store synchronously, so a test always reads
+its own writes. Enable with ``RUN['informer_cache']``.
+"""
+
+import copy
+import logging
+import re
+import threading
+import time
+
+from kubernetes import watch as k8s_watch
+from kubernetes.client.rest import ApiException
+from openshift.dynamic.exceptions import DynamicApiError
+from urllib3.exceptions import HTTPError
+
+from ocs_ci.framework import config
+from ocs_ci.ocs.api_backend import get_api_backend
+
+log = logging.getLogger(__name__)
+
+# Timeout of a single watch request, the watch is restarted afterwards
+WATCH_TIMEOUT = 300
+# Delay before re-establishing a broken watch
+WATCH_RETRY_DELAY = 3
+
+_informers = {}
+_informers_lock = threading.Lock()
+
+
+def is_informer_cache_enabled():
+    """
+    Returns:
+        bool: True if reads and waits should be served by informers
+
+    """
+    return bool(config.RUN.get("informer_cache"))
+
+
+def get_informer(kubeconfig, kind, namespace=None, all_namespaces=False):
+    """
+    Get the shared informer for the (cluster, kind, namespace), start it if
+    it doesn't exist yet.
+
+    Args:
+        kubeconfig (str): Path to the kubeconfig of the cluster
+        kind (str): Kind of the resource as accepted by oc
+        namespace (str): Namespace to watch
+        all_namespaces (bool): Watch the kind in all namespaces
+
+    Returns:
+        SharedInformer: started informer
+
+    Raises:
+        APIBackendNotSupported: if the kind can't be resolved
+
+    """
+    backend = get_api_backend(kubeconfig)
+    resource = backend.resolve(kind)
+    if not resource.namespaced or all_namespaces:
+        namespace = None
+    elif not namespace:
+        namespace = backend.default_namespace
+    key = (kubeconfig, resource.group, resource.name, namespace)
+    with _informers_lock:
+        informer = _informers.get(key)
+        if informer is None or informer.stopped:
+            informer = SharedInformer(backend, resource, namespace)
+            informer.start()
+            _informers[key] = informer
+        return informer
+
+
+def invalidate_informers(kubeconfig=None):
+    """
+    Mark informers stale so that the next read re-lists the objects.
+    Called after every write to provide read-your-writes semantics.
+
+    Args:
+        kubeconfig (str): Invalidate only informers of this cluster
+
+    """
+    with _informers_lock:
+        informers = list(_informers.items())
+    for key, informer in informers:
+        if kubeconfig is None or key[0] == kubeconfig:
+            informer.invalidate()
+
+
+def stop_informers():
+    """
+    Stop all running informers, called at the end of the session
+    """
+    with _informers_lock:
+        informers = list(_informers.values())
+        _informers.clear()
+    for informer in informers:
+        informer.stop()
+
+
+def _split_selector(selector):
+    """
+    Split selector by commas which are not inside of parentheses
+    """
+    return [
+        requirement.strip()
+        for requirement in re.split(r",(?![^()]*\))", selector)
+        if requirement.strip()
+    ]
+
+
+def match_label_selector(labels, selector):
+    """
+    Check whether the labels match the label selector
+
+    Supports the same syntax as the API server: 'key', '!key', 'key=value',
+    'key==value', 'key!=value', 'key in (a,b)' and 'key notin (a,b)'.
+
+    Args:
+        labels (dict): Labels of the object
+        selector (str): Label selector
+
+    Returns:
+        bool: True if all the requirements of the selector are met
+
+    """
+    labels = labels or {}
+    for requirement in _split_selector(selector or ""):
+        set_match = re.fullmatch(r"(\S+)\s+(in|notin)\s+\((.*)\)", requirement)
+        if set_match:
+            key, operator, values = set_match.groups()
+            values = {value.strip() for value in values.split(",")}
+            if operator == "in" and labels.get(key) not in values:
+                return False
+            if operator == "notin" and key in labels and labels[key] in values:
+                return False
+        elif "!=" in requirement:
+            key, value = [part.strip() for part in requirement.split("!=", 1)]
+            if labels.get(key) == value:
+                return False
+        elif "=" in requirement:
+            key, value = [
+                part.strip() for part in re.split(r"==?", requirement, maxsplit=1)
+            ]
+            if labels.get(key) != value:
+                return False
+        elif requirement.startswith("!"):
+            if requirement[1:].strip() in labels:
+                return False
+        elif requirement not in labels:
+            return False
+    return True
+
+
+def match_field_selector(obj, field_selector):
+    """
+    Check whether the object matches the field selector, e.g.
+    'status.phase=Running,spec.nodeName!=node1'
+
+    Args:
+        obj (dict): Object data
+        field_selector (str): Field selector
+
+    Returns:
+        bool: True if all the requirements of the selector are met
+
+    """
+    for requirement in _split_selector(field_selector or ""):
+        negate = "!=" in requirement
+        path, value = [
+            part.strip() for part in re.split(r"!=|==?", requirement, maxsplit=1)
+        ]
+        current = obj
+        for key in path.split("."):
+            current = current.get(key) if isinstance(current, dict) else None
+        current = "" if current is None else str(current)
+        if (current == value) == negate:
+            return False
+    return True
+
+
+def _is_older(obj, current):
+    """
+    Compare resource versions of two revisions of the same object
+
+    Returns:
+        bool: True if obj is older than current, False if it is newer or the
+            resource versions aren't comparable
+
+    """
+    new_version = obj["metadata"].get("resourceVersion", "")
+    current_version = current["metadata"].get("resourceVersion", "")
+    if new_version.isdigit() and current_version.isdigit():
+        return int(new_version) < int(current_version)
+    return False
+
+
+class SharedInformer(object):
+    """
+    LIST+WATCH based in-memory store of the objects of one kind
+    """
+
+    def __init__(self, backend, resource, namespace=None):
+        """
+        Initializer function
+
+        Args:
+            backend (KubeAPIBackend): API backend of the cluster
+            resource (openshift.dynamic.Resource): Watched resource
+            namespace (str): Watched namespace, None for all namespaces
+
+        """
+        self.backend = backend
+        self.resource = resource
+        self.namespace = namespace
+        self.generation = 0
+        self.stopped = False
+        self._store = {}
+        self._resource_version = None
+        self._stale = True
+        self._condition = threading.Condition()
+        self._listeners = []
+        self._watcher = None
+        self._thread = None
+
+    def __repr__(self):
+        return (
+            f"SharedInformer({self.resource.kind}, namespace={self.namespace}, "
+            f"objects={len(self._store)})"
+        )
+
+    def start(self):
+        """
+        Do the initial LIST and start the WATCH thread
+        """
+        self.resync()
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"informer-{self.resource.name}-{self.namespace}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop the WATCH thread
+        """
+        self.stopped = True
+        if self._watcher:
+            self._watcher.stop()
+        with self._condition:
+            self._condition.notify_all()
+
+    def invalidate(self):
+        """
+        Mark the store stale, the next read re-lists the objects
+        """
+        with self._condition:
+            self._stale = True
+
+    def resync(self):
+        """
+        Replace the content of the store with a fresh LIST
+        """
+        response = self.backend._request(
+            f"list {self.resource.kind} -n {self.namespace}",
+            self.resource.get,
+            namespace=self.namespace,
+        ).to_dict()
+        with self._condition:
+            self._store = {}
+            for item in response.get("items", []):
+                item.setdefault("apiVersion", self.resource.group_version)
+                item.setdefault("kind", self.resource.kind)
+                self._store[self._key(item)] = item
+            self._resource_version = response["metadata"]["resourceVersion"]
+            self._stale = False
+            self.generation += 1
+            self._condition.notify_all()
+        self._notify_listeners()
+
+    @staticmethod
+    def _key(item):
+        metadata = item["metadata"]
+        return metadata.get("namespace"), metadata["name"]
+
+    def _ensure_fresh(self):
+        if self._stale:
+            self.resync()
+
+    def _run(self):
+        while not self.stopped:
+            try:
+                if self._stale:
+                    self.resync()
+                self._watcher = k8s_watch.Watch()
+                for event in self.backend.dynamic_client.watch(
+                    self.resource,
+                    namespace=self.namespace,
+                    resource_version=self._resource_version,
+                    timeout=WATCH_TIMEOUT,
+                    watcher=self._watcher,
+                ):
+                    self._handle_event(event)
+                    if self.stopped:
+                        break
+            except (DynamicApiError, ApiException, HTTPError) as ex:
+                # 410 Gone means our resource version is too old to continue
+                log.debug(f"Watch of {self} interrupted, re-listing: {ex}")
+                self.invalidate()
+                time.sleep(WATCH_RETRY_DELAY)
+            except Exception:
+                log.exception(f"Unexpected error in watch of {self}")
+                self.invalidate()
+                time.sleep(WATCH_RETRY_DELAY)
+
+    def _handle_event(self, event):
+        obj = event["raw_object"]
+        if event["type"] == "ERROR":
+            raise ApiException(status=obj.get("code"), reason=obj.get("message"))
+        with self._condition:
+            self._resource_version = obj["metadata"]["resourceVersion"]
+            if event["type"] == "BOOKMARK":
+                return
+            obj.setdefault("apiVersion", self.resource.group_version)
+            obj.setdefault("kind", self.resource.kind)
+            current = self._store.get(self._key(obj))
+            if current is not None and _is_older(obj, current):
+                # event replayed after a re-list which already has newer data
+                return
+            if event["type"] == "DELETED":
+                self._store.pop(self._key(obj), None)
+            else:
+                self._store[self._key(obj)] = obj
+            self.generation += 1
+            self._condition.notify_all()
+        self._notify_listeners()
+
+    def add_listener(self, callback):
+        """
+        Register callback called from the watch thread on every change of the
+        store, e.g. AdaptiveTimeoutSampler.wakeup
+
+        Args:
+            callback (function): Callback without arguments, has to be fast
+
+        """
+        with self._condition:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        """
+        Unregister callback registered by add_listener
+
+        Args:
+            callback (function): The registered callback
+
+        """
+        with self._condition:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def _notify_listeners(self):
+        with self._condition:
+            listeners = list(self._listeners)
+        for callback in listeners:
+            try:
+                callback()
+            except Exception:
+                log.exception(f"Listener {callback} of {self} failed")
+
+    def get(self, name, namespace=None):
+        """
+        Get the object from the store
+
+        Args:
+            name (str): Name of the object
+            namespace (str): Namespace of the object
+
+        Returns:
+            dict: copy of the object, None if it isn't in the store
+
+        """
+        self._ensure_fresh()
+        namespace = namespace if self.resource.namespaced else None
+        with self._condition:
+            obj = self._store.get((namespace or self.namespace, name))
+            return copy.deepcopy(obj) if obj is not None else None
+
+    def list(self, selector=None, field_selector=None):
+        """
+        List objects from the store
+
+        Args:
+            selector (str): The label selector to filter with
+            field_selector (str): The field selector to filter with
+
+        Returns:
+            list: copies of the matching objects
+
+        """
+        self._ensure_fresh()
+        with self._condition:
+            items = [
+                obj
+                for obj in self._store.values()
+                if match_label_selector(obj["metadata"].get("labels"), selector)
+                and match_field_selector(obj, field_selector)
+            ]
+            return copy.deepcopy(items)
+
+    def wait_for_change(self, generation, timeout):
+        """
+        Block until the store changes after the given generation
+
+        Args:
+            generation (int): Generation seen by the caller
+            timeout (float): Maximum time to wait in seconds
+
+        Returns:
+            int: current generation of the store
+
+        """
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self.generation != generation or self.stopped,
+                timeout=timeout,
+            )
+            return self.generation
@@ -0,0 +1,345 @@
+"""
+Bounded-parallel harvesting of the pod and node logs
+
+The log collection helpers used to download the logs one pod or node at a
+time, while delete_objs_parallel-like helpers start a thread per object. The
+LogHarvester runs the 'oc' commands of the log jobs in one shared pool of
+threads of the configured size and limits the rate of the commands started
+against every cluster (token bucket per cluster index), so a collection from
+hundreds of pods neither takes ages nor floods the API server. The output of
+every command is spooled by exec_oc_cmd_stream and streamed straight to a
+gzip compressed file, the logs are never held in memory. Failed jobs are
+retried.
+
+Usage:
+    harvester = get_log_harvester()
+    files = harvester.harvest(
+        [pod_logs_job(pod_obj.name, log_dir, namespace=pod_obj.namespace)]
+    )
+"""
+
+import gzip
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ocs_ci.framework import config
+from ocs_ci.ocs.exceptions import CommandFailed
+from ocs_ci.ocs.ocp import OCP
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 8
+DEFAULT_RETRIES = 2
+DEFAULT_RETRY_DELAY = 5
+LOG_SUFFIX = ".log.gz"
+
+_harvester = None
+_harvester_lock = threading.Lock()
+
+
+class RateLimiter(object):
+    """
+    Token bucket limiting the rate of the commands
+    """
+
+    def __init__(self, rate, burst=None):
+        """
+        Initializer function
+
+        Args:
+            rate (float): commands per second
+            burst (int): commands which can be started at once, rate by
+                default
+
+        """
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Wait for a token
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class HarvestJob(object):
+    """
+    'oc' command whose output is saved to a compressed file
+    """
+
+    def __init__(self, name, command, file_path, namespace=None, timeout=600):
+        """
+        Initializer function
+
+        Args:
+            name (str): name of the job, e.g. the pod or node name
+            command (str): 'oc' command without the initial 'oc'
+            file_path (str): path of the gzip compressed output
+            namespace (str): namespace of the command
+            timeout (int): timeout of the command in seconds
+
+        """
+        self.name = name
+        self.command = command
+        self.file_path = file_path
+        self.namespace = namespace
+        self.timeout = timeout
+
+    def __repr__(self):
+        return f"HarvestJob({self.name}, {self.command})"
+
+
+def pod_logs_job(
+    pod_name,
+    log_dir,
+    namespace=None,
+    container=None,
+    all_containers=False,
+    previous=False,
+    file_name=None,
+):
+    """
+    Args:
+        pod_name (str): name of the pod
+        log_dir (str): directory of the log file
+        namespace (str): namespace of the pod, the cluster namespace by
+            default
+        container (str): name of the container
+        all_containers (bool): fetch logs from all containers of the pod
+        previous (bool): True, if pod previous log required
+        file_name (str): name of the log file, <namespace>_<pod_name>.log.gz
+            by default
+
+    Returns:
+        HarvestJob: job named <namespace>_<pod_name> saving the logs of the
+            pod, the namespace tells apart the pods of the same name
+
+    """
+    namespace = namespace or config.ENV_DATA["cluster_namespace"]
+    name = f"{namespace}_{pod_name}"
+    cmd = f"logs {pod_name}"
+    if container:
+        cmd += f" -c {container}"
+    if previous:
+        cmd += " --previous"
+    if all_containers:
+        cmd += " --all-containers=true"
+    return HarvestJob(
+        name,
+        cmd,
+        os.path.join(log_dir, file_name or f"{name}{LOG_SUFFIX}"),
+        namespace=namespace,
+    )
+
+
+def node_logs_job(node_name, log_dir, file_name=None):
+    """
+    Args:
+        node_name (str): name of the node
+        log_dir (str): directory of the log file
+        file_name (str): name of the log file, <node_name>.log.gz by default
+
+    Returns:
+        HarvestJob: job saving the output of 'dmesg' run on the node
+
+    """
+    return HarvestJob(
+        node_name,
+        f'debug nodes/{node_name} --to-namespace=default -- chroot /host /bin/bash -c "dmesg"',
+        os.path.join(log_dir, file_name or f"{node_name}{LOG_SUFFIX}"),
+        timeout=300,
+    )
+
+
+class LogHarvester(object):
+    """
+    Shared pool of threads saving the logs of the harvest jobs
+    """
+
+    def __init__(
+        self,
+        workers=DEFAULT_WORKERS,
+        rate_limit=None,
+        retries=DEFAULT_RETRIES,
+        retry_delay=DEFAULT_RETRY_DELAY,
+    ):
+        """
+        Initializer function
+
+        Args:
+            workers (int): maximum number of the concurrent commands
+            rate_limit (float): maximum number of the commands started per
+                second against one cluster, no limit if None
+            retries (int): number of the retries of a failed job
+            retry_delay (int): seconds to wait before a retry
+
+        """
+        self.workers = max(1, workers)
+        self.rate_limit = rate_limit
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self._limiters = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="log-harvester"
+        )
+
+    def _get_limiter(self, cluster_index):
+        if not self.rate_limit:
+            return None
+        with self._lock:
+            if cluster_index not in self._limiters:
+                self._limiters[cluster_index] = RateLimiter(self.rate_limit)
+            return self._limiters[cluster_index]
+
+    def _save(self, job):
+        log_dir = os.path.dirname(job.file_path)
+        os.makedirs(log_dir, exist_ok=True)
+        ocp_obj = OCP(namespace=job.namespace)
+        # unique temporary file, the jobs never share it even if they write
+        # the same log file
+        fd, tmp_path = tempfile.mkstemp(dir=log_dir, suffix=".tmp")
+        try:
+            with (
+                os.fdopen(fd, "wb") as tmp_file,
+                ocp_obj.exec_oc_cmd_stream(
+                    job.command, timeout=job.timeout, silent=True
+                ) as completed_process,
+                completed_process.stdout.open() as src,
+                gzip.GzipFile(fileobj=tmp_file, mode="wb") as dst,
+            ):
+                shutil.copyfileobj(src, dst)
+            # mkstemp creates the file readable only by the owner
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, job.file_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return job.file_path
+
+    def _run(self, job, cluster_index):
+        limiter = self._get_limiter(cluster_index)
+        with config.bind_ctx(cluster_index):
+            for attempt in range(self.retries + 1):
+                if limiter:
+                    limiter.acquire()
+                try:
+                    return self._save(job)
+                except (CommandFailed, subprocess.TimeoutExpired) as err:
+                    if attempt == self.retries:
+                        raise
+                    logger.warning(
+                        f"Failed to harvest logs of {job.name} (attempt "
+                        f"{attempt + 1}/{self.retries + 1}): {err}"
+                    )
+                    time.sleep(self.retry_delay)
+
+    def submit(self, job):
+        """
+        Queue the job, it runs against the cluster of the current context
+
+        Args:
+            job (HarvestJob): the job
+
+        Returns:
+            concurrent.futures.Future: future of the path of the log file
+
+        """
+        return self._executor.submit(self._run, job, config.cur_index)
+
+    def harvest(self, jobs):
+        """
+        Run the jobs and wait for them
+
+        Args:
+            jobs (list): HarvestJob objects
+
+        Returns:
+            dict: job name as key, path of the compressed log file as value,
+                the failed jobs are logged and left out
+
+        """
+        futures = [(job, self.submit(job)) for job in jobs]
+        files = {}
+        for job, future in futures:
+            try:
+                files[job.name] = future.result()
+            except Exception as err:
+                logger.error(f"Failed to harvest logs of {job.name}: {err}")
+        logger.info(f"Harvested logs of {len(files)}/{len(futures)} jobs")
+        return files
+
+    def shutdown(self, wait=True):
+        """
+        Stop the threads of the harvester
+
+        Args:
+            wait (bool): wait for the queued jobs
+
+        """
+        self._executor.shutdown(wait=wait)
+
+
+def get_log_harvester():
+    """
+    Returns:
+        LogHarvester: harvester of the run, created with the workers, rate
+            limit and retries from the RUN section of the config
+
+    """
+    global _harvester
+    with _harvester_lock:
+        if _harvester is None:
+            _harvester = LogHarvester(
+                workers=config.RUN.get("log_harvest_workers", DEFAULT_WORKERS),
+                rate_limit=config.RUN.get("log_harvest_rate_limit"),
+                retries=config.RUN.get("log_harvest_retries", DEFAULT_RETRIES),
+            )
+        return _harvester
+
+
+def read_log_file(file_path):
+    """
+    Args:
+        file_path (str): path of the compressed log file
+
+    Returns:
+        str: content of the log file
+
+    """
+    with gzip.open(file_path, "rt", errors="replace") as f:
+        return f.read()
+
+
+def iter_log_file(file_path):
+    """
+    Args:
+        file_path (str): path of the compressed log file
+
+    Yields:
+        str: lines of the log file
+
+    """
+    with gzip.open(file_path, "rt", errors="replace") as f:
+        yield from f
@@ -51,6 +51,7 @@ from ocs_ci.ocs.resources.pod import (
     get_mon_pods,
     pod_resource_utilization_raw_output_from_adm_top,
 )
+from ocs_ci.ocs.ceph_snapshot import get_ceph_snapshot
 from ocs_ci.ocs.cluster import (
     CephCluster,
     get_osd_utilization,
@@ -680,6 +681,7 @@ class Longevity(object):
 
         if disk_utilization:
             cluster_sanity_check_dict["disk_utilization"] = {}
+            get_ceph_snapshot().prefetch(["osd_df", "df"])
             # Get OSD utilization
             osd_filled_dict = get_osd_utilization()
             log.info(f"OSD Utilization: {osd_filled_dict}")
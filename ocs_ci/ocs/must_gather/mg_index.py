@@ -0,0 +1,291 @@
+"""
+Single pass index of a must-gather tree
+
+The validations of MustGather used to walk the whole must-gather directory
+for every expected file and again for every check, which takes minutes on a
+big must-gather. MustGatherIndex scans the tree once with os.scandir (and the
+member lists of the tarballs in it, streamed without extracting them) and
+keeps the names, sizes and types of the entries, so the validations are
+dictionary and set lookups against the index.
+
+Usage:
+    index = MustGatherIndex(root)
+    missing = index.missing_substrings(["/ceph_logs/journal_"])
+"""
+
+import logging
+import os
+import re
+import tarfile
+
+logger = logging.getLogger(__name__)
+
+# Number of the first bytes of a file kept as its signature
+SIGNATURE_SIZE = 64
+
+
+class IndexEntry(object):
+    """
+    Entry of the must-gather index
+    """
+
+    __slots__ = ("path", "name", "is_dir", "size", "in_tarball")
+
+    def __init__(self, path, name, is_dir, size, in_tarball=False):
+        self.path = path
+        self.name = name
+        self.is_dir = is_dir
+        self.size = size
+        self.in_tarball = in_tarball
+
+    def __repr__(self):
+        return f"IndexEntry({self.path!r}, size={self.size})"
+
+
+class MustGatherIndex(object):
+    """
+    Index of the files and directories of a must-gather tree
+    """
+
+    def __init__(self, root, include_tarballs=True):
+        """
+        Initializer function, the tree is scanned at once
+
+        Args:
+            root (str): root directory of the must-gather
+            include_tarballs (bool): index also the members of the .tar.gz
+                archives found in the tree
+
+        """
+        self.root = root
+        self.entries = []
+        self._by_name = {}
+        self._children = {}
+        self._signatures = {}
+        self._joined_paths = None
+        self._scan(root)
+        if include_tarballs:
+            for entry in [e for e in self.entries if e.name.endswith(".tar.gz")]:
+                self.add_tarball(entry.path)
+        logger.info(f"Indexed {len(self.entries)} must-gather entries under {root}")
+
+    def _add(self, entry):
+        self.entries.append(entry)
+        self._by_name.setdefault(entry.name, []).append(entry)
+        self._joined_paths = None
+
+    def _scan(self, root):
+        # depth first in the order of os.walk: the files of a directory are
+        # indexed before its subdirectories
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            subdirectories = []
+            children = []
+            try:
+                with os.scandir(directory) as iterator:
+                    for dir_entry in iterator:
+                        # a symlinked directory is indexed as a directory,
+                        # but not descended into, as os.walk doesn't follow
+                        # the links, so a link cycle can't loop forever
+                        is_dir = dir_entry.is_dir(follow_symlinks=True)
+                        descend = is_dir and not dir_entry.is_symlink()
+                        try:
+                            size = 0 if is_dir else dir_entry.stat().st_size
+                        except OSError:
+                            size = 0
+                        entry = IndexEntry(dir_entry.path, dir_entry.name, is_dir, size)
+                        children.append(entry)
+                        if descend:
+                            subdirectories.append(dir_entry.path)
+            except OSError as ex:
+                logger.warning(f"Can't scan {directory}: {ex}")
+                continue
+            self._children[directory] = children
+            for entry in children:
+                self._add(entry)
+            stack.extend(reversed(subdirectories))
+
+    def add_tarball(self, tarball_path):
+        """
+        Index the member paths of the archive, the archive is streamed
+        without extracting it. The parent directories of the members are
+        indexed as well.
+
+        Args:
+            tarball_path (str): path to the .tar.gz file
+
+        Returns:
+            list: the indexed member paths
+
+        """
+        paths = []
+        seen = set()
+        try:
+            with tarfile.open(tarball_path, "r|*") as tar:
+                for member in tar:
+                    name = member.name.replace("\\", "/")
+                    parts = name.split("/")
+                    for i in range(1, len(parts)):
+                        parent = "/".join(parts[:i])
+                        if parent and parent not in seen:
+                            seen.add(parent)
+                            paths.append(parent)
+                            self._add(IndexEntry(parent, parts[i - 1], True, 0, True))
+                    if name not in seen:
+                        seen.add(name)
+                        paths.append(member.name)
+                        self._add(
+                            IndexEntry(
+                                member.name,
+                                parts[-1],
+                                member.isdir(),
+                                member.size,
+                                True,
+                            )
+                        )
+        except (tarfile.TarError, OSError) as e:
+            logger.warning(f"Could not read tarball {tarball_path}: {e}")
+        return paths
+
+    def find(self, name):
+        """
+        Args:
+            name (str): file name
+
+        Returns:
+            str: path of the first file with the name on the disk, None if
+                there isn't any
+
+        """
+        for entry in self._by_name.get(name, []):
+            if not entry.is_dir and not entry.in_tarball:
+                return entry.path
+        return None
+
+    def find_all(self, names):
+        """
+        Args:
+            names (list): file names
+
+        Returns:
+            tuple: dict of the found names to their paths and list of the
+                names which weren't found
+
+        """
+        found = {}
+        missing = []
+        for name in names:
+            path = self.find(name)
+            if path is None:
+                missing.append(name)
+            else:
+                found[name] = path
+        return found, missing
+
+    def files(self, pattern=None):
+        """
+        Args:
+            pattern (str): regular expression searched in the file names
+
+        Returns:
+            list: entries of the files on the disk
+
+        """
+        regex = re.compile(pattern) if pattern else None
+        return [
+            entry
+            for entry in self.entries
+            if not entry.is_dir
+            and not entry.in_tarball
+            and (regex is None or regex.search(entry.name))
+        ]
+
+    def directories(self, pattern):
+        """
+        Args:
+            pattern (str): regular expression searched in the directory paths
+
+        Returns:
+            list: paths of the directories on the disk
+
+        """
+        regex = re.compile(pattern)
+        return [
+            entry.path
+            for entry in self.entries
+            if entry.is_dir and not entry.in_tarball and regex.search(entry.path)
+        ]
+
+    def list_dir(self, directory):
+        """
+        Args:
+            directory (str): path of an indexed directory
+
+        Returns:
+            list: names in the directory
+
+        """
+        return [entry.name for entry in self._children.get(directory, [])]
+
+    def empty_files(self):
+        """
+        Returns:
+            list: entries of the empty files on the disk
+
+        """
+        return [entry for entry in self.files() if entry.size == 0]
+
+    def all_paths(self):
+        """
+        Returns:
+            list: paths of all the entries, on the disk and in the tarballs
+
+        """
+        return [entry.path for entry in self.entries]
+
+    def missing_substrings(self, substrings):
+        """
+        Args:
+            substrings (list): parts of paths, e.g. '/ceph_logs/journal_'
+
+        Returns:
+            list: the substrings which aren't part of any indexed path
+
+        """
+        if self._joined_paths is None:
+            # paths never contain a new line, a match in the joined string is
+            # a match in one of the paths
+            self._joined_paths = "\n".join(self.all_paths())
+        return [
+            substring for substring in substrings if substring not in self._joined_paths
+        ]
+
+    def present_substrings(self, substrings):
+        """
+        Args:
+            substrings (list): parts of paths
+
+        Returns:
+            list: the substrings which are part of some indexed path
+
+        """
+        missing = set(self.missing_substrings(substrings))
+        return [substring for substring in substrings if substring not in missing]
+
+    def signature(self, path):
+        """
+        Args:
+            path (str): path of a file on the disk
+
+        Returns:
+            bytes: the first bytes of the file, read once and cached
+
+        """
+        if path not in self._signatures:
+            try:
+                with open(path, "rb") as f:
+                    self._signatures[path] = f.read(SIGNATURE_SIZE)
+            except OSError:
+                self._signatures[path] = b""
+        return self._signatures[path]
@@ -0,0 +1,392 @@
+"""
+Background scheduler of the must-gather collections of the failed tests
+
+pytest_runtest_makereport used to collect the must-gather of every failed test
+synchronously, so a burst of failures meant several long collections in a row
+blocking the suite, mostly gathering the same logs again. The
+MustGatherScheduler queues the collection requests and runs them in background
+threads. A request waiting in the queue is merged with a new one when their
+log windows (since time of the test up to its failure) overlap, the merged
+collection covers the union of the windows and the log types of the requests
+and is tagged with all the affected tests in mg_collections.json of the
+directory of the failed test logs. The number of the concurrent collections
+and the disk space used by the collected logs are limited by the config, the
+scheduler is flushed at the end of the session.
+
+Usage:
+    scheduler = get_mg_scheduler()
+    scheduler.submit(item.name, since=start_time, ocs=True)
+    scheduler.flush()
+"""
+
+import datetime
+import json
+import logging
+import os
+import threading
+import time
+
+from ocs_ci.framework import config
+from ocs_ci.ocs import defaults, utils
+
+log = logging.getLogger(__name__)
+
+COLLECTIONS_FILE = "mg_collections.json"
+SINCE_TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_dir_size(path):
+    """
+    Args:
+        path (str): directory
+
+    Returns:
+        int: size of the files in the directory tree in bytes
+
+    """
+    size = 0
+    stack = [path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as iterator:
+                for entry in iterator:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        size += entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            continue
+    return size
+
+
+def get_mg_timeout():
+    """
+    Returns:
+        int: timeout of the next collection, extended by 20 minutes for every
+            failed collection of the run
+
+    """
+    adjusted_timeout = utils.mg_fail_count * 1200
+    return config.REPORTING.get(
+        "must_gather_timeout", defaults.MUST_GATHER_TIMEOUT + adjusted_timeout
+    )
+
+
+class MustGatherRequest(object):
+    """
+    Request for the must-gather collection of one or more failed tests
+    """
+
+    def __init__(
+        self, test_name, since=None, until=None, ocp=False, ocs=True, mcg=False
+    ):
+        """
+        Initializer function
+
+        Args:
+            test_name (str): name of the failed test
+            since (datetime.datetime): UTC start of the log window, None for
+                all the logs
+            until (datetime.datetime): UTC end of the log window, now by
+                default
+            ocp (bool): Whether to gather OCP logs
+            ocs (bool): Whether to gather OCS logs
+            mcg (bool): Whether to gather MCG logs
+
+        """
+        self.tests = [test_name]
+        self.since = since
+        self.until = until or datetime.datetime.utcnow()
+        self.ocp = ocp
+        self.ocs = ocs
+        self.mcg = mcg
+
+    def __repr__(self):
+        return f"MustGatherRequest({self.tests}, since={self.since_time})"
+
+    @property
+    def dir_name(self):
+        """
+        Returns:
+            str: name of the log directory, the first test tagged with the
+                number of the merged ones
+
+        """
+        if len(self.tests) == 1:
+            return self.tests[0]
+        return f"{self.tests[0]}_and_{len(self.tests) - 1}_more"
+
+    @property
+    def since_time(self):
+        """
+        Returns:
+            str: since time in RFC3339 format for must-gather, None for all
+                the logs
+
+        """
+        return self.since.strftime(SINCE_TIME_FORMAT) if self.since else None
+
+    def overlaps(self, other):
+        """
+        Args:
+            other (MustGatherRequest): another request
+
+        Returns:
+            bool: True if the log windows of the requests overlap
+
+        """
+        return (self.since is None or self.since <= other.until) and (
+            other.since is None or other.since <= self.until
+        )
+
+    def merge(self, other):
+        """
+        Extend the request by the tests, log window and log types of the other
+        request
+
+        Args:
+            other (MustGatherRequest): request to merge
+
+        """
+        self.tests.extend(other.tests)
+        if self.since is None or other.since is None:
+            self.since = None
+        else:
+            self.since = min(self.since, other.since)
+        self.until = max(self.until, other.until)
+        self.ocp |= other.ocp
+        self.ocs |= other.ocs
+        self.mcg |= other.mcg
+
+
+class MustGatherScheduler(object):
+    """
+    Queue of the must-gather collections run by background threads
+    """
+
+    def __init__(self, workers=1, disk_budget=None, logs_dir=None):
+        """
+        Initializer function
+
+        Args:
+            workers (int): maximum number of the concurrent collections
+            disk_budget (int): maximum size in bytes of the collected logs,
+                the collections are skipped once it's reached, no limit if
+                None
+            logs_dir (str): directory of the failed test logs, the one of the
+                current run by default
+
+        """
+        self.workers = max(1, workers)
+        self.disk_budget = disk_budget
+        self.logs_dir = logs_dir or os.path.join(
+            os.path.expanduser(config.RUN["log_dir"]),
+            f"failed_testcase_ocs_logs_{config.RUN['run_id']}",
+        )
+        self.config_index = config.cur_index
+        self.pending = []
+        self.collections = []
+        self._running = 0
+        self._alive_workers = 0
+        self._condition = threading.Condition()
+
+    def submit(self, test_name, since=None, ocp=False, ocs=True, mcg=False):
+        """
+        Queue the collection of the logs of the failed test, it's merged with
+        a pending collection whose log window overlaps
+
+        Args:
+            test_name (str): name of the failed test
+            since (datetime.datetime): UTC start of the log window, None for
+                all the logs
+            ocp (bool): Whether to gather OCP logs
+            ocs (bool): Whether to gather OCS logs
+            mcg (bool): Whether to gather MCG logs
+
+        Returns:
+            MustGatherRequest: the request which will collect the logs
+
+        """
+        request = MustGatherRequest(test_name, since, ocp=ocp, ocs=ocs, mcg=mcg)
+        with self._condition:
+            for pending in self.pending:
+                if pending.overlaps(request):
+                    pending.merge(request)
+                    log.info(
+                        f"MG collection for {test_name} merged to the pending "
+                        f"collection of {pending.tests}"
+                    )
+                    return pending
+            self.pending.append(request)
+            log.info(
+                f"MG collection for {test_name} queued, since {request.since_time}"
+            )
+            if self._alive_workers < self.workers:
+                self._alive_workers += 1
+                threading.Thread(
+                    target=self._worker, name="mg-scheduler", daemon=True
+                ).start()
+        return request
+
+    def _next_request(self):
+        with self._condition:
+            if not self.pending:
+                # the worker exits, decided under the lock so that submit
+                # starts a new one for the next request
+                self._alive_workers -= 1
+                self._condition.notify_all()
+                return None
+            self._running += 1
+            return self.pending.pop(0)
+
+    def _worker(self):
+        with config.bind_ctx(self.config_index):
+            while True:
+                request = self._next_request()
+                if request is None:
+                    return
+                try:
+                    self._collect(request)
+                except Exception:
+                    log.exception(f"Failed to collect OCS logs of {request.tests}")
+                finally:
+                    with self._condition:
+                        self._running -= 1
+                        self._condition.notify_all()
+
+    def _over_budget(self):
+        if self.disk_budget is None:
+            return False
+        used = get_dir_size(self.logs_dir)
+        if used >= self.disk_budget:
+            log.warning(
+                f"MG logs take {used} bytes of the {self.disk_budget} bytes budget"
+            )
+            return True
+        return False
+
+    def _collect(self, request):
+        if self._over_budget():
+            log.warning(
+                f"Skipping MG collection of {request.tests}, disk budget reached"
+            )
+            self._record(request, "skipped", 0)
+            return
+        start = time.monotonic()
+        timeout = get_mg_timeout()
+        log.info(
+            f"Collecting MG logs of {request.tests} since {request.since_time}, "
+            f"timeout {timeout} seconds"
+        )
+        utils.collect_ocs_logs(
+            dir_name=request.dir_name,
+            ocp=request.ocp,
+            ocs=request.ocs,
+            mcg=request.mcg,
+            silent=True,
+            output_file=True,
+            skip_after_max_fail=True,
+            timeout=timeout,
+            since_time=request.since_time,
+        )
+        self._record(request, "collected", time.monotonic() - start)
+
+    def _record(self, request, status, duration):
+        """
+        Record the collection and its tests to the collections file
+        """
+        with self._condition:
+            self.collections.append(
+                {
+                    "dir_name": request.dir_name,
+                    "tests": list(request.tests),
+                    "since": request.since_time,
+                    "until": request.until.strftime(SINCE_TIME_FORMAT),
+                    "ocp": request.ocp,
+                    "ocs": request.ocs,
+                    "mcg": request.mcg,
+                    "status": status,
+                    "duration": round(duration, 1),
+                }
+            )
+            os.makedirs(self.logs_dir, exist_ok=True)
+            with open(os.path.join(self.logs_dir, COLLECTIONS_FILE), "w") as f:
+                json.dump(self.collections, f, indent=2)
+
+    def cancel_pending(self):
+        """
+        Drop the collections which haven't started yet
+
+        Returns:
+            list: the dropped requests
+
+        """
+        with self._condition:
+            dropped, self.pending = self.pending, []
+        for request in dropped:
+            log.info(f"MG collection of {request.tests} cancelled")
+        return dropped
+
+    def flush(self, timeout=None):
+        """
+        Wait for the queued and running collections to finish
+
+        Args:
+            timeout (int): seconds to wait, no limit if None
+
+        Returns:
+            bool: True if all the collections finished
+
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self.pending or self._running:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    log.warning(
+                        f"MG collections didn't finish in {timeout} seconds, "
+                        f"{len(self.pending)} pending"
+                    )
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+
+def get_mg_scheduler():
+    """
+    Returns:
+        MustGatherScheduler: scheduler of the run, created with the workers and
+            the disk budget from the REPORTING section of the config
+
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            budget_gb = config.REPORTING.get("mg_disk_budget_gb")
+            _scheduler = MustGatherScheduler(
+                workers=config.REPORTING.get("mg_collection_workers", 1),
+                disk_budget=int(budget_gb * 1024**3) if budget_gb else None,
+            )
+        return _scheduler
+
+
+def flush_mg_scheduler(timeout=None, cancel_pending=False):
+    """
+    Wait for the collections of the scheduler of the run, if it was created
+
+    Args:
+        timeout (int): seconds to wait, no limit if None
+        cancel_pending (bool): drop the collections which haven't started yet
+
+    Returns:
+        bool: True if all the collections finished
+
+    """
+    if _scheduler is None:
+        return True
+    if cancel_pending:
+        _scheduler.cancel_pending()
+    return _scheduler.flush(timeout)
@@ -0,0 +1,303 @@
+"""
+Content addressed storage of the must-gather logs
+
+Every failed test of a run collects a must-gather which is almost the same as
+the previous one and packing each of them to its own tarball stores the same
+content many times, compressed by a single thread. MustGatherStore keeps one
+store per run: every file of a collected must-gather is hashed (sha256) and its
+content is stored once as a compressed blob named by the hash, the must-gather
+itself is recorded as a small json manifest (relative paths, hashes, sizes,
+modes). The files are hashed and the new blobs compressed by a pool of
+threads streaming the files in chunks (hashlib and zlib release the GIL, so
+the compression runs in parallel like pigz), duplicate content is never
+compressed again.
+
+Any must-gather of the run can be restored from its manifest:
+    mg-restore <path>.manifest.json [--dest <dir>]
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from ocs_ci.framework import config
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_SUFFIX = ".manifest.json"
+MANIFEST_VERSION = 1
+CHUNK_SIZE = 1024 * 1024
+DEFAULT_COMPRESS_LEVEL = 6
+# gzip container, the blobs can be read by zcat as well
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+class MustGatherStore(object):
+    """
+    Store of the deduplicated must-gather files of the run
+    """
+
+    def __init__(self, root, workers=None, level=DEFAULT_COMPRESS_LEVEL):
+        """
+        Initializer function
+
+        Args:
+            root (str): directory of the store
+            workers (int): threads hashing and compressing the files, number
+                of CPUs by default
+            level (int): compression level
+
+        """
+        self.root = root
+        self.workers = workers or os.cpu_count() or 4
+        self.level = level
+        self._in_progress = set()
+        self._lock = threading.Lock()
+
+    def blob_path(self, digest):
+        """
+        Args:
+            digest (str): sha256 hex digest of the content
+
+        Returns:
+            str: path of the blob
+
+        """
+        return os.path.join(self.root, "blobs", digest[:2], f"{digest}.gz")
+
+    def _hash_file(self, path):
+        sha = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                sha.update(chunk)
+        return sha.hexdigest()
+
+    def _write_blob(self, path, digest):
+        blob_path = self.blob_path(digest)
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        tmp_path = f"{blob_path}.{uuid.uuid4().hex}.tmp"
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, GZIP_WBITS)
+        with open(path, "rb") as src, open(tmp_path, "wb") as dst:
+            for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                dst.write(compressor.compress(chunk))
+            dst.write(compressor.flush())
+        os.replace(tmp_path, blob_path)
+        return os.path.getsize(blob_path)
+
+    def _store_file(self, path):
+        """
+        Hash the file and store its content if it's not in the store yet
+
+        Returns:
+            tuple: digest and size of the compressed blob written, 0 if the
+                content was already stored
+
+        """
+        digest = self._hash_file(path)
+        with self._lock:
+            if digest in self._in_progress or os.path.exists(self.blob_path(digest)):
+                return digest, 0
+            self._in_progress.add(digest)
+        try:
+            return digest, self._write_blob(path, digest)
+        finally:
+            with self._lock:
+                self._in_progress.discard(digest)
+
+    def pack(self, directory, manifest_path=None):
+        """
+        Store the files of the directory and write its manifest
+
+        Args:
+            directory (str): the must-gather directory
+            manifest_path (str): path of the manifest, <directory>.manifest.json
+                by default
+
+        Returns:
+            str: path of the manifest
+
+        """
+        start = time.monotonic()
+        directory = os.path.abspath(directory)
+        manifest_path = manifest_path or f"{directory}{MANIFEST_SUFFIX}"
+        files, dirs, links = [], [], []
+        for dir_name, subdirs, file_names in os.walk(directory):
+            relative_dir = os.path.relpath(dir_name, directory)
+            if not subdirs and not file_names and relative_dir != ".":
+                dirs.append(relative_dir)
+            for name in subdirs + file_names:
+                path = os.path.join(dir_name, name)
+                if os.path.islink(path):
+                    links.append(
+                        {
+                            "path": os.path.relpath(path, directory),
+                            "target": os.readlink(path),
+                        }
+                    )
+                elif name in file_names:
+                    files.append(path)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            stored = list(executor.map(self._store_file, files))
+        entries = []
+        new_blobs = 0
+        compressed_bytes = 0
+        total_bytes = 0
+        for path, (digest, blob_size) in zip(files, stored):
+            stat = os.stat(path)
+            total_bytes += stat.st_size
+            if blob_size:
+                new_blobs += 1
+                compressed_bytes += blob_size
+            entries.append(
+                {
+                    "path": os.path.relpath(path, directory),
+                    "sha256": digest,
+                    "size": stat.st_size,
+                    "mode": stat.st_mode & 0o777,
+                }
+            )
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "name": os.path.basename(directory),
+            "store": os.path.relpath(self.root, os.path.dirname(manifest_path)),
+            "created": time.time(),
+            "files": entries,
+            "dirs": dirs,
+            "links": links,
+        }
+        with open(manifest_path, "w") as f:
+            json.dump(manifest, f)
+        logger.info(
+            f"Stored {len(entries)} files ({total_bytes} bytes) of {directory} to "
+            f"{self.root}: {new_blobs} new blobs ({compressed_bytes} bytes compressed)"
+            f" in {time.monotonic() - start:.1f}s, manifest {manifest_path}"
+        )
+        return manifest_path
+
+    def restore(self, manifest_path, dest_dir=None):
+        """
+        Rebuild the must-gather directory from the manifest
+
+        Args:
+            manifest_path (str): path of the manifest
+            dest_dir (str): directory to restore to, the directory next to the
+                manifest by default
+
+        Returns:
+            str: the restored directory
+
+        """
+        manifest = load_manifest(manifest_path)
+        dest_dir = dest_dir or manifest_path[: -len(MANIFEST_SUFFIX)]
+        for relative_dir in manifest["dirs"]:
+            os.makedirs(os.path.join(dest_dir, relative_dir), exist_ok=True)
+
+        def restore_file(entry):
+            path = os.path.join(dest_dir, entry["path"])
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            decompressor = zlib.decompressobj(GZIP_WBITS)
+            with (
+                open(self.blob_path(entry["sha256"]), "rb") as src,
+                open(path, "wb") as dst,
+            ):
+                for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                    dst.write(decompressor.decompress(chunk))
+                dst.write(decompressor.flush())
+            os.chmod(path, entry["mode"])
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            list(executor.map(restore_file, manifest["files"]))
+        for link in manifest["links"]:
+            path = os.path.join(dest_dir, link["path"])
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.symlink(link["target"], path)
+        logger.info(f"Restored {manifest['name']} to {dest_dir}")
+        return dest_dir
+
+
+def load_manifest(manifest_path):
+    """
+    Args:
+        manifest_path (str): path of the manifest
+
+    Returns:
+        dict: the manifest
+
+    """
+    with open(manifest_path) as f:
+        return json.load(f)
+
+
+def get_store_for_manifest(manifest_path, workers=None):
+    """
+    Args:
+        manifest_path (str): path of the manifest
+        workers (int): threads restoring the files
+
+    Returns:
+        MustGatherStore: the store the manifest refers to
+
+    """
+    manifest = load_manifest(manifest_path)
+    root = os.path.join(
+        os.path.dirname(os.path.abspath(manifest_path)), manifest["store"]
+    )
+    return MustGatherStore(os.path.normpath(root), workers=workers)
+
+
+def get_run_store():
+    """
+    Returns:
+        MustGatherStore: store of the current run, in REPORTING['mg_store_dir']
+            or in mg_store_<run_id> of the log directory
+
+    """
+    root = config.REPORTING.get("mg_store_dir") or os.path.join(
+        os.path.expanduser(config.RUN["log_dir"]), f"mg_store_{config.RUN['run_id']}"
+    )
+    return MustGatherStore(root)
+
+
+def store_must_gather(log_dir_path, delete=False):
+    """
+    Store the collected must-gather to the store of the run
+
+    Args:
+        log_dir_path (str): the must-gather directory
+        delete (bool): delete the directory once it's stored
+
+    Returns:
+        str: path of the manifest
+
+    """
+    manifest_path = get_run_store().pack(log_dir_path)
+    if delete:
+        shutil.rmtree(log_dir_path)
+    return manifest_path
+
+
+def main():
+    """
+    Main function for mg-restore command
+    """
+    parser = argparse.ArgumentParser(
+        description="Restore must-gather directory from its manifest"
+    )
+    parser.add_argument("manifest", help="path of the .manifest.json file")
+    parser.add_argument(
+        "--dest", help="destination directory, next to the manifest by default"
+    )
+    parser.add_argument("--workers", type=int, help="number of restoring threads")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    store = get_store_for_manifest(args.manifest, workers=args.workers)
+    print(store.restore(args.manifest, args.dest))
@@ -14,6 +14,7 @@ from ocs_ci.ocs.must_gather.const_must_gather import (
     GATHER_COMMANDS_VERSION,
     GATHER_COMMANDS_LOG,
 )
+from ocs_ci.ocs.must_gather.mg_index import MustGatherIndex
 from ocs_ci.utility import version
 from ocs_ci.ocs.constants import MANAGED_SERVICE_PLATFORMS
 
@@ -36,6 +37,7 @@ class MustGather(object):
         self.files_content_issue = list()
         self.ocs_version = version.get_semantic_ocs_version_from_config()
         self.full_paths = list()
+        self._index = None
 
     @property
     def log_type(self):
@@ -47,6 +49,24 @@ class MustGather(object):
             raise ValueError("log type arg must be a string")
         self.type_log = type_log
 
+    @property
+    def index(self):
+        """
+        Returns:
+            MustGatherIndex: index of the must-gather tree, built on the first
+                use
+
+        """
+        if self._index is None or self._index.root != self.root:
+            self._index = MustGatherIndex(self.root)
+        return self._index
+
+    def invalidate_index(self):
+        """
+        Drop the index, e.g. after files were added to the must-gather tree
+        """
+        self._index = None
+
     def collect_must_gather(self, ocs_flags=None, mg_options=None):
         """
         Collect ocs_must_gather and copy the logs to a temporary folder.
@@ -61,6 +81,7 @@ class MustGather(object):
             dir_name=temp_folder, ocp=False, ocs_flags=ocs_flags, mg_options=mg_options
         )
         self.root = temp_folder + "_ocs_logs"
+        self.invalidate_index()
 
     def search_file_path(self):
         """
@@ -89,13 +110,9 @@ class MustGather(object):
             files = GATHER_COMMANDS_VERSION[ocs_version]["OTHERS_EXTERNAL"]
         else:
             files = GATHER_COMMANDS_VERSION[ocs_version][self.type_log]
-        for file in files:
-            self.files_not_exist.append(file)
-            for dir_name, subdir_list, files_list in os.walk(self.root):
-                if file in files_list:
-                    self.files_path[file] = os.path.join(dir_name, file)
-                    self.files_not_exist.remove(file)
-                    break
+        found, missing = self.index.find_all(files)
+        self.files_path.update(found)
+        self.files_not_exist.extend(missing)
 
     def validate_file_size(self):
         """
@@ -104,15 +121,10 @@ class MustGather(object):
         """
         if self.type_log != "OTHERS":
             return
-        for path, subdirs, files in os.walk(self.root):
-            for file in files:
-                file_path = os.path.join(path, file)
-                if (
-                    Path(file_path).stat().st_size == 0
-                    and "noobaa-db-pg-0-init.log" not in file_path
-                ):
-                    logger.error(f"log file {file} empty!")
-                    self.empty_files.append(file)
+        for entry in self.index.empty_files():
+            if "noobaa-db-pg-0-init.log" not in entry.path:
+                logger.error(f"log file {entry.name} empty!")
+                self.empty_files.append(entry.name)
 
     def validate_expected_files(self):
         """
@@ -141,16 +153,19 @@ class MustGather(object):
         if self.type_log != "CEPH" or self.ocs_version < version.VERSION_4_9:
             return
         pattern = re.compile("exit code [1-9]+")
-        for root, dirs, files in os.walk(self.root):
-            for file in files:
-                try:
-                    with open(os.path.join(root, file), "r") as f:
-                        data_file = f.read()
-                    exit_code_error = pattern.findall(data_file.lower())
-                    if len(exit_code_error) > 0 and "gather-debug" not in file:
-                        self.files_content_issue.append(os.path.join(root, file))
-                except Exception as e:
-                    logger.error(f"There is no option to read {file}, error: {e}")
+        for entry in self.index.files():
+            if "gather-debug" in entry.name or b"\0" in self.index.signature(
+                entry.path
+            ):
+                # binary files (e.g. archives) can't contain the error message
+                continue
+            try:
+                with open(entry.path, "r") as f:
+                    data_file = f.read()
+                if pattern.search(data_file.lower()):
+                    self.files_content_issue.append(entry.path)
+            except Exception as e:
+                logger.error(f"There is no option to read {entry.name}, error: {e}")
 
     def print_must_gather_debug(self) -> None:
         try:
@@ -175,14 +190,11 @@ class MustGather(object):
             if pattern is False:
                 pod_names.append(pod.name)
 
-        for dir_name, subdir_list, files_list in os.walk(self.root):
-            if re.search("openshift-storage/pods$", dir_name):
-                pod_path = dir_name
-                break
+        pod_path = self.index.directories("openshift-storage/pods$")[0]
 
         pod_files = []
         logger.info("Get pod names on openshift-storage/pods directory")
-        for pod_file in os.listdir(pod_path):
+        for pod_file in self.index.list_dir(pod_path):
             pattern = self.check_pod_name_pattern(pod_file)
             if pattern is False:
                 pod_files.append(pod_file)
@@ -249,18 +261,15 @@ class MustGather(object):
         """
         ocs_version = version.get_ocs_version_from_csv(only_major_minor=True)
         if self.type_log == "OTHERS" and ocs_version >= version.VERSION_4_6:
-            flag = False
             logger.info("Verify noobaa_diagnostics folder exist")
-            for path, subdirs, files in os.walk(self.root):
-                for file in files:
-                    if re.search(r"noobaa_diagnostics_.*.tar.gz", file):
-                        flag = True
-                        logger.info(f"Extract noobaa_diagnostics dir {file}")
-                        path_noobaa_diag = os.path.join(path, file)
-                        files_noobaa_diag = tarfile.open(path_noobaa_diag)
-                        files_noobaa_diag.extractall(path)
-                        break
-            if not flag:
+            diagnostics = self.index.files(r"noobaa_diagnostics_.*.tar.gz")
+            for entry in diagnostics[:1]:
+                logger.info(f"Extract noobaa_diagnostics dir {entry.name}")
+                with tarfile.open(entry.path) as files_noobaa_diag:
+                    files_noobaa_diag.extractall(os.path.dirname(entry.path))
+                # the extracted files have to be indexed as well
+                self.invalidate_index()
+            if not diagnostics:
                 logger.error("noobaa_diagnostics.tar.gz does not exist")
                 self.files_not_exist.append("noobaa_diagnostics.tar.gz")
 
@@ -275,22 +284,7 @@ class MustGather(object):
             list: paths of all members (files and dirs) in the archive
 
         """
-        paths = []
-        try:
-            with tarfile.open(tarball_path, "r:*") as tar:
-                for member in tar.getmembers():
-                    # Add the member path (files and dirs)
-                    paths.append(member.name)
-                    # Ensure parent directory paths are included for substring
-                    # matching in verify_paths_in_dir / verify_paths_not_in_dir
-                    parts = member.name.replace("\\", "/").split("/")
-                    for i in range(1, len(parts)):
-                        parent = "/".join(parts[:i])
-                        if parent and parent not in paths:
-                            paths.append(parent)
-        except (tarfile.TarError, OSError) as e:
-            logger.warning(f"Could not read tarball {tarball_path}: {e}")
-        return paths
+        return self.index.add_tarball(tarball_path)
 
     def get_all_paths(self):
         """
@@ -301,17 +295,10 @@ class MustGather(object):
         and from inside such tarballs.
 
         """
-        self.full_paths = []
-
-        for root_dir, dirs, files in os.walk(self.root):
-            for name in files + dirs:
-                full_path = os.path.join(root_dir, name)
-                self.full_paths.append(full_path)
-            # Collect paths from must-gather tarballs found under root
-            for name in files:
-                if name.endswith(".tar.gz"):
-                    tarball_path = os.path.join(root_dir, name)
-                    self.full_paths.extend(self._get_paths_from_tarball(tarball_path))
+        # the tree could change since the last validation, e.g. by a new
+        # must-gather collected to the same root
+        self.invalidate_index()
+        self.full_paths = self.index.all_paths()
 
     def verify_paths_in_dir(self, paths):
         """
@@ -325,15 +312,7 @@ class MustGather(object):
             list: the paths do not exist in mg dir
 
         """
-        paths_exist = []
-        for path in paths:
-            status = False
-            for full_path in self.full_paths:
-                if path in full_path:
-                    status = True
-            if not status:
-                paths_exist.append(path)
-        return paths_exist
+        return self.index.missing_substrings(paths)
 
     def verify_paths_not_in_dir(self, paths):
         """
@@ -347,15 +326,7 @@ class MustGather(object):
             list: the paths exist in mg dir
 
         """
-        paths_not_exist = []
-        for path in paths:
-            status = True
-            for full_path in self.full_paths:
-                if path in full_path:
-                    status = False
-            if not status:
-                paths_not_exist.append(path)
-        return paths_not_exist
+        return self.index.present_substrings(paths)
 
     def validate_must_gather(self):
         """
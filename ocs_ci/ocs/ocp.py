@@ -7,6 +7,7 @@ import logging
 import os
 import re
 import shlex
+import subprocess
 import tempfile
 import time
 import yaml
@@ -14,25 +15,58 @@ import json
 import copy
 
 from ocs_ci.ocs.exceptions import (
+    APIBackendNotSupported,
     CommandFailed,
     NotSupportedFunctionError,
     NonUpgradedImagesFoundError,
     ResourceWrongStatusException,
     ResourceNameNotSpecifiedException,
     TimeoutExpiredError,
+    UnsupportedPrinterColumn,
 )
 from ocs_ci.utility.proxy import update_kubeconfig_with_proxy_url_for_client
+from ocs_ci.utility import call_profiler
 from ocs_ci.utility.retry import retry, catch_exceptions
 from ocs_ci.utility.utils import TimeoutSampler
-from ocs_ci.utility.utils import exec_cmd, run_cmd, update_container_with_mirrored_image
+from ocs_ci.utility.utils import (
+    exec_cmd,
+    exec_cmd_stream,
+    mask_secrets,
+    run_cmd,
+    update_container_with_mirrored_image,
+)
 from ocs_ci.utility.templating import dump_data_to_temp_yaml, load_yaml
 from ocs_ci.utility import version
 from ocs_ci.ocs import constants
+from ocs_ci.ocs.api_backend import get_api_backend, is_api_backend_enabled
+from ocs_ci.ocs.informer import (
+    get_informer,
+    invalidate_informers,
+    is_informer_cache_enabled,
+)
+from ocs_ci.ocs import output_format as output_format_utils
+from ocs_ci.ocs import printer_columns
 from ocs_ci.framework import config
 
 
 log = logging.getLogger(__name__)
 
+# oc verbs which modify resources, informers are invalidated after them
+MUTATING_VERBS = (
+    "annotate",
+    "apply",
+    "create",
+    "delete",
+    "label",
+    "patch",
+    "replace",
+    "rollout",
+    "scale",
+    "set",
+)
+# (kubeconfig, apiVersion, kind) -> additionalPrinterColumns of the CRD
+_crd_printer_columns = {}
+
 
 class OCP(object):
     """
@@ -142,6 +176,334 @@ class OCP(object):
         """
         self._data = self.get()
 
+    def get_kubeconfig_path(self, cluster_config=None):
+        """
+        Get the kubeconfig of the cluster where the resource lives, without
+        switching the cluster context.
+
+        Args:
+            cluster_config (MultiClusterConfig): config of the cluster the
+                command runs on, the cluster of the resource by default
+
+        Returns:
+            str: Path to the kubeconfig
+
+        """
+        if self.cluster_kubeconfig and os.path.exists(self.cluster_kubeconfig):
+            return self.cluster_kubeconfig
+        if cluster_config is None:
+            cluster_config = config.cluster_ctx
+            if self.cluster_context is not None and self.cluster_context < len(
+                config.clusters
+            ):
+                cluster_config = config.clusters[self.cluster_context]
+        kubeconfig = cluster_config.RUN.get("kubeconfig")
+        if kubeconfig and os.path.exists(kubeconfig):
+            return kubeconfig
+        kubeconfig = os.path.join(
+            cluster_config.ENV_DATA.get("cluster_path", ""),
+            cluster_config.RUN.get("kubeconfig_location", "auth/kubeconfig"),
+        )
+        if os.path.exists(kubeconfig):
+            return kubeconfig
+        return os.getenv("KUBECONFIG")
+
+    def _try_api_backend(self, verb, method, *args, **kwargs):
+        """
+        Serve the verb by the in-process API backend if it is enabled
+
+        Args:
+            verb (str): Name of the verb used to check the configuration
+            method (str): Name of the KubeAPIBackend method to call
+
+        Returns:
+            tuple: (bool, object) - whether the request was served by the
+                API backend and the result of the request
+
+        Raises:
+            CommandFailed: In case the API request fails
+
+        """
+        if not is_api_backend_enabled(verb):
+            return False, None
+        kubeconfig = self.get_kubeconfig_path()
+        if not kubeconfig:
+            return False, None
+        backend = get_api_backend(kubeconfig, skip_tls_verify=self.skip_tls_verify)
+        start_time = time.perf_counter()
+        return_code = 1
+        try:
+            result = getattr(backend, method)(*args, **kwargs)
+            return_code = 0
+            return True, result
+        except APIBackendNotSupported as ex:
+            log.debug(f"API backend can't serve {verb}, using oc: {ex}")
+            return_code = None
+            return False, None
+        finally:
+            if return_code is not None and call_profiler.is_call_profiler_enabled():
+                call_profiler.record_call(
+                    "api",
+                    verb,
+                    self.kind.lower(),
+                    kwargs.get("namespace", self.namespace),
+                    self.cluster_context,
+                    time.perf_counter() - start_time,
+                    return_code=return_code,
+                )
+            if verb in MUTATING_VERBS:
+                invalidate_informers(kubeconfig)
+
+    def get_informer(self, all_namespaces=False):
+        """
+        Get the shared informer serving reads and waits of this object
+
+        Args:
+            all_namespaces (bool): Get informer watching all namespaces
+
+        Returns:
+            SharedInformer: informer, None if the informer cache is disabled
+                or the kind can't be watched
+
+        """
+        if not is_informer_cache_enabled():
+            return None
+        kubeconfig = self.get_kubeconfig_path()
+        if not kubeconfig:
+            return None
+        try:
+            return get_informer(
+                kubeconfig,
+                self.kind,
+                namespace=self.namespace,
+                all_namespaces=all_namespaces and not self.namespace,
+            )
+        except (APIBackendNotSupported, CommandFailed) as ex:
+            log.debug(f"Informer cache can't serve {self.kind}: {ex}")
+            return None
+
+    def _get_from_informer(
+        self, resource_name, selector, field_selector, all_namespaces
+    ):
+        """
+        Serve 'oc get -o yaml' from the informer store
+
+        Returns:
+            dict: resource or List of resources, None if the request has to be
+                sent to the server (e.g. the object isn't in the store yet)
+
+        """
+        informer = self.get_informer(all_namespaces)
+        if not informer:
+            return None
+        if resource_name:
+            if " " in resource_name.strip() or "/" in resource_name:
+                return None
+            return informer.get(resource_name.strip())
+        return {
+            "apiVersion": "v1",
+            "items": informer.list(selector, field_selector),
+            "kind": "List",
+            "metadata": {"resourceVersion": ""},
+        }
+
+    def _informer_serves_column(self, column):
+        """
+        Check whether the column value can be computed from the informer store
+
+        Args:
+            column (str): The name of the column
+
+        Returns:
+            bool: True if get_resource of the column is served from memory
+
+        """
+        informer = self.get_informer()
+        return informer is not None and printer_columns.is_builtin_column(
+            informer.resource.kind, column
+        )
+
+    def _get_column_from_informer(self, resource_name, column):
+        """
+        Get column value of the resource from the informer store
+
+        Returns:
+            str: value of the column, None if it can't be served from memory
+
+        """
+        if not self._informer_serves_column(column):
+            return None
+        resource = self.get_informer().get(resource_name)
+        if resource is None:
+            return None
+        return printer_columns.get_column_value(resource, column)
+
+    def get_printer_columns(self, resource):
+        """
+        Get additionalPrinterColumns of the CRD of the custom resource.
+        The CRD is fetched once per cluster and kind and cached.
+
+        Args:
+            resource (dict): Resource data with apiVersion and kind
+
+        Returns:
+            list: printer column definitions, empty list for built-in kinds
+                or if the CRD can't be found
+
+        """
+        api_version = resource.get("apiVersion", "")
+        kind = resource.get("kind", "")
+        if "/" not in api_version:
+            return []
+        group, version = api_version.rsplit("/", 1)
+        key = (self.get_kubeconfig_path(), api_version, kind)
+        if key not in _crd_printer_columns:
+            columns = []
+            plural = kind.lower()
+            candidates = [f"{plural}s", f"{plural}es"]
+            if plural.endswith("y"):
+                candidates.insert(0, f"{plural[:-1]}ies")
+            crd_ocp = OCP(
+                kind="CustomResourceDefinition",
+                cluster_kubeconfig=self.cluster_kubeconfig,
+            )
+            for candidate in candidates:
+                crd = crd_ocp.get(
+                    resource_name=f"{candidate}.{group}", dont_raise=True, silent=True
+                )
+                if crd and crd.get("spec", {}).get("names", {}).get("kind") == kind:
+                    columns = printer_columns.get_crd_printer_columns(crd, version)
+                    break
+            _crd_printer_columns[key] = columns
+        return _crd_printer_columns[key]
+
+    def get_column_value(self, resource, column):
+        """
+        Compute the column which 'oc get' prints for already fetched resource,
+        without running another 'oc get'
+
+        Args:
+            resource (dict): Resource data as returned by get method
+            column (str): The name of the column
+
+        Returns:
+            str: The value of the column
+
+        Raises:
+            UnsupportedPrinterColumn: if the column can't be computed
+
+        """
+        kind = resource.get("kind")
+        if printer_columns.is_builtin_column(kind, column):
+            return printer_columns.get_column_value(resource, column)
+        return printer_columns.get_column_value(
+            resource, column, self.get_printer_columns(resource)
+        )
+
+    def _get_item_status(self, item, column, jsonpath=None, **kwargs):
+        """
+        Get the value compared with the condition in wait_for_resource.
+        Falls back to get_resource when the column can't be computed.
+
+        Args:
+            item (dict): Resource data
+            column (str): The name of the column
+            jsonpath (str): JSONPath expression used instead of the column
+            **kwargs: passed to get_resource
+
+        Returns:
+            str: The value of the column or of the jsonpath expression
+
+        """
+        if jsonpath:
+            return printer_columns.get_jsonpath_str(item, jsonpath)
+        try:
+            return self.get_column_value(item, column)
+        except UnsupportedPrinterColumn as ex:
+            log.debug(f"{ex}, using oc get")
+            return self.get_resource(item["metadata"]["name"], column, **kwargs)
+
+    def _count_in_condition(self, items, condition, column, jsonpath, statuses):
+        """
+        Count the items of a List in the condition of wait_for_resource by
+        evaluating the condition over the whole List at once
+
+        Args:
+            items (list): Resources data of the List
+            condition (str): The desired value of the column or jsonpath
+            column (str): The name of the column
+            jsonpath (str): JSONPath expression used instead of the column
+            statuses (list): values already fetched by get_resource, used
+                when the column can't be computed from the data
+
+        Returns:
+            int: number of the items in the condition
+
+        """
+        if not items:
+            return 0
+        try:
+            if jsonpath or printer_columns.is_builtin_column(
+                items[0].get("kind"), column
+            ):
+                columns = None
+            else:
+                columns = self.get_printer_columns(items[0])
+            return printer_columns.count_matching(
+                items,
+                printer_columns.Condition(
+                    f"{jsonpath or column}=={condition}", columns
+                ),
+            )
+        except UnsupportedPrinterColumn as ex:
+            log.debug(f"{ex}, counting the values from oc get")
+            return sum(1 for status in statuses if status == condition)
+
+    def _sample_resources(self, timeout, sleep, resource_name, selector):
+        """
+        Sample 'oc get' of the resources, in the same way as TimeoutSampler
+        does. With informer cache the samples are read from memory and the
+        next sample is taken as soon as a watch event changes the store.
+
+        Args:
+            timeout (int): Time in seconds to wait
+            sleep (int): Sampling time in seconds used without informer
+            resource_name (str): The name of the resource
+            selector (str): The resource selector to search with
+
+        Yields:
+            dict: output of the get method
+
+        Raises:
+            TimeoutExpiredError: when the timeout is reached
+
+        """
+        informer = self.get_informer()
+        if not informer:
+            yield from TimeoutSampler(
+                timeout, sleep, self.get, resource_name, True, selector
+            )
+            return
+        start_time = time.time()
+        generation = informer.generation
+        while True:
+            try:
+                sample = self.get(resource_name, True, selector)
+            except Exception as ex:
+                # e.g. the resource doesn't exist yet, keep waiting for it as
+                # TimeoutSampler does
+                log.debug(f"Exception raised during iteration: {ex}")
+            else:
+                yield sample
+            remaining = timeout - (time.time() - start_time)
+            if remaining <= 0:
+                raise TimeoutExpiredError(
+                    timeout,
+                    f"Timed out after {timeout}s waiting for {self.kind} "
+                    f"{resource_name or selector}",
+                )
+            generation = informer.wait_for_change(generation, remaining)
+
     def exec_oc_cmd(
         self,
         command,
@@ -153,6 +515,7 @@ class OCP(object):
         cluster_config=None,
         skip_tls_verify=False,
         output_file=None,
+        output_format=None,
         **kwargs,
     ):
         """
@@ -175,21 +538,80 @@ class OCP(object):
             skip_tls_verify (bool): Adding '--insecure-skip-tls-verify' to oc command
             output_file (str): path where to write output of stdout and stderr from command - apply only when
                 silent mode is True
+            output_format (str): 'json' or 'yaml' format of the output parsed
+                when out_yaml_format is True, None to detect it from the output
 
         Returns:
-            dict: Dictionary represents a returned yaml file.
+            dict: Dictionary represents a returned yaml or json document.
             str: If out_yaml_format is False.
 
         """
-        # switch to a context where the resource was created
-        original_context = None
+        # run in the context where the resource was created, bound only to the
+        # current thread so that commands on other clusters can run in parallel
         if (
-            config.cluster_ctx.MULTICLUSTER.get("multicluster_index")
+            self.cluster_context is not None
+            and config.cluster_ctx.MULTICLUSTER.get("multicluster_index")
             != self.cluster_context
         ):
-            original_context = config.cluster_ctx.MULTICLUSTER.get("multicluster_index")
-            config.switch_ctx(self.cluster_context)
+            with config.bind_ctx(self.cluster_context):
+                return self.exec_oc_cmd(
+                    command,
+                    out_yaml_format=out_yaml_format,
+                    secrets=secrets,
+                    timeout=timeout,
+                    ignore_error=ignore_error,
+                    silent=silent,
+                    cluster_config=cluster_config,
+                    skip_tls_verify=skip_tls_verify,
+                    output_file=output_file,
+                    output_format=output_format,
+                    **kwargs,
+                )
 
+        target_config = cluster_config
+        oc_cmd, cluster_config = self._build_oc_cmd(
+            command, cluster_config, skip_tls_verify
+        )
+        out = run_cmd(
+            cmd=oc_cmd,
+            secrets=secrets,
+            timeout=timeout,
+            ignore_error=ignore_error,
+            threading_lock=self.threading_lock,
+            silent=silent,
+            cluster_config=cluster_config,
+            output_file=output_file,
+            **kwargs,
+        )
+
+        try:
+            if out.startswith("hints = "):
+                out = out[out.index("{") :]
+        except ValueError:
+            pass
+
+        if (command.split() or [""])[0] in MUTATING_VERBS:
+            # invalidate only the informers of the cluster written to
+            invalidate_informers(self.get_kubeconfig_path(target_config))
+
+        if out_yaml_format:
+            return output_format_utils.parse_output(out, output_format)
+        return out
+
+    def _build_oc_cmd(self, command, cluster_config=None, skip_tls_verify=False):
+        """
+        Build the full 'oc' command line with kubeconfig and namespace
+
+        Args:
+            command (str): The command without the initial 'oc'
+            cluster_config (MultiClusterConfig): config of the cluster, None
+                for the current one
+            skip_tls_verify (bool): Adding '--insecure-skip-tls-verify'
+
+        Returns:
+            tuple: (command line, cluster config)
+
+        """
         oc_cmd = "oc "
         env_kubeconfig = None
         if not cluster_config:
@@ -211,32 +633,104 @@ class OCP(object):
             oc_cmd += f"-n {self.namespace} "
         if skip_tls_verify or self.skip_tls_verify:
             command += " --insecure-skip-tls-verify"
+        return oc_cmd + command, cluster_config
 
-        oc_cmd += command
-        out = run_cmd(
-            cmd=oc_cmd,
+    def exec_oc_cmd_stream(
+        self,
+        command,
+        secrets=None,
+        timeout=600,
+        ignore_error=False,
+        silent=False,
+        cluster_config=None,
+        skip_tls_verify=False,
+        **kwargs,
+    ):
+        """
+        Executing 'oc' command with large output (e.g. logs) with bounded
+        memory usage, see exec_cmd_stream
+
+        Args:
+            command (str): The command to execute (e.g. logs pod-name)
+                without the initial 'oc' at the beginning
+            secrets (list): A list of secrets to be masked with asterisks
+            timeout (int): timeout for the oc_cmd, defaults to 600 seconds
+            ignore_error (bool): True if ignore non zero return code and do not
+                raise the exception.
+            silent (bool): If True will silent errors from the server, default false
+            cluster_config (MultiClusterConfig): cluster_config will be used only in the context of multiclsuter
+                executions
+            skip_tls_verify (bool): Adding '--insecure-skip-tls-verify' to oc command
+            **kwargs: arguments of exec_cmd_stream, e.g. spool_size
+
+        Returns:
+            StreamedProcess: the finished command with lazily readable output
+
+        """
+        if (
+            self.cluster_context is not None
+            and config.cluster_ctx.MULTICLUSTER.get("multicluster_index")
+            != self.cluster_context
+        ):
+            with config.bind_ctx(self.cluster_context):
+                return self.exec_oc_cmd_stream(
+                    command,
+                    secrets=secrets,
+                    timeout=timeout,
+                    ignore_error=ignore_error,
+                    silent=silent,
+                    cluster_config=cluster_config,
+                    skip_tls_verify=skip_tls_verify,
+                    **kwargs,
+                )
+        oc_cmd, cluster_config = self._build_oc_cmd(
+            command, cluster_config, skip_tls_verify
+        )
+        return exec_cmd_stream(
+            oc_cmd,
             secrets=secrets,
             timeout=timeout,
             ignore_error=ignore_error,
-            threading_lock=self.threading_lock,
             silent=silent,
             cluster_config=cluster_config,
-            output_file=output_file,
             **kwargs,
         )
 
-        try:
-            if out.startswith("hints = "):
-                out = out[out.index("{") :]
-        except ValueError:
-            pass
+    def popen_oc_cmd(self, command, cluster_config=None, skip_tls_verify=False):
+        """
+        Start a long running 'oc' command (e.g. a watch) without waiting for
+        it, the caller reads its output and terminates it
+
+        Args:
+            command (str): The command to execute (e.g. rsh pod-name ceph -w)
+                without the initial 'oc' at the beginning
+            cluster_config (MultiClusterConfig): cluster_config will be used only in the context of multiclsuter
+                executions
+            skip_tls_verify (bool): Adding '--insecure-skip-tls-verify' to oc command
 
-        if original_context is not None:
-            config.switch_ctx(original_context)
+        Returns:
+            subprocess.Popen: the running process, stderr is merged to the
+                line buffered text stdout
 
-        if out_yaml_format:
-            return yaml.load(out, Loader=yaml.CSafeLoader)
-        return out
+        """
+        if (
+            self.cluster_context is not None
+            and config.cluster_ctx.MULTICLUSTER.get("multicluster_index")
+            != self.cluster_context
+        ):
+            with config.bind_ctx(self.cluster_context):
+                return self.popen_oc_cmd(command, cluster_config, skip_tls_verify)
+        oc_cmd, _ = self._build_oc_cmd(command, cluster_config, skip_tls_verify)
+        log.info(f"Starting command: {oc_cmd}")
+        return subprocess.Popen(
+            shlex.split(oc_cmd),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            errors="replace",
+            bufsize=1,
+        )
 
     @retry(CommandFailed, tries=3, delay=30, backoff=1)
     def exec_oc_debug_cmd(
@@ -306,13 +800,17 @@ class OCP(object):
         field_selector=None,
         cluster_config=None,
         skip_tls_verify=False,
+        output_format=None,
+        jsonpath=None,
+        custom_columns=None,
     ):
         """
         Get command - 'oc get <resource>'
 
         Args:
             resource_name (str): The resource name to fetch
-            out_yaml_format (bool): Adding '-o yaml' to oc command
+            out_yaml_format (bool): Adding '-o json' or '-o yaml' to oc command
+                and parsing the output
             selector (str): The label selector to look for.
             all_namespaces (bool): Equal to oc get <resource> -A
             retry (int): Number of attempts to retry to get resource
@@ -321,15 +819,33 @@ class OCP(object):
             field_selector (str): Selector (field query) to filter on, supports
                 '=', '==', and '!='. (e.g. status.phase=Running)
             skip_tls_verify (bool): Adding '--insecure-skip-tls-verify' to oc command
+            output_format (str): 'json' or 'yaml', default is
+                RUN['oc_output_format']
+            jsonpath (str): Return only the output of '-o jsonpath=<jsonpath>'
+                e.g. '{.items[*].metadata.name}'
+            custom_columns (dict): Return only the requested fields per
+                resource, column name -> field path, e.g.
+                {'NAME': '.metadata.name', 'PHASE': '.status.phase'}
 
         Example:
             get('my-pv1')
+            get(selector='app=rook-ceph-osd', jsonpath='{.items[*].metadata.name}')
 
         Returns:
             dict: Dictionary represents a returned yaml file
+            str: output of the jsonpath projection
+            list: dict of column name -> value per resource for custom_columns
             None: Incase dont_raise is True and get is not found
 
         """
+        projection = jsonpath is not None or custom_columns is not None
+        # explicitly provided cluster config and TLS options are handled by oc
+        use_api_backend = (
+            out_yaml_format
+            and not projection
+            and not cluster_config
+            and not (skip_tls_verify and not self.skip_tls_verify)
+        )
         if not cluster_config:
             cluster_config = config
         resource_name = resource_name if resource_name else self.resource_name
@@ -350,17 +866,48 @@ class OCP(object):
             command += f" --selector={selector}"
         if field_selector is not None:
             command += f" --field-selector={field_selector}"
-        if out_yaml_format:
-            command += " -o yaml"
+        if jsonpath is not None:
+            command += f" {output_format_utils.jsonpath_option(jsonpath)}"
+        elif custom_columns is not None:
+            command += f" {output_format_utils.custom_columns_option(custom_columns)}"
+        elif out_yaml_format:
+            output_format = output_format or output_format_utils.get_output_format()
+            command += f" {output_format_utils.output_option(output_format)}"
         retry += 1
+        if use_api_backend:
+            cached = self._get_from_informer(
+                resource_name, selector, field_selector, all_namespaces
+            )
+            if cached is not None:
+                return cached
         while retry:
             try:
-                return self.exec_oc_cmd(
+                if use_api_backend:
+                    served, result = self._try_api_backend(
+                        "get",
+                        "get",
+                        kind,
+                        resource_name=resource_name,
+                        namespace=self.namespace,
+                        selector=selector,
+                        field_selector=field_selector,
+                        all_namespaces=all_namespaces,
+                        api_version=self.api_version,
+                    )
+                    if served:
+                        return result
+                    use_api_backend = False
+                out = self.exec_oc_cmd(
                     command,
+                    out_yaml_format=not projection,
                     silent=silent,
                     cluster_config=cluster_config,
                     skip_tls_verify=skip_tls_verify,
+                    output_format=output_format,
                 )
+                if custom_columns is not None:
+                    return output_format_utils.parse_custom_columns(out, custom_columns)
+                return out
             except CommandFailed as ex:
                 if not silent:
                     log.warning(
@@ -467,9 +1014,15 @@ class OCP(object):
             command += f"{self.kind} {resource_name}"
             if config.RUN.get("resource_checker"):
                 config.RUN["RESOURCE_DICT_TEST"][self.kind] = resource_name
+        served = False
+        if yaml_file and out_yaml_format:
+            served, output = self._try_api_backend(
+                "create", "create", yaml_file, namespace=self.namespace
+            )
         if out_yaml_format:
             command += " -o yaml"
-        output = self.exec_oc_cmd(command)
+        if not served:
+            output = self.exec_oc_cmd(command)
         log.debug(f"{yaml.dump(output)}")
         self.cluster_context = config.cluster_ctx.MULTICLUSTER.get("multicluster_index")
         return output
@@ -501,6 +1054,19 @@ class OCP(object):
                 "At least one of resource_name or yaml_file have to " "be provided"
             )
 
+        served, output = self._try_api_backend(
+            "delete",
+            "delete",
+            kind=self.kind,
+            resource_name=resource_name,
+            yaml_file=yaml_file,
+            namespace=self.namespace,
+            wait=wait,
+            force=force,
+            timeout=timeout,
+        )
+        if served:
+            return output
         command = "delete "
         if resource_name:
             command += f"{self.kind} {resource_name}"
@@ -524,6 +1090,11 @@ class OCP(object):
         Returns:
             dict: Dictionary represents a returned yaml file
         """
+        served, output = self._try_api_backend(
+            "apply", "apply", yaml_file, namespace=self.namespace
+        )
+        if served:
+            return output
         command = f"apply -f {yaml_file}"
         return self.exec_oc_cmd(command)
 
@@ -541,6 +1112,17 @@ class OCP(object):
 
         """
         resource_name = resource_name or self.resource_name
+        served, _ = self._try_api_backend(
+            "patch",
+            "patch",
+            self.kind,
+            resource_name,
+            params,
+            namespace=self.namespace,
+            format_type=format_type,
+        )
+        if served:
+            return True
         params = "'" + f"{params}" + "'"
         command = f"patch {self.kind} {resource_name} -n {self.namespace} -p {params}"
         if format_type:
@@ -649,6 +1231,23 @@ class OCP(object):
             timeout = remaining_timeout
 
         namespace: str | None = namespace if namespace else self.namespace
+        try:
+            served, result = self._try_api_backend(
+                "wait",
+                "wait",
+                self.kind,
+                resource_name=resource_name,
+                namespace=namespace,
+                condition=condition,
+                jsonpath=jsonpath,
+                delete=delete,
+                selector=selector,
+                timeout=timeout,
+            )
+        except CommandFailed:
+            return False
+        if served:
+            return result
         base_cmd: str = f"wait {self.kind} {resource_name} --namespace {namespace}"
         # Build the wait command based on the mode
         if delete:
@@ -1040,6 +1639,7 @@ class OCP(object):
         sleep=3,
         dont_allow_other_resources=False,
         error_condition=None,
+        jsonpath=None,
     ):
         """
         Wait for a resource to reach to a desired condition
@@ -1068,6 +1668,8 @@ class OCP(object):
                 unrecoverable state of the resource(s) which is not expected to
                 be part of a workflow under test, and at the same time, the
                 timeout itself is large.
+            jsonpath (str): JSONPath expression of the field compared with the
+                condition instead of the column, e.g. '{.status.phase}'
 
         Returns:
             bool: True in case all resources reached desired condition,
@@ -1084,7 +1686,13 @@ class OCP(object):
 
         # if dont_allow_other_resources or resource_count or error_condition are used, don't try build command with
         # oc wait, but use the old way with oc get and TimeoutSampler
-        if not (dont_allow_other_resources or resource_count or error_condition):
+        if not (
+            dont_allow_other_resources
+            or resource_count
+            or error_condition
+            or jsonpath
+            or self._informer_serves_column(column)
+        ):
             if not self._process_oc_wait_cmd(column, condition):
                 # continue with legacy approach
                 pass
@@ -1115,18 +1723,23 @@ class OCP(object):
         actual_status = None
 
         try:
-            for sample in TimeoutSampler(
-                timeout, sleep, self.get, resource_name, True, selector
+            for sample in self._sample_resources(
+                timeout, sleep, resource_name, selector
             ):
                 # Only 1 resource expected to be returned
                 if resource_name:
                     retry = int(timeout / sleep if sleep else timeout / 1)
-                    status = self.get_resource(
-                        resource_name,
-                        column,
-                        retry=retry,
-                        wait=sleep,
-                    )
+                    if sample.get("kind") == "List":
+                        status = self.get_resource(
+                            resource_name,
+                            column,
+                            retry=retry,
+                            wait=sleep,
+                        )
+                    else:
+                        status = self._get_item_status(
+                            sample, column, jsonpath, retry=retry, wait=sleep
+                        )
                     if status == condition:
                         log.info(
                             f"status of {resource_name} at {column}"
@@ -1149,19 +1762,14 @@ class OCP(object):
                         )
                 # More than 1 resources returned
                 elif sample.get("kind") == "List":
-                    in_condition = []
-                    in_condition_len = 0
                     actual_status = []
                     sample = sample["items"]
                     sample_len = len(sample)
                     for item in sample:
                         try:
                             item_name = item.get("metadata").get("name")
-                            status = self.get_resource(item_name, column)
+                            status = self._get_item_status(item, column, jsonpath)
                             actual_status.append(status)
-                            if status == condition:
-                                in_condition.append(item)
-                                in_condition_len = len(in_condition)
                             if (
                                 error_condition is not None
                                 and status == error_condition
@@ -1177,25 +1785,28 @@ class OCP(object):
                                 f"Failed to get status of resource: {item_name} at column {column}, "
                                 f"Error: {ex}"
                             )
-                        if resource_count:
-                            if in_condition_len == resource_count:
+                    in_condition_len = self._count_in_condition(
+                        sample, condition, column, jsonpath, actual_status
+                    )
+                    if resource_count:
+                        if in_condition_len >= resource_count:
+                            log.info(
+                                f"{in_condition_len} resources already "
+                                f"reached condition!"
+                            )
+                            if dont_allow_other_resources and (
+                                sample_len != resource_count
+                                or in_condition_len != resource_count
+                            ):
                                 log.info(
-                                    f"{in_condition_len} resources already "
-                                    f"reached condition!"
+                                    f"There are {sample_len} resources in "
+                                    f"total. Continue to waiting as "
+                                    f"you don't allow other resources!"
                                 )
-                                if (
-                                    dont_allow_other_resources
-                                    and sample_len != in_condition_len
-                                ):
-                                    log.info(
-                                        f"There are {sample_len} resources in "
-                                        f"total. Continue to waiting as "
-                                        f"you don't allow other resources!"
-                                    )
-                                    continue
+                            else:
                                 return True
-                        elif len(sample) == len(in_condition):
-                            return True
+                    elif sample_len and in_condition_len == sample_len:
+                        return True
                     # preparing logging message with expected number of
                     # resource items we are waiting for
                     if resource_count > 0:
@@ -1276,6 +1887,20 @@ class OCP(object):
         if config.ENV_DATA["platform"].lower() == constants.IBM_POWER_PLATFORM:
             timeout = 720
         start_time = time.time()
+        informer = self.get_informer() if resource_name else None
+        if informer:
+            generation = informer.generation
+            while informer.get(resource_name) is not None:
+                remaining = timeout - (time.time() - start_time)
+                if remaining <= 0:
+                    describe_out = self.describe(resource_name=resource_name)
+                    raise TimeoutError(
+                        f"Timeout when waiting for {resource_name} to delete. "
+                        f"Describe output: {describe_out}"
+                    )
+                generation = informer.wait_for_change(generation, remaining)
+            log.info(f"{self.kind} {resource_name} got deleted successfully")
+            return True
         while True:
             try:
                 self.get(resource_name=resource_name)
@@ -1318,6 +1943,10 @@ class OCP(object):
         """
         resource_name = resource_name if resource_name else self.resource_name
         selector = selector if selector else self.selector
+        if resource_name and not selector:
+            value = self._get_column_from_informer(resource_name, column)
+            if value is not None:
+                return value
         # Get the resource in str format
         resource = self.get(
             resource_name=resource_name,
@@ -1547,6 +2176,18 @@ class OCP(object):
 
         """
         log.info("fetching logs from %s/%s", self.kind, name)
+        if not all_containers:
+            served, output = self._try_api_backend(
+                "logs",
+                "logs",
+                self.kind,
+                name,
+                self.namespace,
+                container_name=container_name,
+                timeout=timeout,
+            )
+            if served:
+                return mask_secrets(output, secrets)
         oc_cmd = f"logs {self.kind}/{name}"
         if container_name is not None:
             oc_cmd += f" --container='{container_name}'"
@@ -0,0 +1,293 @@
+"""
+Columnar model of the placement groups and OSDs
+
+'ceph pg dump pgs_brief' of a big cluster has tens of thousands of PGs and
+walking the parsed json in python loops for every validation is slow. The
+PlacementModel converts the dump and 'ceph osd df' once to numpy arrays and
+pandas frames: up and acting sets are padded 2D arrays (missing OSDs are -1),
+so PGs per OSD, primaries, remapped PGs, per pool distribution and the skew
+of the distribution are computed by vectorized operations.
+
+Usage:
+    model = PlacementModel.from_snapshot()
+    pgs_per_osd = model.pgs_per_osd()
+    remapped = model.remapped_pgids()
+"""
+
+import itertools
+import logging
+
+import numpy as np
+import pandas as pd
+
+from ocs_ci.ocs.ceph_snapshot import get_ceph_snapshot
+
+log = logging.getLogger(__name__)
+
+# OSD id used by CRUSH for a missing OSD (e.g. a missing EC shard)
+CRUSH_ITEM_NONE = 0x7FFFFFFF
+NO_OSD = -1
+
+
+def _osd_sets_to_array(osd_sets):
+    """
+    Convert the up or acting sets of the PGs to a padded 2D array
+
+    Args:
+        osd_sets (list): list of lists of OSD ids
+
+    Returns:
+        numpy.ndarray: array of shape (PGs, max set size), NO_OSD for the
+            padding and the missing OSDs
+
+    """
+    lengths = np.fromiter(map(len, osd_sets), dtype=np.int64, count=len(osd_sets))
+    width = int(lengths.max()) if len(lengths) else 0
+    array = np.full((len(osd_sets), width), NO_OSD, dtype=np.int64)
+    flat = np.fromiter(
+        itertools.chain.from_iterable(osd_sets),
+        dtype=np.int64,
+        count=int(lengths.sum()),
+    )
+    array[np.arange(width) < lengths[:, None]] = flat
+    array[array == CRUSH_ITEM_NONE] = NO_OSD
+    return array
+
+
+class PlacementModel(object):
+    """
+    Columnar model of the PGs and OSDs of the cluster
+    """
+
+    def __init__(self, pg_dump, osd_df=None):
+        """
+        Initializer function
+
+        Args:
+            pg_dump (dict or list): parsed 'ceph pg dump pgs_brief' output
+            osd_df (dict): parsed 'ceph osd df' output
+
+        """
+        pg_stats = pg_dump.get("pg_stats", []) if isinstance(pg_dump, dict) else pg_dump
+        self.pgids = np.array([pg["pgid"] for pg in pg_stats], dtype=object)
+        self.pools = (
+            pd.Series(self.pgids, dtype=object)
+            .str.partition(".")[0]
+            .astype(np.int64)
+            .to_numpy()
+            if len(self.pgids)
+            else np.array([], dtype=np.int64)
+        )
+        self.states = np.array([pg["state"] for pg in pg_stats], dtype=object)
+        self.up = _osd_sets_to_array([pg.get("up", []) for pg in pg_stats])
+        self.acting = _osd_sets_to_array([pg.get("acting", []) for pg in pg_stats])
+        self.up_primary = np.array(
+            [pg.get("up_primary", NO_OSD) for pg in pg_stats], dtype=np.int64
+        )
+        self.acting_primary = np.array(
+            [pg.get("acting_primary", NO_OSD) for pg in pg_stats], dtype=np.int64
+        )
+        nodes = (osd_df or {}).get("nodes", [])
+        self.osds = pd.DataFrame(
+            nodes,
+            columns=sorted(set().union(*(node.keys() for node in nodes)))
+            or ["id", "name", "pgs", "utilization", "crush_weight"],
+        )
+        if not self.osds.empty:
+            if "id" not in self.osds:
+                self.osds["id"] = (
+                    self.osds["name"].str.partition(".")[2].astype(np.int64)
+                )
+            self.osds = self.osds.set_index("id", drop=False).sort_index()
+
+    @classmethod
+    def from_snapshot(cls, snapshot=None, include_pgs=True):
+        """
+        Build the model from the shared ceph state snapshot
+
+        Args:
+            snapshot (CephStateSnapshot): snapshot, the one of the current
+                cluster by default
+            include_pgs (bool): False to skip the pg dump when only the OSD
+                data are needed
+
+        Returns:
+            PlacementModel: the model
+
+        """
+        snapshot = snapshot or get_ceph_snapshot()
+        snapshot.prefetch(["pg_dump", "osd_df"] if include_pgs else ["osd_df"])
+        pg_dump = snapshot.get("pg_dump") if include_pgs else []
+        return cls(pg_dump, snapshot.get("osd_df"))
+
+    @property
+    def osd_ids(self):
+        """
+        Returns:
+            numpy.ndarray: ids of the OSDs known from osd df or the PG sets
+
+        """
+        if not self.osds.empty:
+            return self.osds["id"].to_numpy(dtype=np.int64)
+        return np.unique(self.acting[self.acting != NO_OSD])
+
+    def _count_per_osd(self, osd_ids):
+        osd_ids = osd_ids[osd_ids != NO_OSD]
+        ids = self.osd_ids
+        size = max(
+            int(ids.max()) + 1 if len(ids) else 0, int(osd_ids.max(initial=-1)) + 1
+        )
+        counts = np.bincount(osd_ids, minlength=size)
+        return pd.Series(counts[ids], index=ids)
+
+    def get_pgids(self, pool=None, state=None):
+        """
+        Args:
+            pool (int): Only the PGs of the pool id
+            state (str): Only the PGs in the state, e.g. 'active+clean'
+
+        Returns:
+            list: pgids
+
+        """
+        mask = np.ones(len(self.pgids), dtype=bool)
+        if pool is not None:
+            mask &= self.pools == pool
+        if state is not None:
+            mask &= self.states == state
+        return self.pgids[mask].tolist()
+
+    def pgs_per_osd(self, source="acting"):
+        """
+        Number of PGs mapped to each OSD
+
+        Args:
+            source (str): 'up' or 'acting' set of the PGs, or 'osd_df' for the
+                counts reported by 'ceph osd df'
+
+        Returns:
+            pandas.Series: PG count indexed by OSD id
+
+        """
+        if source == "osd_df":
+            return self.osds["pgs"].astype(np.int64)
+        return self._count_per_osd(getattr(self, source).ravel())
+
+    def primaries_per_osd(self):
+        """
+        Returns:
+            pandas.Series: number of PGs for which the OSD is the acting
+                primary, indexed by OSD id
+
+        """
+        return self._count_per_osd(self.acting_primary)
+
+    def pg_count_deviation(self, source="osd_df"):
+        """
+        Difference of the PG count of each OSD from the rounded average, the
+        measure used by validate_pg_balancer
+
+        Args:
+            source (str): see pgs_per_osd
+
+        Returns:
+            pandas.Series: absolute difference indexed by OSD id
+
+        """
+        pgs = self.pgs_per_osd(source)
+        return (pgs - round(pgs.mean())).abs()
+
+    def skew_score(self, source="acting"):
+        """
+        Skew of the PG distribution against the CRUSH weights of the OSDs,
+        root mean square of the relative difference of the PG count of each
+        OSD from its weight proportional share. 0 is a perfect distribution.
+
+        Args:
+            source (str): see pgs_per_osd
+
+        Returns:
+            float: the score
+
+        """
+        pgs = self.pgs_per_osd(source).to_numpy(dtype=float)
+        if not len(pgs) or not pgs.sum():
+            return 0.0
+        if "crush_weight" in self.osds and self.osds["crush_weight"].sum() > 0:
+            weights = self.osds["crush_weight"].to_numpy(dtype=float)
+        else:
+            weights = np.ones(len(pgs))
+        targets = pgs.sum() * weights / weights.sum()
+        relative = np.divide(
+            pgs - targets, targets, out=np.zeros_like(pgs), where=targets > 0
+        )
+        return float(np.sqrt(np.mean(relative**2)))
+
+    def remapped_pgids(self):
+        """
+        Returns:
+            list: pgids of the PGs whose up set differs from the acting set
+
+        """
+        up, acting = self.up, self.acting
+        width = max(up.shape[1], acting.shape[1])
+        up = np.pad(up, ((0, 0), (0, width - up.shape[1])), constant_values=NO_OSD)
+        acting = np.pad(
+            acting, ((0, 0), (0, width - acting.shape[1])), constant_values=NO_OSD
+        )
+        return self.pgids[(up != acting).any(axis=1)].tolist()
+
+    def degraded_pgids(self):
+        """
+        Returns:
+            list: pgids of the PGs with a missing OSD in the acting set
+
+        """
+        sizes = (self.up != NO_OSD).sum(axis=1)
+        acting_sizes = (self.acting != NO_OSD).sum(axis=1)
+        return self.pgids[acting_sizes < sizes].tolist()
+
+    def pool_distribution(self, source="acting"):
+        """
+        Number of PGs of each pool mapped to each OSD
+
+        Args:
+            source (str): 'up' or 'acting'
+
+        Returns:
+            pandas.DataFrame: PG counts, pool ids as rows and OSD ids as
+                columns
+
+        """
+        sets = getattr(self, source)
+        pools = np.broadcast_to(self.pools[:, None], sets.shape)
+        valid = sets != NO_OSD
+        pool_ids, pool_index = np.unique(pools[valid], return_inverse=True)
+        osd_ids = self.osd_ids
+        osd_index = np.searchsorted(osd_ids, sets[valid])
+        known = (osd_index < len(osd_ids)) & (
+            osd_ids[np.minimum(osd_index, len(osd_ids) - 1)] == sets[valid]
+        )
+        counts = np.zeros((len(pool_ids), len(osd_ids)), dtype=np.int64)
+        np.add.at(counts, (pool_index[known], osd_index[known]), 1)
+        return pd.DataFrame(counts, index=pool_ids, columns=osd_ids)
+
+    def state_counts(self):
+        """
+        Returns:
+            dict: number of PGs per state
+
+        """
+        states, counts = np.unique(self.states.astype(str), return_counts=True)
+        return dict(zip(states.tolist(), counts.tolist()))
+
+    def osd_column(self, column):
+        """
+        Args:
+            column (str): column of 'ceph osd df' nodes, e.g. 'utilization'
+
+        Returns:
+            dict: value of the column per OSD name
+
+        """
+        return dict(zip(self.osds["name"], self.osds[column].tolist()))
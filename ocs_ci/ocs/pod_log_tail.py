@@ -0,0 +1,485 @@
+"""
+Incremental, cursor based collection of the pod logs
+
+get_pod_logs and the helpers built on it download the whole container log (or
+everything since a fixed time) on every call, so a loop waiting for a log line
+pulls the same megabytes again and again. A PodLogTail keeps a cursor (the
+timestamp of the last line read and the number of lines read with it) per
+pod and container. Every poll runs 'oc logs --timestamps --since-time=<cursor>'
+and appends only the new lines to a local spool file, the lines repeated
+because of the second granularity of --since-time are skipped. The readers
+and the pattern matchers work on the spool, a LogMatcher remembers its offset
+in the spool, so waiting for a log line costs work proportional to the new
+output only.
+
+Usage:
+    matched = wait_for_pattern_in_pod_logs(pod_name, "Reconcile completed")
+    logs = read_pod_logs(pod_name, container="rook-ceph-operator", since="5m")
+"""
+
+import logging
+import os
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+
+from ocs_ci.framework import config
+from ocs_ci.ocs import constants
+from ocs_ci.ocs.ocp import OCP
+from ocs_ci.utility.utils import TimeoutSampler
+
+logger = logging.getLogger(__name__)
+
+SINCE_TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+DURATION_RE = re.compile(r"(\d+)(h|m|s)")
+DURATION_UNITS = {"h": "hours", "m": "minutes", "s": "seconds"}
+
+_tails = {}
+_tails_lock = threading.Lock()
+
+
+def parse_log_timestamp(timestamp):
+    """
+    Parse the RFC3339Nano timestamp added by 'oc logs --timestamps'
+
+    Args:
+        timestamp (str): e.g. '2026-01-15T10:00:00.123456789Z'
+
+    Returns:
+        tuple: datetime of the second (UTC) and the nanoseconds, sortable
+
+    Raises:
+        ValueError: If the string isn't a timestamp
+
+    """
+    seconds, _, fraction = timestamp.rstrip("Z").partition(".")
+    second = datetime.strptime(seconds, "%Y-%m-%dT%H:%M:%S").replace(
+        tzinfo=timezone.utc
+    )
+    if fraction and not fraction.isdigit():
+        raise ValueError(f"Invalid timestamp {timestamp}")
+    return second, int(fraction[:9].ljust(9, "0")) if fraction else 0
+
+
+def parse_since_time(since_time):
+    """
+    Args:
+        since_time (str or datetime): RFC3339 time, e.g. '2026-01-15T10:00:00Z'
+
+    Returns:
+        datetime: the time in UTC
+
+    """
+    if isinstance(since_time, datetime):
+        moment = since_time
+    else:
+        moment = datetime.fromisoformat(since_time.replace("Z", "+00:00"))
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
+
+
+def parse_duration(since):
+    """
+    Args:
+        since (str): relative duration like 5s, 2m, 3h or 1h30m
+
+    Returns:
+        timedelta: the duration
+
+    Raises:
+        ValueError: If the duration can't be parsed
+
+    """
+    parts = DURATION_RE.findall(since)
+    if not parts or "".join(value + unit for value, unit in parts) != since:
+        raise ValueError(f"Invalid duration {since}")
+    return sum(
+        (timedelta(**{DURATION_UNITS[unit]: int(value)}) for value, unit in parts),
+        timedelta(),
+    )
+
+
+def get_spool_dir():
+    """
+    Returns:
+        str: directory of the log spools of the run
+
+    """
+    return os.path.join(
+        os.path.expanduser(config.RUN["log_dir"]),
+        f"pod_log_spool_{config.RUN['run_id']}",
+    )
+
+
+class PodLogTail(object):
+    """
+    Spool of the log of one container of a pod, extended by the new lines on
+    every poll
+    """
+
+    def __init__(
+        self, pod_name, container=None, namespace=None, since_time=None, spool_dir=None
+    ):
+        """
+        Initializer function
+
+        Args:
+            pod_name (str): Name of the pod
+            container (str): Name of the container, the default container of
+                the pod if None
+            namespace (str): Namespace of the pod
+            since_time (datetime): UTC time of the first line to collect, the
+                whole log if None
+            spool_dir (str): directory of the spool file
+
+        """
+        self.pod_name = pod_name
+        self.container = container
+        self.namespace = namespace or config.ENV_DATA["cluster_namespace"]
+        self.start = since_time
+        spool_dir = spool_dir or get_spool_dir()
+        os.makedirs(spool_dir, exist_ok=True)
+        self.spool_path = os.path.join(
+            spool_dir,
+            f"{config.ENV_DATA.get('cluster_name')}_{self.namespace}_{pod_name}_"
+            f"{container or 'default'}.log",
+        )
+        open(self.spool_path, "w").close()
+        self.polls = 0
+        self.lines = 0
+        self._cursor = None
+        self._cursor_lines = 0
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return (
+            f"PodLogTail({self.namespace}/{self.pod_name}, {self.container}, "
+            f"{self.lines} lines)"
+        )
+
+    def poll(self, timeout=600):
+        """
+        Append the lines logged since the last poll to the spool
+
+        Args:
+            timeout (int): timeout of the 'oc logs' command
+
+        Returns:
+            int: number of the new lines
+
+        """
+        with self._lock:
+            cmd = f"logs {self.pod_name} --timestamps"
+            if self.container:
+                cmd += f" -c {self.container}"
+            since = self._cursor[0] if self._cursor else self.start
+            if since:
+                cmd += f" --since-time={since.strftime(SINCE_TIME_FORMAT)}"
+            ocp_pod = OCP(kind=constants.POD, namespace=self.namespace)
+            cursor = self._cursor
+            skip = self._cursor_lines
+            new_lines = 0
+            with (
+                ocp_pod.exec_oc_cmd_stream(cmd, timeout=timeout) as process,
+                open(self.spool_path, "a", encoding="utf-8") as spool,
+            ):
+                for line in process.stdout.iter_lines():
+                    timestamp, _, message = line.partition(" ")
+                    try:
+                        key = parse_log_timestamp(timestamp)
+                    except ValueError:
+                        logger.debug(f"Skipping log line without timestamp: {line}")
+                        continue
+                    if cursor is not None:
+                        # --since-time has second granularity, skip the lines
+                        # which were read by the previous poll
+                        if key < cursor:
+                            continue
+                        if key == cursor and skip:
+                            skip -= 1
+                            continue
+                    if self.start and key[0] < self.start.replace(microsecond=0):
+                        continue
+                    spool.write(f"{timestamp} {message}\n")
+                    if key == self._cursor:
+                        self._cursor_lines += 1
+                    else:
+                        self._cursor = key
+                        self._cursor_lines = 1
+                    new_lines += 1
+            self.polls += 1
+            self.lines += new_lines
+            logger.debug(f"{new_lines} new lines in {self}")
+            return new_lines
+
+    def entries(self, offset=0):
+        """
+        Read the spooled lines
+
+        Args:
+            offset (int): byte offset in the spool to start from
+
+        Yields:
+            tuple: timestamp key, the line without the timestamp and the
+                offset after the line
+
+        """
+        with open(self.spool_path, "rb") as spool:
+            spool.seek(offset)
+            for raw_line in spool:
+                offset += len(raw_line)
+                timestamp, _, message = (
+                    raw_line.decode("utf-8", errors="replace")
+                    .rstrip("\n")
+                    .partition(" ")
+                )
+                yield parse_log_timestamp(timestamp), message, offset
+
+    def read_lines(self, since_time=None, tail=None):
+        """
+        Args:
+            since_time (datetime): only the lines logged since the UTC time
+            tail (int): only the last lines
+
+        Returns:
+            list: the spooled lines without the timestamps
+
+        """
+        lines = [
+            message
+            for key, message, _ in self.entries()
+            if since_time is None
+            or key[0] + timedelta(microseconds=key[1] // 1000) >= since_time
+        ]
+        if tail is not None:
+            lines = lines[-int(tail) :] if int(tail) else []
+        return lines
+
+
+class LogMatcher(object):
+    """
+    Incremental search of a pattern in the spool of a PodLogTail, every check
+    searches only the lines spooled since the previous check
+    """
+
+    def __init__(self, log_tail, pattern, flags=0):
+        """
+        Initializer function
+
+        Args:
+            log_tail (PodLogTail): the tail to search in
+            pattern (str): regular expression to search for
+            flags (int): flags of the regular expression
+
+        """
+        self.log_tail = log_tail
+        self.regex = re.compile(pattern, flags)
+        self.offset = 0
+
+    def check(self, poll=True):
+        """
+        Args:
+            poll (bool): poll the new lines of the log first
+
+        Returns:
+            str: the first new line matching the pattern, None if there isn't
+                any
+
+        """
+        if poll:
+            self.log_tail.poll()
+        for _, message, offset in self.log_tail.entries(self.offset):
+            self.offset = offset
+            if self.regex.search(message):
+                return message
+        return None
+
+
+def get_pod_log_tail(pod_name, container=None, namespace=None, since_time=None):
+    """
+    Get the tail of the container log shared by all the callers, the tail is
+    started again if it doesn't cover the requested time
+
+    Args:
+        pod_name (str): Name of the pod
+        container (str): Name of the container
+        namespace (str): Namespace of the pod
+        since_time (str or datetime): RFC3339 time of the first line needed,
+            the whole log if None
+
+    Returns:
+        PodLogTail: the tail
+
+    """
+    namespace = namespace or config.ENV_DATA["cluster_namespace"]
+    since_time = parse_since_time(since_time) if since_time else None
+    key = (config.cur_index, namespace, pod_name, container)
+    with _tails_lock:
+        log_tail = _tails.get(key)
+        if log_tail is None or (
+            log_tail.start is not None
+            and (since_time is None or since_time < log_tail.start)
+        ):
+            log_tail = PodLogTail(pod_name, container, namespace, since_time)
+            _tails[key] = log_tail
+        return log_tail
+
+
+def get_container_names(pod_name, namespace=None):
+    """
+    Args:
+        pod_name (str): Name of the pod
+        namespace (str): Namespace of the pod
+
+    Returns:
+        list: names of the init containers and containers of the pod
+
+    """
+    namespace = namespace or config.ENV_DATA["cluster_namespace"]
+    spec = OCP(kind=constants.POD, namespace=namespace).get(resource_name=pod_name)[
+        "spec"
+    ]
+    return [
+        container["name"]
+        for container in spec.get("initContainers", []) + spec.get("containers", [])
+    ]
+
+
+def read_pod_logs(
+    pod_name,
+    container=None,
+    namespace=None,
+    all_containers=False,
+    since=None,
+    since_time=None,
+    tail=None,
+):
+    """
+    Get the logs of the pod from the spool, only the new lines are downloaded
+
+    Args:
+        pod_name (str): Name of the pod
+        container (str): Name of the container
+        namespace (str): Namespace of the pod
+        all_containers (bool): logs of all the containers of the pod
+        since (str): only the lines newer than a relative duration like 5s,
+            2m, or 3h
+        since_time (str or datetime): only the lines since the RFC3339 time
+        tail (int): number of the last lines (of each container)
+
+    Returns:
+        list: lines of the logs
+
+    """
+    if since:
+        since_time = datetime.now(timezone.utc) - parse_duration(since)
+    since_time = parse_since_time(since_time) if since_time else None
+    containers = (
+        get_container_names(pod_name, namespace) if all_containers else [container]
+    )
+    lines = []
+    for name in containers:
+        log_tail = get_pod_log_tail(pod_name, name, namespace, since_time)
+        log_tail.poll()
+        lines.extend(log_tail.read_lines(since_time, tail))
+    return lines
+
+
+def grep_lines(
+    lines, pattern, regex=False, case_sensitive=False, context=0, first_match_only=True
+):
+    """
+    Filter the lines like grep
+
+    Args:
+        lines (list): the lines
+        pattern (str): string to search for, a regular expression if regex
+        regex (bool): True, if the pattern is a regular expression
+        case_sensitive (bool): True, if the search is case sensitive
+        context (int): number of lines to include before and after a match
+        first_match_only (bool): True, to stop at the first match
+
+    Returns:
+        list: the matching lines with their context, groups of lines are
+            separated by '--' like by grep
+
+    """
+    flags = 0 if case_sensitive else re.IGNORECASE
+    search = re.compile(pattern if regex else re.escape(pattern), flags).search
+    ranges = []
+    for number, line in enumerate(lines):
+        if search(line):
+            start, end = max(0, number - context), number + context + 1
+            if ranges and start <= ranges[-1][1]:
+                ranges[-1][1] = end
+            else:
+                ranges.append([start, end])
+            if first_match_only:
+                break
+    output = []
+    for start, end in ranges:
+        if output:
+            output.append("--")
+        output.extend(lines[start:end])
+    return output
+
+
+def wait_for_pattern_in_pod_logs(
+    pod_name,
+    pattern,
+    container=None,
+    namespace=None,
+    since_time=None,
+    timeout=300,
+    sleep=5,
+    flags=0,
+):
+    """
+    Wait for a line matching the pattern in the log of the pod container,
+    every poll downloads and searches only the new lines
+
+    Args:
+        pod_name (str): Name of the pod
+        pattern (str): regular expression to wait for
+        container (str): Name of the container
+        namespace (str): Namespace of the pod
+        since_time (str or datetime): search the lines since the RFC3339 time,
+            the whole log if None
+        timeout (int): seconds to wait
+        sleep (int): seconds between the polls
+        flags (int): flags of the regular expression
+
+    Returns:
+        str: the matching line
+
+    Raises:
+        TimeoutExpiredError: If no line matched in time
+
+    """
+    log_tail = get_pod_log_tail(pod_name, container, namespace, since_time)
+    matcher = LogMatcher(log_tail, pattern, flags)
+    since = parse_since_time(since_time) if since_time else None
+    # lines older than since_time can be in the shared spool
+    if since is not None:
+        for key, _, offset in log_tail.entries():
+            if key[0] + timedelta(microseconds=key[1] // 1000) >= since:
+                break
+            matcher.offset = offset
+    for matched in TimeoutSampler(timeout, sleep, matcher.check):
+        if matched is not None:
+            logger.info(f"Found {pattern} in logs of {pod_name}: {matched}")
+            return matched
+
+
+def clear_pod_log_tails():
+    """
+    Forget all the tails, their spools are removed
+    """
+    with _tails_lock:
+        for log_tail in _tails.values():
+            try:
+                os.remove(log_tail.spool_path)
+            except OSError:
+                pass
+        _tails.clear()
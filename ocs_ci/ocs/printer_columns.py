@@ -0,0 +1,548 @@
+"""
+Printer column evaluation of already fetched resources
+
+'oc get <kind>' prints a table whose columns are computed by the server from
+the resource data. Waiting for a list of resources used to run one more
+'oc get' per item just to parse a single column out of the table. This module
+computes the columns used by the tests (STATUS, READY, PHASE, RESTARTS, ...)
+from the resource dictionaries, so a whole List is evaluated from one
+response. Custom resources use the additionalPrinterColumns of their CRD.
+
+It also provides a small condition API on top of jsonpath expressions, e.g.
+'{.status.phase}=Bound' or '{.status.readyReplicas}>=2'.
+"""
+
+import logging
+import re
+
+from ocs_ci.ocs.exceptions import UnsupportedPrinterColumn
+
+log = logging.getLogger(__name__)
+
+NONE_VALUE = "<none>"
+ACCESS_MODES_SHORT = {
+    "ReadWriteOnce": "RWO",
+    "ReadOnlyMany": "ROX",
+    "ReadWriteMany": "RWX",
+    "ReadWriteOncePod": "RWOP",
+}
+NODE_ROLE_LABEL_PREFIX = "node-role.kubernetes.io/"
+NODE_ROLE_LABEL = "kubernetes.io/role"
+
+_JSONPATH_TOKEN = re.compile(
+    r"""
+    \.(?P<key>[\w\-/]+)
+    | \[(?P<index>-?\d+|\*)\]
+    | \[['"](?P<quoted>[^'"]+)['"]\]
+    | \[\?\(@\.(?P<filter_path>[\w.\-/]+)\s*(?P<filter_op>==|!=)\s*
+        ['"]?(?P<filter_value>[^'"\)]*)['"]?\)\]
+    """,
+    re.VERBOSE,
+)
+_CONDITION = re.compile(
+    r"""
+    \s*(?P<subject>\{.*?\}|[^=!<>]+?)
+    \s*(?P<operator>==|!=|>=|<=|=|>|<|\s\s*notin\s|\s\s*in\s)
+    \s*(?P<value>.*?)\s*
+    """,
+    re.VERBOSE,
+)
+
+
+def _parse_jsonpath(expression):
+    """
+    Split jsonpath expression to tokens
+
+    Args:
+        expression (str): e.g. '{.status.conditions[?(@.type=="Ready")].status}'
+
+    Returns:
+        list: of re.Match objects of the tokens
+
+    Raises:
+        UnsupportedPrinterColumn: if the expression uses unsupported syntax
+
+    """
+    path = expression.strip().strip("'\"").strip()
+    if path.startswith("{") and path.endswith("}"):
+        path = path[1:-1].strip()
+    if path.startswith("$"):
+        path = path[1:]
+    if path and not path.startswith((".", "[")):
+        path = f".{path}"
+    tokens = []
+    position = 0
+    while position < len(path):
+        match = _JSONPATH_TOKEN.match(path, position)
+        if not match:
+            raise UnsupportedPrinterColumn(
+                f"Unsupported jsonpath expression: {expression}"
+            )
+        tokens.append(match)
+        position = match.end()
+    return tokens
+
+
+def _get_path(data, path):
+    for key in path.split("."):
+        data = data.get(key) if isinstance(data, dict) else None
+    return data
+
+
+def evaluate_jsonpath(data, expression):
+    """
+    Evaluate jsonpath expression in the same way as 'oc get -o jsonpath'
+
+    Supports keys, indexes, wildcards and equality filters, e.g.
+    '{.items[*].metadata.name}' or '{.status.conditions[?(@.type=="Ready")].status}'
+
+    Args:
+        data (dict): Resource data
+        expression (str): jsonpath expression
+
+    Returns:
+        list: all the values matched by the expression
+
+    Raises:
+        UnsupportedPrinterColumn: if the expression uses unsupported syntax
+
+    """
+    values = [data]
+    for token in _parse_jsonpath(expression):
+        matched = []
+        for value in values:
+            if token["key"] or token["quoted"]:
+                key = token["key"] or token["quoted"]
+                if isinstance(value, dict) and key in value:
+                    matched.append(value[key])
+            elif token["index"]:
+                if not isinstance(value, list):
+                    continue
+                if token["index"] == "*":
+                    matched.extend(value)
+                elif -len(value) <= int(token["index"]) < len(value):
+                    matched.append(value[int(token["index"])])
+            else:
+                candidates = value if isinstance(value, list) else [value]
+                for candidate in candidates:
+                    field = _get_path(candidate, token["filter_path"])
+                    equal = jsonpath_value_to_str(field) == token["filter_value"]
+                    if equal == (token["filter_op"] == "=="):
+                        matched.append(candidate)
+        values = matched
+    return [value for value in values if value is not None]
+
+
+def jsonpath_value_to_str(value):
+    """
+    Format value in the same way as 'oc get -o jsonpath' prints it
+
+    Args:
+        value: Value found by the jsonpath expression
+
+    Returns:
+        str: printed value
+
+    """
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return str(value).lower()
+    if isinstance(value, list):
+        return " ".join(jsonpath_value_to_str(item) for item in value)
+    return str(value)
+
+
+def get_jsonpath_str(data, expression):
+    """
+    Get the output of 'oc get -o jsonpath=<expression>' for the resource
+
+    Args:
+        data (dict): Resource data
+        expression (str): jsonpath expression
+
+    Returns:
+        str: values matched by the expression separated by space
+
+    """
+    return jsonpath_value_to_str(evaluate_jsonpath(data, expression))
+
+
+def _pod_status(pod):
+    """
+    Compute STATUS column of the pod, same logic as printPod of kubectl
+    """
+    metadata = pod.get("metadata", {})
+    spec = pod.get("spec", {})
+    status = pod.get("status", {})
+    reason = status.get("reason") or status.get("phase", "")
+    initializing = False
+    init_statuses = status.get("initContainerStatuses") or []
+    for index, container in enumerate(init_statuses):
+        state = container.get("state", {})
+        terminated = state.get("terminated")
+        waiting = state.get("waiting")
+        if terminated and terminated.get("exitCode") == 0:
+            continue
+        if terminated:
+            if terminated.get("reason"):
+                reason = f"Init:{terminated['reason']}"
+            elif terminated.get("signal"):
+                reason = f"Init:Signal:{terminated['signal']}"
+            else:
+                reason = f"Init:ExitCode:{terminated.get('exitCode')}"
+        elif waiting and waiting.get("reason") not in (None, "", "PodInitializing"):
+            reason = f"Init:{waiting['reason']}"
+        elif container.get("started") and not waiting:
+            # restartable init container (sidecar) is running
+            continue
+        else:
+            reason = f"Init:{index}/{len(spec.get('initContainers') or [])}"
+        initializing = True
+        break
+    if not initializing:
+        has_running = False
+        for container in reversed(status.get("containerStatuses") or []):
+            state = container.get("state", {})
+            terminated = state.get("terminated")
+            waiting = state.get("waiting")
+            if waiting and waiting.get("reason"):
+                reason = waiting["reason"]
+            elif terminated and terminated.get("reason"):
+                reason = terminated["reason"]
+            elif terminated:
+                if terminated.get("signal"):
+                    reason = f"Signal:{terminated['signal']}"
+                else:
+                    reason = f"ExitCode:{terminated.get('exitCode')}"
+            elif container.get("ready") and state.get("running"):
+                has_running = True
+        if reason == "Completed" and has_running:
+            conditions = status.get("conditions") or []
+            pod_ready = any(
+                condition.get("type") == "Ready" and condition.get("status") == "True"
+                for condition in conditions
+            )
+            reason = "Running" if pod_ready else "NotReady"
+    if metadata.get("deletionTimestamp"):
+        reason = "Unknown" if status.get("reason") == "NodeLost" else "Terminating"
+    return reason
+
+
+def _pod_ready(pod):
+    statuses = pod.get("status", {}).get("containerStatuses") or []
+    ready = sum(
+        1
+        for container in statuses
+        if container.get("ready") and container.get("state", {}).get("running")
+    )
+    return f"{ready}/{len(pod.get('spec', {}).get('containers') or [])}"
+
+
+def _pod_restarts(pod):
+    status = pod.get("status", {})
+    statuses = (status.get("initContainerStatuses") or []) + (
+        status.get("containerStatuses") or []
+    )
+    return str(sum(container.get("restartCount", 0) for container in statuses))
+
+
+def _access_modes(resource):
+    modes = resource.get("status", {}).get("accessModes") or resource.get(
+        "spec", {}
+    ).get("accessModes")
+    if not modes:
+        return ""
+    return ",".join(ACCESS_MODES_SHORT.get(mode, mode) for mode in modes)
+
+
+def _phase_or_terminating(resource):
+    if resource.get("metadata", {}).get("deletionTimestamp"):
+        return "Terminating"
+    return resource.get("status", {}).get("phase", "")
+
+
+def _pv_claim(pv):
+    claim = pv.get("spec", {}).get("claimRef")
+    if not claim:
+        return ""
+    return f"{claim.get('namespace')}/{claim.get('name')}"
+
+
+def _node_status(node):
+    conditions = node.get("status", {}).get("conditions") or []
+    status = "Unknown"
+    for condition in conditions:
+        if condition.get("type") == "Ready":
+            status = "Ready" if condition.get("status") == "True" else "NotReady"
+    if node.get("spec", {}).get("unschedulable"):
+        status = f"{status},SchedulingDisabled"
+    return status
+
+
+def _node_roles(node):
+    roles = set()
+    for label, value in (node.get("metadata", {}).get("labels") or {}).items():
+        if label.startswith(NODE_ROLE_LABEL_PREFIX):
+            role = label[len(NODE_ROLE_LABEL_PREFIX) :]
+            if role:
+                roles.add(role)
+        elif label == NODE_ROLE_LABEL and value:
+            roles.add(value)
+    return ",".join(sorted(roles)) if roles else NONE_VALUE
+
+
+def _replicas_ready(resource):
+    status = resource.get("status", {})
+    return f"{status.get('readyReplicas', 0)}/{resource.get('spec', {}).get('replicas', 0)}"
+
+
+def _job_completions(job):
+    spec = job.get("spec", {})
+    succeeded = job.get("status", {}).get("succeeded", 0)
+    if spec.get("completions") is not None:
+        return f"{succeeded}/{spec['completions']}"
+    parallelism = spec.get("parallelism", 0)
+    if parallelism > 1:
+        return f"{succeeded}/1 of {parallelism}"
+    return f"{succeeded}/1"
+
+
+def _data_count(resource):
+    return str(len(resource.get("data") or {}) + len(resource.get("binaryData") or {}))
+
+
+def _field(*path, default=""):
+    """
+    Column which prints the value of the field
+    """
+
+    def get_field(resource):
+        value = _get_path(resource, ".".join(path))
+        return default if value is None else str(value)
+
+    return get_field
+
+
+# (kind, column) -> function computing the column of the resource
+BUILTIN_COLUMNS = {
+    ("Pod", "STATUS"): _pod_status,
+    ("Pod", "READY"): _pod_ready,
+    ("Pod", "RESTARTS"): _pod_restarts,
+    ("Pod", "IP"): _field("status", "podIP", default=NONE_VALUE),
+    ("Pod", "NODE"): _field("spec", "nodeName", default=NONE_VALUE),
+    ("PersistentVolumeClaim", "STATUS"): _phase_or_terminating,
+    ("PersistentVolumeClaim", "VOLUME"): _field("spec", "volumeName"),
+    ("PersistentVolumeClaim", "CAPACITY"): _field("status", "capacity", "storage"),
+    ("PersistentVolumeClaim", "ACCESS MODES"): _access_modes,
+    ("PersistentVolumeClaim", "STORAGECLASS"): _field(
+        "spec", "storageClassName", default=NONE_VALUE
+    ),
+    ("PersistentVolumeClaim", "VOLUMEMODE"): _field("spec", "volumeMode"),
+    ("PersistentVolume", "STATUS"): _phase_or_terminating,
+    ("PersistentVolume", "CAPACITY"): _field("spec", "capacity", "storage"),
+    ("PersistentVolume", "ACCESS MODES"): _access_modes,
+    ("PersistentVolume", "RECLAIM POLICY"): _field(
+        "spec", "persistentVolumeReclaimPolicy"
+    ),
+    ("PersistentVolume", "CLAIM"): _pv_claim,
+    ("PersistentVolume", "STORAGECLASS"): _field("spec", "storageClassName"),
+    ("Node", "STATUS"): _node_status,
+    ("Node", "ROLES"): _node_roles,
+    ("Node", "VERSION"): _field("status", "nodeInfo", "kubeletVersion"),
+    ("Namespace", "STATUS"): _field("status", "phase"),
+    ("Project", "STATUS"): _field("status", "phase"),
+    ("Deployment", "READY"): _replicas_ready,
+    ("Deployment", "UP-TO-DATE"): _field("status", "updatedReplicas", default="0"),
+    ("Deployment", "AVAILABLE"): _field("status", "availableReplicas", default="0"),
+    ("StatefulSet", "READY"): _replicas_ready,
+    ("ReplicaSet", "DESIRED"): _field("spec", "replicas", default="0"),
+    ("ReplicaSet", "CURRENT"): _field("status", "replicas", default="0"),
+    ("ReplicaSet", "READY"): _field("status", "readyReplicas", default="0"),
+    ("Job", "COMPLETIONS"): _job_completions,
+    ("ConfigMap", "DATA"): _data_count,
+    ("Secret", "DATA"): _data_count,
+    ("Secret", "TYPE"): _field("type"),
+}
+
+
+def is_builtin_column(kind, column):
+    """
+    Check whether the column of the built-in kind is computed by this module
+
+    Args:
+        kind (str): Kind of the resource, e.g. 'Pod'
+        column (str): The name of the column
+
+    Returns:
+        bool: True if the column can be computed without CRD printer columns
+
+    """
+    return column == "NAME" or (kind, column) in BUILTIN_COLUMNS
+
+
+def get_crd_printer_columns(crd, version):
+    """
+    Get printer columns of the custom resource which are printed by default
+    'oc get' (without '-o wide')
+
+    Args:
+        crd (dict): CustomResourceDefinition data
+        version (str): Version of the custom resource, e.g. 'v1'
+
+    Returns:
+        list: additionalPrinterColumns definitions
+
+    """
+    for crd_version in crd.get("spec", {}).get("versions") or []:
+        if crd_version.get("name") == version:
+            return [
+                column
+                for column in crd_version.get("additionalPrinterColumns") or []
+                if not column.get("priority")
+            ]
+    return []
+
+
+def get_column_value(resource, column, printer_columns=None):
+    """
+    Compute the value of the column which 'oc get' prints for the resource
+
+    Args:
+        resource (dict): Resource data with kind, as returned by 'oc get -o yaml'
+        column (str): The name of the column, e.g. 'STATUS'
+        printer_columns (list): additionalPrinterColumns of the CRD for
+            custom resources
+
+    Returns:
+        str: The value of the column
+
+    Raises:
+        UnsupportedPrinterColumn: if the column can't be computed
+
+    """
+    if column == "NAME":
+        return resource.get("metadata", {}).get("name", "")
+    kind = resource.get("kind")
+    function = BUILTIN_COLUMNS.get((kind, column))
+    if function:
+        return function(resource)
+    for printer_column in printer_columns or []:
+        if printer_column.get("name", "").upper() != column:
+            continue
+        if printer_column.get("type") == "date":
+            raise UnsupportedPrinterColumn(
+                f"Relative time column {column} of {kind} is not supported"
+            )
+        values = evaluate_jsonpath(resource, printer_column["jsonPath"])
+        return ",".join(jsonpath_value_to_str(value) for value in values)
+    raise UnsupportedPrinterColumn(f"Column {column} of {kind} is not supported")
+
+
+class Condition(object):
+    """
+    Condition on a resource field or printer column
+
+    The expression has form '<subject> <operator> <value>' where the subject
+    is a jsonpath expression in braces or a printer column name, e.g.
+    '{.status.phase}=Bound', 'STATUS!=Running', '{.spec.replicas}>=3' or
+    '{.status.phase} in (Bound,Pending)'.
+    """
+
+    def __init__(self, expression, printer_columns=None):
+        """
+        Initializer function
+
+        Args:
+            expression (str): The condition expression
+            printer_columns (list): additionalPrinterColumns used for column
+                subjects of custom resources
+
+        Raises:
+            UnsupportedPrinterColumn: if the expression can't be parsed
+
+        """
+        match = _CONDITION.fullmatch(expression)
+        if not match:
+            raise UnsupportedPrinterColumn(
+                f"Unsupported condition expression: {expression}"
+            )
+        self.expression = expression
+        self.subject = match["subject"].strip()
+        self.operator = match["operator"].strip()
+        self.value = match["value"].strip("'\"")
+        self.printer_columns = printer_columns
+        if self.operator in ("in", "notin"):
+            self.value = {
+                value.strip().strip("'\"")
+                for value in self.value.strip("()").split(",")
+            }
+        elif self.subject.startswith(("{", ".")):
+            # fail early on unsupported syntax
+            _parse_jsonpath(self.subject)
+
+    def __repr__(self):
+        return f"Condition({self.expression!r})"
+
+    def get_value(self, resource):
+        """
+        Get the value of the subject of the condition
+
+        Args:
+            resource (dict): Resource data
+
+        Returns:
+            str: value of the jsonpath or of the column
+
+        """
+        if self.subject.startswith(("{", ".")):
+            return get_jsonpath_str(resource, self.subject)
+        return get_column_value(resource, self.subject, self.printer_columns)
+
+    def evaluate(self, resource):
+        """
+        Evaluate the condition on the resource
+
+        Args:
+            resource (dict): Resource data
+
+        Returns:
+            bool: True if the resource matches the condition
+
+        """
+        value = self.get_value(resource)
+        if self.operator in ("=", "=="):
+            return value == self.value
+        if self.operator == "!=":
+            return value != self.value
+        if self.operator == "in":
+            return value in self.value
+        if self.operator == "notin":
+            return value not in self.value
+        try:
+            actual, expected = float(value), float(self.value)
+        except ValueError:
+            return False
+        return {
+            ">": actual > expected,
+            "<": actual < expected,
+            ">=": actual >= expected,
+            "<=": actual <= expected,
+        }[self.operator]
+
+
+def count_matching(resources, condition):
+    """
+    Count resources which match the condition
+
+    Args:
+        resources (list): Resources data, e.g. items of a List
+        condition (Condition or str): The condition or its expression
+
+    Returns:
+        int: number of the matching resources
+
+    """
+    if isinstance(condition, str):
+        condition = Condition(condition)
+    return sum(1 for resource in resources if condition.evaluate(resource))
@@ -2,10 +2,14 @@ import json
 import logging
 import os
 import random
+import shlex
 import time
 import traceback
 import tempfile
+import uuid
 
+from ocs_ci.ocs.ceph_channel import build_argv_batch_script, parse_batch_output
+from ocs_ci.ocs.ceph_snapshot import is_read_only_ceph_command
 from ocs_ci.ocs.resources import pod
 from ocs_ci.utility.utils import exec_cmd, run_cmd
 from ocs_ci.ocs import constants, ocp
@@ -26,10 +30,27 @@ class RadosHelper:
             self.log = lambda x: log.info(x)
         self.num_pools = self.get_num_pools()
         self.cluster = cluster
-        pools = self.list_pools()
-        self.pools = {}
-        for pool in pools:
-            self.pools[pool] = self.get_pool_property(pool, "pg_num")
+        # cached 'osd dump', the pool metadata are read from it
+        self._osd_dump = None
+        self.pools = {
+            str(pool["pool_name"]): int(pool["pg_num"])
+            for pool in self.get_osd_dump_json()["pools"]
+        }
+
+    def _cluster_cmd_args(self, args):
+        binary = "rados" if args and args[0] == "rados" else "ceph"
+        if binary == "rados":
+            args = args[1:]
+        return ["sudo", binary, "--cluster", self.cluster] + [str(x) for x in args]
+
+    def _invalidate_if_changed(self, args):
+        args = [str(x) for x in args]
+        if (
+            args
+            and args[0] != "rados"
+            and not is_read_only_ceph_command(" ".join(args))
+        ):
+            self.invalidate_pool_cache()
 
     def raw_cluster_cmd(self, *args):
         """
@@ -47,8 +68,68 @@ class RadosHelper:
         clstr_cmd = " ".join(str(x) for x in ceph_args)
         print(clstr_cmd)
         (stdout, stderr) = self.mon.exec_command(cmd=clstr_cmd)
+        self._invalidate_if_changed(args)
         return stdout, stderr
 
+    def raw_cluster_cmds(self, *commands):
+        """
+        Run several ceph or rados commands in one exec on the mon node
+
+        Args:
+            commands (tuple): arguments of each command, e.g.
+                ("osd", "pool", "get", "rbd", "size") for a ceph command or
+                ("rados", "-p", "rbd", "ls") for a rados command
+
+        Returns:
+            list: tuples (stdout, stderr, return code) of the commands, return
+                code is None if the command didn't finish
+
+        """
+        if not commands:
+            return []
+        marker = f"OCS-CI-RADOS-{uuid.uuid4().hex}"
+        script = build_argv_batch_script(
+            [self._cluster_cmd_args(list(args)) for args in commands], marker
+        )
+        logger.info(f"Running batch of {len(commands)} commands: {commands}")
+        (stdout, stderr) = self.mon.exec_command(cmd=f"sh -c {shlex.quote(script)}")
+        for args in commands:
+            self._invalidate_if_changed(args)
+        return parse_batch_output(stdout.read().decode(), marker, len(commands))
+
+    def raw_cluster_cmds_json(self, *commands):
+        """
+        Run several ceph or rados commands with json output in one exec
+
+        Args:
+            commands (tuple): arguments of each command without the format
+
+        Returns:
+            list: parsed output of each command
+
+        Raises:
+            CommandFailed: If a command failed
+
+        """
+        results = []
+        outputs = self.raw_cluster_cmds(
+            *(tuple(args) + ("--format=json",) for args in commands)
+        )
+        for args, (stdout, stderr, return_code) in zip(commands, outputs):
+            if return_code != 0:
+                raise CommandFailed(
+                    f"Error during execution of command: {' '.join(map(str, args))}"
+                    f"\nError is {stderr or 'the command did not finish'}"
+                )
+            results.append(_loads_json_output(stdout))
+        return results
+
+    def invalidate_pool_cache(self):
+        """
+        Drop the cached osd dump, the next pool lookup reads it again
+        """
+        self._osd_dump = None
+
     def get_num_pools(self):
         """
         :returns: number of pools in the
@@ -56,15 +137,20 @@ class RadosHelper:
         """
         """TODO"""
 
-    def get_osd_dump_json(self):
+    def get_osd_dump_json(self, refresh=False):
         """
-        osd dump --format=json converted to a python object
+        osd dump --format=json converted to a python object, the dump is cached
+        until a command changing the cluster runs through this helper
+
+        Args:
+            refresh (bool): read the dump again even if it's cached
+
         :returns: the python object
         """
-        (out, err) = self.raw_cluster_cmd("osd", "dump", "--format=json")
-        print(type(out))
-        outbuf = out.read().decode()
-        return json.loads("\n".join(outbuf.split("\n")[1:]))
+        if self._osd_dump is None or refresh:
+            (out, err) = self.raw_cluster_cmd("osd", "dump", "--format=json")
+            self._osd_dump = _loads_json_output(out.read().decode())
+        return self._osd_dump
 
     def create_pool(
         self,
@@ -143,12 +229,33 @@ class RadosHelper:
         outbuf = output.read().decode()
         return int(outbuf.split()[1])
 
+    def get_pool_properties(self, pool_name, props):
+        """
+        Get several properties of the pool in one exec
+
+        Args:
+            pool_name (str): pool
+            props (list): properties to be checked, e.g. ['size', 'min_size']
+
+        Returns:
+            dict: property name to its int value
+
+        """
+        assert isinstance(pool_name, str)
+        outputs = self.raw_cluster_cmds_json(
+            *(("osd", "pool", "get", pool_name, prop) for prop in props)
+        )
+        return {prop: int(output[prop]) for prop, output in zip(props, outputs)}
+
     def get_pool_dump(self, pool):
         """
         get the osd dump part of a pool
         """
-        osd_dump = self.get_osd_dump_json()
-        for i in osd_dump["pools"]:
+        for i in self.get_osd_dump_json()["pools"]:
+            if i["pool_name"] == pool:
+                return i
+        # the pool could be created by other client, read the dump again
+        for i in self.get_osd_dump_json(refresh=True)["pools"]:
             if i["pool_name"] == pool:
                 return i
         assert False
@@ -169,6 +276,23 @@ class RadosHelper:
         pg_str = "{poolnum}.{pgnum}".format(poolnum=poolnum, pgnum=pgnum)
         return pg_str
 
+    def get_pg_maps(self, pool, pgnums):
+        """
+        Get the maps of several PGs of the pool in one exec
+
+        Args:
+            pool (str): pool name
+            pgnums (list): pg numbers
+
+        Returns:
+            dict: pg number to the parsed 'pg map' output
+
+        """
+        outputs = self.raw_cluster_cmds_json(
+            *(("pg", "map", self.get_pgid(pool, pgnum)) for pgnum in pgnums)
+        )
+        return dict(zip(pgnums, outputs))
+
     def get_pg_primary(self, pool, pgnum):
         """
         get primary for pool, pgnum (e.g. (data, 0)->0
@@ -180,6 +304,23 @@ class RadosHelper:
         return int(j["acting"][0])
         assert False
 
+    def get_pg_primaries(self, pool, pgnums):
+        """
+        get primaries of several pgs of the pool in one exec
+
+        Args:
+            pool (str): pool name
+            pgnums (list): pg numbers
+
+        Returns:
+            dict: pg number to the id of its primary OSD
+
+        """
+        return {
+            pgnum: int(pg_map["acting"][0])
+            for pgnum, pg_map in self.get_pg_maps(pool, pgnums).items()
+        }
+
     def get_pg_random(self, pool, pgnum):
         """
         get random osd for pool, pgnum (e.g. (data, 0)->0
@@ -213,9 +354,7 @@ class RadosHelper:
         """
         :return 1 if up, 0 if down
         """
-        (output, err) = self.raw_cluster_cmd("osd", "dump", "--format=json")
-        outbuf = output.read().decode()
-        jbuf = json.loads(outbuf)
+        jbuf = self.get_osd_dump_json(refresh=True)
         self.log(jbuf)
 
         for osd in jbuf["osds"]:
@@ -280,6 +419,25 @@ class RadosHelper:
         return mgr_object
 
 
+def _loads_json_output(output):
+    """
+    Parse the json output of a command run on the mon node, skipping the lines
+    printed before the json document (e.g. by sudo)
+
+    Args:
+        output (str): stdout of the command
+
+    Returns:
+        dict or list: the parsed output
+
+    """
+    lines = output.split("\n")
+    for index, line in enumerate(lines):
+        if line.lstrip().startswith(("{", "[")):
+            return json.loads("\n".join(lines[index:]))
+    return json.loads(output)
+
+
 def verify_cephblockpool_status(
     pool_name=constants.DEFAULT_BLOCKPOOL,
     namespace=None,
@@ -316,19 +474,19 @@ def verify_cephblockpool_status(
     return phase == required_phase
 
 
-def fetch_pool_names(namespace=config.ENV_DATA["cluster_namespace"]):
+def _get_cephblockpools(namespace):
     """
-    Fetch the list of Ceph block pools in the specified namespace.
+    List the CephBlockPool resources, served by the informer cache when it's
+    enabled
 
     Args:
         namespace (str): The namespace to search for Ceph block pools.
-                         If None, defaults to the cluster namespace from config.
 
     Returns:
-        list: A list of names of Ceph block pools.
+        list: CephBlockPool resources
 
     """
-    pool_obj = (
+    return (
         ocp.OCP(
             kind=constants.CEPHBLOCKPOOL,
             namespace=namespace,
@@ -336,7 +494,21 @@ def fetch_pool_names(namespace=config.ENV_DATA["cluster_namespace"]):
         .get()
         .get("items")
     )
-    return [pool["metadata"]["name"] for pool in pool_obj]
+
+
+def fetch_pool_names(namespace=config.ENV_DATA["cluster_namespace"]):
+    """
+    Fetch the list of Ceph block pools in the specified namespace.
+
+    Args:
+        namespace (str): The namespace to search for Ceph block pools.
+                         If None, defaults to the cluster namespace from config.
+
+    Returns:
+        list: A list of names of Ceph block pools.
+
+    """
+    return [pool["metadata"]["name"] for pool in _get_cephblockpools(namespace)]
 
 
 def get_ec_pool_names(namespace=config.ENV_DATA["cluster_namespace"]):
@@ -350,17 +522,9 @@ def get_ec_pool_names(namespace=config.ENV_DATA["cluster_namespace"]):
         list: Names of erasure-coded CephBlockPools.
 
     """
-    pool_obj = (
-        ocp.OCP(
-            kind=constants.CEPHBLOCKPOOL,
-            namespace=namespace,
-        )
-        .get()
-        .get("items")
-    )
     return [
         pool["metadata"]["name"]
-        for pool in pool_obj
+        for pool in _get_cephblockpools(namespace)
         if pool.get("spec", {}).get("erasureCoded", {}).get("dataChunks", 0) > 0
     ]
 
@@ -519,15 +683,19 @@ def corrupt_pg(osd_deployment, pool_name, pool_object):
     bridge_name = bluefs_container["volumeMounts"][0]["name"]
 
     ct_pod = pod.get_ceph_tools_pod()
-    logger.info("Setting osd noout flag")
-    ct_pod.exec_ceph_cmd("ceph osd set noout")
-    logger.info("Setting osd noscrub flag")
-    ct_pod.exec_ceph_cmd("ceph osd set noscrub")
-    logger.info("Setting osd nodeep-scrub flag")
-    ct_pod.exec_ceph_cmd("ceph osd set nodeep-scrub")
-
-    logger.info(f"Looking for Placement Group ID with {pool_object} object")
-    pgid = ct_pod.exec_ceph_cmd(f"ceph osd map {pool_name} {pool_object}")["pgid"]
+    logger.info(
+        "Setting osd noout, noscrub and nodeep-scrub flags and looking for "
+        f"Placement Group ID with {pool_object} object"
+    )
+    *_, osd_map = ct_pod.exec_ceph_cmds(
+        [
+            "ceph osd set noout",
+            "ceph osd set noscrub",
+            "ceph osd set nodeep-scrub",
+            f"ceph osd map {pool_name} {pool_object}",
+        ]
+    )
+    pgid = osd_map["pgid"]
     logger.info(f"Found Placement Group ID: {pgid}")
 
     # Update osd deployment with an initContainer that breaks the pool before
@@ -0,0 +1,292 @@
+"""
+Progress aware tracking of the Ceph data rebalance
+
+CephCluster.wait_for_rebalance used to poll for all PGs being active+clean on
+a fixed cadence and required several consecutive clean checks, each of them a
+full poll interval apart, which added a fixed tail to every wait. The
+RebalanceTracker samples the recovery counters of 'ceph status' (misplaced
+and degraded objects, PG states and the progress events of the mgr progress
+module) into a time series. The recovery rate and the ETA are computed from
+the series, the wait ends as soon as the counters are zero and stay so for a
+few short confirmation samples, and the timeline is kept for the performance
+reporting of the tests.
+
+Usage:
+    tracker = RebalanceTracker()
+    assert tracker.wait(timeout=1800)
+    logger.info(tracker.summary())
+"""
+
+import collections
+import logging
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from ocs_ci.framework import config
+from ocs_ci.ocs.ceph_channel import get_ceph_command_channel
+
+log = logging.getLogger(__name__)
+
+# Samples used for the recovery rate
+RATE_WINDOW = 6
+
+RebalanceSample = collections.namedtuple(
+    "RebalanceSample",
+    [
+        "timestamp",
+        "elapsed",
+        "misplaced_objects",
+        "degraded_objects",
+        "unfound_objects",
+        "num_pgs",
+        "active_clean_pgs",
+        "recovering_objects_per_sec",
+        "progress",
+    ],
+)
+
+
+def sample_from_status(ceph_status, elapsed=0.0, timestamp=None):
+    """
+    Build the rebalance sample from the output of 'ceph status'
+
+    Args:
+        ceph_status (dict): parsed 'ceph status' output
+        elapsed (float): seconds since the start of the tracking
+        timestamp (datetime): time of the sample, now by default
+
+    Returns:
+        RebalanceSample: the sample
+
+    """
+    pgmap = ceph_status.get("pgmap", {})
+    active_clean = sum(
+        state["count"]
+        for state in pgmap.get("pgs_by_state", [])
+        if state["state_name"] == "active+clean"
+    )
+    events = (ceph_status.get("progress_events") or {}).values()
+    progress = [event.get("progress", 0) for event in events]
+    return RebalanceSample(
+        timestamp or datetime.now(timezone.utc),
+        elapsed,
+        pgmap.get("misplaced_objects", 0),
+        pgmap.get("degraded_objects", 0),
+        pgmap.get("unfound_objects", 0),
+        pgmap.get("num_pgs", 0),
+        active_clean,
+        pgmap.get("recovering_objects_per_sec", 0),
+        min(progress) if progress else None,
+    )
+
+
+def is_rebalance_complete(sample):
+    """
+    Args:
+        sample (RebalanceSample): the sample
+
+    Returns:
+        bool: True if there are no objects to recover and all the PGs are
+            active+clean
+
+    """
+    return (
+        sample.num_pgs > 0
+        and sample.active_clean_pgs == sample.num_pgs
+        and not sample.misplaced_objects
+        and not sample.degraded_objects
+        and not sample.unfound_objects
+    )
+
+
+class RebalanceTracker(object):
+    """
+    Time series of the recovery counters of the cluster
+    """
+
+    def __init__(self, namespace=None, sample_func=None):
+        """
+        Initializer function
+
+        Args:
+            namespace (str): Namespace of OCS
+            sample_func (callable): returns the parsed 'ceph status', reads it
+                from the toolbox by default
+
+        """
+        self.namespace = namespace or config.ENV_DATA["cluster_namespace"]
+        self._sample_func = sample_func or self._read_status
+        self.samples = []
+        self.start_time = None
+        self.end_time = None
+
+    def _read_status(self):
+        return get_ceph_command_channel(self.namespace).run_one("ceph status")
+
+    def sample(self):
+        """
+        Take a sample of the recovery counters
+
+        Returns:
+            RebalanceSample: the sample
+
+        """
+        now = time.monotonic()
+        if self.start_time is None:
+            self.start_time = now
+        sample = sample_from_status(self._sample_func(), now - self.start_time)
+        self.samples.append(sample)
+        log.info(
+            f"Rebalance: {sample.active_clean_pgs}/{sample.num_pgs} PGs "
+            f"active+clean, {sample.misplaced_objects} misplaced and "
+            f"{sample.degraded_objects} degraded objects, ETA {self.eta()}"
+        )
+        return sample
+
+    def remaining_objects(self):
+        """
+        Returns:
+            numpy.ndarray: misplaced plus degraded objects of each sample
+
+        """
+        return np.array(
+            [
+                sample.misplaced_objects + sample.degraded_objects
+                for sample in self.samples
+            ],
+            dtype=float,
+        )
+
+    def recovery_rate(self, window=RATE_WINDOW):
+        """
+        Recovery rate of the last samples, the slope of the linear fit of the
+        remaining objects
+
+        Args:
+            window (int): Number of the last samples used
+
+        Returns:
+            float: recovered objects per second, 0 if unknown
+
+        """
+        samples = self.samples[-window:]
+        if len(samples) < 2:
+            return float(samples[-1].recovering_objects_per_sec) if samples else 0.0
+        elapsed = np.array([sample.elapsed for sample in samples], dtype=float)
+        if np.ptp(elapsed) == 0:
+            return 0.0
+        slope = np.polyfit(elapsed, self.remaining_objects()[-len(samples) :], 1)[0]
+        # ignore the rounding noise of the fit of a flat series
+        return round(max(float(-slope), 0.0), 6)
+
+    def eta(self):
+        """
+        Returns:
+            float: estimated seconds to the end of the recovery, None if it
+                can't be estimated
+
+        """
+        if not self.samples:
+            return None
+        remaining = self.remaining_objects()[-1]
+        if not remaining:
+            return 0.0
+        rate = self.recovery_rate()
+        if rate > 0:
+            return round(remaining / rate, 1)
+        progress = self.samples[-1].progress
+        elapsed = self.samples[-1].elapsed
+        if progress and elapsed:
+            return round(elapsed * (1 - progress) / progress, 1)
+        return None
+
+    def wait(self, timeout=600, sleep=10, stable_samples=3, confirm_sleep=2):
+        """
+        Wait for the rebalance to complete
+
+        Args:
+            timeout (int): Seconds to wait for the completion of the rebalance
+            sleep (int): Seconds between the samples during the recovery
+            stable_samples (int): Number of consecutive clean samples needed
+            confirm_sleep (int): Seconds between the confirmation samples
+                once the counters reached zero
+
+        Returns:
+            bool: True if the rebalance completed, False otherwise
+
+        """
+        deadline = time.monotonic() + timeout
+        clean = 0
+        while True:
+            try:
+                sample = self.sample()
+            except Exception as ex:
+                # e.g. the toolbox is missing during node replacement or the
+                # status is partial, retried as TimeoutSampler did
+                log.warning(f"Failed to sample the rebalance status: {ex}")
+                sample = None
+                clean = 0
+            if sample is not None:
+                clean = clean + 1 if is_rebalance_complete(sample) else 0
+            if clean >= stable_samples:
+                self.end_time = time.monotonic()
+                log.info(
+                    f"Re-balance completed in {self.duration:.1f}s, "
+                    f"{clean} consecutive clean samples"
+                )
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                log.error(
+                    f"Data re-balance failed to complete within the given "
+                    f"timeout of {timeout} seconds"
+                )
+                return False
+            time.sleep(min(confirm_sleep if clean else sleep, remaining))
+
+    @property
+    def duration(self):
+        """
+        Returns:
+            float: seconds from the first sample to the completion (or the
+                last sample)
+
+        """
+        if not self.samples:
+            return 0.0
+        if self.end_time is not None:
+            return self.end_time - self.start_time
+        return self.samples[-1].elapsed
+
+    def timeline(self):
+        """
+        Returns:
+            list: samples as dicts for the performance reports
+
+        """
+        return [
+            dict(sample._asdict(), timestamp=sample.timestamp.isoformat())
+            for sample in self.samples
+        ]
+
+    def summary(self):
+        """
+        Returns:
+            dict: duration, completion, peak and average recovery of the
+                rebalance
+
+        """
+        remaining = self.remaining_objects()
+        return {
+            "duration": round(self.duration, 1),
+            "completed": self.end_time is not None,
+            "samples": len(self.samples),
+            "peak_remaining_objects": int(remaining.max()) if len(remaining) else 0,
+            "average_recovery_rate": (
+                round(float(remaining.max() - remaining[-1]) / self.duration, 1)
+                if len(remaining) and self.duration
+                else 0.0
+            ),
+        }
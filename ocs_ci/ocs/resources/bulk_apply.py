@@ -0,0 +1,288 @@
+# -*- coding: utf8 -*-
+"""
+Bulk creation of Kubernetes/OpenShift objects with server side apply.
+
+Scale and performance tests create hundreds of objects (typically PVCs) at
+once. Instead of one 'oc create' per object followed by a blind sleep, a batch
+of manifests is submitted as a single multi-document request with server side
+apply, and the objects are tracked by a watch until they reach the desired
+state, recording per-object latency from the submission.
+
+Usage:
+    bulk = BulkApply(pvc_dict_list, namespace="my-namespace")
+    bulk.submit()
+    latencies = bulk.wait_for("STATUS=Bound", timeout=600)
+    logger.info(latency_summary(latencies))
+    bulk.delete()
+"""
+
+import copy
+import logging
+import os
+import statistics
+import tempfile
+import time
+
+import yaml
+
+from ocs_ci.framework import config
+from ocs_ci.ocs.api_backend import FIELD_MANAGER
+from ocs_ci.ocs.exceptions import TimeoutExpiredError
+from ocs_ci.ocs.informer import get_informer
+from ocs_ci.ocs.ocp import OCP
+from ocs_ci.ocs.printer_columns import Condition
+
+logger = logging.getLogger(__name__)
+
+
+def latency_summary(latencies):
+    """
+    Compute statistics of per-object latencies
+
+    Args:
+        latencies (dict): Latency in seconds per object name
+
+    Returns:
+        dict: count, min, max, avg, median and p95 of the latencies
+
+    """
+    values = sorted(latencies.values())
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "min": round(values[0], 3),
+        "max": round(values[-1], 3),
+        "avg": round(statistics.mean(values), 3),
+        "median": round(statistics.median(values), 3),
+        "p95": round(values[min(len(values) - 1, int(len(values) * 0.95))], 3),
+    }
+
+
+def track_resources(
+    kind,
+    names,
+    namespace=None,
+    condition=None,
+    deleted=False,
+    start_time=None,
+    timeout=600,
+    sleep=3,
+    cluster_kubeconfig="",
+):
+    """
+    Track objects of one kind by a watch until they exist and match the
+    condition, or until they are deleted. Without access to the API (e.g. the
+    kind can't be watched) the objects are polled with a single list request
+    per iteration.
+
+    Args:
+        kind (str): Kind of the objects
+        names (list): Names of the tracked objects
+        namespace (str): Namespace of the objects, None for cluster scoped kinds
+        condition (Condition or str): Condition the objects have to match,
+            e.g. 'STATUS=Bound', None to wait only for the objects to exist
+        deleted (bool): Wait for the objects to be deleted instead
+        start_time (float): Time the latencies are measured from, default now
+        timeout (int): Time in seconds to wait
+        sleep (int): Polling interval in seconds used without watch
+        cluster_kubeconfig (str): Path to the kubeconfig of the cluster
+
+    Returns:
+        dict: Latency in seconds per object name
+
+    Raises:
+        TimeoutExpiredError: if not all the objects reached the state in time
+
+    """
+    if isinstance(condition, str):
+        condition = Condition(condition)
+    start_time = start_time or time.time()
+    ocp_obj = OCP(kind=kind, namespace=namespace, cluster_kubeconfig=cluster_kubeconfig)
+    informer = None
+    kubeconfig = ocp_obj.get_kubeconfig_path()
+    try:
+        if kubeconfig:
+            informer = get_informer(kubeconfig, kind, namespace)
+    except Exception as ex:
+        logger.warning(f"Can't watch {kind}, polling the objects instead: {ex}")
+    pending = set(names)
+    latencies = {}
+    generation = None
+    while True:
+        if informer:
+            generation = informer.generation
+            items = informer.list()
+        else:
+            items = ocp_obj.get(dont_raise=True)
+            items = items.get("items", []) if items else []
+        now = time.time()
+        existing = {item["metadata"]["name"]: item for item in items}
+        for name in list(pending):
+            item = existing.get(name)
+            if deleted:
+                done = item is None
+            else:
+                done = item is not None and (
+                    condition is None or condition.evaluate(item)
+                )
+            if done:
+                latencies[name] = now - start_time
+                pending.discard(name)
+        if not pending:
+            return latencies
+        remaining = timeout - (time.time() - start_time)
+        if remaining <= 0:
+            raise TimeoutExpiredError(
+                timeout,
+                f"{len(pending)} of {len(names)} {kind} objects didn't reach "
+                f"{'deletion' if deleted else condition or 'existence'}: "
+                f"{sorted(pending)[:20]}",
+            )
+        logger.info(
+            f"{len(names) - len(pending)} of {len(names)} {kind} objects done, "
+            f"waiting for {len(pending)} more"
+        )
+        if informer:
+            informer.wait_for_change(generation, min(remaining, 60))
+        else:
+            time.sleep(min(remaining, sleep))
+
+
+class BulkApply(object):
+    """
+    Batch of objects which are created by single server side apply request
+    and tracked by a watch
+    """
+
+    def __init__(self, obj_dict_list, namespace=None, cluster_kubeconfig=""):
+        """
+        Initializer function
+
+        Args:
+            obj_dict_list (list): List of dictionaries with k8s objects
+            namespace (str): Namespace of the objects which don't specify one
+            cluster_kubeconfig (str): Path to the kubeconfig of the cluster
+
+        """
+        self.namespace = namespace or config.ENV_DATA["cluster_namespace"]
+        self.cluster_kubeconfig = cluster_kubeconfig
+        self.objects = copy.deepcopy(obj_dict_list)
+        self.submit_time = None
+        self.yaml_file = None
+        self.latencies = {}
+        self._ocp = OCP(namespace=self.namespace, cluster_kubeconfig=cluster_kubeconfig)
+
+    def __len__(self):
+        return len(self.objects)
+
+    @property
+    def groups(self):
+        """
+        Objects of the batch grouped by kind and namespace
+
+        Returns:
+            dict: (kind, namespace) -> list of object names
+
+        """
+        groups = {}
+        for obj in self.objects:
+            namespace = obj["metadata"].get("namespace") or self.namespace
+            groups.setdefault((obj["kind"], namespace), []).append(
+                obj["metadata"]["name"]
+            )
+        return groups
+
+    def _dump(self):
+        if self.yaml_file is None:
+            fd, self.yaml_file = tempfile.mkstemp(prefix="bulk_apply_", suffix=".yaml")
+            with os.fdopen(fd, "w") as yaml_file:
+                yaml.safe_dump_all(self.objects, yaml_file)
+        return self.yaml_file
+
+    def submit(self):
+        """
+        Submit all the objects as one multi-document server side apply
+
+        Returns:
+            float: submission time the latencies are measured from
+
+        """
+        yaml_file = self._dump()
+        logger.info(f"Applying {len(self)} objects in bulk from {yaml_file}")
+        self.submit_time = time.time()
+        served, _ = self._ocp._try_api_backend(
+            "apply", "apply", yaml_file, namespace=self.namespace
+        )
+        if not served:
+            self._ocp.exec_oc_cmd(
+                f"apply --server-side --force-conflicts "
+                f"--field-manager={FIELD_MANAGER} -f {yaml_file}",
+                out_yaml_format=False,
+                timeout=max(600, len(self)),
+            )
+        return self.submit_time
+
+    def wait_for(self, condition=None, timeout=600, sleep=3, deleted=False):
+        """
+        Wait until all the objects of the batch match the condition
+
+        Args:
+            condition (Condition or str): e.g. 'STATUS=Bound' or
+                '{.status.phase}=Running', None to wait only for existence
+            timeout (int): Time in seconds to wait
+            sleep (int): Polling interval in seconds used without watch
+            deleted (bool): Wait for the objects to be deleted instead
+
+        Returns:
+            dict: Latency in seconds from submission per object name
+
+        Raises:
+            TimeoutExpiredError: if not all the objects reached the state in time
+
+        """
+        start_time = self.submit_time or time.time()
+        latencies = {}
+        for (kind, namespace), names in self.groups.items():
+            latencies.update(
+                track_resources(
+                    kind,
+                    names,
+                    namespace=namespace,
+                    condition=condition,
+                    deleted=deleted,
+                    start_time=start_time,
+                    # the timeout is measured from start_time by the tracking
+                    timeout=timeout,
+                    sleep=sleep,
+                    cluster_kubeconfig=self.cluster_kubeconfig,
+                )
+            )
+        self.latencies = latencies
+        logger.info(f"Latencies of the bulk of objects: {latency_summary(latencies)}")
+        return latencies
+
+    def delete(self, wait=True, timeout=600):
+        """
+        Delete all the objects of the batch by single request
+
+        Args:
+            wait (bool): Wait by watch until all the objects are gone
+            timeout (int): Time in seconds to wait
+
+        Returns:
+            dict: Latency in seconds of deletion per object name, empty dict
+                if wait is False
+
+        """
+        yaml_file = self._dump()
+        logger.info(f"Deleting {len(self)} objects in bulk from {yaml_file}")
+        self.submit_time = time.time()
+        self._ocp.exec_oc_cmd(
+            f"delete -f {yaml_file} --wait=false --ignore-not-found",
+            out_yaml_format=False,
+            timeout=max(600, len(self)),
+        )
+        if not wait:
+            return {}
+        return self.wait_for(timeout=timeout, deleted=True)
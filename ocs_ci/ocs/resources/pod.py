@@ -13,18 +13,19 @@ import yaml
 import tempfile
 import time
 import calendar
-from threading import Thread
+from threading import Lock, Thread
 import base64
 from semantic_version import Version
 
 from ocs_ci.ocs.ocp import get_images, OCP, verify_images_upgraded, get_sha256_digest
 from ocs_ci.helpers import helpers
 from ocs_ci.helpers.proxy import update_container_with_proxy_env
-from ocs_ci.ocs import constants, defaults, node, workload, ocp
+from ocs_ci.ocs import constants, defaults, node, workload, ocp, printer_columns
 from ocs_ci.framework import config
 from ocs_ci.ocs.exceptions import (
     CephToolBoxNotFoundException,
     CommandFailed,
+    ExecSessionUnavailable,
     NotAllPodsHaveSameImagesError,
     NonUpgradedImagesFoundError,
     TimeoutExpiredError,
@@ -36,7 +37,15 @@ from ocs_ci.ocs.exceptions import (
     TolerationNotFoundException,
 )
 
+from ocs_ci.ocs.ceph_channel import CephCommandChannel
+from ocs_ci.ocs.ceph_snapshot import invalidate_ceph_snapshot, is_ceph_state_changed_by
+from ocs_ci.ocs.exec_pool import (
+    exec_in_pod,
+    get_default_container,
+    is_exec_session_pool_enabled,
+)
 from ocs_ci.ocs.utils import setup_ceph_toolbox, get_pod_name_by_pattern
+from ocs_ci.ocs.pod_log_tail import grep_lines, read_pod_logs
 from ocs_ci.ocs.resources.ocs import OCS
 from ocs_ci.ocs.resources.job import get_job_obj, get_jobs_with_prefix
 from ocs_ci.utility import templating
@@ -54,6 +63,10 @@ from ocs_ci.ocs.constants import CSI_RBD_ADDON_NODEPLUGIN_LABEL_420
 logger = logging.getLogger(__name__)
 FIO_TIMEOUT = 600
 
+# Handles of the Running toolbox pods per cluster, see get_ceph_tools_pod
+_ceph_tools_pod_cache = {}
+_ceph_tools_pod_cache_lock = Lock()
+
 TEXT_CONTENT = (
     "Lorem ipsum dolor sit amet, consectetur adipiscing elit, "
     "sed do eiusmod tempor incididunt ut labore et dolore magna "
@@ -187,19 +200,51 @@ class Pod(OCS):
         Returns:
             Munch Obj: This object represents a returned yaml file
         """
-        if container_name:
-            cmd = f"exec {self.name} -c {container_name} -- {command}"
-        else:
-            cmd = f"rsh {self.name} "
-            cmd += command
-        return self.ocp.exec_oc_cmd(
-            cmd,
-            out_yaml_format,
-            secrets=secrets,
-            timeout=timeout,
-            cluster_config=cluster_config,
-            **kwargs,
-        )
+        # the shared ceph state snapshot is outdated by commands changing it
+        changes_ceph_state = is_ceph_state_changed_by(command)
+        try:
+            if (
+                is_exec_session_pool_enabled()
+                and not cluster_config
+                and set(kwargs) <= {"ignore_error", "silent"}
+            ):
+                kubeconfig = self.ocp.get_kubeconfig_path()
+                container = container_name or get_default_container(self.pod_data)
+                if kubeconfig and container:
+                    try:
+                        out = exec_in_pod(
+                            kubeconfig,
+                            self.namespace,
+                            self.name,
+                            container,
+                            command,
+                            secrets=secrets,
+                            timeout=timeout,
+                            **kwargs,
+                        )
+                        if out_yaml_format:
+                            return yaml.load(out, Loader=yaml.CSafeLoader)
+                        return out
+                    except ExecSessionUnavailable as ex:
+                        # raised only before the command was submitted, so
+                        # the command can't run twice
+                        logger.debug(f"{ex}, using oc")
+            if container_name:
+                cmd = f"exec {self.name} -c {container_name} -- {command}"
+            else:
+                cmd = f"rsh {self.name} "
+                cmd += command
+            return self.ocp.exec_oc_cmd(
+                cmd,
+                out_yaml_format,
+                secrets=secrets,
+                timeout=timeout,
+                cluster_config=cluster_config,
+                **kwargs,
+            )
+        finally:
+            if changes_ceph_state:
+                invalidate_ceph_snapshot()
 
     def exec_s3_cmd_on_pod(self, command, mcg_obj=None):
         """
@@ -388,6 +433,31 @@ class Pod(OCS):
             return [item for item in out if item]
         return out
 
+    def exec_ceph_cmds(self, ceph_cmds, timeout=600, ignore_error=False):
+        """
+        Execute a batch of Ceph commands on the Ceph tools pod in one round
+        trip, see CephCommandChannel
+
+        Args:
+            ceph_cmds (list): The Ceph commands without the output format
+            timeout (int): timeout of the whole batch, defaults to 600 seconds
+            ignore_error (bool): If True, failed commands don't raise and
+                their result is the CommandFailed exception
+
+        Returns:
+            list: Parsed json output of the Ceph commands
+
+        Raises:
+            CommandFailed: In case the pod is not a toolbox pod or a command
+                failed
+
+        """
+        if "rook-ceph-tools" not in self.labels.values():
+            raise CommandFailed("Ceph commands can be executed only on toolbox pod")
+        return CephCommandChannel(tools_pod=self).run(
+            ceph_cmds, timeout=timeout, ignore_error=ignore_error
+        )
+
     def get_storage_path(self, storage_type="fs"):
         """
         Get the pod volume mount path or device path
@@ -836,6 +906,83 @@ def get_all_pods(
     return pod_objs
 
 
+def is_ceph_tools_pod_cache_enabled():
+    """
+    Returns:
+        bool: True if the toolbox pod handles should be cached
+
+    """
+    return bool(config.RUN.get("ceph_toolbox_cache", True))
+
+
+def invalidate_ceph_tools_pod_cache():
+    """
+    Drop the cached toolbox pod handles of all the clusters, e.g. after the
+    toolbox was re-created
+    """
+    with _ceph_tools_pod_cache_lock:
+        _ceph_tools_pod_cache.clear()
+
+
+def is_ceph_tools_pod_alive(ceph_pod):
+    """
+    Cheap liveness probe of the toolbox pod handle. It's a single get of the
+    pod by name, served from the pod watch when the informer cache is enabled.
+
+    Args:
+        ceph_pod (Pod): The Ceph tools pod object
+
+    Returns:
+        bool: True if the same pod is still Running (STATUS column, as
+            get_ceph_tools_pod checks it) with all containers ready and not
+            being deleted
+
+    """
+    pod_data = ceph_pod.ocp.get(
+        resource_name=ceph_pod.name, dont_raise=True, silent=True
+    )
+    if not pod_data:
+        return False
+    metadata = pod_data.get("metadata", {})
+    if metadata.get("uid") != ceph_pod.pod_data.get("metadata", {}).get("uid"):
+        return False
+    # e.g. CrashLoopBackOff or Terminating pod
+    status = printer_columns.get_column_value(
+        dict(pod_data, kind=constants.POD), "STATUS"
+    )
+    if status != constants.STATUS_RUNNING:
+        return False
+    # Running pod whose container fails the readiness probe
+    container_statuses = pod_data.get("status", {}).get("containerStatuses") or []
+    return bool(container_statuses) and all(
+        container.get("ready") for container in container_statuses
+    )
+
+
+def _get_cached_ceph_tools_pod(key):
+    """
+    Get the cached toolbox pod handle if it's still alive
+
+    Args:
+        key (tuple): cluster index, kubeconfig and namespace of the toolbox
+
+    Returns:
+        Pod: The Ceph tools pod object, None if not cached or not alive
+
+    """
+    with _ceph_tools_pod_cache_lock:
+        ceph_pod = _ceph_tools_pod_cache.get(key)
+    if ceph_pod is None:
+        return None
+    if is_ceph_tools_pod_alive(ceph_pod):
+        return ceph_pod
+    logger.info(f"Cached ceph tools pod {ceph_pod.name} is gone, looking it up again")
+    with _ceph_tools_pod_cache_lock:
+        if _ceph_tools_pod_cache.get(key) is ceph_pod:
+            del _ceph_tools_pod_cache[key]
+    return None
+
+
 def get_ceph_tools_pod(
     skip_creating_pod=False, wait=False, namespace=None, get_running_pods=True
 ):
@@ -849,6 +996,7 @@ def get_ceph_tools_pod(
         namespace: Namespace of OCS
         get_running_pods (bool): If True, get only the ceph tool pods in a Running status.
             If False, get the ceph tool pods even if they are not in a Running status.
+            Only the Running tools pods are cached (RUN['ceph_toolbox_cache']).
 
     Returns:
         Pod object: The Ceph tools pod object
@@ -884,6 +1032,16 @@ def get_ceph_tools_pod(
     else:
         namespace = namespace or config.ENV_DATA["cluster_namespace"]
 
+    # The handle of the Running toolbox is cached per cluster and validated by
+    # a single get of the pod instead of listing and checking all the toolbox
+    # pods on every call
+    cache_key = None
+    if get_running_pods and is_ceph_tools_pod_cache_enabled():
+        cache_key = (config.cur_index, cluster_kubeconfig, namespace)
+        ceph_pod = _get_cached_ceph_tools_pod(cache_key)
+        if ceph_pod:
+            return ceph_pod
+
     ocp_pod_obj = OCP(
         kind=constants.POD,
         namespace=namespace,
@@ -976,6 +1134,9 @@ def get_ceph_tools_pod(
             new_ceph_pod = patch_consumer_toolbox(consumer_tools_pod=ceph_pod)
             ceph_pod = new_ceph_pod or ceph_pod
 
+    if cache_key:
+        with _ceph_tools_pod_cache_lock:
+            _ceph_tools_pod_cache[cache_key] = ceph_pod
     return ceph_pod
 
 
@@ -1989,6 +2150,7 @@ def get_pod_logs(
     context=0,
     return_empty_string=True,
     first_match_only=True,
+    incremental=None,
 ):
     """
     Get logs from a given pod
@@ -2012,12 +2174,42 @@ def get_pod_logs(
             Applicable only if grep is provided. Default value is True.
         first_match_only (bool): True, if the function should return the first match only. False otherwise.
             Applicable only if grep is provided. Default value is True.
+        incremental (bool): True, to download only the lines logged since the previous call to the spool of
+            the pod container, see pod_log_tail. Not applicable to the previous logs. The grep string is
+            searched literally, unless regex is True. By default RUN['incremental_pod_logs'].
 
     Returns:
         str: Output from 'oc get logs <pod_name> command
 
+    Raises:
+        CommandFailed: If grep is provided, incremental is True, return_empty_string is False and no line
+            matches
+
     """
     namespace = namespace or config.ENV_DATA["cluster_namespace"]
+    if incremental is None:
+        incremental = config.RUN.get("incremental_pod_logs", False)
+    if incremental and not previous:
+        lines = read_pod_logs(
+            pod_name,
+            container=container,
+            namespace=namespace,
+            all_containers=all_containers,
+            since=since,
+            tail=tail,
+        )
+        if grep:
+            lines = grep_lines(
+                lines,
+                grep,
+                regex=regex,
+                case_sensitive=case_senitive,
+                context=context,
+                first_match_only=first_match_only,
+            )
+            if not lines and not return_empty_string:
+                raise CommandFailed(f"No line matching {grep} in logs of {pod_name}")
+        return "\n".join(lines)
     pod = OCP(kind=constants.POD, namespace=namespace)
     cmd = f"logs {pod_name}"
     if container:
@@ -2044,6 +2236,54 @@ def get_pod_logs(
     return pod.exec_oc_cmd(cmd, out_yaml_format=False, shell=bool(grep))
 
 
+def save_pod_logs(
+    pod_name,
+    file_path,
+    container=None,
+    namespace=None,
+    previous=False,
+    all_containers=False,
+    since=None,
+    tail=None,
+    timeout=600,
+):
+    """
+    Save logs of the pod to the file without loading them to memory, suitable
+    for big logs like the logs of OSDs or must-gather pods
+
+    Args:
+        pod_name (str): Name of the pod
+        file_path (str): Path of the file to write the logs to
+        container (str): Name of the container
+        namespace (str): Namespace of the pod
+        previous (bool): True, if pod previous log required. False otherwise.
+        all_containers (bool): fetch logs from all containers of the resource
+        since (str): only return logs newer than a relative duration like 5s, 2m, or 3h.
+        tail (str): number of lines to tail
+        timeout (int): timeout for the command in seconds
+
+    Returns:
+        int: size of the saved logs in bytes
+
+    """
+    namespace = namespace or config.ENV_DATA["cluster_namespace"]
+    pod = OCP(kind=constants.POD, namespace=namespace)
+    cmd = f"logs {pod_name}"
+    if container:
+        cmd += f" -c {container}"
+    if previous:
+        cmd += " --previous"
+    if all_containers:
+        cmd += " --all-containers=true"
+    if since:
+        cmd += f" --since={since}"
+    if tail:
+        cmd += f" --tail={tail}"
+    with pod.exec_oc_cmd_stream(cmd, timeout=timeout) as completed_process:
+        completed_process.stdout.save(file_path)
+        return completed_process.stdout.size
+
+
 def get_pod_node(pod_obj):
     """
     Get the node that the pod is running on
@@ -4025,6 +4265,7 @@ def search_pattern_in_pod_logs(
     container=None,
     all_containers=False,
     since=None,
+    incremental=None,
 ):
     """
     Searches for the given regular expression pattern in the logs of a pod and returns all matching lines.
@@ -4037,6 +4278,7 @@ def search_pattern_in_pod_logs(
         all_containers (bool, optional): Whether to search logs for all containers in the pod. Defaults to False.
         since (str, optional): Only return logs newer than a relative duration like 5s, 2m, or 3h.
             Defaults to None.
+        incremental (bool, optional): Download only the new lines of the logs, see get_pod_logs.
 
     Returns:
         A list of matched lines with the pattern.
@@ -4048,6 +4290,7 @@ def search_pattern_in_pod_logs(
         container=container,
         all_containers=all_containers,
         since=since,
+        incremental=incremental,
     )
 
     matched_lines = [line for line in pod_logs.split("\n") if re.search(pattern, line)]
@@ -33,6 +33,7 @@ from ocs_ci.ocs.exceptions import (
     PVNotSufficientException,
     ResourceWrongStatusException,
 )
+from ocs_ci.ocs.ceph_snapshot import invalidate_ceph_snapshot
 from ocs_ci.ocs.managedservice import get_provider_service_type
 from ocs_ci.ocs.ocp import get_images, OCP
 from ocs_ci.ocs.resources import csv, deployment
@@ -2037,6 +2038,7 @@ def add_capacity(osd_size_capacity_requested, add_extra_disk_to_existing_worker=
         params=params.strip("\n"),
         format_type="json",
     )
+    invalidate_ceph_snapshot()
     return new_storage_devices_sets_count
 
 
@@ -2114,6 +2116,7 @@ def set_deviceset_count(count):
         params=params.strip("\n"),
         format_type="json",
     )
+    invalidate_ceph_snapshot()
 
 
 def get_storage_cluster(namespace=None):
@@ -3354,6 +3357,7 @@ def resize_osd(new_osd_size, check_size=True):
         params=params.strip("\n"),
         format_type="json",
     )
+    invalidate_ceph_snapshot()
     return res
 
 
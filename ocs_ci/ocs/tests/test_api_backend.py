@@ -0,0 +1,149 @@
+# -*- coding: utf8 -*-
+
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+
+from ocs_ci.framework import config
+from ocs_ci.ocs import api_backend
+from ocs_ci.ocs.exceptions import APIBackendNotSupported, CommandFailed
+from ocs_ci.ocs.ocp import OCP
+
+
+def make_resource(kind, name, group="", namespaced=True, short_names=None):
+    resource = Mock()
+    resource.kind = kind
+    resource.name = name
+    resource.singular_name = kind.lower()
+    resource.short_names = short_names or []
+    resource.group = group
+    resource.group_version = f"{group}/v1" if group else "v1"
+    resource.preferred = True
+    resource.namespaced = namespaced
+    return resource
+
+
+@pytest.fixture
+def backend():
+    """
+    KubeAPIBackend with mocked dynamic client which knows pods, PVCs and
+    CephClusters.
+    """
+    backend = api_backend.KubeAPIBackend("/tmp/kubeconfig")
+    dynamic_client = Mock()
+    dynamic_client.resources.search.return_value = [
+        make_resource("Pod", "pods", short_names=["po"]),
+        make_resource(
+            "PersistentVolumeClaim", "persistentvolumeclaims", short_names=["pvc"]
+        ),
+        make_resource("CephCluster", "cephclusters", group="ceph.rook.io"),
+    ]
+    backend._dynamic_client = dynamic_client
+    backend._default_namespace = "default"
+    return backend
+
+
+@pytest.mark.parametrize(
+    "expression,expected",
+    [
+        ("{.status.phase}", ["status", "phase"]),
+        ("'{.status.readyReplicas}'", ["status", "readyReplicas"]),
+        ("{.status.conditions[0].type}", ["status", "conditions", 0, "type"]),
+    ],
+)
+def test_parse_jsonpath(expression, expected):
+    assert api_backend.parse_jsonpath(expression) == expected
+
+
+def test_parse_jsonpath_filter_not_supported():
+    with pytest.raises(APIBackendNotSupported):
+        api_backend.parse_jsonpath('{.status.conditions[?(@.type=="Ready")]}')
+
+
+def test_get_jsonpath_value():
+    data = {"status": {"conditions": [{"type": "Ready", "status": "True"}]}}
+    keys = api_backend.parse_jsonpath("{.status.conditions[0].status}")
+    assert api_backend.get_jsonpath_value(data, keys) == "True"
+    assert api_backend.get_jsonpath_value(data, ["status", "missing"]) is None
+
+
+@pytest.mark.parametrize(
+    "kind,expected",
+    [
+        ("Pod", "pods"),
+        ("po", "pods"),
+        ("pvc", "persistentvolumeclaims"),
+        ("cephcluster", "cephclusters"),
+        ("cephclusters.ceph.rook.io", "cephclusters"),
+    ],
+)
+def test_resolve(backend, kind, expected):
+    assert backend.resolve(kind).name == expected
+
+
+def test_resolve_unknown_kind(backend):
+    with pytest.raises(APIBackendNotSupported):
+        backend.resolve("UnknownKind")
+
+
+def test_get_list_has_oc_shape(backend):
+    pods = backend.resolve("pod")
+    pods.get.return_value.to_dict.return_value = {
+        "kind": "PodList",
+        "apiVersion": "v1",
+        "metadata": {"resourceVersion": "123"},
+        "items": [{"metadata": {"name": "pod-a"}}],
+    }
+    output = backend.get("pod", namespace="openshift-storage", selector="app=a")
+    pods.get.assert_called_once_with(
+        namespace="openshift-storage", label_selector="app=a"
+    )
+    assert output["kind"] == "List"
+    assert output["items"][0]["kind"] == "Pod"
+    assert output["items"][0]["apiVersion"] == "v1"
+
+
+def test_get_multiple_names_not_supported(backend):
+    with pytest.raises(APIBackendNotSupported):
+        backend.get("pod", resource_name="pod-a pod-b")
+
+
+def test_api_error_message_has_oc_format():
+    ex = Mock()
+    ex.reason = "Not Found"
+    ex.body = json.dumps({"reason": "NotFound", "message": 'pods "a" not found'})
+    error = api_backend.api_error_to_command_failed(ex, "get pod a")
+    assert isinstance(error, CommandFailed)
+    assert 'Error from server (NotFound): pods "a" not found' in str(error)
+
+
+def test_ocp_get_falls_back_to_cli():
+    ocp_obj = OCP(kind="Pod", namespace="openshift-storage")
+    fake_backend = Mock()
+    fake_backend.get.side_effect = APIBackendNotSupported("unsupported")
+    with (
+        patch.dict(config.RUN, {"oc_backend": "api"}),
+        patch.object(OCP, "get_kubeconfig_path", return_value="/tmp/kubeconfig"),
+        patch("ocs_ci.ocs.ocp.get_api_backend", return_value=fake_backend),
+        patch.object(
+            OCP, "exec_oc_cmd", return_value={"kind": "List", "items": []}
+        ) as exec_oc_cmd,
+    ):
+        assert ocp_obj.get() == {"kind": "List", "items": []}
+    fake_backend.get.assert_called_once()
+    exec_oc_cmd.assert_called_once()
+
+
+def test_ocp_get_served_by_api_backend():
+    ocp_obj = OCP(kind="Pod", namespace="openshift-storage")
+    fake_backend = Mock()
+    fake_backend.get.return_value = {"kind": "Pod"}
+    with (
+        patch.dict(config.RUN, {"oc_backend": "api"}),
+        patch.object(OCP, "get_kubeconfig_path", return_value="/tmp/kubeconfig"),
+        patch("ocs_ci.ocs.ocp.get_api_backend", return_value=fake_backend),
+        patch.object(OCP, "exec_oc_cmd") as exec_oc_cmd,
+    ):
+        assert ocp_obj.get("pod-a") == {"kind": "Pod"}
+    exec_oc_cmd.assert_not_called()
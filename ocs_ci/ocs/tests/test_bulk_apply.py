@@ -0,0 +1,109 @@
+# -*- coding: utf8 -*-
+
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+import yaml
+
+from ocs_ci.ocs.exceptions import TimeoutExpiredError
+from ocs_ci.ocs.ocp import OCP
+from ocs_ci.ocs.resources import bulk_apply
+
+
+def make_pvc(name, phase="Pending"):
+    return {
+        "apiVersion": "v1",
+        "kind": "PersistentVolumeClaim",
+        "metadata": {"name": name, "namespace": "test"},
+        "status": {"phase": phase},
+    }
+
+
+def fake_informer(*lists):
+    """
+    Informer mock which returns given lists of objects one after another
+    """
+    informer = Mock()
+    informer.generation = 1
+    informer.list.side_effect = list(lists)
+    return informer
+
+
+def test_latency_summary():
+    summary = bulk_apply.latency_summary({f"pvc-{i}": i for i in range(1, 101)})
+    assert summary["count"] == 100
+    assert summary["min"] == 1
+    assert summary["max"] == 100
+    assert summary["p95"] == 96
+    assert bulk_apply.latency_summary({}) == {"count": 0}
+
+
+def test_track_resources_by_watch():
+    informer = fake_informer(
+        [make_pvc("pvc-a", "Bound"), make_pvc("pvc-b")],
+        [make_pvc("pvc-a", "Bound"), make_pvc("pvc-b", "Bound")],
+    )
+    with (
+        patch.object(OCP, "get_kubeconfig_path", return_value="/tmp/kubeconfig"),
+        patch.object(bulk_apply, "get_informer", return_value=informer),
+    ):
+        latencies = bulk_apply.track_resources(
+            "PersistentVolumeClaim",
+            ["pvc-a", "pvc-b"],
+            namespace="test",
+            condition="STATUS=Bound",
+            timeout=10,
+        )
+    assert set(latencies) == {"pvc-a", "pvc-b"}
+    assert latencies["pvc-a"] <= latencies["pvc-b"]
+    informer.wait_for_change.assert_called_once()
+
+
+def test_track_resources_deletion_timeout():
+    informer = fake_informer(*[[make_pvc("pvc-a")]] * 10)
+    with (
+        patch.object(OCP, "get_kubeconfig_path", return_value="/tmp/kubeconfig"),
+        patch.object(bulk_apply, "get_informer", return_value=informer),
+        pytest.raises(TimeoutExpiredError),
+    ):
+        bulk_apply.track_resources(
+            "PersistentVolumeClaim", ["pvc-a"], deleted=True, timeout=0
+        )
+
+
+def test_bulk_apply_submit_and_wait(tmp_path):
+    pvcs = [make_pvc(f"pvc-{i}") for i in range(3)]
+    bulk = bulk_apply.BulkApply(pvcs, namespace="test")
+    with (
+        patch.object(OCP, "_try_api_backend", return_value=(False, None)),
+        patch.object(OCP, "exec_oc_cmd") as exec_oc_cmd,
+        patch.object(
+            bulk_apply, "track_resources", return_value={"pvc-0": 1.0}
+        ) as track_resources,
+    ):
+        bulk.submit()
+        assert bulk.wait_for("STATUS=Bound") == {"pvc-0": 1.0}
+    command = exec_oc_cmd.call_args[0][0]
+    assert command.startswith("apply --server-side --force-conflicts")
+    with open(bulk.yaml_file) as yaml_file:
+        assert len(list(yaml.safe_load_all(yaml_file))) == 3
+    assert track_resources.call_args[0] == (
+        "PersistentVolumeClaim",
+        ["pvc-0", "pvc-1", "pvc-2"],
+    )
+
+
+def test_wait_for_counts_timeout_from_submission():
+    bulk = bulk_apply.BulkApply([make_pvc("pvc-a")], namespace="test")
+    # e.g. the apply of a large batch took 60 seconds
+    bulk.submit_time = time.time() - 60
+    informer = fake_informer([make_pvc("pvc-a")], [make_pvc("pvc-a", "Bound")])
+    with (
+        patch.object(OCP, "get_kubeconfig_path", return_value="/tmp/kubeconfig"),
+        patch.object(bulk_apply, "get_informer", return_value=informer),
+    ):
+        latencies = bulk.wait_for("STATUS=Bound", timeout=100)
+    assert latencies["pvc-a"] >= 60
+    # 40 seconds were left for the tracking
+    assert 30 < informer.wait_for_change.call_args[0][1] <= 40
@@ -0,0 +1,166 @@
+# -*- coding: utf8 -*-
+
+import copy
+import subprocess
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ocs_ci.framework import config
+from ocs_ci.ocs import constants
+from ocs_ci.ocs.ceph_channel import CephCommandChannel
+from ocs_ci.ocs.exceptions import CommandFailed
+from ocs_ci.ocs.resources import pod
+
+FAKE_CEPH = """#!/bin/sh
+case "$1" in
+    status) echo '{"pgmap": {"num_pgs": 10}}' ;;
+    health) printf '{"status": "HEALTH_OK"}' ;;
+    fs) echo '[{"name": "fs"}, {}]' ;;
+    version) echo 'ceph version 18.2.1' ;;
+    *) echo "unknown command $1" >&2; echo "details" >&2; exit 22 ;;
+esac
+"""
+
+TOOLS_POD = {
+    "kind": "Pod",
+    "metadata": {
+        "name": "rook-ceph-tools-1",
+        "namespace": "openshift-storage",
+        "uid": "uid-1",
+        "labels": {"app": "rook-ceph-tools"},
+    },
+    "spec": {"containers": [{"name": "rook-ceph-tools"}]},
+    "status": {
+        "phase": constants.STATUS_RUNNING,
+        "containerStatuses": [
+            {"name": "rook-ceph-tools", "ready": True, "state": {"running": {}}}
+        ],
+    },
+}
+
+
+class LocalPod(object):
+    """
+    Runs the commands of the toolbox locally with the fake ceph executable
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.commands = []
+
+    def exec_cmd_on_pod(self, command, out_yaml_format=True, timeout=600):
+        self.commands.append(command)
+        return subprocess.run(
+            command,
+            shell=True,
+            env={"PATH": f"{self.path}:/usr/bin:/bin"},
+            stdout=subprocess.PIPE,
+            check=True,
+            text=True,
+        ).stdout
+
+
+@pytest.fixture
+def local_pod(tmp_path):
+    fake_ceph = tmp_path / "ceph"
+    fake_ceph.write_text(FAKE_CEPH)
+    fake_ceph.chmod(0o755)
+    return LocalPod(str(tmp_path))
+
+
+def test_batch_in_one_round_trip(local_pod):
+    channel = CephCommandChannel(tools_pod=local_pod)
+    assert channel.run(["ceph status", "health", "ceph fs ls", "ceph version"]) == [
+        {"pgmap": {"num_pgs": 10}},
+        {"status": "HEALTH_OK"},
+        [{"name": "fs"}],
+        "ceph version 18.2.1",
+    ]
+    assert len(local_pod.commands) == 1
+    assert channel.run([]) == []
+
+
+def test_batch_failures(local_pod):
+    channel = CephCommandChannel(tools_pod=local_pod)
+    with pytest.raises(CommandFailed, match="unknown command osd\ndetails"):
+        channel.run(["ceph status", "ceph osd 'tree name'"])
+    status, failure = channel.run(["ceph status", "ceph osd tree"], ignore_error=True)
+    assert status == {"pgmap": {"num_pgs": 10}}
+    assert isinstance(failure, CommandFailed)
+
+
+@pytest.fixture
+def toolbox_cluster():
+    """
+    Fake cluster with one Running toolbox pod
+    """
+    pods = [copy.deepcopy(TOOLS_POD)]
+    ocp_obj = MagicMock()
+    ocp_obj.data = {"items": pods}
+    ocp_obj.get_resource_status.return_value = constants.STATUS_RUNNING
+    ocp_obj.get.side_effect = lambda resource_name, **kwargs: next(
+        (p for p in pods if p["metadata"]["name"] == resource_name), None
+    )
+    with (
+        patch.object(pod, "OCP", return_value=ocp_obj),
+        patch.object(pod, "setup_ceph_toolbox"),
+        patch.object(pod, "update_container_with_proxy_env"),
+        patch.object(pod, "_ceph_tools_pod_cache", {}),
+        patch.dict(config.ENV_DATA, {"cluster_namespace": "openshift-storage"}),
+        patch.dict(config.RUN, {"ceph_toolbox_cache": True}),
+    ):
+        yield pods, ocp_obj
+
+
+def test_tools_pod_cached_and_validated(toolbox_cluster):
+    pods, ocp_obj = toolbox_cluster
+    tools_pod = pod.get_ceph_tools_pod()
+    assert tools_pod.name == "rook-ceph-tools-1"
+    ocp_obj.get_resource_status.reset_mock()
+    ocp_obj.get.reset_mock()
+
+    assert pod.get_ceph_tools_pod() is tools_pod
+    # only the liveness probe of the cached pod, no listing of the pods
+    ocp_obj.get.assert_called_once()
+    ocp_obj.get_resource_status.assert_not_called()
+
+    # the toolbox was re-created
+    pods[0] = copy.deepcopy(TOOLS_POD)
+    pods[0]["metadata"].update(name="rook-ceph-tools-2", uid="uid-2")
+    new_tools_pod = pod.get_ceph_tools_pod()
+    assert new_tools_pod.name == "rook-ceph-tools-2"
+    assert pod.get_ceph_tools_pod() is new_tools_pod
+
+    pod.invalidate_ceph_tools_pod_cache()
+    assert pod.get_ceph_tools_pod() is not new_tools_pod
+
+
+def test_terminating_tools_pod_not_used(toolbox_cluster):
+    pods, _ = toolbox_cluster
+    tools_pod = pod.get_ceph_tools_pod()
+    pods[0]["metadata"]["deletionTimestamp"] = "2026-10-17T10:00:00Z"
+    assert not pod.is_ceph_tools_pod_alive(tools_pod)
+    assert pod.get_ceph_tools_pod() is not tools_pod
+
+
+@pytest.mark.parametrize(
+    "container_status",
+    [
+        # crash looping toolbox, the pod phase is still Running
+        {
+            "ready": False,
+            "state": {"waiting": {"reason": "CrashLoopBackOff"}},
+        },
+        # the readiness probe fails
+        {"ready": False, "state": {"running": {}}},
+    ],
+)
+def test_not_ready_tools_pod_not_used(toolbox_cluster, container_status):
+    pods, _ = toolbox_cluster
+    tools_pod = pod.get_ceph_tools_pod()
+    assert pod.is_ceph_tools_pod_alive(tools_pod)
+    pods[0]["status"]["containerStatuses"] = [
+        dict(container_status, name="rook-ceph-tools")
+    ]
+    assert not pod.is_ceph_tools_pod_alive(tools_pod)
@@ -0,0 +1,155 @@
+# -*- coding: utf8 -*-
+
+import json
+import subprocess
+import sys
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ocs_ci.ocs import ceph_health_stream, cluster
+from ocs_ci.ocs.ceph_health_stream import (
+    HEALTH_ERR,
+    HEALTH_OK,
+    HEALTH_WARN,
+    CephHealthStream,
+    CephHealthTimeline,
+    parse_watch_line,
+)
+from ocs_ci.ocs.exceptions import CephHealthException
+
+STATUS = {"health": {"status": HEALTH_OK, "checks": {}}, "fsid": "x"}
+WATCH_OUTPUT = [
+    json.dumps(STATUS),
+    "2026-10-17T10:00:01.000000+0000 mon.a [WRN] Health check failed: "
+    "1 osds down (OSD_DOWN)",
+    json.dumps(
+        {
+            "stamp": "2026-10-17T10:00:02.500000+0000",
+            "priority": "[ERR]",
+            "message": "Health check failed: Reduced data availability: "
+            "1 pg inactive (PG_AVAILABILITY)",
+        }
+    ),
+    "some unrelated output",
+    "2026-10-17T10:00:03.250000+0000 mon.a [INF] Health check cleared: "
+    "PG_AVAILABILITY (was: Reduced data availability: 1 pg inactive)",
+    "2026-10-17T10:00:04.000000+0000 mon.a [INF] Health check cleared: "
+    "OSD_DOWN (was: 1 osds down)",
+    "2026-10-17T10:00:04.000000+0000 mon.a [INF] Cluster is now healthy",
+    "2026-10-17T10:10:00.000000+0000 mon.a [INF] overall HEALTH_OK",
+]
+
+
+def stamp(seconds):
+    return datetime(2026, 10, 17, 10, 0, tzinfo=timezone.utc) + timedelta(
+        seconds=seconds
+    )
+
+
+def test_parse_watch_line():
+    assert parse_watch_line(WATCH_OUTPUT[0]) == ("status", STATUS)
+    assert parse_watch_line(WATCH_OUTPUT[1])[:3] == ("log", stamp(1), "WRN")
+    assert parse_watch_line(WATCH_OUTPUT[2])[:3] == ("log", stamp(2.5), "ERR")
+    assert parse_watch_line(WATCH_OUTPUT[3]) is None
+
+
+def test_timeline_transitions(monkeypatch):
+    monkeypatch.setenv("PYTEST_CURRENT_TEST", "tests/test_a.py::test_b (call)")
+    stream = CephHealthStream(namespace="openshift-storage")
+    stream.timeline.update_from_status(STATUS, timestamp=stamp(0))
+    for line in WATCH_OUTPUT[1:]:
+        stream.feed(line)
+    timeline = stream.timeline
+    assert [event.status for event in timeline.events()] == [
+        HEALTH_OK,
+        HEALTH_WARN,
+        HEALTH_ERR,
+        HEALTH_WARN,
+        HEALTH_OK,
+        HEALTH_OK,
+    ]
+    assert timeline.intervals(HEALTH_ERR) == [(stamp(2.5), stamp(3.25))]
+    assert timeline.intervals(HEALTH_WARN) == [
+        (stamp(1), stamp(2.5)),
+        (stamp(3.25), stamp(4)),
+    ]
+    assert timeline.was_in(HEALTH_ERR, since=stamp(3), until=stamp(10))
+    assert timeline.intervals(HEALTH_ERR, since=stamp(3)) == [(stamp(3), stamp(3.25))]
+    assert not timeline.was_in(HEALTH_ERR, since=stamp(3.5))
+    assert not timeline.was_in(HEALTH_ERR, until=stamp(2))
+    assert len(timeline.events(test="tests/test_a.py::test_b")) == 6
+    assert timeline.status == HEALTH_OK and not timeline.checks
+
+
+def test_timeline_is_bounded_and_windows():
+    timeline = CephHealthTimeline(max_events=3)
+    with timeline.window() as window:
+        timeline.update_from_status({"health": {"status": HEALTH_OK}})
+        timeline.update_from_log(
+            datetime.now(timezone.utc), "ERR", "Health check failed: x (MON_DOWN)"
+        )
+    timeline.update_from_log(
+        datetime.now(timezone.utc), "INF", "Health check cleared: MON_DOWN"
+    )
+    assert window.was_in(HEALTH_ERR)
+    assert window.intervals(HEALTH_ERR)[0][1] is None
+    assert len(window.events()) == 2
+    for _ in range(5):
+        timeline.update_from_log(
+            datetime.now(timezone.utc), "WRN", "Health check update: y (OSD_DOWN)"
+        )
+    assert len(timeline.events()) == 3
+
+
+def test_stream_reads_watch_process():
+    script = "import sys\nfor line in sys.argv[1:]: print(line, flush=True)"
+    stream = CephHealthStream(namespace="openshift-storage")
+    processes = []
+
+    def start_process():
+        if processes:
+            stream._stop_event.set()
+        processes.append(
+            subprocess.Popen(
+                [sys.executable, "-c", script] + WATCH_OUTPUT,
+                stdout=subprocess.PIPE,
+                text=True,
+            )
+        )
+        return processes[-1]
+
+    with (
+        patch.object(stream, "_start_process", side_effect=start_process),
+        patch.object(ceph_health_stream, "RECONNECT_DELAY", 0),
+    ):
+        stream.start()
+        stream._thread.join(30)
+    # the watch was started again after the process ended
+    assert len(processes) == 2
+    assert stream.timeline.intervals(HEALTH_ERR)[0] == (stamp(2.5), stamp(3.25))
+
+
+def test_monitor_stream_mode():
+    def fake_stream(namespace, timeline):
+        timeline.update_from_status(STATUS, timestamp=stamp(0))
+        timeline.update_from_log(
+            stamp(5), "ERR", "Health check failed: 1 pg inactive (PG_AVAILABILITY)"
+        )
+        timeline.update_from_log(stamp(6), "INF", "Cluster is now healthy")
+        return MagicMock()
+
+    ceph_cluster = MagicMock(namespace="openshift-storage")
+    with patch.object(cluster, "CephHealthStream", side_effect=fake_stream):
+        with pytest.raises(CephHealthException, match="HEALTH_ERR since"):
+            with cluster.CephHealthMonitor(ceph_cluster, mode="stream") as monitor:
+                pass
+    ceph_cluster.get_ceph_health.assert_not_called()
+    assert monitor is None
+
+
+def test_parse_timestamp_fallback():
+    before = datetime.now(timezone.utc)
+    assert ceph_health_stream.parse_timestamp("not a time") >= before
+    assert ceph_health_stream.parse_timestamp("2026-10-17 10:00:01") == stamp(1)
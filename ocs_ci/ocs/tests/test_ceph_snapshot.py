@@ -0,0 +1,125 @@
+# -*- coding: utf8 -*-
+
+from unittest.mock import patch
+
+import pytest
+
+from ocs_ci.framework import config
+from ocs_ci.ocs import ceph_snapshot, cluster
+from ocs_ci.ocs.ceph_snapshot import CephStateSnapshot
+
+OUTPUTS = {
+    "ceph status": {"health": {"status": "HEALTH_OK"}},
+    "ceph df": {"stats": {"total_bytes": 300, "total_used_raw_bytes": 30}},
+    "ceph df detail": {"pools": []},
+    "ceph osd df": {
+        "nodes": [
+            {"name": "osd.0", "utilization": 10.5, "pgs": 100},
+            {"name": "osd.1", "utilization": 9.5, "pgs": 90},
+        ]
+    },
+    "ceph osd tree": {"nodes": []},
+    "ceph osd dump": {"pools": [{"pool_name": "rbd", "pool": 2}]},
+    "ceph pg dump pgs_brief": {"pg_stats": []},
+}
+
+
+class FakeChannel(object):
+    def __init__(self):
+        self.batches = []
+
+    def run(self, commands):
+        self.batches.append(commands)
+        return [OUTPUTS[command] for command in commands]
+
+
+@pytest.fixture
+def channel():
+    fake_channel = FakeChannel()
+    with (
+        patch.object(
+            ceph_snapshot, "get_ceph_command_channel", return_value=fake_channel
+        ),
+        patch.object(ceph_snapshot, "_snapshots", {}),
+        patch.dict(config.ENV_DATA, {"cluster_namespace": "openshift-storage"}),
+        patch.dict(config.RUN, {"ceph_snapshot_ttl": 5}),
+    ):
+        yield fake_channel
+
+
+@pytest.mark.parametrize(
+    "command,read_only",
+    [
+        ("ceph status", True),
+        ("ceph -s", True),
+        ("ceph osd pool get rbd size", True),
+        ("ceph crash ls", True),
+        ("ceph health detail", True),
+        ("ceph osd df --format json", True),
+        ("ceph --cluster ceph osd tree", True),
+        ("ceph pg 1.0 query", True),
+        ("ceph osd set noout", False),
+        ("ceph osd pool set rbd size 2", False),
+        ("ceph crash archive-all", False),
+        ("ceph health mute MON_NETSPLIT --sticky", False),
+        ("ceph osd pool set stats size 2", False),
+        ("ceph osd pool create info 32", False),
+        ("ceph tell osd.0 injectargs --osd_max_backfills=2", False),
+        ("ceph config set osd detail true", False),
+    ],
+)
+def test_is_read_only_ceph_command(command, read_only):
+    assert ceph_snapshot.is_read_only_ceph_command(command) is read_only
+    assert ceph_snapshot.is_ceph_state_changed_by(command) is not read_only
+
+
+def test_sections_refreshed_on_demand(channel):
+    with patch.object(ceph_snapshot.time, "monotonic", return_value=100):
+        snapshot = ceph_snapshot.get_ceph_snapshot()
+        assert snapshot is ceph_snapshot.get_ceph_snapshot("openshift-storage")
+        assert cluster.get_osd_utilization() == {"osd.0": 10.5, "osd.1": 9.5}
+        assert cluster.get_pgs_per_osd() == {"osd.0": 100, "osd.1": 90}
+        assert cluster.get_percent_used_capacity() == 10.0
+        assert cluster.get_pool_num("rbd") == 2
+        assert cluster.exec_ceph_osd_tree_with_retry() == {"nodes": []}
+        # the returned sections are copies
+        snapshot.get("df")["stats"].clear()
+        assert snapshot.get("df")["stats"]["total_bytes"] == 300
+    # only the requested sections are fetched, each once
+    assert channel.batches == [
+        ["ceph osd df"],
+        ["ceph df"],
+        ["ceph osd dump"],
+        ["ceph osd tree"],
+    ]
+
+    # after the TTL the section is fetched again
+    with patch.object(ceph_snapshot.time, "monotonic", return_value=106):
+        cluster.get_ceph_df_stats()
+        cluster.get_ceph_df_stats()
+    assert channel.batches[4:] == [["ceph df"]]
+
+    # the callers reading several sections prefetch the stale ones at once
+    with patch.object(ceph_snapshot.time, "monotonic", return_value=107):
+        snapshot.prefetch(["df", "osd_df", "pg_dump"])
+        cluster.get_pgs_brief_dump()
+        cluster.get_osd_utilization()
+    assert channel.batches[5:] == [["ceph osd df", "ceph pg dump pgs_brief"]]
+
+
+def test_invalidate_and_disabled_snapshot(channel):
+    snapshot = ceph_snapshot.get_ceph_snapshot()
+    snapshot.get("osd_tree")
+    snapshot.get("osd_tree")
+    assert len(channel.batches) == 1
+    ceph_snapshot.invalidate_ceph_snapshot()
+    snapshot.get("osd_tree")
+    assert len(channel.batches) == 2
+
+    no_cache = CephStateSnapshot(ttl=0)
+    no_cache.prefetch()
+    no_cache.get("osd_tree")
+    no_cache.get("osd_tree")
+    assert channel.batches[2:] == [["ceph osd tree"], ["ceph osd tree"]]
+    with pytest.raises(ValueError):
+        no_cache.get("mon_dump")
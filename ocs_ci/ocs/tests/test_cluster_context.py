@@ -0,0 +1,153 @@
+# -*- coding: utf8 -*-
+
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from ocs_ci.framework import Config, config
+from ocs_ci.ocs import cluster_context, ocp
+from ocs_ci.ocs.exceptions import CommandFailed
+from ocs_ci.ocs.ocp import OCP
+from ocs_ci.utility import utils
+
+
+@pytest.fixture
+def clusters(tmp_path):
+    """
+    Replace the clusters of the config by three fake clusters
+    """
+    cluster_configs = []
+    for index in range(3):
+        cluster_config = Config()
+        cluster_config.MULTICLUSTER = {"multicluster_index": index}
+        cluster_config.ENV_DATA = {
+            "cluster_name": f"cluster-{index}",
+            "cluster_namespace": "openshift-storage",
+            "cluster_path": str(tmp_path / f"cluster-{index}"),
+        }
+        cluster_config.RUN = {"kubeconfig_location": "auth/kubeconfig"}
+        cluster_configs.append(cluster_config)
+    with (
+        patch.object(config, "clusters", cluster_configs),
+        patch.object(config, "_cur_index", 0),
+        patch.object(cluster_context, "_registry", {}),
+    ):
+        yield cluster_configs
+
+
+def test_bind_ctx_is_local_to_thread(clusters):
+    seen_by_other_thread = []
+
+    def other_thread():
+        seen_by_other_thread.append(config.ENV_DATA["cluster_name"])
+
+    with config.bind_ctx(1):
+        assert config.ENV_DATA["cluster_name"] == "cluster-1"
+        assert config.cur_index == 1
+        thread = threading.Thread(target=other_thread)
+        thread.start()
+        thread.join()
+        # switch inside the bound block doesn't touch the global context
+        config.switch_ctx(2)
+        assert config.ENV_DATA["cluster_name"] == "cluster-2"
+        assert config._cur_index == 0
+    assert seen_by_other_thread == ["cluster-0"]
+    assert config.ENV_DATA["cluster_name"] == "cluster-0"
+    assert config.cur_index == 0
+
+
+def test_cluster_context_registry(clusters):
+    context = cluster_context.get_cluster_context(2)
+    assert context is cluster_context.get_cluster_context(2)
+    assert context.name == "cluster-2"
+    assert context.kubeconfig.endswith("cluster-2/auth/kubeconfig")
+    assert cluster_context.get_cluster_context().index == 0
+    assert [c.index for c in cluster_context.get_cluster_contexts(skip_index=1)] == [
+        0,
+        2,
+    ]
+    assert context.ocp(kind="Pod").cluster_context == 2
+
+
+def test_run_on_clusters_in_parallel(clusters):
+    # all the calls have to run at once to pass the barrier
+    barrier = threading.Barrier(3, timeout=10)
+
+    def get_name(context, suffix):
+        barrier.wait()
+        return config.ENV_DATA["cluster_name"] + suffix
+
+    assert cluster_context.run_on_clusters(get_name, args=("!",)) == {
+        0: "cluster-0!",
+        1: "cluster-1!",
+        2: "cluster-2!",
+    }
+    assert config.cur_index == 0
+
+
+def test_run_on_clusters_raises_failure(clusters):
+    done = []
+
+    def check(context):
+        if context.index == 0:
+            raise CommandFailed("cluster-0 is broken")
+        done.append(context.index)
+
+    with pytest.raises(CommandFailed, match="cluster-0 is broken"):
+        cluster_context.run_on_clusters(check)
+    assert sorted(done) == [1, 2]
+
+
+def test_run_cmd_multicluster(clusters):
+    def fake_exec_cmd(cmd, cluster_config=None, **kwargs):
+        return (cmd, cluster_config.ENV_DATA["cluster_name"], config.cur_index)
+
+    with (
+        patch.object(utils, "exec_cmd", side_effect=fake_exec_cmd),
+        patch.object(config, "switch_ctx") as switch_ctx,
+    ):
+        for parallel in (True, False):
+            assert utils.run_cmd_multicluster(
+                "oc get nodes", skip_index=[1], parallel=parallel
+            ) == [
+                ("oc get nodes", "cluster-0", 0),
+                None,
+                ("oc get nodes", "cluster-2", 2),
+            ]
+    switch_ctx.assert_not_called()
+
+
+def test_run_cmd_multicluster_sequential_by_default(clusters):
+    order = []
+
+    def fake_exec_cmd(cmd, cluster_config=None, **kwargs):
+        order.append(cluster_config.ENV_DATA["cluster_name"])
+        if cluster_config.ENV_DATA["cluster_name"] == "cluster-1":
+            raise CommandFailed("cluster-1 is broken")
+
+    with (
+        patch.object(utils, "exec_cmd", side_effect=fake_exec_cmd),
+        patch.object(cluster_context, "run_on_clusters") as run_on_clusters,
+        pytest.raises(CommandFailed),
+    ):
+        utils.run_cmd_multicluster("oc create -f ns.yaml")
+    run_on_clusters.assert_not_called()
+    # the first failure stops the processing
+    assert order == ["cluster-0", "cluster-1"]
+
+
+def test_exec_oc_cmd_binds_resource_cluster(clusters):
+    with config.bind_ctx(2):
+        ocp_obj = OCP(kind="Pod", namespace="test")
+
+    def fake_run_cmd(cmd, cluster_config=None, **kwargs):
+        return f'{{"cluster": "{cluster_config.ENV_DATA["cluster_name"]}"}}'
+
+    with (
+        patch.object(ocp, "run_cmd", side_effect=fake_run_cmd),
+        patch.object(config, "switch_ctx") as switch_ctx,
+    ):
+        assert ocp_obj.exec_oc_cmd("get pod") == {"cluster": "cluster-2"}
+    switch_ctx.assert_not_called()
+    assert config.cur_index == 0
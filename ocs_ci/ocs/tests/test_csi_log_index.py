@@ -0,0 +1,183 @@
+# -*- coding: utf8 -*-
+
+import time
+import uuid
+from unittest.mock import patch
+
+from ocs_ci.helpers import performance_lib
+from ocs_ci.helpers.csi_log_index import (
+    CREATE_END,
+    CREATE_START,
+    DELETE_END,
+    DELETE_START,
+    SNAPSHOT_END,
+    CsiLogIndex,
+)
+from ocs_ci.ocs import constants
+
+PV = "pvc-0a1b2c3d-0000-1111-2222-333344445555"
+VOLUME_ID = "0001-0011-openshift-storage-0000000000000001-5f0c7f3a"
+HANDLE = "0001-0011-openshift-storage-0000000000000001-0e8d2b4a"
+PLUGIN_LOG = [
+    f"I0115 10:00:00.100000       1 utils.go:195] ID: 10 Req-ID: {PV} GRPC call: "
+    "/csi.v1.Controller/CreateVolume",
+    f"I0115 10:00:00.200000       1 rbd_util.go:1315] ID: 10 Req-ID: {PV} generated "
+    f"Volume ID ({VOLUME_ID}) and image name (csi-vol-5f0c7f3a) for request name ({PV})",
+    f"I0115 10:00:01.600000       1 utils.go:212] ID: 10 Req-ID: {PV} GRPC response: "
+    '{"volume":{}}',
+    "I0115 10:00:05.000000       1 utils.go:195] ID: 11 GRPC call: /csi.v1.Identity/Probe",
+    f"I0115 10:01:00.000000       1 utils.go:195] ID: 12 Req-ID: {VOLUME_ID} GRPC call: "
+    "/csi.v1.Controller/DeleteVolume",
+    f"I0115 10:01:02.500000       1 utils.go:212] ID: 12 Req-ID: {VOLUME_ID} GRPC "
+    "response: {}",
+    "I0115 10:02:00.000000       1 utils.go:195] ID: 13 Req-ID: snapshot-77aa GRPC "
+    "call: /csi.v1.Controller/CreateSnapshot",
+    "I0115 10:02:03.000000       1 utils.go:212] ID: 13 Req-ID: snapshot-77aa GRPC "
+    "response: {}",
+    "not a klog line",
+]
+NODE_LOG = [
+    f"I0115 10:03:00.000000    7 utils.go:195] ID: 5 Req-ID: {HANDLE} GRPC call: "
+    "/csi.v1.Node/NodeStageVolume",
+    f"I0115 10:03:00.500000    7 utils.go:212] ID: 5 Req-ID: {HANDLE} GRPC response: {{}}",
+    f"I0115 10:03:01.000000    7 utils.go:195] ID: 6 Req-ID: {HANDLE} GRPC call: "
+    "/csi.v1.Node/NodePublishVolume",
+    f"I0115 10:03:01.250000    7 utils.go:212] ID: 6 Req-ID: {HANDLE} GRPC response: {{}}",
+]
+PROVISIONER_LOG = [
+    'I0115 10:00:00.000000       1 controller.go:1366] "Started" PVC="ns/pvc-test-1"',
+    'I0115 10:00:01.700000       1 controller.go:1449] "Succeeded" PVC="ns/pvc-test-1"',
+    'I0115 10:00:00.000000       1 controller.go:1366] provision "ns/pvc-test-2" class '
+    '"sc": started',
+    'I0115 10:00:03.000000       1 controller.go:1449] provision "ns/pvc-test-2" class '
+    '"sc": succeeded',
+    f'I0115 10:01:00.000000       1 controller.go:1502] "shouldDelete is true" PV="{PV}"',
+    f'I0115 10:01:03.000000       1 controller.go:1559] "deleted succeeded" PV="{PV}"',
+]
+SNAPSHOT_LOG = [
+    "I0115 10:02:00.000000       1 snapshot_controller.go:291] createSnapshotContent: "
+    "Creating content for snapshot ns/snap-1 through the plugin ...",
+    "I0115 10:02:04.000000       1 snapshot_controller_base.go:213] snapshot ns/snap-1 "
+    "is ready to use",
+]
+
+
+def test_index_lookups():
+    index = CsiLogIndex([PLUGIN_LOG, NODE_LOG, PROVISIONER_LOG, SNAPSHOT_LOG])
+    assert index.lines == 20
+    assert index.grpc_times(PV, "call") == ["I0115 10:00:00.100000"]
+    assert index.grpc_times(PV, "response") == ["I0115 10:00:01.600000"]
+    assert index.volume_id(PV) == VOLUME_ID
+    assert index.grpc_times(VOLUME_ID, "response") == ["I0115 10:01:02.500000"]
+    assert index.req_ids("77aa") == ["snapshot-77aa"]
+    stage = index.grpc_events(HANDLE, "call", "/csi.v1.Node/NodeStageVolume")
+    assert [call.grpc_id for call in stage] == ["5"]
+    assert index.response_times(stage[0]) == ["I0115 10:03:00.500000"]
+    assert index.provisioner_times("pvc-test-1", CREATE_START) == [
+        "I0115 10:00:00.000000"
+    ]
+    assert index.provisioner_times("pvc-test-1", CREATE_END) == [
+        "I0115 10:00:01.700000"
+    ]
+    assert index.provisioner_times("pvc-test-2", CREATE_END) == [
+        "I0115 10:00:03.000000"
+    ]
+    assert index.provisioner_times("pvc-test-2", CREATE_END, legacy=False) == []
+    assert index.provisioner_times(PV, DELETE_START) == ["I0115 10:01:00.000000"]
+    assert index.provisioner_times(PV, DELETE_END) == ["I0115 10:01:03.000000"]
+    assert index.snapshot_times("snap-1", SNAPSHOT_END) == ["I0115 10:02:04.000000"]
+
+
+class FakePvc(object):
+    def __init__(self, name, backed_pv):
+        self.name = name
+        self.backed_pv = backed_pv
+
+
+def test_measurements_read_logs_once(monkeypatch):
+    monkeypatch.setattr(
+        performance_lib, "_log_indexes", performance_lib.collections.OrderedDict()
+    )
+    with (
+        patch.object(performance_lib, "get_logfile_names", return_value=["prov-0"]),
+        patch.object(
+            performance_lib, "read_csi_logs", return_value=[PLUGIN_LOG]
+        ) as read_csi_logs,
+    ):
+        pvc = FakePvc("pvc-test-1", PV)
+        start = "2026-01-15T10:00:00Z"
+        assert (
+            performance_lib.csi_pvc_time_measure(
+                constants.CEPHBLOCKPOOL, pvc, "create", start
+            )
+            == 1.5
+        )
+        assert (
+            performance_lib.csi_pvc_time_measure(
+                constants.CEPHBLOCKPOOL, pvc, "delete", start
+            )
+            == 2.5
+        )
+        assert (
+            performance_lib.measure_csi_snapshot_creation_time(
+                constants.CEPHBLOCKPOOL, "77aa", start
+            )
+            == 3.0
+        )
+        assert read_csi_logs.call_count == 1
+
+
+def test_measurement_refreshes_cached_logs(monkeypatch):
+    monkeypatch.setattr(
+        performance_lib, "_log_indexes", performance_lib.collections.OrderedDict()
+    )
+    logs = [[PROVISIONER_LOG[0]]]
+    with (
+        patch.object(performance_lib, "get_logfile_names", return_value=["prov-0"]),
+        patch.object(
+            performance_lib, "read_csi_logs", side_effect=lambda *args: logs
+        ) as read_csi_logs,
+    ):
+        start = "2026-01-15T10:00:00Z"
+        performance_lib.get_csi_log_index(
+            constants.CEPHBLOCKPOOL, "csi-provisioner", start
+        )
+        # the end of the creation was logged after the logs were indexed
+        logs = [PROVISIONER_LOG[:2]]
+        time.sleep(0.01)
+        assert (
+            performance_lib.measure_pvc_creation_time(
+                constants.CEPHBLOCKPOOL, "pvc-test-1", start
+            )
+            == 1.7
+        )
+        assert read_csi_logs.call_count == 2
+
+
+def test_bulk_measurement_of_many_pvcs(monkeypatch):
+    monkeypatch.setattr(
+        performance_lib, "_log_indexes", performance_lib.collections.OrderedDict()
+    )
+    pvcs = []
+    log = []
+    for i in range(5000):
+        pv_name = f"pvc-{uuid.UUID(int=i)}"
+        pvcs.append(FakePvc(f"pvc-test-{i}", pv_name))
+        log.append(
+            f"I0115 10:00:{i % 60:02d}.000000       1 utils.go:195] ID: {i} "
+            f"Req-ID: {pv_name} GRPC call: /csi.v1.Controller/CreateVolume"
+        )
+        log.append(
+            f"I0115 10:01:{i % 60:02d}.500000       1 utils.go:212] ID: {i} "
+            f"Req-ID: {pv_name} GRPC response: {{}}"
+        )
+    with (
+        patch.object(performance_lib, "get_logfile_names", return_value=["csi-0"]),
+        patch.object(performance_lib, "read_csi_logs", return_value=[log]),
+    ):
+        start = time.monotonic()
+        total = performance_lib.csi_bulk_pvc_time_measure(
+            constants.CEPHBLOCKPOOL, pvcs, "create", "2026-01-15T10:00:00Z"
+        )
+        assert time.monotonic() - start < 10
+    assert total == 119.5
@@ -0,0 +1,182 @@
+# -*- coding: utf8 -*-
+
+import re
+import shlex
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
+from ocs_ci.ocs import exec_pool
+from ocs_ci.ocs.exceptions import CommandFailed, ExecSessionUnavailable
+
+SCRIPT_RE = re.compile(
+    r"\( (?P<command>.*) \) </dev/null; printf '\\n(?P<marker>\w+)%d"
+)
+
+
+class FakeShell(object):
+    """
+    Exec stream which runs the written commands by the handler and returns
+    the output in small chunks
+    """
+
+    def __init__(self, handler, chunk_size=7):
+        self.handler = handler
+        self.chunk_size = chunk_size
+        self.open = True
+        self.stdout = []
+        self.stderr = []
+        self.commands = []
+
+    def is_open(self):
+        return self.open
+
+    def close(self):
+        self.open = False
+
+    def write_stdin(self, script):
+        match = SCRIPT_RE.match(script)
+        argv = shlex.split(match["command"])
+        self.commands.append(argv)
+        result = self.handler(argv)
+        if result is None:
+            # the command never finishes
+            return
+        stdout, stderr, return_code = result
+        stdout = f"{stdout}\n{match['marker']}{return_code}\n"
+        stderr = f"{stderr}\n{match['marker']}\n"
+        self.stdout.extend(
+            stdout[i : i + self.chunk_size]
+            for i in range(0, len(stdout), self.chunk_size)
+        )
+        self.stderr.append(stderr)
+
+    def update(self, timeout=0):
+        pass
+
+    def peek_stdout(self):
+        return bool(self.stdout)
+
+    def peek_stderr(self):
+        return bool(self.stderr)
+
+    def read_stdout(self):
+        return self.stdout.pop(0)
+
+    def read_stderr(self):
+        return self.stderr.pop(0)
+
+
+def ceph_handler(argv):
+    if argv == ["true"]:
+        return "", "", 0
+    if argv[:2] == ["ceph", "health"]:
+        return '{"status": "HEALTH_OK"}', "", 0
+    if argv[0] == "sleep":
+        return None
+    return "", f"{argv[0]}: not found", 127
+
+
+@pytest.fixture
+def fake_streams():
+    """
+    Patch exec streams by FakeShell instances, returns list of opened streams
+    """
+    streams = []
+
+    def fake_stream(*args, **kwargs):
+        streams.append(FakeShell(ceph_handler))
+        return streams[-1]
+
+    exec_pool.close_exec_sessions()
+    with (
+        patch.object(exec_pool, "get_api_backend"),
+        patch.object(exec_pool, "stream", side_effect=fake_stream),
+    ):
+        yield streams
+    exec_pool.close_exec_sessions()
+
+
+def run(command, **kwargs):
+    return exec_pool.exec_in_pod(
+        "/tmp/kubeconfig", "openshift-storage", "tools", "tools", command, **kwargs
+    )
+
+
+def test_commands_reuse_session(fake_streams):
+    for _ in range(3):
+        assert run("ceph health --format json") == '{"status": "HEALTH_OK"}'
+    assert len(fake_streams) == 1
+    # the shell is checked once, when the session is opened
+    assert fake_streams[0].commands[:2] == [
+        ["true"],
+        ["ceph", "health", "--format", "json"],
+    ]
+
+
+def test_failed_command(fake_streams):
+    with pytest.raises(CommandFailed) as ex:
+        run("rados df --key secret-key", secrets=["secret-key"])
+    assert "command terminated with exit code 127" in str(ex.value)
+    assert "secret-key" not in str(ex.value)
+    assert run("rados df", ignore_error=True) == ""
+
+
+def test_reconnect_after_stream_closed(fake_streams):
+    run("ceph health")
+    # e.g. the pod was restarted
+    fake_streams[0].close()
+    assert run("ceph health") == '{"status": "HEALTH_OK"}'
+    assert len(fake_streams) == 2
+
+
+def test_command_timeout_closes_session(fake_streams):
+    with pytest.raises(subprocess.TimeoutExpired):
+        run("sleep 100", timeout=0.2)
+    assert not fake_streams[0].open
+    run("ceph health")
+    assert len(fake_streams) == 2
+
+
+def test_session_unavailable_without_shell(fake_streams):
+    def fake_stream(*args, **kwargs):
+        shell = FakeShell(ceph_handler)
+        # the stream is closed by the server, because the shell doesn't exist
+        shell.handler = lambda argv: shell.close()
+        fake_streams.append(shell)
+        return shell
+
+    session = exec_pool.ExecSession("/tmp/kubeconfig", "ns", "pod", "container")
+    with patch.object(exec_pool, "stream", side_effect=fake_stream):
+        with pytest.raises(ExecSessionUnavailable):
+            session.connect()
+        with pytest.raises(ExecSessionUnavailable):
+            session.run(["ls"])
+    # only the probes were written
+    assert [shell.commands for shell in fake_streams] == [[["true"]], [["true"]]]
+
+
+def test_stream_closed_during_first_command(fake_streams):
+    session = exec_pool.ExecSession("/tmp/kubeconfig", "ns", "pod", "container")
+    session.connect()
+    shell = fake_streams[0]
+    # e.g. the pod was deleted while the command ran
+    shell.handler = lambda argv: shell.close()
+    # the command may have run, it must not be re-run by 'oc'
+    with pytest.raises(CommandFailed, match="closed while running: rm -f x"):
+        session.run(["rm", "-f", "x"])
+    assert shell.commands == [["true"], ["rm", "-f", "x"]]
+
+
+def test_get_default_container():
+    pod_data = {
+        "metadata": {},
+        "spec": {"containers": [{"name": "first"}, {"name": "second"}]},
+    }
+    assert exec_pool.get_default_container(pod_data) == "first"
+    pod_data["metadata"]["annotations"] = {
+        "kubectl.kubernetes.io/default-container": "second"
+    }
+    assert exec_pool.get_default_container(pod_data) == "second"
+    assert exec_pool.get_default_container({"metadata": {}}) is None
@@ -0,0 +1,173 @@
+# -*- coding: utf8 -*-
+
+import itertools
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from ocs_ci.framework import Config, config
+from ocs_ci.ocs import cluster_context, health_orchestrator
+from ocs_ci.ocs.exceptions import (
+    CephHealthException,
+    CephHealthNotRecoveredException,
+    CephHealthRecoveredException,
+    CommandFailed,
+)
+from ocs_ci.ocs.health_orchestrator import check_clusters_health
+from ocs_ci.utility.utils import ceph_health_check_multi_storagecluster_external
+
+
+@pytest.fixture
+def clusters():
+    """
+    Replace the clusters of the config by ACM hub, two ODF clusters and client
+    """
+    cluster_configs = []
+    for index, cluster_type in enumerate(["hub", "odf", "odf", "client"]):
+        cluster_config = Config()
+        cluster_config.MULTICLUSTER = {
+            "multicluster_index": index,
+            "acm_cluster": cluster_type == "hub",
+        }
+        cluster_config.ENV_DATA = {
+            "cluster_name": f"cluster-{index}",
+            "cluster_namespace": f"storage-{index}",
+            "cluster_type": cluster_type,
+        }
+        cluster_configs.append(cluster_config)
+    with (
+        patch.object(config, "clusters", cluster_configs),
+        patch.object(config, "_cur_index", 0),
+        patch.object(cluster_context, "_registry", {}),
+        patch.dict(config.DEPLOYMENT, {"multi_storagecluster": False}),
+        patch.object(health_orchestrator.time, "sleep"),
+    ):
+        yield cluster_configs
+
+
+def test_clusters_checked_in_parallel(clusters):
+    barrier = threading.Barrier(2, timeout=10)
+    healths = {"storage-1": ["HEALTH_OK"], "storage-2": ["HEALTH_WARN x", "HEALTH_OK"]}
+    checked = []
+
+    def run_ceph_health_cmd(namespace, detail=False):
+        # the namespace of the bound cluster context is used
+        assert config.ENV_DATA["cluster_namespace"] == namespace
+        if not checked.count(namespace):
+            # both clusters are checked at the same time
+            barrier.wait()
+        checked.append(namespace)
+        return healths[namespace].pop(0)
+
+    with patch.object(health_orchestrator, "run_ceph_health_cmd", run_ceph_health_cmd):
+        report = check_clusters_health(timeout=60, delay=5)
+    assert health_orchestrator.get_ceph_cluster_indexes() == [1, 2]
+    assert report.healthy
+    assert [(v.cluster, v.attempts) for v in report] == [
+        ("cluster-1", 1),
+        ("cluster-2", 2),
+    ]
+    report.raise_for_health()
+
+
+def test_verdicts_of_failed_and_recovered_clusters(clusters):
+    def run_ceph_health_cmd(namespace, detail=False):
+        if namespace == "storage-1":
+            raise CommandFailed("toolbox not running")
+        return "HEALTH_WARN 1 daemons have recently crashed"
+
+    def recover(health, namespace, **kwargs):
+        raise CephHealthRecoveredException("recovered after the crash archive")
+
+    with (
+        patch.object(health_orchestrator, "run_ceph_health_cmd", run_ceph_health_cmd),
+        patch.object(health_orchestrator, "ceph_health_recover", recover),
+        patch.object(health_orchestrator.time, "monotonic", side_effect=range(100)),
+    ):
+        report = check_clusters_health(timeout=20, delay=5, fix_ceph_health=True)
+    failed, recovered = report.verdicts
+    assert not failed.healthy and "toolbox not running" in failed.error
+    assert failed.attempts > 1
+    assert recovered.healthy and recovered.recovered
+    assert report.unhealthy() == [failed]
+    with pytest.raises(CephHealthException, match="cluster-1: CommandFailed"):
+        report.raise_for_health()
+
+
+def test_not_recovered_and_external_cluster(clusters):
+    config.DEPLOYMENT["multi_storagecluster"] = True
+
+    def recover(health, namespace, **kwargs):
+        raise CephHealthNotRecoveredException("no known fix")
+
+    with (
+        patch.object(
+            health_orchestrator, "run_ceph_health_cmd", return_value="HEALTH_ERR"
+        ),
+        patch.object(health_orchestrator, "ceph_health_recover", recover),
+        patch.object(
+            health_orchestrator,
+            "ceph_health_multi_storagecluster_external_base",
+            return_value=True,
+        ),
+    ):
+        report = check_clusters_health(indexes=[2], fix_ceph_health=True)
+    assert report.summary() == {
+        "cluster-2": "HEALTH_ERR",
+        "external multi-storagecluster": "HEALTH_OK",
+    }
+    assert report.unhealthy()[0].error == "no known fix"
+    # the type of the exception of ceph_health_recover is kept
+    with pytest.raises(CephHealthNotRecoveredException, match="no known fix"):
+        report.raise_for_health()
+
+
+def test_health_checks_of_multicluster_run(clusters):
+    with patch.object(config, "multicluster", True):
+        assert health_orchestrator.is_clusters_health_check()
+        with patch.object(
+            health_orchestrator, "run_ceph_health_cmd", return_value="HEALTH_OK"
+        ):
+            assert health_orchestrator.ceph_health_check_clusters(tries=2, delay=5)
+    with patch.object(config, "multicluster", False):
+        assert not health_orchestrator.is_clusters_health_check()
+        config.DEPLOYMENT["multi_storagecluster"] = True
+        assert health_orchestrator.is_clusters_health_check()
+
+
+def test_external_cluster_check(clusters):
+    health = iter(
+        [CephHealthException("HEALTH_WARN clock skew"), CommandFailed("ssh"), True]
+    )
+
+    def external_base():
+        result = next(health)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    with patch.object(
+        health_orchestrator,
+        "ceph_health_multi_storagecluster_external_base",
+        external_base,
+    ):
+        assert ceph_health_check_multi_storagecluster_external(tries=5, delay=1)
+        health = itertools.repeat(CephHealthException("HEALTH_WARN clock skew"))
+        with (
+            patch.object(
+                health_orchestrator.time, "monotonic", side_effect=itertools.count()
+            ),
+            pytest.raises(CephHealthException, match="clock skew"),
+        ):
+            ceph_health_check_multi_storagecluster_external(tries=3, delay=1)
+
+
+def test_delay_on_ibm_power(clusters):
+    with (
+        patch.dict(config.ENV_DATA, {"platform": "powervs"}),
+        patch.object(health_orchestrator, "check_clusters_health") as check,
+    ):
+        assert health_orchestrator.ceph_health_check_clusters(tries=10, delay=15)
+    assert check.call_args.kwargs["delay"] == 60
+    assert check.call_args.kwargs["timeout"] == 600
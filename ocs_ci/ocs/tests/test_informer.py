@@ -0,0 +1,193 @@
+# -*- coding: utf8 -*-
+
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from ocs_ci.framework import config
+from ocs_ci.ocs import informer
+from ocs_ci.ocs.exceptions import CommandFailed
+from ocs_ci.ocs.ocp import OCP
+
+
+def make_pvc(name, phase="Bound", labels=None, resource_version="1"):
+    return {
+        "metadata": {
+            "name": name,
+            "namespace": "test",
+            "labels": labels or {},
+            "resourceVersion": resource_version,
+            "uid": name,
+        },
+        "status": {"phase": phase},
+    }
+
+
+@pytest.fixture
+def pvc_informer():
+    """
+    SharedInformer of PVCs which was synced, without running watch thread
+    """
+    resource = Mock()
+    resource.kind = "PersistentVolumeClaim"
+    resource.group_version = "v1"
+    resource.namespaced = True
+    resource.get.return_value.to_dict.return_value = {
+        "metadata": {"resourceVersion": "10"},
+        "items": [
+            make_pvc("pvc-a", labels={"app": "a"}),
+            make_pvc("pvc-b", phase="Pending", labels={"app": "b"}),
+        ],
+    }
+    backend = Mock()
+    backend._request.side_effect = lambda description, func, **kwargs: func(**kwargs)
+    pvc_informer = informer.SharedInformer(backend, resource, "test")
+    pvc_informer.resync()
+    return pvc_informer
+
+
+@pytest.mark.parametrize(
+    "selector,expected",
+    [
+        ("app=a", True),
+        ("app==a", True),
+        ("app!=a", False),
+        ("app", True),
+        ("!app", False),
+        ("app in (a,b)", True),
+        ("app notin (a,b)", False),
+        ("app=a,tier", False),
+        ("app in (b, c),tier notin (x)", False),
+        ("", True),
+    ],
+)
+def test_match_label_selector(selector, expected):
+    assert informer.match_label_selector({"app": "a"}, selector) is expected
+
+
+def test_match_field_selector():
+    pvc = make_pvc("pvc-a")
+    assert informer.match_field_selector(pvc, "status.phase=Bound")
+    assert informer.match_field_selector(pvc, "metadata.name!=pvc-b")
+    assert not informer.match_field_selector(pvc, "status.phase==Pending")
+
+
+def test_informer_list_and_get(pvc_informer):
+    assert [pvc["metadata"]["name"] for pvc in pvc_informer.list("app=b")] == ["pvc-b"]
+    pvc = pvc_informer.get("pvc-a")
+    assert pvc["kind"] == "PersistentVolumeClaim"
+    # returned objects are copies of the store
+    pvc["status"]["phase"] = "Lost"
+    assert pvc_informer.get("pvc-a")["status"]["phase"] == "Bound"
+    assert pvc_informer.get("pvc-c") is None
+
+
+def test_informer_events(pvc_informer):
+    generation = pvc_informer.generation
+    pvc_informer._handle_event(
+        {"type": "MODIFIED", "raw_object": make_pvc("pvc-b", resource_version="11")}
+    )
+    pvc_informer._handle_event(
+        {"type": "DELETED", "raw_object": make_pvc("pvc-a", resource_version="12")}
+    )
+    assert pvc_informer.generation == generation + 2
+    assert pvc_informer.get("pvc-b")["status"]["phase"] == "Bound"
+    assert pvc_informer.get("pvc-a") is None
+
+
+def test_informer_ignores_replayed_events(pvc_informer):
+    pvc_informer._handle_event(
+        {
+            "type": "MODIFIED",
+            "raw_object": make_pvc("pvc-b", phase="Lost", resource_version="0"),
+        }
+    )
+    assert pvc_informer.get("pvc-b")["status"]["phase"] == "Pending"
+
+
+def test_wait_for_change_is_woken_by_event(pvc_informer):
+    generation = pvc_informer.generation
+    event = {"type": "ADDED", "raw_object": make_pvc("pvc-c", resource_version="13")}
+    threading.Timer(0.1, pvc_informer._handle_event, [event]).start()
+    start = time.time()
+    assert pvc_informer.wait_for_change(generation, timeout=10) == generation + 1
+    assert time.time() - start < 5
+
+
+def test_informer_notifies_listeners(pvc_informer):
+    events = []
+    pvc_informer.add_listener(lambda: events.append(1))
+    pvc_informer._handle_event(
+        {"type": "ADDED", "raw_object": make_pvc("pvc-c", resource_version="13")}
+    )
+    pvc_informer._handle_event({"type": "BOOKMARK", "raw_object": make_pvc("x")})
+    assert events == [1]
+
+
+def test_ocp_reads_from_informer(pvc_informer):
+    ocp_obj = OCP(kind="PersistentVolumeClaim", namespace="test")
+    with (
+        patch.dict(config.RUN, {"informer_cache": True}),
+        patch.object(OCP, "get_informer", return_value=pvc_informer),
+        patch.object(OCP, "exec_oc_cmd") as exec_oc_cmd,
+    ):
+        assert ocp_obj.get(selector="app=a")["items"][0]["metadata"]["name"] == (
+            "pvc-a"
+        )
+        assert ocp_obj.get_resource("pvc-b", "STATUS") == "Pending"
+        assert ocp_obj.wait_for_resource(
+            condition="Bound", resource_name="pvc-a", timeout=5
+        )
+    exec_oc_cmd.assert_not_called()
+
+
+def test_wait_for_resource_created_later(pvc_informer):
+    ocp_obj = OCP(kind="PersistentVolumeClaim", namespace="test")
+    event = {"type": "ADDED", "raw_object": make_pvc("pvc-c", resource_version="13")}
+    threading.Timer(0.2, pvc_informer._handle_event, [event]).start()
+    with (
+        patch.dict(config.RUN, {"informer_cache": True}),
+        patch.object(OCP, "get_informer", return_value=pvc_informer),
+        # 'oc get' fallback for the name missing in the store
+        patch.object(OCP, "exec_oc_cmd", side_effect=CommandFailed("pvc-c not found")),
+    ):
+        assert ocp_obj.wait_for_resource(
+            condition="Bound", resource_name="pvc-c", timeout=10
+        )
+
+
+def test_oc_write_invalidates_informers_of_its_cluster(tmp_path):
+    kubeconfigs = []
+    for name in ("a", "b"):
+        kubeconfig = tmp_path / name
+        kubeconfig.touch()
+        kubeconfigs.append(str(kubeconfig))
+    informers = {
+        (kubeconfig, "", "persistentvolumeclaims", "test"): Mock()
+        for kubeconfig in kubeconfigs
+    }
+    informer_a, informer_b = informers.values()
+    cluster_b = Mock()
+    cluster_b.RUN = {"kubeconfig": kubeconfigs[1]}
+    ocp_obj = OCP(kind="PersistentVolumeClaim", namespace="test")
+    with (
+        patch.dict(informer._informers, informers, clear=True),
+        patch("ocs_ci.ocs.ocp.run_cmd", return_value=""),
+        patch.object(OCP, "_build_oc_cmd", return_value=("oc", cluster_b)),
+    ):
+        ocp_obj.cluster_kubeconfig = kubeconfigs[0]
+        ocp_obj.exec_oc_cmd("delete pvc pvc-a", out_yaml_format=False)
+        informer_a.invalidate.assert_called_once()
+        informer_b.invalidate.assert_not_called()
+
+        ocp_obj.cluster_kubeconfig = ""
+        ocp_obj.exec_oc_cmd(
+            "delete pvc pvc-b", out_yaml_format=False, cluster_config=cluster_b
+        )
+        informer_b.invalidate.assert_called_once()
+        # reads don't invalidate
+        ocp_obj.exec_oc_cmd("get pvc", out_yaml_format=False, cluster_config=cluster_b)
+    informer_a.invalidate.assert_called_once()
+    informer_b.invalidate.assert_called_once()
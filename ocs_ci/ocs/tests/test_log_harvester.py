@@ -0,0 +1,116 @@
+# -*- coding: utf8 -*-
+
+import io
+import os
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from ocs_ci.ocs import log_harvester
+from ocs_ci.ocs.exceptions import CommandFailed
+from ocs_ci.ocs.log_harvester import (
+    LogHarvester,
+    RateLimiter,
+    node_logs_job,
+    pod_logs_job,
+    read_log_file,
+)
+
+
+class FakeOC(object):
+    """
+    exec_oc_cmd_stream returning 'output of <command>', failing the first
+    calls of the commands in fail_first
+    """
+
+    def __init__(self, fail_first=(), delay=0):
+        self.fail_first = set(fail_first)
+        self.delay = delay
+        self.commands = []
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def exec_oc_cmd_stream(self, command, timeout=600, silent=False):
+        with self._lock:
+            self.commands.append(command)
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            time.sleep(self.delay)
+            if command in self.fail_first:
+                self.fail_first.discard(command)
+                raise CommandFailed(f"{command} failed")
+        finally:
+            with self._lock:
+                self.running -= 1
+        process = MagicMock()
+        process.__enter__.return_value = process
+        process.stdout.open.return_value = io.BytesIO(f"output of {command}".encode())
+        return process
+
+
+def test_harvest_saves_compressed_logs(tmp_path):
+    fake_oc = FakeOC(fail_first=["logs pod-b"], delay=0.05)
+    harvester = LogHarvester(workers=2, retries=1, retry_delay=0)
+    jobs = [
+        pod_logs_job(name, str(tmp_path), namespace="ns")
+        for name in ["pod-a", "pod-b", "pod-c", "pod-d"]
+    ]
+    jobs.append(node_logs_job("node-1", str(tmp_path)))
+    with patch.object(
+        log_harvester.OCP, "exec_oc_cmd_stream", side_effect=fake_oc.exec_oc_cmd_stream
+    ):
+        files = harvester.harvest(jobs)
+    harvester.shutdown()
+    assert sorted(files) == ["node-1", "ns_pod-a", "ns_pod-b", "ns_pod-c", "ns_pod-d"]
+    assert files["ns_pod-a"] == str(tmp_path / "ns_pod-a.log.gz")
+    assert read_log_file(files["ns_pod-b"]) == "output of logs pod-b"
+    assert "dmesg" in read_log_file(files["node-1"])
+    assert fake_oc.commands.count("logs pod-b") == 2
+    assert fake_oc.max_running <= 2
+
+
+def test_harvest_leaves_out_failed_jobs(tmp_path):
+    fake_oc = FakeOC(fail_first=["logs pod-a"])
+    harvester = LogHarvester(workers=2, retries=0)
+    jobs = [
+        pod_logs_job(name, str(tmp_path), namespace="ns") for name in ["pod-a", "pod-b"]
+    ]
+    with patch.object(
+        log_harvester.OCP, "exec_oc_cmd_stream", side_effect=fake_oc.exec_oc_cmd_stream
+    ):
+        files = harvester.harvest(jobs)
+    harvester.shutdown()
+    assert list(files) == ["ns_pod-b"]
+    assert sorted(os.listdir(tmp_path)) == ["ns_pod-b.log.gz"]
+
+
+def test_harvest_pods_of_same_name(tmp_path):
+    fake_oc = FakeOC(delay=0.05)
+    harvester = LogHarvester(workers=4, retries=0)
+    namespaces = ["openshift-kube-apiserver", "openshift-kube-scheduler"]
+    jobs = [
+        pod_logs_job("installer-7-node-1", str(tmp_path), namespace=namespace)
+        for namespace in namespaces
+    ]
+    with patch.object(
+        log_harvester.OCP, "exec_oc_cmd_stream", side_effect=fake_oc.exec_oc_cmd_stream
+    ):
+        files = harvester.harvest(jobs)
+    harvester.shutdown()
+    assert sorted(files) == [
+        f"{namespace}_installer-7-node-1" for namespace in namespaces
+    ]
+    for path in files.values():
+        assert read_log_file(path) == "output of logs installer-7-node-1"
+    assert len(os.listdir(tmp_path)) == 2
+
+
+def test_rate_limiter():
+    limiter = RateLimiter(20, burst=2)
+    start = time.monotonic()
+    for _ in range(6):
+        limiter.acquire()
+    # 2 commands of the burst at once, the other 4 at 20 per second
+    assert time.monotonic() - start >= 0.18
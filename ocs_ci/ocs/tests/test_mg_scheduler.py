@@ -0,0 +1,81 @@
+# -*- coding: utf8 -*-
+
+import datetime
+import json
+import threading
+from unittest.mock import patch
+
+from ocs_ci.ocs.must_gather import mg_scheduler
+from ocs_ci.ocs.must_gather.mg_scheduler import (
+    MustGatherRequest,
+    MustGatherScheduler,
+)
+
+T0 = datetime.datetime(2026, 1, 1, 10, 0, 0)
+
+
+def minutes(n):
+    return T0 + datetime.timedelta(minutes=n)
+
+
+def test_request_overlap_and_merge():
+    first = MustGatherRequest("test_a", since=minutes(0), until=minutes(10))
+    second = MustGatherRequest(
+        "test_b", since=minutes(5), until=minutes(20), ocp=True, ocs=False
+    )
+    later = MustGatherRequest("test_c", since=minutes(21), until=minutes(30))
+    assert first.overlaps(second) and second.overlaps(first)
+    assert not first.overlaps(later)
+    assert MustGatherRequest("test_d", until=minutes(25)).overlaps(later)
+    assert not MustGatherRequest("test_d", until=minutes(1)).overlaps(later)
+
+    first.merge(second)
+    assert first.tests == ["test_a", "test_b"]
+    assert (first.since, first.until) == (minutes(0), minutes(20))
+    assert first.ocp and first.ocs and not first.mcg
+    assert first.dir_name == "test_a_and_1_more"
+    assert first.since_time == "2026-01-01T10:00:00Z"
+
+
+def test_scheduler_coalesces_pending_collections(tmp_path):
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def collect_ocs_logs(**kwargs):
+        calls.append(kwargs)
+        started.set()
+        release.wait(10)
+
+    scheduler = MustGatherScheduler(workers=1, logs_dir=str(tmp_path))
+    with (
+        patch.object(mg_scheduler.utils, "collect_ocs_logs", collect_ocs_logs),
+        patch.object(mg_scheduler, "get_mg_timeout", return_value=600),
+    ):
+        now = datetime.datetime.utcnow()
+        scheduler.submit("test_a", since=now)
+        assert started.wait(10)
+        # queued while test_a is being collected, the windows overlap
+        scheduler.submit("test_b", since=now)
+        scheduler.submit("test_c", since=now, mcg=True)
+        assert len(scheduler.pending) == 1
+        release.set()
+        assert scheduler.flush(timeout=10)
+
+    assert [call["dir_name"] for call in calls] == ["test_a", "test_b_and_1_more"]
+    assert calls[1]["mcg"] and calls[1]["timeout"] == 600
+    with open(tmp_path / mg_scheduler.COLLECTIONS_FILE) as f:
+        collections = json.load(f)
+    assert [c["tests"] for c in collections] == [["test_a"], ["test_b", "test_c"]]
+    assert {c["status"] for c in collections} == {"collected"}
+
+
+def test_scheduler_disk_budget(tmp_path):
+    (tmp_path / "test_a_ocs_logs").mkdir()
+    (tmp_path / "test_a_ocs_logs" / "log").write_bytes(b"x" * 2048)
+    scheduler = MustGatherScheduler(disk_budget=1024, logs_dir=str(tmp_path))
+    with patch.object(mg_scheduler.utils, "collect_ocs_logs") as collect_ocs_logs:
+        scheduler.submit("test_b")
+        assert scheduler.flush(timeout=10)
+    collect_ocs_logs.assert_not_called()
+    assert scheduler.collections[0]["status"] == "skipped"
@@ -0,0 +1,88 @@
+# -*- coding: utf8 -*-
+
+import filecmp
+import gzip
+import json
+import os
+import sys
+from unittest.mock import patch
+
+from ocs_ci.ocs.must_gather import mg_store
+from ocs_ci.ocs.must_gather.mg_store import MustGatherStore
+
+
+def make_mg(root, test_log):
+    files = {
+        "ceph/ceph_status": "HEALTH_OK\n" * 1000,
+        "namespaces/openshift-storage/pods/osd-0/osd.log": "osd log line\n" * 5000,
+        "cluster-scoped-resources/nodes.yaml": "kind: Node\n",
+        "test.log": test_log,
+        "empty.log": "",
+    }
+    for path, content in files.items():
+        full_path = root / path
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        full_path.write_text(content)
+    (root / "empty_dir").mkdir()
+    os.symlink("ceph/ceph_status", root / "latest_status")
+    return root
+
+
+def blobs(store_root):
+    return [
+        os.path.join(dir_name, name)
+        for dir_name, _, names in os.walk(store_root / "blobs")
+        for name in names
+    ]
+
+
+def test_pack_deduplicates_and_restores(tmp_path):
+    store_root = tmp_path / "mg_store"
+    store = MustGatherStore(str(store_root), workers=4)
+    first = make_mg(tmp_path / "logs" / "test_a_ocs_logs", "test a")
+    second = make_mg(tmp_path / "logs" / "test_b_ocs_logs", "test b")
+
+    first_manifest = store.pack(str(first))
+    assert first_manifest == f"{first}.manifest.json"
+    assert len(blobs(store_root)) == 5
+    store.pack(str(second))
+    # only the test log of the second must-gather differs
+    assert len(blobs(store_root)) == 6
+    blob_size = sum(os.path.getsize(blob) for blob in blobs(store_root))
+    assert blob_size < 2 * sum(
+        os.path.getsize(os.path.join(d, n))
+        for d, _, names in os.walk(first)
+        for n in names
+        if not os.path.islink(os.path.join(d, n))
+    )
+    with open(first_manifest) as f:
+        manifest = json.load(f)
+    assert manifest["store"] == os.path.join("..", "mg_store")
+    status = next(e for e in manifest["files"] if e["path"] == "ceph/ceph_status")
+    # the blobs are plain gzip files
+    with gzip.open(store.blob_path(status["sha256"]), "rt") as f:
+        assert f.read() == "HEALTH_OK\n" * 1000
+
+    restored = store.restore(first_manifest, str(tmp_path / "restored"))
+    comparison = filecmp.dircmp(first, restored)
+    assert not comparison.diff_files and not comparison.left_only
+    assert not comparison.right_only
+    assert os.readlink(os.path.join(restored, "latest_status")) == "ceph/ceph_status"
+    assert os.path.isdir(os.path.join(restored, "empty_dir"))
+    assert filecmp.cmp(
+        first / "namespaces/openshift-storage/pods/osd-0/osd.log",
+        os.path.join(restored, "namespaces/openshift-storage/pods/osd-0/osd.log"),
+        shallow=False,
+    )
+
+
+def test_store_must_gather_and_restore_command(tmp_path):
+    mg_dir = make_mg(tmp_path / "logs" / "test_ocs_logs", "test")
+    with patch.dict(
+        mg_store.config.REPORTING, {"mg_store_dir": str(tmp_path / "store")}
+    ):
+        manifest = mg_store.store_must_gather(str(mg_dir), delete=True)
+    assert not mg_dir.exists()
+    with patch.object(sys, "argv", ["mg-restore", manifest, "--workers", "2"]):
+        mg_store.main()
+    assert (mg_dir / "test.log").read_text() == "test"
@@ -0,0 +1,114 @@
+# -*- coding: utf8 -*-
+
+import io
+import os
+import tarfile
+from unittest.mock import patch
+
+import pytest
+
+from ocs_ci.ocs.must_gather import must_gather
+from ocs_ci.ocs.must_gather.mg_index import MustGatherIndex
+
+
+def add_file(path, content="data"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    return path
+
+
+@pytest.fixture
+def mg_root(tmp_path):
+    root = tmp_path / "mg_ocs_logs"
+    image = root / "quay-io-ocs-must-gather"
+    add_file(image / "ceph" / "ceph_status")
+    add_file(image / "ceph" / "ceph_logs" / "journal_compute-1" / "log.log")
+    add_file(image / "ceph" / "nested" / "ceph_status", "second copy")
+    add_file(image / "namespaces" / "openshift-storage" / "pods" / "osd-0" / "a.log")
+    add_file(image / "namespaces" / "openshift-storage" / "pods" / "mon-a" / "b.log")
+    add_file(image / "noobaa" / "empty.log", "")
+    add_file(image / "noobaa" / "noobaa-db-pg-0-init.log", "")
+    add_file(image / "storagecluster.yaml", "kind: StorageCluster")
+    tarball = image / "gather.tar.gz"
+    with tarfile.open(tarball, "w:gz") as tar:
+        member = tarfile.TarInfo("inner/ceph_logs/crash/report.txt")
+        member.size = 3
+        tar.addfile(member, io.BytesIO(b"abc"))
+    return root
+
+
+def test_index_matches_walk(mg_root):
+    index = MustGatherIndex(str(mg_root))
+    walked = []
+    for dir_name, dirs, files in os.walk(mg_root):
+        walked.extend(os.path.join(dir_name, name) for name in files + dirs)
+    on_disk = [entry.path for entry in index.entries if not entry.in_tarball]
+    assert sorted(on_disk) == sorted(walked)
+    # the first file found in the order of os.walk wins
+    assert index.find("ceph_status").endswith("ceph/ceph_status")
+    found, missing = index.find_all(["storagecluster.yaml", "missing.log"])
+    assert list(found) == ["storagecluster.yaml"] and missing == ["missing.log"]
+    assert {entry.name for entry in index.empty_files()} == {
+        "empty.log",
+        "noobaa-db-pg-0-init.log",
+    }
+    assert index.missing_substrings(
+        ["/ceph_logs/journal_", "inner/ceph_logs/crash", "/not_there"]
+    ) == ["/not_there"]
+    assert index.present_substrings(["inner/ceph_logs", "/not_there"]) == [
+        "inner/ceph_logs"
+    ]
+    pods = index.directories("openshift-storage/pods$")
+    assert sorted(index.list_dir(pods[0])) == ["mon-a", "osd-0"]
+    assert index.signature(found["storagecluster.yaml"]) == b"kind: StorageCluster"
+
+
+def test_symlinked_directories_not_followed(mg_root):
+    image = mg_root / "quay-io-ocs-must-gather"
+    # link cycle and a link to a directory with files
+    (image / "ceph" / "loop").symlink_to(image, target_is_directory=True)
+    (image / "ceph_link").symlink_to(image / "ceph", target_is_directory=True)
+    index = MustGatherIndex(str(mg_root))
+    walked = []
+    for dir_name, dirs, files in os.walk(mg_root):
+        walked.extend(os.path.join(dir_name, name) for name in files + dirs)
+    on_disk = [entry.path for entry in index.entries if not entry.in_tarball]
+    assert sorted(on_disk) == sorted(walked)
+    assert str(image / "ceph" / "loop") in index.directories("loop")
+    # nothing is indexed under the links
+    linked = (str(image / "ceph_link") + os.sep, str(image / "ceph" / "loop") + os.sep)
+    assert not [path for path in index.all_paths() if path.startswith(linked)]
+
+
+def test_must_gather_validations(mg_root):
+    with patch.object(
+        must_gather.version, "get_semantic_ocs_version_from_config", return_value=4.18
+    ):
+        mg = must_gather.MustGather()
+    mg.root = str(mg_root)
+    mg.type_log = "OTHERS"
+    with (
+        patch.object(must_gather.config, "UPGRADE", {"upgrade_ocs_version": "4.18"}),
+        patch.object(must_gather.config, "ENV_DATA", {"platform": "aws"}),
+        patch.object(
+            must_gather, "storagecluster_independent_check", return_value=False
+        ),
+        patch.dict(
+            must_gather.GATHER_COMMANDS_VERSION,
+            {4.18: {"OTHERS": ["storagecluster.yaml", "ceph_status", "missing"]}},
+        ),
+        patch.object(must_gather, "MustGatherIndex", wraps=MustGatherIndex) as index,
+    ):
+        mg.validate_file_size()
+        mg.validate_expected_files()
+        mg.get_all_paths()
+    assert mg.empty_files == ["empty.log"]
+    assert mg.files_not_exist == ["missing"]
+    assert mg.files_path["ceph_status"].endswith("ceph/ceph_status")
+    # one scan for the validations and a fresh one for get_all_paths
+    assert index.call_count == 2
+    assert mg.verify_paths_in_dir(["/ceph_logs/journal_", "/x"]) == ["/x"]
+    assert mg.verify_paths_not_in_dir(["/x", "crash/report.txt"]) == [
+        "crash/report.txt"
+    ]
+    assert "inner/ceph_logs" in mg.full_paths
@@ -0,0 +1,116 @@
+# -*- coding: utf8 -*-
+
+import json
+from unittest.mock import patch
+
+import pytest
+import yaml
+
+from ocs_ci.framework import config
+from ocs_ci.ocs import ocp, output_format
+from ocs_ci.ocs.ocp import OCP
+
+PVC_LIST = {
+    "apiVersion": "v1",
+    "kind": "List",
+    "items": [
+        {
+            "kind": "PersistentVolumeClaim",
+            "metadata": {"name": f"pvc-{i}", "labels": {"app": "a"}},
+            "status": {"phase": "Bound", "capacity": {"storage": "1Gi"}},
+        }
+        for i in range(3)
+    ],
+}
+
+CUSTOM_COLUMNS_OUT = """\
+NAME    PHASE     VOLUME
+pvc-0   Bound     pvc-5b1e0f6a
+pvc-1   Pending   <none>
+my pvc  Bound     pvc-0c1d2e3f
+"""
+
+
+@pytest.mark.parametrize(
+    "dump,fmt",
+    [
+        (json.dumps, "json"),
+        (json.dumps, None),
+        (yaml.safe_dump, "yaml"),
+        (yaml.safe_dump, None),
+    ],
+)
+def test_parse_output(dump, fmt):
+    assert output_format.parse_output(dump(PVC_LIST), fmt) == PVC_LIST
+
+
+def test_parse_output_falls_back_to_yaml():
+    # e.g. a message printed instead of the document
+    assert output_format.parse_output("No resources found", "json") == (
+        "No resources found"
+    )
+
+
+def test_parse_output_without_orjson():
+    with patch.object(output_format, "orjson", None):
+        assert output_format.parse_output(json.dumps(PVC_LIST)) == PVC_LIST
+
+
+def test_parse_custom_columns():
+    columns = {"NAME": ".metadata.name", "phase": ".status.phase", "VOLUME": "."}
+    assert output_format.parse_custom_columns(CUSTOM_COLUMNS_OUT, columns) == [
+        {"NAME": "pvc-0", "phase": "Bound", "VOLUME": "pvc-5b1e0f6a"},
+        {"NAME": "pvc-1", "phase": "Pending", "VOLUME": None},
+        {"NAME": "my pvc", "phase": "Bound", "VOLUME": "pvc-0c1d2e3f"},
+    ]
+    assert output_format.parse_custom_columns("", columns) == []
+
+
+@pytest.fixture
+def oc_get(tmp_path):
+    """
+    Patch run_cmd of OCP and disable the API backend, returns the run_cmd mock
+    """
+    with (
+        patch.object(OCP, "_try_api_backend", return_value=(False, None)),
+        patch.object(OCP, "_get_from_informer", return_value=None),
+        patch.object(ocp, "run_cmd") as run_cmd,
+        patch.dict(config.ENV_DATA, {"cluster_path": str(tmp_path)}),
+    ):
+        yield run_cmd
+
+
+@pytest.mark.parametrize(
+    "fmt,dump",
+    [("json", json.dumps), ("yaml", yaml.safe_dump)],
+)
+def test_get_output_format(oc_get, fmt, dump):
+    oc_get.return_value = dump(PVC_LIST)
+    ocp_obj = OCP(kind="PersistentVolumeClaim", namespace="test")
+    assert ocp_obj.get(selector="app=a", output_format=fmt) == PVC_LIST
+    assert oc_get.call_args[1]["cmd"].endswith(f"--selector=app=a -o {fmt}")
+
+
+def test_get_projections(oc_get):
+    ocp_obj = OCP(kind="PersistentVolumeClaim", namespace="test")
+    oc_get.return_value = "pvc-0 pvc-1"
+    assert (
+        ocp_obj.get(selector="app=a", jsonpath="{.items[*].metadata.name}")
+        == "pvc-0 pvc-1"
+    )
+    assert oc_get.call_args[1]["cmd"].endswith(
+        "-o 'jsonpath={.items[*].metadata.name}'"
+    )
+    oc_get.return_value = CUSTOM_COLUMNS_OUT
+    items = ocp_obj.get(
+        custom_columns={
+            "NAME": ".metadata.name",
+            "PHASE": ".status.phase",
+            "VOLUME": ".spec.volumeName",
+        }
+    )
+    assert [item["PHASE"] for item in items] == ["Bound", "Pending", "Bound"]
+    assert oc_get.call_args[1]["cmd"].endswith(
+        "-o custom-columns=NAME:.metadata.name,PHASE:.status.phase,"
+        "VOLUME:.spec.volumeName"
+    )
@@ -0,0 +1,146 @@
+# -*- coding: utf8 -*-
+
+import collections
+import random
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ocs_ci.ocs import cluster, pg_analytics
+from ocs_ci.ocs.pg_analytics import CRUSH_ITEM_NONE, PlacementModel
+
+OSD_DF = {
+    "nodes": [
+        {"id": 2, "name": "osd.2", "pgs": 3, "utilization": 81.9, "crush_weight": 1},
+        {"id": 0, "name": "osd.0", "pgs": 4, "utilization": 80.1, "crush_weight": 1},
+        {"id": 1, "name": "osd.1", "pgs": 25, "utilization": 79.5, "crush_weight": 2},
+    ]
+}
+PG_DUMP = {
+    "pg_ready": True,
+    "pg_stats": [
+        {
+            "pgid": "1.0",
+            "state": "active+clean",
+            "up": [0, 1, 2],
+            "acting": [0, 1, 2],
+            "up_primary": 0,
+            "acting_primary": 0,
+        },
+        {
+            "pgid": "2.0",
+            "state": "active+remapped+backfilling",
+            "up": [1, 2, 0],
+            "acting": [1, 2, 1],
+            "up_primary": 1,
+            "acting_primary": 1,
+        },
+        {
+            "pgid": "10.1f",
+            "state": "active+undersized+degraded",
+            "up": [2, 1, CRUSH_ITEM_NONE],
+            "acting": [2, CRUSH_ITEM_NONE, CRUSH_ITEM_NONE],
+            "up_primary": 2,
+            "acting_primary": 2,
+        },
+        {
+            "pgid": "10.2",
+            "state": "active+clean",
+            "up": [1],
+            "acting": [1],
+            "up_primary": 1,
+            "acting_primary": 1,
+        },
+    ],
+}
+
+
+@pytest.fixture
+def model():
+    return PlacementModel(PG_DUMP, OSD_DF)
+
+
+def test_pg_queries(model):
+    assert model.get_pgids() == ["1.0", "2.0", "10.1f", "10.2"]
+    assert model.get_pgids(pool=10) == ["10.1f", "10.2"]
+    assert model.get_pgids(state="active+clean") == ["1.0", "10.2"]
+    assert model.remapped_pgids() == ["2.0", "10.1f"]
+    assert model.degraded_pgids() == ["10.1f"]
+    assert model.state_counts() == {
+        "active+clean": 2,
+        "active+remapped+backfilling": 1,
+        "active+undersized+degraded": 1,
+    }
+    # a list dump of older ceph versions is accepted as well
+    assert PlacementModel(PG_DUMP["pg_stats"]).get_pgids(pool=1) == ["1.0"]
+
+
+def test_osd_distribution(model):
+    assert model.pgs_per_osd().to_dict() == {0: 1, 1: 4, 2: 3}
+    assert model.pgs_per_osd("up").to_dict() == {0: 2, 1: 4, 2: 3}
+    assert model.pgs_per_osd("osd_df").to_dict() == {0: 4, 1: 25, 2: 3}
+    assert model.primaries_per_osd().to_dict() == {0: 1, 1: 2, 2: 1}
+    assert model.pg_count_deviation().to_dict() == {0: 7, 1: 14, 2: 8}
+    assert model.pool_distribution().to_dict(orient="index") == {
+        1: {0: 1, 1: 1, 2: 1},
+        2: {0: 0, 1: 2, 2: 1},
+        10: {0: 0, 1: 1, 2: 1},
+    }
+    assert model.osd_column("utilization") == {
+        "osd.0": 80.1,
+        "osd.1": 79.5,
+        "osd.2": 81.9,
+    }
+    assert model.skew_score("osd_df") > 0.5
+    # PG counts proportional to the CRUSH weights are a perfect distribution
+    balanced = {
+        "nodes": [
+            {"id": 0, "name": "osd.0", "pgs": 10, "crush_weight": 1},
+            {"id": 1, "name": "osd.1", "pgs": 20, "crush_weight": 2},
+        ]
+    }
+    assert PlacementModel([], balanced).skew_score("osd_df") == 0
+
+
+def test_counts_match_python_loops():
+    random.seed(14)
+    pg_stats = []
+    for index in range(20000):
+        acting = random.sample(range(30), 3)
+        pg_stats.append(
+            {
+                "pgid": f"{index % 7}.{index:x}",
+                "state": "active+clean",
+                "up": acting,
+                "acting": acting,
+                "up_primary": acting[0],
+                "acting_primary": acting[0],
+            }
+        )
+    model = PlacementModel({"pg_stats": pg_stats})
+    expected = collections.Counter(osd for pg in pg_stats for osd in pg["acting"])
+    assert model.pgs_per_osd().to_dict() == dict(expected)
+    assert model.get_pgids(pool=3) == [
+        pg["pgid"] for pg in pg_stats if pg["pgid"].startswith("3.")
+    ]
+    assert model.pool_distribution().to_numpy().sum() == 60000
+    assert model.remapped_pgids() == []
+
+
+def test_cluster_validations():
+    snapshot = MagicMock()
+    snapshot.get.side_effect = {"osd_df": OSD_DF, "pg_dump": PG_DUMP}.get
+    with (
+        patch.object(pg_analytics, "get_ceph_snapshot", return_value=snapshot),
+        patch.object(cluster, "get_pg_balancer_status", return_value=True),
+        patch.object(cluster, "get_balancer_eval", return_value=0.01),
+        patch.object(cluster, "get_pgs_brief_dump", return_value=PG_DUMP),
+        patch.object(cluster, "get_pool_num", return_value=10),
+    ):
+        assert cluster.validate_osd_utilization(osd_used=79)
+        assert not cluster.validate_osd_utilization(osd_used=80)
+        assert cluster.get_pgs_per_osd() == {"osd.0": 4, "osd.1": 25, "osd.2": 3}
+        assert not cluster.validate_pg_balancer()
+        assert cluster.get_all_pgid() == ["1.0", "2.0", "10.1f", "10.2"]
+        assert cluster.get_specific_pool_pgid("pool") == ["10.1f", "10.2"]
+    snapshot.get.assert_any_call("osd_df")
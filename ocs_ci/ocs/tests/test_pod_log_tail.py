@@ -0,0 +1,184 @@
+# -*- coding: utf8 -*-
+
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+
+from ocs_ci.ocs import pod_log_tail
+from ocs_ci.ocs.exceptions import TimeoutExpiredError
+from ocs_ci.ocs.pod_log_tail import (
+    LogMatcher,
+    PodLogTail,
+    grep_lines,
+    parse_duration,
+    parse_log_timestamp,
+)
+
+
+class FakeOutput(object):
+    def __init__(self, lines):
+        self.lines = lines
+
+    def iter_lines(self):
+        return iter(self.lines)
+
+
+class FakeProcess(object):
+    def __init__(self, lines):
+        self.stdout = FakeOutput(lines)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+class FakeLog(object):
+    """
+    Container log served like 'oc logs --timestamps [--since-time]'
+    """
+
+    def __init__(self):
+        self.entries = []
+        self.commands = []
+
+    def add(self, timestamp, message):
+        self.entries.append((timestamp, message))
+
+    def exec_oc_cmd_stream(self, cmd, timeout=600):
+        self.commands.append(cmd)
+        since = None
+        for arg in cmd.split():
+            if arg.startswith("--since-time="):
+                since = datetime.strptime(
+                    arg.split("=", 1)[1], "%Y-%m-%dT%H:%M:%SZ"
+                ).replace(tzinfo=timezone.utc)
+        return FakeProcess(
+            [
+                f"{timestamp} {message}"
+                for timestamp, message in self.entries
+                if since is None or parse_log_timestamp(timestamp)[0] >= since
+            ]
+        )
+
+
+@pytest.fixture
+def fake_log(tmp_path):
+    fake_log = FakeLog()
+    pod_log_tail.clear_pod_log_tails()
+    with (
+        patch.object(
+            pod_log_tail.OCP,
+            "exec_oc_cmd_stream",
+            side_effect=fake_log.exec_oc_cmd_stream,
+        ),
+        patch.object(pod_log_tail, "get_spool_dir", return_value=str(tmp_path)),
+    ):
+        yield fake_log
+    pod_log_tail.clear_pod_log_tails()
+
+
+def test_parsing():
+    assert parse_log_timestamp("2026-01-15T10:00:00.1Z") < parse_log_timestamp(
+        "2026-01-15T10:00:00.123Z"
+    )
+    assert parse_log_timestamp("2026-01-15T10:00:00Z")[1] == 0
+    with pytest.raises(ValueError):
+        parse_log_timestamp("Error:")
+    assert parse_duration("1h30m").total_seconds() == 5400
+    with pytest.raises(ValueError):
+        parse_duration("5x")
+
+
+def test_poll_appends_only_new_lines(fake_log, tmp_path):
+    fake_log.add("2026-01-15T10:00:00.100Z", "first")
+    fake_log.add("2026-01-15T10:00:01.200Z", "second")
+    fake_log.add("2026-01-15T10:00:01.200Z", "second again")
+    log_tail = PodLogTail("osd-0", "osd", "ns", spool_dir=str(tmp_path))
+    assert log_tail.poll() == 3
+    assert "--since-time" not in fake_log.commands[0]
+    fake_log.add("2026-01-15T10:00:01.200Z", "same time")
+    fake_log.add("2026-01-15T10:00:01.700Z", "third")
+    # the lines of the second 10:00:01 are served again and skipped
+    assert log_tail.poll() == 2
+    assert fake_log.commands[1].endswith("--since-time=2026-01-15T10:00:01Z")
+    assert log_tail.poll() == 0
+    assert log_tail.read_lines() == [
+        "first",
+        "second",
+        "second again",
+        "same time",
+        "third",
+    ]
+    assert log_tail.read_lines(tail=2) == ["same time", "third"]
+    since = datetime(2026, 1, 15, 10, 0, 1, 500000, tzinfo=timezone.utc)
+    assert log_tail.read_lines(since_time=since) == ["third"]
+
+
+def test_matcher_checks_new_lines(fake_log, tmp_path):
+    fake_log.add("2026-01-15T10:00:00Z", "reconcile started")
+    log_tail = PodLogTail("operator", namespace="ns", spool_dir=str(tmp_path))
+    matcher = LogMatcher(log_tail, "reconcile (done|completed)")
+    assert matcher.check() is None
+    offset = matcher.offset
+    fake_log.add("2026-01-15T10:00:05Z", "reconcile completed")
+    assert matcher.check() == "reconcile completed"
+    assert matcher.offset > offset
+    assert matcher.check() is None
+
+
+def test_wait_for_pattern(fake_log):
+    fake_log.add("2026-01-15T10:00:00Z", "old done")
+    fake_log.add("2026-01-15T10:00:10Z", "new line")
+    with pytest.raises(TimeoutExpiredError):
+        pod_log_tail.wait_for_pattern_in_pod_logs(
+            "operator",
+            "done",
+            namespace="ns",
+            since_time="2026-01-15T10:00:05Z",
+            timeout=1,
+            sleep=0.2,
+        )
+    fake_log.add("2026-01-15T10:00:20Z", "reconcile done")
+    assert (
+        pod_log_tail.wait_for_pattern_in_pod_logs(
+            "operator", "done", namespace="ns", since_time="2026-01-15T10:00:05Z"
+        )
+        == "reconcile done"
+    )
+    # the spool of the shared tail is reused by the second wait
+    assert all("--since-time" in cmd for cmd in fake_log.commands)
+
+
+def test_get_pod_logs_incremental(fake_log):
+    from ocs_ci.ocs.resources.pod import get_pod_logs
+
+    fake_log.add("2026-01-15T10:00:00Z", "a ERROR b")
+    fake_log.add("2026-01-15T10:00:01Z", "ok")
+    logs = get_pod_logs("osd-0", namespace="ns", incremental=True)
+    assert logs == "a ERROR b\nok"
+    assert (
+        get_pod_logs("osd-0", namespace="ns", grep="error", incremental=True)
+        == "a ERROR b"
+    )
+    assert len(fake_log.commands) == 2
+
+
+def test_grep_lines():
+    lines = ["a", "match 1", "b", "c", "d", "match 2", "e"]
+    assert grep_lines(lines, "MATCH") == ["match 1"]
+    assert grep_lines(lines, "match", first_match_only=False, context=1) == [
+        "a",
+        "match 1",
+        "b",
+        "--",
+        "d",
+        "match 2",
+        "e",
+    ]
+    assert grep_lines(lines, "match [0-9]", regex=True, case_sensitive=True) == [
+        "match 1"
+    ]
+    assert grep_lines(lines, "match [0-9]") == []
@@ -0,0 +1,240 @@
+# -*- coding: utf8 -*-
+
+from unittest.mock import patch
+
+import pytest
+
+from ocs_ci.ocs import printer_columns
+from ocs_ci.ocs.exceptions import UnsupportedPrinterColumn
+from ocs_ci.ocs.ocp import OCP
+
+
+def make_pod(name, waiting_reason=None, ready=True, restarts=0, deleted=False):
+    running = {"running": {"startedAt": "2024-01-01T00:00:00Z"}}
+    state = {"waiting": {"reason": waiting_reason}} if waiting_reason else running
+    pod = {
+        "kind": "Pod",
+        "metadata": {"name": name},
+        "spec": {"containers": [{"name": "a"}, {"name": "b"}]},
+        "status": {
+            "phase": "Running" if not waiting_reason else "Pending",
+            "containerStatuses": [
+                {"name": "a", "ready": ready, "restartCount": restarts, "state": state},
+                {
+                    "name": "b",
+                    "ready": True,
+                    "restartCount": 1,
+                    "state": running,
+                },
+            ],
+        },
+    }
+    if deleted:
+        pod["metadata"]["deletionTimestamp"] = "2024-01-01T00:00:00Z"
+    return pod
+
+
+def make_pvc(name, phase):
+    return {
+        "kind": "PersistentVolumeClaim",
+        "metadata": {"name": name},
+        "spec": {"accessModes": ["ReadWriteMany"], "storageClassName": "sc"},
+        "status": {"phase": phase},
+    }
+
+
+CEPH_CLUSTER_COLUMNS = [
+    {"name": "Phase", "type": "string", "jsonPath": ".status.phase"},
+    {"name": "Health", "type": "string", "jsonPath": ".status.ceph.health"},
+    {"name": "Age", "type": "date", "jsonPath": ".metadata.creationTimestamp"},
+]
+
+
+@pytest.mark.parametrize(
+    "pod,column,expected",
+    [
+        (make_pod("p"), "STATUS", "Running"),
+        (
+            make_pod("p", waiting_reason="CrashLoopBackOff"),
+            "STATUS",
+            "CrashLoopBackOff",
+        ),
+        (make_pod("p", deleted=True), "STATUS", "Terminating"),
+        (make_pod("p"), "READY", "2/2"),
+        (make_pod("p", ready=False), "READY", "1/2"),
+        (make_pod("p", restarts=3), "RESTARTS", "4"),
+        (make_pod("p"), "NAME", "p"),
+    ],
+)
+def test_pod_columns(pod, column, expected):
+    assert printer_columns.get_column_value(pod, column) == expected
+
+
+def test_pod_init_container_status():
+    pod = make_pod("p")
+    pod["spec"]["initContainers"] = [{"name": "init"}]
+    pod["status"]["initContainerStatuses"] = [
+        {"name": "init", "state": {"running": {}}, "restartCount": 0}
+    ]
+    assert printer_columns.get_column_value(pod, "STATUS") == "Init:0/1"
+
+
+def test_builtin_columns():
+    pvc = make_pvc("pvc-a", "Bound")
+    assert printer_columns.get_column_value(pvc, "STATUS") == "Bound"
+    assert printer_columns.get_column_value(pvc, "ACCESS MODES") == "RWX"
+    node = {
+        "kind": "Node",
+        "metadata": {
+            "labels": {
+                "node-role.kubernetes.io/worker": "",
+                "node-role.kubernetes.io/infra": "",
+            }
+        },
+        "spec": {"unschedulable": True},
+        "status": {"conditions": [{"type": "Ready", "status": "True"}]},
+    }
+    assert printer_columns.get_column_value(node, "ROLES") == "infra,worker"
+    assert printer_columns.get_column_value(node, "STATUS") == (
+        "Ready,SchedulingDisabled"
+    )
+    config_map = {"kind": "ConfigMap", "data": {"a": "1", "b": "2"}}
+    assert printer_columns.get_column_value(config_map, "DATA") == "2"
+
+
+def test_crd_printer_columns():
+    ceph_cluster = {
+        "kind": "CephCluster",
+        "status": {"phase": "Ready", "ceph": {"health": "HEALTH_OK"}},
+    }
+    assert (
+        printer_columns.get_column_value(ceph_cluster, "HEALTH", CEPH_CLUSTER_COLUMNS)
+        == "HEALTH_OK"
+    )
+    with pytest.raises(UnsupportedPrinterColumn):
+        printer_columns.get_column_value(ceph_cluster, "AGE", CEPH_CLUSTER_COLUMNS)
+    with pytest.raises(UnsupportedPrinterColumn):
+        printer_columns.get_column_value(ceph_cluster, "PHASE")
+
+
+@pytest.mark.parametrize(
+    "expression,expected",
+    [
+        ("{.status.phase}", "Running"),
+        ('{.status.conditions[?(@.type=="Ready")].status}', "True"),
+        ("{.status.conditions[*].type}", "Ready Initialized"),
+        ("{.status.conditions[-1].status}", "False"),
+        ("{.status.missing}", ""),
+    ],
+)
+def test_get_jsonpath_str(expression, expected):
+    pod = {
+        "status": {
+            "phase": "Running",
+            "conditions": [
+                {"type": "Ready", "status": "True"},
+                {"type": "Initialized", "status": "False"},
+            ],
+        }
+    }
+    assert printer_columns.get_jsonpath_str(pod, expression) == expected
+
+
+@pytest.mark.parametrize(
+    "expression,count",
+    [
+        ("{.status.phase}=Bound", 2),
+        ("{.status.phase} != Bound", 1),
+        ("STATUS==Pending", 1),
+        ("{.status.phase} in (Bound, Pending)", 3),
+        ("{.status.phase} notin (Bound)", 1),
+        ("{.spec.replicas}>=2", 0),
+    ],
+)
+def test_count_matching(expression, count):
+    pvcs = [
+        make_pvc("pvc-a", "Bound"),
+        make_pvc("pvc-b", "Bound"),
+        make_pvc("pvc-c", "Pending"),
+    ]
+    assert printer_columns.count_matching(pvcs, expression) == count
+
+
+def test_wait_for_resource_evaluates_list_in_memory():
+    ocp_obj = OCP(kind="PersistentVolumeClaim", namespace="test")
+    sample = {
+        "kind": "List",
+        "items": [make_pvc(f"pvc-{i}", "Bound") for i in range(100)],
+    }
+    with (
+        patch.object(OCP, "get", return_value=sample),
+        patch.object(OCP, "get_resource") as get_resource,
+    ):
+        assert ocp_obj.wait_for_resource(
+            condition="Bound", selector="app=a", resource_count=100, timeout=5
+        )
+        assert ocp_obj.wait_for_resource(
+            condition="sc",
+            selector="app=a",
+            jsonpath="{.spec.storageClassName}",
+            timeout=5,
+        )
+    get_resource.assert_not_called()
+
+
+def test_wait_for_resource_falls_back_to_get_resource():
+    ocp_obj = OCP(kind="CephCluster", namespace="test")
+    sample = {
+        "kind": "List",
+        "items": [{"kind": "CephCluster", "metadata": {"name": "ocs"}}],
+    }
+    with (
+        patch.object(OCP, "get", return_value=sample),
+        patch.object(OCP, "get_printer_columns", return_value=[]),
+        patch.object(OCP, "get_resource", return_value="Ready") as get_resource,
+    ):
+        assert ocp_obj.wait_for_resource(
+            condition="Ready", column="PHASE", selector="app=a", resource_count=1
+        )
+    get_resource.assert_called_once_with("ocs", "PHASE")
+
+
+@pytest.mark.parametrize(
+    "items, resource_count, dont_allow_other_resources, jsonpath, expected",
+    [
+        (["Bound", "Bound", "Pending"], 2, False, None, True),
+        (["Bound", "Bound", "Pending"], 2, True, None, False),
+        (["Bound", "Bound"], 2, True, None, True),
+        (["Bound", "Bound"], 3, False, None, False),
+        (["Bound", "Bound"], 0, False, "{.status.phase}", True),
+        (["Bound", "Pending"], 0, False, "{.status.phase}", False),
+        ([], 0, False, "{.status.phase}", False),
+    ],
+)
+def test_wait_for_resource_counts_by_count_matching(
+    items, resource_count, dont_allow_other_resources, jsonpath, expected
+):
+    ocp_obj = OCP(kind="PersistentVolumeClaim", namespace="test")
+    sample = {
+        "kind": "List",
+        "items": [make_pvc(f"pvc-{i}", phase) for i, phase in enumerate(items)],
+    }
+    with (
+        patch.object(OCP, "get", return_value=sample),
+        patch.object(OCP, "get_resource") as get_resource,
+        patch.object(
+            printer_columns, "count_matching", wraps=printer_columns.count_matching
+        ) as count_matching,
+        # a single sample, i.e. the wait would time out if not satisfied
+        patch.object(OCP, "_sample_resources", return_value=iter([sample])),
+    ):
+        result = ocp_obj.wait_for_resource(
+            condition="Bound",
+            selector="app=a",
+            resource_count=resource_count,
+            dont_allow_other_resources=dont_allow_other_resources,
+            jsonpath=jsonpath,
+        )
+    assert result is expected
+    assert count_matching.called == bool(items)
+    get_resource.assert_not_called()
@@ -0,0 +1,110 @@
+# -*- coding: utf8 -*-
+
+import io
+import logging
+import subprocess
+
+import pytest
+
+from ocs_ci.ocs.exceptions import CommandFailed
+from ocs_ci.ocs.rados_utils import RadosHelper
+
+OSD_DUMP = (
+    '{"pools": [{"pool_name": "rbd", "pool": 2, "pg_num": 32}, '
+    '{"pool_name": "data", "pool": 3, "pg_num": 8}], '
+    '"osds": [{"osd": 0, "up": 1}]}'
+)
+# fake sudo, ceph and rados executables of the mon node, every ceph call is
+# recorded to the log file
+FAKE_SUDO = '#!/bin/sh\nexec "$@"\n'
+FAKE_CEPH = f"""#!/bin/sh
+shift 2
+echo "$*" >> "$(dirname "$0")/calls.log"
+case "$*" in
+    "osd dump --format=json") echo 'sudo: banner'; echo '{OSD_DUMP}' ;;
+    "osd pool get rbd size --format=json") echo '{{"pool": "rbd", "size": 3}}' ;;
+    "osd pool get rbd min_size --format=json") echo '{{"min_size": 2}}' ;;
+    "pg map 2.0 --format=json") echo '{{"pgid": "2.0", "acting": [1, 0, 2]}}' ;;
+    "pg map 2.1 --format=json") echo '{{"pgid": "2.1", "acting": [2, 1, 0]}}' ;;
+    "osd pool set rbd size 2") echo "set pool 2 size to 2" ;;
+    *) echo "unknown command $*" >&2; exit 22 ;;
+esac
+"""
+FAKE_RADOS = '#!/bin/sh\nshift 2\necho "objects of $*"\n'
+
+
+class LocalMon(object):
+    """
+    Runs the commands of the mon node locally with the fake executables
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.commands = []
+
+    def exec_command(self, cmd):
+        self.commands.append(cmd)
+        result = subprocess.run(
+            cmd,
+            shell=True,
+            env={"PATH": f"{self.path}:/usr/bin:/bin"},
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        return io.BytesIO(result.stdout), io.BytesIO(result.stderr)
+
+    def ceph_calls(self):
+        with open(f"{self.path}/calls.log") as calls:
+            return calls.read().splitlines()
+
+
+@pytest.fixture
+def mon(tmp_path):
+    for name, content in (
+        ("sudo", FAKE_SUDO),
+        ("ceph", FAKE_CEPH),
+        ("rados", FAKE_RADOS),
+    ):
+        executable = tmp_path / name
+        executable.write_text(content)
+        executable.chmod(0o755)
+    return LocalMon(str(tmp_path))
+
+
+def test_pool_metadata_from_one_osd_dump(mon):
+    helper = RadosHelper(mon, log=logging.getLogger(__name__))
+    assert helper.pools == {"rbd": 32, "data": 8}
+    assert helper.list_pools() == ["rbd", "data"]
+    assert helper.get_pool_num("data") == 3
+    assert helper.get_pgid("rbd", 5) == "2.5"
+    assert mon.ceph_calls() == ["osd dump --format=json"]
+
+    # a command changing the cluster drops the cached dump
+    helper.raw_cluster_cmd("osd", "pool", "set", "rbd", "size", "2")
+    helper.get_pool_num("rbd")
+    assert mon.ceph_calls()[-1] == "osd dump --format=json"
+    assert helper.is_up(0) == 1
+    assert mon.ceph_calls().count("osd dump --format=json") == 3
+
+
+def test_batched_commands(mon):
+    helper = RadosHelper(mon)
+    mon.commands.clear()
+    assert helper.get_pool_properties("rbd", ["size", "min_size"]) == {
+        "size": 3,
+        "min_size": 2,
+    }
+    assert helper.get_pg_primaries("rbd", [0, 1]) == {0: 1, 1: 2}
+    stdout, stderr, return_code = helper.raw_cluster_cmds(
+        ("rados", "-p", "rbd", "ls"), ("osd", "unknown")
+    )[1]
+    assert (return_code, stderr) == (22, "unknown command osd unknown")
+    assert helper.raw_cluster_cmds(("rados", "-p", "rbd", "ls"))[0] == (
+        "objects of -p rbd ls",
+        "",
+        0,
+    )
+    # each batch is a single exec on the mon node
+    assert len(mon.commands) == 4
+    with pytest.raises(CommandFailed, match="unknown command"):
+        helper.raw_cluster_cmds_json(("osd", "pool", "get", "rbd", "crush_rule"))
@@ -0,0 +1,114 @@
+# -*- coding: utf8 -*-
+
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
+from ocs_ci.ocs import rebalance_tracker
+from ocs_ci.ocs.exceptions import CommandFailed, NoRunningCephToolBoxException
+from ocs_ci.ocs.rebalance_tracker import (
+    RebalanceTracker,
+    is_rebalance_complete,
+    sample_from_status,
+)
+
+
+def ceph_status(misplaced, degraded=0, clean=64, progress=None):
+    pgmap = {
+        "num_pgs": 64,
+        "pgs_by_state": [{"state_name": "active+clean", "count": clean}],
+    }
+    if clean < 64:
+        pgmap["pgs_by_state"].append(
+            {"state_name": "active+remapped+backfilling", "count": 64 - clean}
+        )
+    if misplaced:
+        pgmap["misplaced_objects"] = misplaced
+    if degraded:
+        pgmap["degraded_objects"] = degraded
+    status = {"pgmap": pgmap}
+    if progress is not None:
+        status["progress_events"] = {"e1": {"message": "Rebalancing", "progress": 0.5}}
+    return status
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    fake_clock = FakeClock()
+    with (
+        patch.object(rebalance_tracker.time, "monotonic", fake_clock.monotonic),
+        patch.object(rebalance_tracker.time, "sleep", fake_clock.sleep),
+    ):
+        yield fake_clock
+
+
+def test_sample_from_status():
+    sample = sample_from_status(ceph_status(100, 20, clean=60, progress=0.5))
+    assert (sample.misplaced_objects, sample.degraded_objects) == (100, 20)
+    assert (sample.active_clean_pgs, sample.num_pgs) == (60, 64)
+    assert sample.progress == 0.5
+    assert not is_rebalance_complete(sample)
+    assert is_rebalance_complete(sample_from_status(ceph_status(0)))
+    assert not is_rebalance_complete(sample_from_status({"pgmap": {}}))
+
+
+def test_rate_eta_and_early_exit(clock):
+    statuses = iter(
+        [ceph_status(1000 - 100 * i, clean=10) for i in range(10)]
+        + [ceph_status(0)] * 10
+    )
+    tracker = RebalanceTracker(namespace="ns", sample_func=lambda: next(statuses))
+    for _ in range(4):
+        tracker.sample()
+        clock.sleep(10)
+    assert tracker.recovery_rate() == pytest.approx(10)
+    assert tracker.eta() == pytest.approx(70)
+    assert tracker.wait(timeout=600, sleep=10, stable_samples=3, confirm_sleep=2)
+    # 10 recovery samples 10s apart, then 3 clean samples 2s apart
+    assert len(tracker.samples) == 13
+    assert tracker.duration == pytest.approx(104)
+    summary = tracker.summary()
+    assert summary["completed"] and summary["peak_remaining_objects"] == 1000
+    assert tracker.timeline()[0]["misplaced_objects"] == 1000
+
+
+def test_wait_timeout_and_failures(clock):
+    def read_status():
+        if clock.now < 20:
+            raise CommandFailed("toolbox restarted")
+        return ceph_status(500, clean=10)
+
+    tracker = RebalanceTracker(namespace="ns", sample_func=read_status)
+    assert not tracker.wait(timeout=60, sleep=10)
+    assert clock.now == 60
+    assert not tracker.summary()["completed"]
+    assert tracker.eta() is None
+
+
+def test_wait_retries_all_sampling_errors(clock):
+    errors = [
+        NoRunningCephToolBoxException("toolbox is being rescheduled"),
+        subprocess.TimeoutExpired("ceph status", 60),
+        KeyError("pgmap"),
+    ]
+
+    def read_status():
+        if errors:
+            raise errors.pop(0)
+        return ceph_status(0)
+
+    tracker = RebalanceTracker(namespace="ns", sample_func=read_status)
+    assert tracker.wait(timeout=600, sleep=10, stable_samples=2)
+    assert not errors
@@ -1,5 +1,4 @@
 import datetime
-import json
 import logging
 import os
 import pickle
@@ -24,9 +23,10 @@ from libcloud.compute.types import Provider
 from paramiko.ssh_exception import SSHException
 
 from ocs_ci.framework import config as ocsci_config, config
-from ocs_ci.ocs import constants, defaults
+from ocs_ci.ocs import constants, defaults, log_harvester
 from ocs_ci.ocs.external_ceph import RolesContainer, Ceph, CephNode
 from ocs_ci.ocs.clients import WinNode
+from ocs_ci.ocs.must_gather.mg_store import store_must_gather
 from ocs_ci.ocs.exceptions import (
     CommandFailed,
     ExternalClusterDetailsException,
@@ -39,6 +39,7 @@ from ocs_ci.ocs.parallel import parallel
 from ocs_ci.ocs.resources.ocs import OCS
 from ocs_ci.utility import templating, version
 from ocs_ci.utility.prometheus import PrometheusAPI
+from ocs_ci.utility.prometheus_export import PrometheusExporter
 from ocs_ci.utility.retry import retry
 from ocs_ci.utility.utils import (
     create_directory_path,
@@ -951,7 +952,8 @@ def run_must_gather(
 
     Args:
         log_dir_path (str): directory for dumped must-gather logs (if REPORTING["tarball_mg_logs"] is set, this
-            directory will be packed to the parent directory with extension .tar.gz)
+            directory will be packed to the parent directory with extension .tar.gz, if REPORTING["dedup_mg_logs"]
+            is set, the files are stored to the deduplicated store of the run, see mg_store)
         image (str): must-gather image registry path
         command (str): optional command to execute within the must-gather image
         cluster_config (MultiClusterConfig): Holds specifc cluster config object in case of multicluster
@@ -1021,7 +1023,14 @@ def run_must_gather(
             log.error(f"Must-Gather Output: {mg_output}")
         export_mg_pods_logs(log_dir_path=log_dir_path)
 
-    if config.REPORTING.get("tarball_mg_logs"):
+    if config.REPORTING.get("dedup_mg_logs"):
+        try:
+            store_must_gather(
+                log_dir_path, delete=config.REPORTING.get("delete_packed_mg_logs")
+            )
+        except Exception as err:
+            log.error(f"Failed during storing files! Error: {err}")
+    elif config.REPORTING.get("tarball_mg_logs"):
         tarball_path = f"{log_dir_path}.tar.gz"
         try:
             with tarfile.open(tarball_path, "w:gz") as tar:
@@ -1085,9 +1094,10 @@ def get_logs_ocp_mg_pods(log_dir_path):
         log_dir_path (str): the path of copying the logs
 
     """
-    from ocs_ci.ocs.resources.pod import get_all_pods, get_pod_logs
+    from ocs_ci.ocs.resources.pod import get_all_pods
 
     namespaces = get_namespce_name_by_pattern(pattern="openshift-must-gather")
+    jobs = []
     try:
         for namespace in namespaces:
             pods_mg_ns = get_all_pods(namespace=namespace)
@@ -1104,17 +1114,18 @@ def get_logs_ocp_mg_pods(log_dir_path):
                     df.write(f"ocp mg pod describe:\n{pod_mg_describe}")
                 log.debug(f"ocp mg pod describe:\n{pod_mg_describe}")
 
-                ocp_mg_pod_logs = get_pod_logs(
-                    pod_name=pod_mg_ns.name, namespace=namespace, all_containers=True
-                )
-                file_path_describe = os.path.join(
-                    log_dir_path, f"log_ocp_mg_{pod_mg_ns.name}.log"
+                jobs.append(
+                    log_harvester.pod_logs_job(
+                        pod_mg_ns.name,
+                        log_dir_path,
+                        namespace=namespace,
+                        all_containers=True,
+                        file_name=f"log_ocp_mg_{pod_mg_ns.name}{log_harvester.LOG_SUFFIX}",
+                    )
                 )
-                with open(file_path_describe, "w") as df:
-                    df.write(ocp_mg_pod_logs)
-                log.debug(f"ocp mg pod logs:\n{ocp_mg_pod_logs}")
     except Exception as e:
         log.error(e)
+    log_harvester.get_log_harvester().harvest(jobs)
 
 
 def get_helper_pods_output(log_dir_path):
@@ -1125,9 +1136,10 @@ def get_helper_pods_output(log_dir_path):
         log_dir_path (str): the path of copying the logs
 
     """
-    from ocs_ci.ocs.resources.pod import get_pod_obj, get_pod_logs
+    from ocs_ci.ocs.resources.pod import get_pod_obj
 
     helper_pods = get_pod_name_by_pattern(pattern="helper")
+    jobs = []
     for helper_pod in helper_pods:
         try:
             helper_pod_obj = get_pod_obj(
@@ -1144,15 +1156,16 @@ def get_helper_pods_output(log_dir_path):
                 f"****helper pod {helper_pod} describe****\n{describe_helper_pod}\n"
             )
 
-            log_helper_pod = get_pod_logs(pod_name=helper_pod)
-            file_path_describe = os.path.join(
-                log_dir_path, f"log_ocs_mg_helper_pod_{helper_pod}.log"
+            jobs.append(
+                log_harvester.pod_logs_job(
+                    helper_pod,
+                    log_dir_path,
+                    file_name=f"log_ocs_mg_helper_pod_{helper_pod}{log_harvester.LOG_SUFFIX}",
+                )
             )
-            with open(file_path_describe, "w") as df:
-                df.write(log_helper_pod)
-            log.debug(f"****helper pod {helper_pod} logs***\n{log_helper_pod}")
         except Exception as e:
             log.error(e)
+    log_harvester.get_log_harvester().harvest(jobs)
 
 
 def collect_noobaa_db_dump(log_dir_path, cluster_config=None):
@@ -1536,7 +1549,9 @@ def collect_prometheus_metrics(
     threading_lock=None,
 ):
     """
-    Collects metrics from Prometheus and saves them in file in json format.
+    Collects metrics from Prometheus and saves them in files, compressed
+    numpy archives or json depending on REPORTING['prometheus_export_format'].
+    The metrics are fetched concurrently in chunks, see prometheus_export.
     Metrics can be found in OCP Console in Monitoring -> Metrics.
 
     Args:
@@ -1549,6 +1564,10 @@ def collect_prometheus_metrics(
         stop (str): stop timestamp of required datapoints
         step (float): step of required datapoints
         threading_lock: (threading.RLock): Lock to use for thread safety (default: None)
+
+    Returns:
+        dict: metric as key, path of its file as value
+
     """
     api = PrometheusAPI(threading_lock=threading_lock)
     log_dir_path = os.path.join(
@@ -1560,14 +1579,17 @@ def collect_prometheus_metrics(
         log.info(f"Creating directory {log_dir_path}")
         os.makedirs(log_dir_path)
 
-    for metric in metrics:
-        datapoints = api.get(
-            "query_range", {"query": metric, "start": start, "end": stop, "step": step}
-        )
-        file_name = os.path.join(log_dir_path, f"{metric}.json")
-        log.info(f"Saving {metric} data into {file_name}")
-        with open(file_name, "w") as outfile:
-            json.dump(datapoints.json(), outfile)
+    exporter = PrometheusExporter(
+        api, workers=ocsci_config.REPORTING.get("prometheus_export_workers", 8)
+    )
+    return exporter.export(
+        metrics,
+        log_dir_path,
+        start,
+        stop,
+        step=step,
+        file_format=ocsci_config.REPORTING.get("prometheus_export_format", "npz"),
+    )
 
 
 def oc_get_all_obc_names():
@@ -0,0 +1,436 @@
+# -*- coding: utf8 -*-
+"""
+Profiler of the calls made to the cluster
+
+Every command run by exec_cmd (mostly 'oc') and every request served by the
+in-process API backend is recorded with its verb, kind, namespace, cluster
+index, duration, size of stdout and return code. The calls are aggregated in
+memory per pytest test id into HDR-style latency histograms, so the overhead
+per call is a few dictionary operations and the memory doesn't grow with the
+number of calls.
+
+At the end of the run the summary is dumped as JSON to the log directory and
+the hottest calls are embedded in the HTML email report, which shows e.g. that
+a test made 4200 'oc get pod' calls. Disable by ``RUN['call_profiler']``.
+"""
+
+import json
+import logging
+import os
+import threading
+
+from ocs_ci.framework import config
+
+log = logging.getLogger(__name__)
+
+# test id used for the calls made outside of tests (e.g. session setup)
+NO_TEST = "<session>"
+# options of oc which take a value as the next argument
+OC_OPTIONS_WITH_VALUE = {
+    "-n",
+    "--namespace",
+    "--kubeconfig",
+    "--context",
+    "--cluster",
+    "--server",
+    "--token",
+    "--as",
+    "--user",
+    "-l",
+    "--selector",
+    "--field-selector",
+    "-o",
+    "--output",
+    "-f",
+    "--filename",
+    "-c",
+    "--container",
+    "-p",
+    "--patch",
+    "--type",
+    "--timeout",
+    "--for",
+    "--request-timeout",
+}
+# verbs of oc which are followed by the kind of the resource
+OC_KIND_VERBS = {
+    "get",
+    "describe",
+    "delete",
+    "patch",
+    "label",
+    "annotate",
+    "wait",
+    "edit",
+    "scale",
+    "explain",
+    "set",
+}
+
+_lock = threading.Lock()
+_stats = {}
+
+
+def is_call_profiler_enabled():
+    """
+    Returns:
+        bool: True if the calls should be recorded
+
+    """
+    return config.RUN.get("call_profiler", True)
+
+
+class LatencyHistogram(object):
+    """
+    Log-linear histogram of latencies in the way of HdrHistogram. Values are
+    recorded in microseconds into buckets which keep the relative error under
+    1 / SUB_BUCKETS, so the memory is bounded by the range of the values and
+    not by the number of recorded values.
+    """
+
+    SUB_BUCKET_BITS = 5
+    SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    @classmethod
+    def bucket_index(cls, value):
+        """
+        Args:
+            value (int): Value in microseconds
+
+        Returns:
+            int: index of the bucket of the value
+
+        """
+        if value < 2 * cls.SUB_BUCKETS:
+            return value
+        shift = value.bit_length() - cls.SUB_BUCKET_BITS - 1
+        return (shift + 1) * cls.SUB_BUCKETS + (value >> shift) - cls.SUB_BUCKETS
+
+    @classmethod
+    def bucket_range(cls, index):
+        """
+        Args:
+            index (int): Index of the bucket
+
+        Returns:
+            tuple: the lowest and the highest value in microseconds of the bucket
+
+        """
+        if index < 2 * cls.SUB_BUCKETS:
+            return index, index
+        shift = index // cls.SUB_BUCKETS - 1
+        lowest = (index % cls.SUB_BUCKETS + cls.SUB_BUCKETS) << shift
+        return lowest, lowest + (1 << shift) - 1
+
+    def record(self, seconds):
+        """
+        Record one value
+
+        Args:
+            seconds (float): Latency in seconds
+
+        """
+        index = self.bucket_index(max(0, int(seconds * 1000000)))
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def merge(self, other):
+        """
+        Add the values of other histogram to this one
+
+        Args:
+            other (LatencyHistogram): histogram to merge
+
+        """
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        for attr, func in (("min", min), ("max", max)):
+            values = [
+                value
+                for value in (getattr(self, attr), getattr(other, attr))
+                if value is not None
+            ]
+            setattr(self, attr, func(values) if values else None)
+
+    def percentile(self, percentile):
+        """
+        Args:
+            percentile (float): Percentile between 0 and 100
+
+        Returns:
+            float: the highest value in seconds equivalent to the value at
+                the percentile, None if no value was recorded
+
+        """
+        if not self.count:
+            return None
+        target = max(1, round(self.count * percentile / 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                highest = self.bucket_range(index)[1] / 1000000
+                return min(highest, self.max)
+        return self.max
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: summary of the histogram in seconds
+
+        """
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "total": round(self.total, 3),
+            "min": round(self.min, 4),
+            "avg": round(self.total / self.count, 4),
+            "p50": round(self.percentile(50), 4),
+            "p90": round(self.percentile(90), 4),
+            "p99": round(self.percentile(99), 4),
+            "max": round(self.max, 4),
+        }
+
+
+class CallStats(object):
+    """
+    Aggregated calls with the same test, source, verb, kind, namespace and
+    cluster
+    """
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.stdout_bytes = 0
+        self.failures = 0
+
+    def record(self, duration, stdout_bytes, return_code):
+        self.latency.record(duration)
+        self.stdout_bytes += stdout_bytes or 0
+        if return_code != 0:
+            self.failures += 1
+
+
+def get_current_test_id():
+    """
+    Returns:
+        str: node id of the running pytest test, NO_TEST outside of tests
+
+    """
+    current_test = os.environ.get("PYTEST_CURRENT_TEST")
+    if not current_test:
+        return NO_TEST
+    # e.g. 'tests/test_a.py::test_b[param] (call)'
+    return current_test.rsplit(" ", 1)[0]
+
+
+def parse_command(cmd):
+    """
+    Get the verb, kind and namespace of the command
+
+    Args:
+        cmd (list): Command and its arguments
+
+    Returns:
+        tuple: (source, verb, kind, namespace), source is the name of the
+            executable, verb and kind are empty strings if unknown and
+            namespace is None if not specified, '*' for all namespaces
+
+    """
+    if not cmd:
+        return "", "", "", None
+    source = os.path.basename(str(cmd[0]))
+    positional = []
+    namespace = None
+    args = iter(cmd[1:])
+    for arg in args:
+        arg = str(arg)
+        if arg == "--":
+            break
+        if arg in ("-A", "--all-namespaces"):
+            namespace = "*"
+        elif arg in ("-n", "--namespace"):
+            namespace = next(args, None)
+        elif arg.startswith("--namespace="):
+            namespace = arg.split("=", 1)[1]
+        elif arg in OC_OPTIONS_WITH_VALUE:
+            next(args, None)
+        elif not arg.startswith("-"):
+            positional.append(arg)
+    if source not in ("oc", "kubectl"):
+        # arguments of other commands may contain secrets, keep only the
+        # executable
+        return source, "", "", namespace
+    verb = positional[0] if positional else ""
+    kind = ""
+    if verb in OC_KIND_VERBS and len(positional) > 1:
+        # e.g. 'pod/name' or 'pods.v1'
+        kind = positional[1].split("/")[0].split(",")[0].lower()
+    elif verb in ("logs", "rsh", "exec", "cp", "debug", "port-forward"):
+        kind = "pod"
+    return source, verb, kind, namespace
+
+
+def record_call(
+    source,
+    verb,
+    kind="",
+    namespace=None,
+    cluster_index=None,
+    duration=0.0,
+    stdout_bytes=0,
+    return_code=0,
+    test_id=None,
+):
+    """
+    Record one call to the cluster
+
+    Args:
+        source (str): Executable or backend which made the call, e.g. 'oc'
+            or 'api'
+        verb (str): Verb of the call, e.g. 'get'
+        kind (str): Kind of the resource
+        namespace (str): Namespace of the call
+        cluster_index (int): Multicluster index of the cluster
+        duration (float): Duration of the call in seconds
+        stdout_bytes (int): Size of the output of the call
+        return_code (int): Return code, None if the call didn't finish
+        test_id (str): pytest test id, default is the running test
+
+    """
+    key = (
+        test_id or get_current_test_id(),
+        source,
+        verb,
+        kind or "",
+        namespace or "",
+        cluster_index,
+    )
+    with _lock:
+        stats = _stats.get(key)
+        if stats is None:
+            stats = _stats[key] = CallStats()
+        stats.record(duration, stdout_bytes, return_code)
+
+
+def record_command(cmd, duration, stdout_bytes, return_code, cluster_index=None):
+    """
+    Record command run by exec_cmd
+
+    Args:
+        cmd (list or str): The command with its arguments
+        duration (float): Duration of the command in seconds
+        stdout_bytes (int): Size of the stdout of the command
+        return_code (int): Return code, None if the command timed out
+        cluster_index (int): Multicluster index of the cluster
+
+    """
+    if not is_call_profiler_enabled():
+        return
+    try:
+        if isinstance(cmd, str):
+            cmd = cmd.split()
+        source, verb, kind, namespace = parse_command(cmd)
+        record_call(
+            source,
+            verb,
+            kind,
+            namespace,
+            cluster_index,
+            duration,
+            stdout_bytes,
+            return_code,
+        )
+    except Exception as ex:
+        log.debug(f"Failed to record the call {cmd}: {ex}")
+
+
+def reset():
+    """
+    Drop all the recorded calls
+    """
+    with _lock:
+        _stats.clear()
+
+
+def _aggregate(group_by):
+    with _lock:
+        items = list(_stats.items())
+    groups = {}
+    for key, stats in items:
+        group_key = group_by(key)
+        group = groups.get(group_key)
+        if group is None:
+            group = groups[group_key] = CallStats()
+        group.latency.merge(stats.latency)
+        group.stdout_bytes += stats.stdout_bytes
+        group.failures += stats.failures
+    return groups
+
+
+def _stats_to_dict(stats):
+    result = stats.latency.to_dict()
+    result["stdout_bytes"] = stats.stdout_bytes
+    result["failures"] = stats.failures
+    return result
+
+
+def get_summary(top=None):
+    """
+    Summary of the recorded calls
+
+    Args:
+        top (int): Number of the hottest entries per section, all if None
+
+    Returns:
+        dict: 'calls' - stats per test, source, verb, kind, namespace and
+            cluster, 'verbs' - stats per source, verb and kind over the run,
+            'tests' - stats per test, all sorted by total time descending
+
+    """
+    fields = ("test", "source", "verb", "kind", "namespace", "cluster")
+    sections = {
+        "calls": (fields, lambda key: key),
+        "verbs": (("source", "verb", "kind"), lambda key: key[1:4]),
+        "tests": (("test",), lambda key: key[:1]),
+    }
+    summary = {}
+    for section, (names, group_by) in sections.items():
+        entries = []
+        for key, stats in _aggregate(group_by).items():
+            entry = dict(zip(names, key))
+            entry.update(_stats_to_dict(stats))
+            entries.append(entry)
+        entries.sort(key=lambda entry: entry.get("total", 0), reverse=True)
+        summary[section] = entries[:top] if top else entries
+    return summary
+
+
+def dump_summary(path):
+    """
+    Dump the summary of the recorded calls as JSON
+
+    Args:
+        path (str): Path of the JSON file
+
+    Returns:
+        dict: the dumped summary
+
+    """
+    summary = get_summary()
+    with open(path, "w") as summary_file:
+        json.dump(summary, summary_file, indent=2)
+    log.info(f"Profile of the calls to the cluster saved to '{path}'")
+    return summary
@@ -1,19 +1,26 @@
 import base64
+import hashlib
+import json
 import logging
 import os
 import requests
+import shutil
 import tempfile
+import threading
 import time
 import yaml
 from threading import Timer
 from datetime import datetime
 
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 from ocs_ci.framework import config
 from ocs_ci.ocs import constants, defaults
-from ocs_ci.ocs.exceptions import AlertingError, AuthError, NoThreadingLockUsedError
+from ocs_ci.ocs.exceptions import AlertingError, AuthError, CommandFailed
 from ocs_ci.ocs.ocp import OCP
 from ocs_ci.utility.ssl_certs import get_root_ca_cert
-from ocs_ci.utility.utils import TimeoutIterator
+from ocs_ci.utility.utils import TimeoutIterator, exec_cmd
 
 logger = logging.getLogger(__name__)
 
@@ -491,15 +498,249 @@ def wait_for_alert_cleared(api, alert_name, timeout=600):
     logger.info("Alert '%s' cleared successfully", alert_name)
 
 
+# lifetime of the OAuth access tokens of OpenShift by default, used when the
+# expiration of the token can't be read from the cluster
+DEFAULT_TOKEN_TTL = 24 * 3600
+# the token is refreshed when it expires in less than this
+TOKEN_REFRESH_MARGIN = 300
+POOL_SIZE = 16
+HTTP_RETRIES = 3
+
+_transports = {}
+_transports_lock = threading.Lock()
+
+
+class PrometheusTransport(object):
+    """
+    HTTP transport of the Prometheus API of a cluster shared by all the
+    PrometheusAPI objects of the cluster and the user.
+
+    The requests go through one requests.Session with a pool of keep-alive
+    connections and retries of the connection errors and of the 429, 502, 503
+    and 504 responses. The OAuth token is obtained by 'oc login' to a private
+    copy of the kubeconfig, so the kubeconfig of the run is never modified,
+    and it's cached until it's about to expire or it's rejected by the API.
+    The transport is thread safe.
+    """
+
+    def __init__(self, user, password, kubeconfig, skip_tls_verify=False):
+        """
+        Initializer function
+
+        Args:
+            user (str): OpenShift username used to connect to API
+            password (str): Password for the OpenShift username
+            kubeconfig (str): path of the kubeconfig of the cluster, it's only
+                read
+            skip_tls_verify (bool): Adding '--insecure-skip-tls-verify' to the
+                login
+
+        """
+        self.user = user
+        self.password = password
+        self.kubeconfig = kubeconfig
+        self.skip_tls_verify = skip_tls_verify
+        self.endpoint = None
+        self._token = None
+        self._token_expires = 0
+        self._lock = threading.Lock()
+        retry = Retry(
+            total=HTTP_RETRIES,
+            backoff_factor=0.5,
+            status_forcelist=(429, 502, 503, 504),
+            allowed_methods=frozenset(["GET"]),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _oc(self, kubeconfig, *args, secrets=None):
+        command = ["oc", "--kubeconfig", kubeconfig, *args]
+        if self.skip_tls_verify:
+            command.append("--insecure-skip-tls-verify")
+        return exec_cmd(command, secrets=secrets).stdout.decode().strip()
+
+    def _get_token_expiration(self, kubeconfig, token):
+        """
+        Returns:
+            float: expiration of the token (time.time), None if it can't be
+                read from the cluster
+
+        """
+        prefix = "sha256~"
+        if not token.startswith(prefix):
+            return None
+        digest = hashlib.sha256(token[len(prefix) :].encode()).digest()
+        name = prefix + base64.urlsafe_b64encode(digest).decode().rstrip("=")
+        try:
+            token_obj = json.loads(
+                self._oc(kubeconfig, "get", "useroauthaccesstoken", name, "-o", "json")
+            )
+            expires_in = int(token_obj["expiresIn"])
+            created = datetime.strptime(
+                token_obj["metadata"]["creationTimestamp"], "%Y-%m-%dT%H:%M:%SZ"
+            )
+        except (CommandFailed, KeyError, ValueError) as ex:
+            logger.debug(f"Failed to get expiration of the token: {ex}")
+            return None
+        if not expires_in:
+            return float("inf")
+        return (created - datetime(1970, 1, 1)).total_seconds() + expires_in
+
+    def _login(self):
+        """
+        Login into OCP with a private copy of the kubeconfig and cache the
+        token
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            kubeconfig = os.path.join(tmp_dir, "kubeconfig")
+            shutil.copyfile(self.kubeconfig, kubeconfig)
+            try:
+                self._oc(
+                    kubeconfig,
+                    "login",
+                    "-u",
+                    self.user,
+                    "-p",
+                    self.password,
+                    secrets=[self.password],
+                )
+                token = self._oc(
+                    kubeconfig, "whoami", "--show-token", secrets=[self.password]
+                )
+            except CommandFailed as ex:
+                raise AuthError(f"Login to OCP failed: {ex}")
+            expires = self._get_token_expiration(kubeconfig, token)
+        if expires is None:
+            expires = time.time() + DEFAULT_TOKEN_TTL
+        self._token = token
+        self._token_expires = expires
+        logger.info(
+            f"Obtained token of {self.user} for Prometheus API, valid for "
+            f"{expires - time.time():.0f} seconds"
+        )
+
+    def get_token(self):
+        """
+        Returns:
+            str: cached token, a new one if it's about to expire
+
+        """
+        with self._lock:
+            if (
+                self._token is None
+                or time.time() >= self._token_expires - TOKEN_REFRESH_MARGIN
+            ):
+                self._login()
+            return self._token
+
+    def invalidate_token(self, token):
+        """
+        Drop the token rejected by the API, the next request logs in again.
+        The token obtained by a concurrent request in the meantime is kept.
+
+        Args:
+            token (str): the rejected token
+
+        """
+        with self._lock:
+            if self._token == token:
+                self._token = None
+
+    def refresh(self):
+        """
+        Login into OCP and look up the endpoint of Prometheus again
+        """
+        with self._lock:
+            self._login()
+        self.refresh_endpoint()
+
+    def refresh_endpoint(self):
+        """
+        Look up the Prometheus route
+        """
+        ocp = OCP(
+            kind=constants.ROUTE,
+            namespace=defaults.OCS_MONITORING_NAMESPACE,
+            cluster_kubeconfig=self.kubeconfig,
+            skip_tls_verify=self.skip_tls_verify,
+        )
+        route_obj = ocp.get(resource_name=defaults.PROMETHEUS_ROUTE)
+        self.endpoint = "https://" + route_obj["spec"]["host"]
+
+    def get(self, url, params=None, verify=False, timeout=60):
+        """
+        GET request with the token, repeated once with a new token if the
+        token is rejected
+
+        Args:
+            url (str): URL of the request
+            params (dict): parameters of the request
+            verify (bool or str): TLS verification or path of the CA bundle
+            timeout (int): timeout of the request in seconds
+
+        Returns:
+            requests.models.Response: the response
+
+        """
+        for attempt in range(2):
+            token = self.get_token()
+            response = self.session.get(
+                url,
+                headers={"Authorization": f"Bearer {token}"},
+                params=params,
+                verify=verify,
+                timeout=timeout,
+            )
+            if response.status_code not in (401, 403) or attempt:
+                return response
+            logger.warning(f"Token rejected ({response.status_code}), logging in again")
+            self.invalidate_token(token)
+
+    def close(self):
+        """
+        Close the connections of the session
+        """
+        self.session.close()
+
+
+def get_prometheus_transport(user, password, kubeconfig, skip_tls_verify=False):
+    """
+    Args:
+        user (str): OpenShift username used to connect to API
+        password (str): Password for the OpenShift username
+        kubeconfig (str): path of the kubeconfig of the cluster
+        skip_tls_verify (bool): Adding '--insecure-skip-tls-verify' to the login
+
+    Returns:
+        PrometheusTransport: transport shared by the callers with the same
+            cluster and user
+
+    """
+    key = (os.path.abspath(kubeconfig), user)
+    with _transports_lock:
+        transport = _transports.get(key)
+        if transport is None or transport.password != password:
+            transport = PrometheusTransport(user, password, kubeconfig, skip_tls_verify)
+            _transports[key] = transport
+    if transport.endpoint is None:
+        transport.refresh_endpoint()
+    return transport
+
+
 class PrometheusAPI(object):
     """
     This is wrapper class for Prometheus API.
     """
 
-    _token = None
     _user = None
     _password = None
     _endpoint = None
+    _transport = None
     _cacert = False
     _threading_lock = None
     _cluster_context = None
@@ -518,15 +759,12 @@ class PrometheusAPI(object):
             user (str): OpenShift username used to connect to API
             password (str): Password for the OpenShift username used to connect to API
             threading_lock (threading.RLock): Lock used for synchronization of the
-                threads in Prometheus calls
+                threads in Prometheus calls, optional, the API objects share a
+                thread safe transport
             cluster_context (object): context object in which the bucket will be created.
                 Default is provider context.
 
         """
-        if threading_lock is None:
-            raise NoThreadingLockUsedError(
-                "using threading.Lock object is mandatory for PrometheusAPI class"
-            )
         self._cluster_context = cluster_context
         with self._cluster_context():
             if (
@@ -545,7 +783,13 @@ class PrometheusAPI(object):
                         password = f.read().rstrip("\n")
                 self._password = password
             self._threading_lock = threading_lock
-            self.refresh_connection()
+            self._transport = get_prometheus_transport(
+                self._user,
+                self._password,
+                config.RUN["kubeconfig"],
+                skip_tls_verify=config.ENV_DATA.get("skip_tls_verify", False),
+            )
+            self._endpoint = self._transport.endpoint
             if (
                 not config.ENV_DATA["platform"].lower() == "ibm_cloud"
                 and not config.ENV_DATA["platform"].lower()
@@ -556,28 +800,12 @@ class PrometheusAPI(object):
 
     def refresh_connection(self):
         """
-        Login into OCP, refresh endpoint and token.
+        Login into OCP, refresh endpoint and token. The kubeconfig is not
+        modified.
         """
         with self._cluster_context():
-            kubeconfig = config.RUN["kubeconfig"]
-            ocp = OCP(
-                kind=constants.ROUTE,
-                namespace=defaults.OCS_MONITORING_NAMESPACE,
-                threading_lock=self._threading_lock,
-                cluster_kubeconfig=kubeconfig,
-                skip_tls_verify=config.ENV_DATA.get("skip_tls_verify", False),
-            )
-            kube_data = ""
-            with open(kubeconfig, "r") as kube_file:
-                kube_data = kube_file.readlines()
-            login_ok = ocp.login(self._user, self._password)
-            if not login_ok:
-                raise AuthError("Login to OCP failed")
-            self._token = ocp.get_user_token()
-            with open(kubeconfig, "w") as kube_file:
-                kube_file.writelines(kube_data)
-            route_obj = ocp.get(resource_name=defaults.PROMETHEUS_ROUTE)
-            self._endpoint = "https://" + route_obj["spec"]["host"]
+            self._transport.refresh()
+            self._endpoint = self._transport.endpoint
 
     def generate_cert(self):
         """
@@ -626,10 +854,8 @@ class PrometheusAPI(object):
             requests.models.Response: Response from Prometheus alerts api
         """
         pattern = f"/api/v1/{resource}"
-        headers = {"Authorization": f"Bearer {self._token}"}
 
         logger.debug(f"GET {self._endpoint + pattern}")
-        logger.debug(f"headers={headers}")
         logger.debug(f"verify={self._cacert}")
         logger.debug(f"params={payload}")
 
@@ -638,10 +864,9 @@ class PrometheusAPI(object):
                 for sample_response in TimeoutIterator(
                     timeout=timeout,
                     sleep=15,
-                    func=requests.get,
+                    func=self._transport.get,
                     func_kwargs={
                         "url": self._endpoint + pattern,
-                        "headers": headers,
                         "verify": self._cacert,
                         "params": payload,
                         "timeout": 60,
@@ -652,25 +877,21 @@ class PrometheusAPI(object):
                         logger.warning(
                             f"There was an error in response: {response.text}"
                         )
-                        logger.warning("Refreshing connection")
-                        self.refresh_connection()
                         if (
                             not config.ENV_DATA["platform"].lower() == "ibm_cloud"
                             and config.ENV_DATA["deployment_type"] == "managed"
                         ):
                             logger.warning("Generating new certificate")
                             self.generate_cert()
-                        logger.warning("Connection refreshed")
                     else:
                         break
             return response
         else:
             with self._cluster_context():
-                response = requests.get(
+                response = self._transport.get(
                     self._endpoint + pattern,
-                    headers=headers,
-                    verify=self._cacert,
                     params=payload,
+                    verify=self._cacert,
                     timeout=60,
                 )
             return response
@@ -1003,6 +1224,7 @@ class PrometheusAlertSubscriber(Timer):
 
     def __init__(self, threading_lock, interval: float):
         self.prometheus_api = PrometheusAPI(threading_lock=threading_lock)
+        self.listeners = []
         super().__init__(
             interval,
             lambda: self.prometheus_api.prometheus_log(self.prometheus_alert_list),
@@ -1015,7 +1237,33 @@ class PrometheusAlertSubscriber(Timer):
         ! This method is called by Timer class, do not call it directly !
         """
         while not self.finished.wait(self.interval):
+            alerts_count = len(self.prometheus_alert_list)
             self.function(*self.args, **self.kwargs)
+            if len(self.prometheus_alert_list) != alerts_count:
+                for callback in list(self.listeners):
+                    callback()
+
+    def add_listener(self, callback):
+        """
+        Register callback called when a new alert is logged, e.g.
+        AdaptiveTimeoutSampler.wakeup
+
+        Args:
+            callback (function): Callback without arguments, has to be fast
+
+        """
+        self.listeners.append(callback)
+
+    def remove_listener(self, callback):
+        """
+        Unregister callback registered by add_listener
+
+        Args:
+            callback (function): The registered callback
+
+        """
+        if callback in self.listeners:
+            self.listeners.remove(callback)
 
     def get_alerts(self):
         """
@@ -0,0 +1,383 @@
+"""
+Concurrent export of Prometheus metrics to compressed columnar files
+
+collect_prometheus_metrics used to fetch every metric by one range query over
+the whole time range and to store the raw JSON response. Prometheus refuses
+range queries returning more than 11000 points per series, so the metrics of
+long tests were lost, and the JSON with a [timestamp, "value"] pair per point
+is several times bigger than the data. The PrometheusExporter splits the range
+into chunks aligned to the step of the query, each of them below the points
+limit, fetches all the metrics x chunks in a pool of threads and stitches the
+chunks of every series together. Each metric is stored as a compressed numpy
+archive (.npz) with the columns of all its series concatenated:
+
+    timestamps (float64), values (float64): the points of all the series
+    offsets (int64): start of every series in the columns, plus the end
+    labels (str): JSON list of the label sets of the series
+    query (str): JSON with the metric, start, end and step of the export
+
+Usage:
+    exporter = PrometheusExporter(api)
+    paths = exporter.export(metrics, log_dir, start, stop, step=1.0)
+    for series in load_metric(paths["ceph_cluster_total_used_bytes"]):
+        print(series.labels, series.values.max())
+"""
+
+import collections
+import json
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from ocs_ci.framework import config
+
+logger = logging.getLogger(__name__)
+
+# limit of the points per series of a range query of Prometheus
+MAX_POINTS_PER_SERIES = 11000
+DEFAULT_MAX_POINTS = 10000
+DEFAULT_WORKERS = 8
+NPZ_SUFFIX = ".npz"
+JSON_SUFFIX = ".json"
+
+Series = collections.namedtuple("Series", ["labels", "timestamps", "values"])
+
+
+def split_range(start, stop, step, max_points=DEFAULT_MAX_POINTS):
+    """
+    Split the range of a range query to the chunks with at most max_points
+    points, the chunks start on the step grid of the range so the stitched
+    series have the same timestamps as a single query
+
+    Args:
+        start (float): start timestamp
+        stop (float): end timestamp
+        step (float): step of the datapoints in seconds
+        max_points (int): maximum number of the points of a chunk
+
+    Returns:
+        list: (start, end) tuples of the chunks
+
+    """
+    chunks = []
+    chunk_span = (max_points - 1) * step
+    index = 0
+    while True:
+        chunk_start = start + index * max_points * step
+        if chunk_start > stop:
+            break
+        chunks.append((chunk_start, min(chunk_start + chunk_span, stop)))
+        index += 1
+    return chunks
+
+
+def get_file_name(metric):
+    """
+    Args:
+        metric (str): the metric or query
+
+    Returns:
+        str: file name of the metric without the suffix
+
+    """
+    return re.sub(r"[^\w:.-]", "_", metric)
+
+
+class PrometheusExporter(object):
+    """
+    Export of the range queries of the metrics in chunks fetched concurrently
+    """
+
+    def __init__(self, api, workers=DEFAULT_WORKERS, max_points=DEFAULT_MAX_POINTS):
+        """
+        Initializer function
+
+        Args:
+            api (PrometheusAPI): API used for the range queries
+            workers (int): maximum number of the concurrent queries
+            max_points (int): maximum number of the points per series of a
+                query, below MAX_POINTS_PER_SERIES
+
+        """
+        self.api = api
+        self.workers = max(1, workers)
+        self.max_points = min(max_points, MAX_POINTS_PER_SERIES)
+
+    def _query_chunk(self, cluster_index, metric, start, end, step):
+        with config.bind_ctx(cluster_index):
+            response = self.api.get(
+                "query_range",
+                payload={"query": metric, "start": start, "end": end, "step": step},
+            )
+        content = response.json()
+        if content.get("status") != "success":
+            raise ValueError(
+                f"Range query of {metric} ({start}, {end}) failed: "
+                f"{content.get('error')}"
+            )
+        return content["data"]["result"]
+
+    def fetch(self, metrics, start, stop, step=1.0):
+        """
+        Fetch the range of the metrics
+
+        Args:
+            metrics (list): metrics or queries
+            start (float): start timestamp
+            stop (float): end timestamp
+            step (float): step of the datapoints in seconds
+
+        Returns:
+            dict: metric as key, list of Series as value, the metrics whose
+                query failed are logged and left out
+
+        """
+        start, stop, step = float(start), float(stop), float(step)
+        chunks = split_range(start, stop, step, self.max_points)
+        logger.info(
+            f"Fetching {len(metrics)} metrics over ({start}, {stop}) with step "
+            f"{step} in {len(chunks)} chunks"
+        )
+        with ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="prometheus-export"
+        ) as executor:
+            futures = {
+                metric: [
+                    executor.submit(
+                        self._query_chunk,
+                        config.cur_index,
+                        metric,
+                        chunk_start,
+                        chunk_end,
+                        step,
+                    )
+                    for chunk_start, chunk_end in chunks
+                ]
+                for metric in metrics
+            }
+            data = {}
+            for metric, chunk_futures in futures.items():
+                try:
+                    results = [future.result() for future in chunk_futures]
+                except Exception as err:
+                    logger.error(f"Failed to fetch metric {metric}: {err}")
+                    continue
+                data[metric] = stitch_series(results)
+        return data
+
+    def export(self, metrics, log_dir, start, stop, step=1.0, file_format="npz"):
+        """
+        Fetch the range of the metrics and save every metric to a file
+
+        Args:
+            metrics (list): metrics or queries
+            log_dir (str): directory of the files
+            start (float): start timestamp
+            stop (float): end timestamp
+            step (float): step of the datapoints in seconds
+            file_format (str): 'npz' for the compressed columnar files, 'json'
+                for the layout of the Prometheus response
+
+        Returns:
+            dict: metric as key, path of its file as value
+
+        """
+        os.makedirs(log_dir, exist_ok=True)
+        query = {"start": float(start), "end": float(stop), "step": float(step)}
+        paths = {}
+        for metric, series in self.fetch(metrics, start, stop, step).items():
+            file_name = os.path.join(log_dir, get_file_name(metric))
+            logger.info(f"Saving {len(series)} series of {metric} to {file_name}")
+            if file_format == "json":
+                paths[metric] = save_metric_json(f"{file_name}{JSON_SUFFIX}", series)
+            else:
+                paths[metric] = save_metric(
+                    f"{file_name}{NPZ_SUFFIX}", series, dict(query, metric=metric)
+                )
+        return paths
+
+
+def stitch_series(results):
+    """
+    Join the series of the results of the chunks of a range query
+
+    Args:
+        results (list): results of the range queries of the chunks in the order
+            of the time, lists of {"metric": labels, "values": points}
+
+    Returns:
+        list: Series, one per label set in the order of the first appearance
+
+    """
+    points = {}
+    labels = {}
+    for result in results:
+        for series in result:
+            key = tuple(sorted(series["metric"].items()))
+            labels.setdefault(key, series["metric"])
+            points.setdefault(key, []).extend(series["values"])
+    stitched = []
+    for key, values in points.items():
+        timestamps = np.array([point[0] for point in values], dtype=np.float64)
+        # the values are strings including 'NaN' and '+Inf'
+        values = np.array([float(point[1]) for point in values], dtype=np.float64)
+        # drop the points of the chunk boundaries returned twice
+        timestamps, index = np.unique(timestamps, return_index=True)
+        stitched.append(Series(labels[key], timestamps, values[index]))
+    return stitched
+
+
+def save_metric(path, series, query=None):
+    """
+    Save the series of a metric to a compressed numpy archive
+
+    Args:
+        path (str): path of the .npz file
+        series (list): Series of the metric
+        query (dict): description of the query stored with the data
+
+    Returns:
+        str: the path
+
+    """
+    offsets = np.zeros(len(series) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(item.timestamps) for item in series])
+    with open(path, "wb") as f:
+        np.savez_compressed(
+            f,
+            timestamps=np.concatenate(
+                [item.timestamps for item in series] or [np.empty(0)]
+            ),
+            values=np.concatenate([item.values for item in series] or [np.empty(0)]),
+            offsets=offsets,
+            labels=np.array(json.dumps([item.labels for item in series])),
+            query=np.array(json.dumps(query or {})),
+        )
+    return path
+
+
+def _format_value(value):
+    """
+    Format the value like Prometheus does in the query responses
+    """
+    if np.isnan(value):
+        return "NaN"
+    if np.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def save_metric_json(path, series):
+    """
+    Save the series of a metric in the layout of the Prometheus range query
+    response
+
+    Args:
+        path (str): path of the .json file
+        series (list): Series of the metric
+
+    Returns:
+        str: the path
+
+    """
+    content = {
+        "status": "success",
+        "data": {
+            "resultType": "matrix",
+            "result": [
+                {
+                    "metric": item.labels,
+                    "values": [
+                        [timestamp, _format_value(value)]
+                        for timestamp, value in zip(
+                            item.timestamps.tolist(), item.values.tolist()
+                        )
+                    ],
+                }
+                for item in series
+            ],
+        },
+    }
+    with open(path, "w") as f:
+        json.dump(content, f)
+    return path
+
+
+def load_metric(path):
+    """
+    Load the series of a metric saved by the exporter
+
+    Args:
+        path (str): path of the .npz file
+
+    Returns:
+        list: Series of the metric
+
+    """
+    with np.load(path, allow_pickle=False) as data:
+        offsets = data["offsets"]
+        timestamps = data["timestamps"]
+        values = data["values"]
+        labels = json.loads(str(data["labels"]))
+    return [
+        Series(
+            labels[i],
+            timestamps[offsets[i] : offsets[i + 1]],
+            values[offsets[i] : offsets[i + 1]],
+        )
+        for i in range(len(labels))
+    ]
+
+
+def load_query(path):
+    """
+    Args:
+        path (str): path of the .npz file
+
+    Returns:
+        dict: metric, start, end and step of the export
+
+    """
+    with np.load(path, allow_pickle=False) as data:
+        return json.loads(str(data["query"]))
+
+
+def load_metrics(log_dir):
+    """
+    Load all the metrics exported to the directory
+
+    Args:
+        log_dir (str): directory of the exported metrics
+
+    Returns:
+        dict: metric as key, list of Series as value
+
+    """
+    metrics = {}
+    for file_name in sorted(os.listdir(log_dir)):
+        if file_name.endswith(NPZ_SUFFIX):
+            path = os.path.join(log_dir, file_name)
+            metrics[load_query(path).get("metric", file_name)] = load_metric(path)
+    return metrics
+
+
+def select_series(series, **labels):
+    """
+    Args:
+        series (list): Series of a metric
+        **labels: label values the series must have, e.g. pod='rook-ceph-mgr-a'
+
+    Returns:
+        list: the matching Series
+
+    """
+    return [
+        item
+        for item in series
+        if all(item.labels.get(name) == value for name, value in labels.items())
+    ]
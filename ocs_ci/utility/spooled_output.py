@@ -0,0 +1,268 @@
+# -*- coding: utf8 -*-
+"""
+Bounded-memory handling of large command output
+
+exec_cmd keeps the whole output of a command in memory and scans it several
+times (decode, masking of secrets, truncation for the log). That is fine for
+the usual short outputs, but 'oc logs' of OSDs or must-gather output can have
+hundreds of MB. SpooledOutput consumes the output chunk by chunk: the secrets
+are masked incrementally, the data are spooled to a temporary file once they
+exceed the memory threshold and only a bounded head and tail of the output is
+kept for the debug log preview. The callers read the output lazily, e.g. by
+iterating lines or copying it to a file.
+"""
+
+import collections
+import io
+import re
+import shutil
+import tempfile
+
+MASK = b"*****"
+# size of the chunks read from the command output
+CHUNK_SIZE = 64 * 1024
+# output bigger than this is spooled to a temporary file
+DEFAULT_SPOOL_SIZE = 4 * 1024 * 1024
+# size of the head and the tail of the output kept for the log preview
+DEFAULT_PREVIEW_SIZE = 16 * 1024
+
+
+class SecretMasker(object):
+    """
+    Incremental replacement of secrets in a stream of bytes. Secrets split
+    between two chunks are masked too, because the end of a chunk which could
+    be a beginning of a secret is held back until the next chunk arrives.
+    """
+
+    def __init__(self, secrets):
+        """
+        Initializer function
+
+        Args:
+            secrets (list): Secret strings to mask
+
+        """
+        secrets = sorted(
+            {secret.encode() for secret in secrets or [] if secret},
+            key=len,
+            reverse=True,
+        )
+        self._pattern = (
+            re.compile(b"|".join(re.escape(secret) for secret in secrets))
+            if secrets
+            else None
+        )
+        self._held_back = max((len(secret) for secret in secrets), default=1) - 1
+        self._carry = b""
+
+    def feed(self, chunk, final=False):
+        """
+        Mask the next chunk of the stream
+
+        Args:
+            chunk (bytes): Next chunk of the stream
+            final (bool): True if it's the last chunk
+
+        Returns:
+            bytes: masked data which can't be a part of a secret anymore
+
+        """
+        if self._pattern is None:
+            return chunk
+        data = self._carry + chunk
+        limit = len(data) if final else max(0, len(data) - self._held_back)
+        parts = []
+        position = 0
+        for match in self._pattern.finditer(data):
+            if match.start() >= limit:
+                break
+            parts.append(data[position : match.start()])
+            parts.append(MASK)
+            position = match.end()
+        end = max(position, limit)
+        parts.append(data[position:end])
+        self._carry = data[end:]
+        return b"".join(parts)
+
+
+class SpooledOutput(object):
+    """
+    Output of a command spooled to memory or to a temporary file with masked
+    secrets and bounded preview
+    """
+
+    def __init__(
+        self,
+        secrets=None,
+        spool_size=DEFAULT_SPOOL_SIZE,
+        preview_size=DEFAULT_PREVIEW_SIZE,
+    ):
+        """
+        Initializer function
+
+        Args:
+            secrets (list): Secret strings to mask
+            spool_size (int): Size in bytes after which the output is moved
+                from memory to a temporary file
+            preview_size (int): Size in bytes of the head and of the tail of
+                the output kept for the preview
+
+        """
+        self._masker = SecretMasker(secrets)
+        self._file = tempfile.SpooledTemporaryFile(
+            max_size=spool_size, prefix="ocs_ci_cmd_output_"
+        )
+        self._preview_size = preview_size
+        self._head = bytearray()
+        self._tail = collections.deque()
+        self._tail_size = 0
+        self.size = 0
+        self.closed_for_writing = False
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return self.iter_lines()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.close()
+
+    def _write_masked(self, data):
+        if not data:
+            return
+        self._file.write(data)
+        self.size += len(data)
+        missing = self._preview_size - len(self._head)
+        if missing > 0:
+            self._head += data[:missing]
+            data = data[missing:]
+        if data:
+            self._tail.append(data)
+            self._tail_size += len(data)
+            # drop the chunks which are not needed for the tail anymore
+            while self._tail_size - len(self._tail[0]) >= self._preview_size:
+                self._tail_size -= len(self._tail.popleft())
+
+    def write(self, chunk):
+        """
+        Add next chunk of the output
+
+        Args:
+            chunk (bytes): The chunk of the output
+
+        """
+        self._write_masked(self._masker.feed(chunk))
+
+    def finish(self):
+        """
+        Flush the data held back by the masking of secrets, called when the
+        command finished
+        """
+        if not self.closed_for_writing:
+            self._write_masked(self._masker.feed(b"", final=True))
+            self.closed_for_writing = True
+
+    def consume(self, stream, chunk_size=CHUNK_SIZE):
+        """
+        Read the stream till its end
+
+        Args:
+            stream (io.BufferedReader): Stream to read, e.g. stdout of a process
+            chunk_size (int): Size of the chunks to read
+
+        """
+        read = getattr(stream, "read1", stream.read)
+        while True:
+            chunk = read(chunk_size)
+            if not chunk:
+                break
+            self.write(chunk)
+        self.finish()
+
+    def preview(self, encoding="utf-8"):
+        """
+        Get bounded preview of the output for logging
+
+        Returns:
+            str: the head and the tail of the output, the middle is replaced
+                by a truncation marker if the output is bigger than two
+                preview sizes
+
+        """
+        head = bytes(self._head)
+        tail = b"".join(self._tail)
+        truncated = self.size - len(head) - len(tail[-self._preview_size :])
+        if truncated > 0:
+            tail = tail[-self._preview_size :]
+            return (
+                f"{head.decode(encoding, errors='replace')}"
+                f"\n[...{truncated} bytes truncated...]\n"
+                f"{tail.decode(encoding, errors='replace')}"
+            )
+        return (head + tail).decode(encoding, errors="replace")
+
+    def open(self):
+        """
+        Returns:
+            file object: binary file with the output positioned at the start,
+                shared with the other readers of this output
+
+        """
+        self.finish()
+        self._file.seek(0)
+        return self._file
+
+    def read(self, encoding="utf-8"):
+        """
+        Read the whole output to memory, use only when the output is known to
+        be small
+
+        Returns:
+            str: decoded output
+
+        """
+        return self.open().read().decode(encoding, errors="replace")
+
+    def iter_lines(self, encoding="utf-8"):
+        """
+        Iterate the lines of the output without loading it to memory
+
+        Yields:
+            str: line of the output without the trailing newline
+
+        """
+        reader = io.TextIOWrapper(
+            self.open(), encoding=encoding, errors="replace", newline=""
+        )
+        try:
+            for line in reader:
+                yield line.rstrip("\r\n")
+        finally:
+            # keep the underlying spool open for the other readers
+            reader.detach()
+
+    def save(self, path, mode="wb"):
+        """
+        Copy the output to the file
+
+        Args:
+            path (str): Path of the file
+            mode (str): 'wb' to overwrite or 'ab' to append to the file
+
+        Returns:
+            str: the path of the file
+
+        """
+        with open(path, mode) as output_file:
+            shutil.copyfileobj(self.open(), output_file)
+        return path
+
+    def close(self):
+        """
+        Release the memory or the temporary file with the output
+        """
+        self._file.close()
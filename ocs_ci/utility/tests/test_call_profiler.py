@@ -0,0 +1,117 @@
+# -*- coding: utf8 -*-
+
+import json
+import random
+
+import pytest
+from bs4 import BeautifulSoup
+
+from ocs_ci.utility import call_profiler
+from ocs_ci.utility.call_profiler import LatencyHistogram
+from ocs_ci.utility.utils import add_call_profile_to_email, exec_cmd
+
+
+@pytest.fixture
+def profiler():
+    call_profiler.reset()
+    yield call_profiler
+    call_profiler.reset()
+
+
+def test_histogram_buckets_roundtrip():
+    for value in [0, 1, 63, 64, 65, 127, 128, 1000, 123456, 10**9]:
+        lowest, highest = LatencyHistogram.bucket_range(
+            LatencyHistogram.bucket_index(value)
+        )
+        assert lowest <= value <= highest
+        # relative error is bounded by the sub-buckets
+        assert highest - lowest <= max(1, value / LatencyHistogram.SUB_BUCKETS)
+
+
+def test_histogram_percentiles():
+    values = [random.uniform(0.01, 5) for _ in range(10000)]
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+    values.sort()
+    for percentile in (50, 90, 99):
+        exact = values[int(len(values) * percentile / 100) - 1]
+        assert histogram.percentile(percentile) == pytest.approx(exact, rel=0.05)
+    assert histogram.percentile(100) == values[-1]
+    assert histogram.to_dict()["count"] == 10000
+    # buckets, not values, are kept in memory
+    assert len(histogram.counts) < 300
+
+    other = LatencyHistogram()
+    other.record(10)
+    histogram.merge(other)
+    assert histogram.count == 10001
+    assert histogram.max == 10
+
+
+@pytest.mark.parametrize(
+    "cmd,expected",
+    [
+        (
+            "oc --kubeconfig /tmp/kc -n openshift-storage get pod -o yaml",
+            ("oc", "get", "pod", "openshift-storage"),
+        ),
+        ("oc get pods.v1/rook-ceph-tools -A", ("oc", "get", "pods.v1", "*")),
+        (
+            "oc -n ns rsh rook-ceph-tools ceph health",
+            ("oc", "rsh", "pod", "ns"),
+        ),
+        ("oc apply -f /tmp/pvc.yaml", ("oc", "apply", "", None)),
+        ("/usr/bin/curl -u user:secret https://x", ("curl", "", "", None)),
+    ],
+)
+def test_parse_command(cmd, expected):
+    assert call_profiler.parse_command(cmd.split()) == expected
+
+
+def test_calls_attributed_to_test(profiler, monkeypatch, tmp_path):
+    monkeypatch.setenv("PYTEST_CURRENT_TEST", "tests/test_a.py::test_b[1] (call)")
+    for _ in range(3):
+        profiler.record_command("oc -n ns get pod", 0.5, 100, 0, cluster_index=0)
+    profiler.record_command("oc -n ns delete pvc a", 2, 0, 1, cluster_index=0)
+    monkeypatch.delenv("PYTEST_CURRENT_TEST")
+    profiler.record_call("api", "get", "pod", "ns", 1, 0.01)
+
+    summary = profiler.get_summary()
+    calls = {(c["test"], c["verb"], c["kind"]): c for c in summary["calls"]}
+    get_pod = calls[("tests/test_a.py::test_b[1]", "get", "pod")]
+    assert get_pod["count"] == 3
+    assert get_pod["total"] == 1.5
+    assert get_pod["stdout_bytes"] == 300
+    assert calls[("tests/test_a.py::test_b[1]", "delete", "pvc")]["failures"] == 1
+    assert (call_profiler.NO_TEST, "get", "pod") in calls
+    verbs = {(v["source"], v["verb"]): v for v in summary["verbs"]}
+    assert verbs[("oc", "get")]["count"] == 3
+    assert verbs[("api", "get")]["count"] == 1
+    assert [t["test"] for t in summary["tests"]] == [
+        "tests/test_a.py::test_b[1]",
+        call_profiler.NO_TEST,
+    ]
+
+    dump_file = tmp_path / "profile.json"
+    profiler.dump_summary(str(dump_file))
+    assert json.loads(dump_file.read_text()) == summary
+
+
+def test_exec_cmd_is_recorded(profiler):
+    exec_cmd("echo profiled")
+    exec_cmd("false", ignore_error=True)
+    verbs = {v["source"]: v for v in profiler.get_summary()["verbs"]}
+    assert verbs["echo"]["count"] == 1
+    assert verbs["echo"]["stdout_bytes"] == len("profiled\n")
+    assert verbs["false"]["failures"] == 1
+
+
+def test_call_profile_in_email(profiler):
+    soup = BeautifulSoup("<h1>Report</h1><h2>Summary</h2>", "html.parser")
+    add_call_profile_to_email(soup)
+    assert not soup.find("table")
+    profiler.record_command("oc get pod", 0.5, 100, 0)
+    add_call_profile_to_email(soup)
+    assert len(soup.find_all("table")) == 2
+    assert "Calls to the cluster by verb" in soup.get_text()
@@ -0,0 +1,109 @@
+# -*- coding: utf8 -*-
+
+import json
+import math
+import threading
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from ocs_ci.utility.prometheus_export import (
+    PrometheusExporter,
+    load_metric,
+    load_metrics,
+    select_series,
+    split_range,
+)
+
+
+class FakePrometheusAPI(object):
+    """
+    Range queries of two series, 'mon.a' with the value of the timestamp and
+    'mon.b' appearing at 100 seconds, the 'broken' metric fails
+    """
+
+    def __init__(self):
+        self.payloads = []
+        self._lock = threading.Lock()
+
+    def get(self, resource, payload=None, timeout=300):
+        assert resource == "query_range"
+        with self._lock:
+            self.payloads.append(payload)
+        response = MagicMock()
+        if payload["query"] == "broken":
+            response.json.return_value = {"status": "error", "error": "bad query"}
+            return response
+        timestamps = np.arange(payload["start"], payload["end"] + 1, payload["step"])
+        result = [
+            {
+                "metric": {"__name__": payload["query"], "ceph_daemon": "mon.a"},
+                "values": [[t, str(t)] for t in timestamps],
+            }
+        ]
+        late = [[t, "NaN"] for t in timestamps if t >= 100]
+        if late:
+            result.append(
+                {
+                    "metric": {"ceph_daemon": "mon.b", "__name__": payload["query"]},
+                    "values": late,
+                }
+            )
+        response.json.return_value = {
+            "status": "success",
+            "data": {"resultType": "matrix", "result": result},
+        }
+        return response
+
+
+def test_split_range():
+    assert split_range(0, 25, 1, max_points=10) == [(0, 9), (10, 19), (20, 25)]
+    assert split_range(0, 20, 2, max_points=5) == [(0, 8), (10, 18), (20, 20)]
+    assert split_range(5, 5, 1) == [(5, 5)]
+
+
+def test_export_stitches_chunks(tmp_path):
+    api = FakePrometheusAPI()
+    exporter = PrometheusExporter(api, workers=4, max_points=50)
+    paths = exporter.export(
+        ["ceph_mon_quorum_status", "broken", "cluster:cpu_usage_cores:sum"],
+        str(tmp_path),
+        0,
+        149,
+        step=1.0,
+    )
+    assert sorted(paths) == ["ceph_mon_quorum_status", "cluster:cpu_usage_cores:sum"]
+    # 3 metrics x 3 chunks
+    assert len(api.payloads) == 9
+    assert max(p["end"] - p["start"] for p in api.payloads) == 49
+    series = load_metric(paths["ceph_mon_quorum_status"])
+    assert [item.labels["ceph_daemon"] for item in series] == ["mon.a", "mon.b"]
+    mon_a = select_series(series, ceph_daemon="mon.a")[0]
+    assert np.array_equal(mon_a.timestamps, np.arange(150))
+    assert np.array_equal(mon_a.values, np.arange(150))
+    mon_b = select_series(series, ceph_daemon="mon.b")[0]
+    assert mon_b.timestamps[0] == 100 and len(mon_b.timestamps) == 50
+    assert all(math.isnan(value) for value in mon_b.values)
+    metrics = load_metrics(str(tmp_path))
+    assert sorted(metrics) == ["ceph_mon_quorum_status", "cluster:cpu_usage_cores:sum"]
+
+
+def test_export_json(tmp_path):
+    exporter = PrometheusExporter(FakePrometheusAPI(), max_points=60)
+    paths = exporter.export(["up"], str(tmp_path), 90, 110, step=10, file_format="json")
+    with open(paths["up"]) as f:
+        content = json.load(f)
+    assert content["data"]["result"][0]["values"] == [
+        [90.0, "90"],
+        [100.0, "100"],
+        [110.0, "110"],
+    ]
+    assert content["data"]["result"][1]["values"][0] == [100.0, "NaN"]
+
+
+@pytest.mark.parametrize("max_points", [3, 7, 1000])
+def test_chunks_match_single_query(max_points):
+    exporter = PrometheusExporter(FakePrometheusAPI(), max_points=max_points)
+    series = exporter.fetch(["up"], 0, 120, step=2.5)["up"]
+    assert np.array_equal(series[0].timestamps, np.arange(0, 121, 2.5))
@@ -0,0 +1,142 @@
+# -*- coding: utf8 -*-
+
+import base64
+import hashlib
+import json
+import subprocess
+import threading
+import time
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ocs_ci.ocs.exceptions import AuthError, CommandFailed
+from ocs_ci.utility import prometheus
+from ocs_ci.utility.prometheus import PrometheusTransport
+
+TOKEN = "sha256~secret"
+
+
+class FakeOC(object):
+    """
+    'oc login' writing the token to the given kubeconfig, like oc does
+    """
+
+    def __init__(self, expires_in=86400, fail_login=False):
+        self.expires_in = expires_in
+        self.fail_login = fail_login
+        self.commands = []
+        self._lock = threading.Lock()
+
+    def exec_cmd(self, command, secrets=None):
+        with self._lock:
+            self.commands.append(command)
+        kubeconfig = command[command.index("--kubeconfig") + 1]
+        args = command[command.index("--kubeconfig") + 2 :]
+        stdout = ""
+        if args[0] == "login":
+            if self.fail_login:
+                raise CommandFailed("Login failed (401 Unauthorized)")
+            # slow login to catch concurrent ones
+            time.sleep(0.1)
+            with open(kubeconfig, "a") as f:
+                f.write(f"token: {TOKEN}\n")
+        elif args[0] == "whoami":
+            stdout = TOKEN
+        elif args[:2] == ["get", "useroauthaccesstoken"]:
+            digest = hashlib.sha256(b"secret").digest()
+            name = "sha256~" + base64.urlsafe_b64encode(digest).decode().rstrip("=")
+            assert args[2] == name
+            stdout = json.dumps(
+                {
+                    "expiresIn": self.expires_in,
+                    "metadata": {
+                        "creationTimestamp": datetime.utcnow().strftime(
+                            "%Y-%m-%dT%H:%M:%SZ"
+                        )
+                    },
+                }
+            )
+        return subprocess.CompletedProcess(command, 0, stdout.encode(), b"")
+
+    def logins(self):
+        return len([cmd for cmd in self.commands if "login" in cmd])
+
+
+@pytest.fixture
+def kubeconfig(tmp_path):
+    path = tmp_path / "kubeconfig"
+    path.write_text("apiVersion: v1\n")
+    return str(path)
+
+
+def response(status_code):
+    resp = MagicMock()
+    resp.status_code = status_code
+    resp.ok = status_code < 400
+    return resp
+
+
+def test_token_cached_without_touching_kubeconfig(kubeconfig):
+    fake_oc = FakeOC()
+    transport = PrometheusTransport("user", "password", kubeconfig)
+    with patch.object(prometheus, "exec_cmd", side_effect=fake_oc.exec_cmd):
+        threads = [threading.Thread(target=transport.get_token) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert transport.get_token() == TOKEN
+    assert fake_oc.logins() == 1
+    assert all(kubeconfig not in cmd for cmd in fake_oc.commands)
+    with open(kubeconfig) as f:
+        assert f.read() == "apiVersion: v1\n"
+    assert 86000 < transport._token_expires - time.time() <= 86400
+
+
+def test_token_refreshed_before_expiration(kubeconfig):
+    # the token expires in the refresh margin
+    fake_oc = FakeOC(expires_in=60)
+    transport = PrometheusTransport("user", "password", kubeconfig)
+    with patch.object(prometheus, "exec_cmd", side_effect=fake_oc.exec_cmd):
+        transport.get_token()
+        transport.get_token()
+    assert fake_oc.logins() == 2
+
+
+def test_rejected_token_is_replaced(kubeconfig):
+    fake_oc = FakeOC()
+    transport = PrometheusTransport("user", "password", kubeconfig)
+    with (
+        patch.object(prometheus, "exec_cmd", side_effect=fake_oc.exec_cmd),
+        patch.object(
+            transport.session,
+            "get",
+            side_effect=[
+                response(200),
+                response(401),
+                response(200),
+                response(403),
+                response(403),
+            ],
+        ) as session_get,
+    ):
+        assert transport.get("https://prometheus/api/v1/alerts").status_code == 200
+        assert fake_oc.logins() == 1
+        assert transport.get("https://prometheus/api/v1/alerts").status_code == 200
+        assert fake_oc.logins() == 2
+        # rejected again with the new token
+        assert transport.get("https://prometheus/api/v1/alerts").status_code == 403
+        assert fake_oc.logins() == 3
+    headers = session_get.call_args.kwargs["headers"]
+    assert headers == {"Authorization": f"Bearer {TOKEN}"}
+
+
+def test_failed_login(kubeconfig):
+    transport = PrometheusTransport("user", "password", kubeconfig)
+    with patch.object(
+        prometheus, "exec_cmd", side_effect=FakeOC(fail_login=True).exec_cmd
+    ):
+        with pytest.raises(AuthError):
+            transport.get_token()
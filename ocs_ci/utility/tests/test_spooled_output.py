@@ -0,0 +1,87 @@
+# -*- coding: utf8 -*-
+
+import random
+import subprocess
+import sys
+
+import pytest
+
+from ocs_ci.ocs.exceptions import CommandFailed
+from ocs_ci.utility.spooled_output import SecretMasker, SpooledOutput
+from ocs_ci.utility.utils import exec_cmd_stream, mask_secrets
+
+
+def split_randomly(data, max_chunk=7):
+    position = 0
+    while position < len(data):
+        size = random.randint(1, max_chunk)
+        yield data[position : position + size]
+        position += size
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_secret_masker_matches_mask_secrets(seed):
+    random.seed(seed)
+    secrets = ["password", "pass", "token-1234567890"]
+    text = "".join(
+        random.choice(["x", "\n", "pass", "password", "token-1234567890", "tok"])
+        for _ in range(200)
+    )
+    masker = SecretMasker(secrets)
+    masked = b"".join(masker.feed(chunk) for chunk in split_randomly(text.encode()))
+    masked += masker.feed(b"", final=True)
+    assert masked.decode() == mask_secrets(text, secrets)
+
+
+def test_spooled_output_preview_and_readers(tmp_path):
+    output = SpooledOutput(secrets=["s3cret"], spool_size=1024, preview_size=100)
+    lines = [f"line {i} s3cret" for i in range(1000)]
+    for chunk in split_randomly("\n".join(lines).encode(), max_chunk=300):
+        output.write(chunk)
+    output.finish()
+    expected = "\n".join(lines).replace("s3cret", "*****")
+    assert output.size == len(expected)
+    # output bigger than spool_size is moved to a file
+    assert output._file._rolled
+    preview = output.preview()
+    assert preview.startswith(expected[:100])
+    assert preview.endswith(expected[-100:])
+    assert f"[...{len(expected) - 200} bytes truncated...]" in preview
+    assert len(output._head) + sum(len(chunk) for chunk in output._tail) < 1000
+    assert list(output.iter_lines())[999] == "line 999 *****"
+    assert output.read() == expected
+    assert open(output.save(str(tmp_path / "out.log"))).read() == expected
+    output.close()
+
+
+def test_small_output_preview():
+    output = SpooledOutput(preview_size=100)
+    output.write(b"short output")
+    assert output.preview() == "short output"
+
+
+def test_exec_cmd_stream(tmp_path):
+    script = "import sys\nfor i in range(200000): print(f'{i} topsecret')"
+    with exec_cmd_stream(
+        [sys.executable, "-c", script],
+        secrets=["topsecret"],
+        spool_size=64 * 1024,
+    ) as completed_process:
+        assert completed_process.returncode == 0
+        stdout = completed_process.stdout
+        assert stdout._file._rolled
+        lines = stdout.iter_lines()
+        assert next(lines) == "0 *****"
+        assert sum(1 for _ in lines) == 199999
+        assert "topsecret" not in stdout.preview()
+        assert completed_process.stderr.size == 0
+
+
+def test_exec_cmd_stream_failure():
+    with pytest.raises(CommandFailed, match="no-such-file"):
+        exec_cmd_stream("ls /no-such-file")
+    with exec_cmd_stream("ls /no-such-file", ignore_error=True) as completed_process:
+        assert completed_process.returncode != 0
+        assert "no-such-file" in completed_process.stderr.read()
+    with pytest.raises(subprocess.TimeoutExpired):
+        exec_cmd_stream("sleep 10", timeout=0.5)
@@ -1,12 +1,20 @@
 # -*- coding: utf8 -*-
 
+import asyncio
 import logging
+import threading
 import time
 
 import pytest
 
 from ocs_ci.ocs.exceptions import TimeoutExpiredError
-from ocs_ci.utility.utils import TimeoutSampler, TimeoutIterator
+from ocs_ci.utility.utils import (
+    AdaptiveTimeoutSampler,
+    AsyncTimeoutSampler,
+    TimeoutSampler,
+    TimeoutIterator,
+    adaptive_interval,
+)
 
 
 @pytest.mark.parametrize("timeout_cls", [TimeoutSampler, TimeoutIterator])
@@ -212,3 +220,129 @@ def test_ts_wait_for_value_negative(caplog):
         assert "function <lambda> failed" in log_msg
         assert "failed to return expected value 2" in log_msg
         assert "during 3 second timeout" in log_msg
+
+
+def test_adaptive_interval():
+    """
+    Intervals grow exponentially up to max_sleep and are jittered.
+    """
+    intervals = [adaptive_interval(i, 1, 10, jitter=0) for i in range(1, 7)]
+    assert intervals == [1, 2, 4, 8, 10, 10]
+    for _ in range(20):
+        assert 0.9 <= adaptive_interval(1, 1, 10, jitter=0.1) <= 1.1
+
+
+def test_adaptive_ts_wait_for_value():
+    """
+    With short min_sleep the condition is detected early.
+    """
+    func_state = []
+
+    def func():
+        func_state.append(0)
+        return len(func_state)
+
+    ts = AdaptiveTimeoutSampler(10, func, min_sleep=0.1, max_sleep=1)
+    start = time.time()
+    ts.wait_for_func_value(4)
+    assert time.time() - start < 2
+    assert not AdaptiveTimeoutSampler(
+        1, func, min_sleep=0.2, max_sleep=1
+    ).wait_for_func_status(True)
+
+
+class WakeSource(object):
+    """
+    Event source which notifies the listeners from another thread
+    """
+
+    def __init__(self):
+        self.listeners = []
+
+    def add_listener(self, callback):
+        self.listeners.append(callback)
+
+    def remove_listener(self, callback):
+        self.listeners.remove(callback)
+
+    def fire(self):
+        for callback in self.listeners:
+            callback()
+
+
+def test_adaptive_ts_woken_by_event_source():
+    """
+    The sampler is woken up by the event source long before the interval
+    elapses, and unregisters itself at the end.
+    """
+    source = WakeSource()
+    state = {"value": 0}
+
+    def change():
+        state["value"] = 1
+        source.fire()
+
+    ts = AdaptiveTimeoutSampler(
+        30,
+        lambda: state["value"],
+        min_sleep=20,
+        max_sleep=20,
+        wake_sources=[source],
+    )
+    threading.Timer(0.2, change).start()
+    start = time.time()
+    ts.wait_for_func_value(1)
+    assert time.time() - start < 5
+    assert source.listeners == []
+
+
+def test_async_ts_many_waits_share_loop():
+    """
+    Many async samplers run concurrently in one event loop.
+    """
+    source = WakeSource()
+    state = {"value": 0}
+
+    async def func(index):
+        return state["value"] > index
+
+    async def wait_all():
+        samplers = [
+            AsyncTimeoutSampler(
+                30,
+                func,
+                func_args=[i],
+                min_sleep=20,
+                max_sleep=20,
+                wake_sources=[source],
+            )
+            for i in range(50)
+        ]
+        loop = asyncio.get_running_loop()
+
+        def change():
+            state["value"] = 100
+            source.fire()
+
+        loop.call_later(0.2, change)
+        return await asyncio.gather(
+            *[sampler.wait_for_func_status(True) for sampler in samplers]
+        )
+
+    start = time.time()
+    assert asyncio.run(wait_all()) == [True] * 50
+    assert time.time() - start < 5
+    assert source.listeners == []
+
+
+def test_async_ts_timeout():
+    """
+    Async sampler with regular function times out.
+    """
+
+    async def wait():
+        return await AsyncTimeoutSampler(
+            1, lambda: 1, min_sleep=0.2, max_sleep=0.5
+        ).wait_for_func_status(2)
+
+    assert asyncio.run(wait()) is False
@@ -1,3 +1,4 @@
+import asyncio
 import binascii
 import tempfile
 from datetime import datetime, timedelta
@@ -15,6 +16,7 @@ import smtplib
 import socket
 import string
 import subprocess
+import threading
 import time
 import traceback
 from typing import Match, Iterator
@@ -64,9 +66,15 @@ from ocs_ci.ocs.exceptions import (
     NoRunningCephToolBoxException,
     ClusterNotInSTSModeException,
 )
+from ocs_ci.utility import call_profiler
 from ocs_ci.utility import version as version_module
 from ocs_ci.utility.flexy import load_cluster_info
 from ocs_ci.utility.retry import retry
+from ocs_ci.utility.spooled_output import (
+    DEFAULT_PREVIEW_SIZE,
+    DEFAULT_SPOOL_SIZE,
+    SpooledOutput,
+)
 from ocs_ci.utility.jira import JiraHelper
 from psutil._common import bytes2human
 from ocs_ci.ocs.constants import HCI_PROVIDER_CLIENT_PLATFORMS
@@ -675,7 +683,13 @@ def run_cmd_interactive(
 
 
 def run_cmd_multicluster(
-    cmd, secrets=None, timeout=600, ignore_error=False, skip_index=None, **kwargs
+    cmd,
+    secrets=None,
+    timeout=600,
+    ignore_error=False,
+    skip_index=None,
+    parallel=False,
+    **kwargs,
 ):
     """
     Run command on multiple clusters. Useful in multicluster scenarios
@@ -690,6 +704,12 @@ def run_cmd_multicluster(
         ignore_error (bool): True if ignore non zero return code and do not
             raise the exception.
         skip_index (list of int): List of indexes that needs to be skipped from executing the command
+        parallel (bool): Run the command on all the clusters at once, each in
+            its own bound cluster context without switching the global one.
+            Use only for commands which don't depend on the order of the
+            clusters, e.g. reads. If False (default), the clusters are
+            processed one after another and the first failure stops the
+            processing.
 
     Raises:
         CommandFailed: In case the command execution fails
@@ -700,43 +720,103 @@ def run_cmd_multicluster(
             if command execution skipped on a particular cluster then corresponding entry will have None
 
     """
-    # Skip indexed cluster while running commands
-    # Useful to skip operations on ACM cluster
-    restore_ctx_index = config.cur_index
+    # Importing here to avoid circular dependency
+    from ocs_ci.ocs.cluster_context import get_cluster_contexts, run_on_clusters
+
     completed_process = [None] * len(config.clusters)
-    # this need's to be done to skip none value as skip_index accepts type none
-    if not isinstance(skip_index, list):
-        skip_index = [skip_index]
-    for cluster in config.clusters:
-        if cluster.MULTICLUSTER["multicluster_index"] in skip_index:
-            log.warning(f"skipping index = {skip_index}")
-            continue
-        else:
-            config.switch_ctx(cluster.MULTICLUSTER["multicluster_index"])
-            log.info(
-                f"Switched the context to cluster:{cluster.ENV_DATA['cluster_name']}"
+    if skip_index is not None:
+        # Skip indexed cluster while running commands
+        # Useful to skip operations on ACM cluster
+        log.warning(f"skipping index = {skip_index}")
+
+    def run(cluster_context):
+        log.info(f"Running the command on cluster: {cluster_context.name}")
+        try:
+            return exec_cmd(
+                cmd,
+                secrets=secrets,
+                timeout=timeout,
+                ignore_error=ignore_error,
+                cluster_config=cluster_context.config,
+                **kwargs,
             )
-            try:
-                completed_process[cluster.MULTICLUSTER["multicluster_index"]] = (
-                    exec_cmd(
-                        cmd,
-                        secrets=secrets,
-                        timeout=timeout,
-                        ignore_error=ignore_error,
-                        **kwargs,
-                    )
-                )
-            except CommandFailed:
-                # In case of failure, restore the cluster context to where we started
-                config.switch_ctx(restore_ctx_index)
-                log.error(
-                    f"Command {cmd} execution failed on cluster {cluster.ENV_DATA['cluster_name']} "
-                )
-                raise
-    config.switch_ctx(restore_ctx_index)
+        except CommandFailed:
+            log.error(
+                f"Command {cmd} execution failed on cluster {cluster_context.name} "
+            )
+            raise
+
+    if parallel:
+        results = run_on_clusters(run, skip_index=skip_index)
+    else:
+        results = {}
+        for cluster_context in get_cluster_contexts(skip_index=skip_index):
+            with cluster_context.bind():
+                results[cluster_context.index] = run(cluster_context)
+    for index, result in results.items():
+        completed_process[index] = result
     return completed_process
 
 
+def _prepare_cmd(cmd, cluster_config, kwargs):
+    """
+    Prepare the command and its environment for execution, adds kubeconfig of
+    the cluster to 'oc' commands
+
+    Args:
+        cmd (str or list): command to run
+        cluster_config (MultiClusterConfig): config of the cluster, None for
+            the current one
+        kwargs (dict): keyword arguments of subprocess, 'env' is popped
+
+    Returns:
+        tuple: (command, environment of the command)
+
+    """
+    _env = kwargs.pop("env", os.environ.copy())
+    kubeconfig_path = config.RUN.get("kubeconfig")
+    if kubeconfig_path:
+        _env["KUBECONFIG"] = kubeconfig_path
+    if cluster_config:
+        kubeconfig_path = cluster_config.RUN.get("kubeconfig")
+        if kubeconfig_path:
+            _env["KUBECONFIG"] = cluster_config.RUN.get("kubeconfig")
+    if isinstance(cmd, str) and not kwargs.get("shell"):
+        cmd = shlex.split(cmd)
+    if (
+        kubeconfig_path
+        and cmd[0] == "oc"
+        and "--kubeconfig" not in cmd
+        and "mirror" not in cmd
+    ):
+        kube_index = 1
+        # check if we have an oc plugin in the command
+        global _oc_plugin_list_cache
+        if _oc_plugin_list_cache is None:
+            cp = subprocess.run(
+                shlex.split("oc plugin list"),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+            if cp.returncode == 0:
+                _oc_plugin_list_cache = cp.stdout.decode().splitlines()
+
+        subcmd = cmd[1].split("-")
+        if len(subcmd) > 1:
+            subcmd = "_".join(subcmd)
+        if not isinstance(subcmd, str) and isinstance(subcmd, list):
+            subcmd = str(subcmd[0])
+
+        plugin_lines = _oc_plugin_list_cache or []
+        for l in plugin_lines:
+            if subcmd in l:
+                kube_index = 2
+                log.info(f"Found oc plugin {subcmd}")
+        cmd = list_insert_at_position(cmd, kube_index, ["--kubeconfig"])
+        cmd = list_insert_at_position(cmd, kube_index + 1, [kubeconfig_path])
+    return cmd, _env
+
+
 @retry(
     CommandFailed,
     tries=6,
@@ -790,47 +870,9 @@ def exec_cmd(
         stderr     (str): The standard error (None if not captured).
 
     """
-    _env = kwargs.pop("env", os.environ.copy())
-    kubeconfig_path = config.RUN.get("kubeconfig")
-    if kubeconfig_path:
-        _env["KUBECONFIG"] = kubeconfig_path
-    if cluster_config:
-        kubeconfig_path = cluster_config.RUN.get("kubeconfig")
-        if kubeconfig_path:
-            _env["KUBECONFIG"] = cluster_config.RUN.get("kubeconfig")
-    if isinstance(cmd, str) and not kwargs.get("shell"):
-        cmd = shlex.split(cmd)
-    if (
-        kubeconfig_path
-        and cmd[0] == "oc"
-        and "--kubeconfig" not in cmd
-        and "mirror" not in cmd
-    ):
-        kube_index = 1
-        # check if we have an oc plugin in the command
-        global _oc_plugin_list_cache
-        if _oc_plugin_list_cache is None:
-            cp = subprocess.run(
-                shlex.split("oc plugin list"),
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-            )
-            if cp.returncode == 0:
-                _oc_plugin_list_cache = cp.stdout.decode().splitlines()
-
-        subcmd = cmd[1].split("-")
-        if len(subcmd) > 1:
-            subcmd = "_".join(subcmd)
-        if not isinstance(subcmd, str) and isinstance(subcmd, list):
-            subcmd = str(subcmd[0])
-
-        plugin_lines = _oc_plugin_list_cache or []
-        for l in plugin_lines:
-            if subcmd in l:
-                kube_index = 2
-                log.info(f"Found oc plugin {subcmd}")
-        cmd = list_insert_at_position(cmd, kube_index, ["--kubeconfig"])
-        cmd = list_insert_at_position(cmd, kube_index + 1, [kubeconfig_path])
+    cmd, _env = _prepare_cmd(cmd, cluster_config, kwargs)
+    completed_process = None
+    start_time = None
     try:
         if kwargs.get("shell"):
             masked_cmd = mask_secrets(cmd, secrets)
@@ -849,10 +891,19 @@ def exec_cmd(
         # stdin is managed internally. Do not inject stdin=PIPE if the caller set stdin.
         if "input" not in kwargs and "stdin" not in kwargs:
             run_kw["stdin"] = subprocess.PIPE
+        start_time = time.perf_counter()
         completed_process = subprocess.run(cmd, **run_kw, **kwargs)
     finally:
         if threading_lock and cmd[0] == "oc":
             threading_lock.release()
+        if start_time is not None:
+            call_profiler.record_command(
+                cmd,
+                time.perf_counter() - start_time,
+                len(completed_process.stdout) if completed_process else 0,
+                completed_process.returncode if completed_process else None,
+                (cluster_config or config).MULTICLUSTER.get("multicluster_index"),
+            )
     masked_stdout = mask_secrets(completed_process.stdout.decode(), secrets)
     truncated_stdout = truncate_long_lines(masked_stdout)
     if len(completed_process.stdout) > 0:
@@ -889,6 +940,154 @@ def exec_cmd(
     return completed_process
 
 
+class StreamedProcess(object):
+    """
+    Finished command with the output spooled by exec_cmd_stream
+
+    Attributes:
+        args (list or str): The command
+        returncode (int): The exit code of the process
+        stdout (SpooledOutput): The standard output with masked secrets
+        stderr (SpooledOutput): The standard error with masked secrets
+
+    """
+
+    def __init__(self, args, returncode, stdout, stderr):
+        self.args = args
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.close()
+
+    def close(self):
+        """
+        Release the spooled output
+        """
+        self.stdout.close()
+        self.stderr.close()
+
+
+def exec_cmd_stream(
+    cmd,
+    secrets=None,
+    timeout=600,
+    ignore_error=False,
+    silent=False,
+    cluster_config=None,
+    spool_size=DEFAULT_SPOOL_SIZE,
+    preview_size=DEFAULT_PREVIEW_SIZE,
+    **kwargs,
+):
+    """
+    Run an arbitrary command locally with bounded memory usage, intended for
+    commands with large output like 'oc logs' or must-gather.
+
+    The output is read in chunks while the command runs, the secrets are
+    masked incrementally and the output is spooled to a temporary file once
+    it exceeds spool_size. Only the head and the tail of the output are
+    logged. The output is read lazily from the returned object, e.g. by
+    ``stdout.iter_lines()`` or ``stdout.save(path)``.
+
+    Args:
+        cmd (str): command to run
+        secrets (list): A list of secrets to be masked with asterisks
+        timeout (int): Timeout for the command, defaults to 600 seconds.
+        ignore_error (bool): True if ignore non zero return code and do not
+            raise the exception.
+        silent (bool): If True will silent errors from the server, default false
+        cluster_config (MultiClusterConfig): In case of multicluster environment this object
+                will be non-null
+        spool_size (int): Size of the output in bytes kept in memory
+        preview_size (int): Size in bytes of the head and of the tail of the
+            output logged
+
+    Raises:
+        CommandFailed: In case the command execution fails
+        subprocess.TimeoutExpired: In case the command didn't finish in time
+
+    Returns:
+        StreamedProcess: the finished command, close it to release the output
+
+    """
+    cmd, _env = _prepare_cmd(cmd, cluster_config, kwargs)
+    if kwargs.get("shell"):
+        masked_cmd = mask_secrets(cmd, secrets)
+    else:
+        masked_cmd = shlex.join(mask_secrets(cmd, secrets))
+    log.info(f"Executing command (streamed output): {masked_cmd}")
+    stdout = SpooledOutput(secrets, spool_size=spool_size, preview_size=preview_size)
+    stderr = SpooledOutput(secrets, spool_size=spool_size, preview_size=preview_size)
+    start_time = time.perf_counter()
+    returncode = None
+    try:
+        process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=_env,
+            **kwargs,
+        )
+        readers = [
+            threading.Thread(target=stdout.consume, args=(process.stdout,)),
+            threading.Thread(target=stderr.consume, args=(process.stderr,)),
+        ]
+        for reader in readers:
+            reader.daemon = True
+            reader.start()
+        try:
+            returncode = process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+            raise
+        finally:
+            for reader in readers:
+                reader.join()
+            process.stdout.close()
+            process.stderr.close()
+    except BaseException:
+        stdout.close()
+        stderr.close()
+        raise
+    finally:
+        call_profiler.record_command(
+            cmd,
+            time.perf_counter() - start_time,
+            stdout.size,
+            returncode,
+            (cluster_config or config).MULTICLUSTER.get("multicluster_index"),
+        )
+
+    if stdout.size:
+        log.debug(
+            f"Command stdout ({stdout.size} bytes): "
+            f"{truncate_large_base64(truncate_long_lines(stdout.preview()))}"
+        )
+    else:
+        log.debug("Command stdout is empty")
+    stderr_preview = stderr.preview()
+    if stderr.size and not silent:
+        log.warning(
+            f"Command stderr ({stderr.size} bytes): "
+            f"{truncate_large_base64(stderr_preview)}"
+        )
+    log.debug(f"Command return code: {returncode}")
+    if returncode and not ignore_error:
+        stdout.close()
+        stderr.close()
+        raise CommandFailed(
+            f"Error during execution of command: {masked_cmd}."
+            f"\nError is {bin_xml_escape(filter_out_emojis(stderr_preview))}"
+        )
+    return StreamedProcess(cmd, returncode, stdout, stderr)
+
+
 def bin_xml_escape(arg):
     """
     Visually escape invalid XML characters.
@@ -2300,8 +2499,14 @@ class TimeoutSampler(object):
                 )
             if self.timeout <= (time.time() - self.start_time):
                 raise self.timeout_exc_cls(*self.timeout_exc_args)
-            log.info("Going to sleep for %d seconds before next iteration", self.sleep)
-            time.sleep(self.sleep)
+            self._wait()
+
+    def _wait(self):
+        """
+        Wait before the next sample
+        """
+        log.info("Going to sleep for %d seconds before next iteration", self.sleep)
+        time.sleep(self.sleep)
 
     def wait_for_func_value(self, value):
         """
@@ -2378,6 +2583,277 @@ class TimeoutIterator(TimeoutSampler):
         super().__init__(timeout, sleep, func, *func_args, **func_kwargs)
 
 
+def adaptive_interval(attempt, min_sleep, max_sleep, backoff=2, jitter=0.1):
+    """
+    Compute exponentially growing, jittered interval between samples
+
+    Args:
+        attempt (int): Number of the wait, starting from 1
+        min_sleep (float): Interval of the first wait
+        max_sleep (float): Maximal interval
+        backoff (float): Multiplier of the interval after each wait
+        jitter (float): Maximal relative random deviation of the interval
+
+    Returns:
+        float: interval in seconds
+
+    """
+    interval = min(max_sleep, min_sleep * backoff ** (attempt - 1))
+    return interval * random.uniform(1 - jitter, 1 + jitter)
+
+
+class AdaptiveTimeoutSampler(TimeoutSampler):
+    """
+    TimeoutSampler with exponentially growing, jittered intervals between
+    samples, which can be woken up early by an event source.
+
+    The sampling starts with short intervals, so conditions which become true
+    shortly are detected early, and backs off up to max_sleep for long waits.
+    Event sources (e.g. SharedInformer or PrometheusAlertSubscriber) call
+    wakeup() when something changed, the next sample is then taken immediately
+    and the interval is reset to min_sleep.
+
+    Parameters of the sampler and of the function are separated in the same
+    way as in TimeoutIterator, eg.::
+
+        sampler = AdaptiveTimeoutSampler(
+            timeout=300,
+            func=pvc_obj.get_phase,
+            min_sleep=1,
+            max_sleep=20,
+            wake_sources=[pvc_obj.ocp.get_informer()],
+        )
+        sampler.wait_for_func_value("Bound")
+
+    Args:
+        timeout (int): Timeout in seconds
+        func (function): The function to sample
+        func_args (list): Arguments for the function
+        func_kwargs (dict): Keyword arguments for the function
+        min_sleep (float): Interval before the second sample
+        max_sleep (float): Maximal interval between samples
+        backoff (float): Multiplier of the interval after each sample
+        jitter (float): Maximal relative random deviation of the interval
+        wake_sources (list): Objects with add_listener and remove_listener
+            methods accepting callback, which is called on every change
+    """
+
+    def __init__(
+        self,
+        timeout,
+        func,
+        func_args=None,
+        func_kwargs=None,
+        min_sleep=1,
+        max_sleep=30,
+        backoff=2,
+        jitter=0.1,
+        wake_sources=None,
+    ):
+        super().__init__(
+            timeout, min_sleep, func, *(func_args or []), **(func_kwargs or {})
+        )
+        self.max_sleep = max(max_sleep, min_sleep)
+        self.backoff = backoff
+        self.jitter = jitter
+        self.wake_sources = [source for source in wake_sources or [] if source]
+        self._wakeup_event = threading.Event()
+        self._wait_count = 0
+
+    def wakeup(self):
+        """
+        Take the next sample immediately, safe to call from any thread
+        """
+        self._wakeup_event.set()
+
+    def __iter__(self):
+        for source in self.wake_sources:
+            source.add_listener(self.wakeup)
+        try:
+            yield from super().__iter__()
+        finally:
+            for source in self.wake_sources:
+                source.remove_listener(self.wakeup)
+
+    def _wait(self):
+        self._wait_count += 1
+        remaining = self.timeout - (time.time() - self.start_time)
+        interval = min(
+            remaining,
+            adaptive_interval(
+                self._wait_count, self.sleep, self.max_sleep, self.backoff, self.jitter
+            ),
+        )
+        log.debug("Waiting up to %.1f seconds before next iteration", interval)
+        if self._wakeup_event.wait(max(interval, 0)):
+            self._wakeup_event.clear()
+            self._wait_count = 0
+            log.debug("Woken up before next iteration")
+
+
+class AsyncTimeoutSampler(object):
+    """
+    asyncio variant of AdaptiveTimeoutSampler, many waits can share one event
+    loop instead of holding a thread each::
+
+        async def wait_for_pvcs(pvc_objs):
+            samplers = [
+                AsyncTimeoutSampler(300, pvc_obj.get_phase) for pvc_obj in pvc_objs
+            ]
+            return await asyncio.gather(
+                *[sampler.wait_for_func_status("Bound") for sampler in samplers]
+            )
+
+    The function can be a coroutine function, a regular function is run in
+    the default executor.
+
+    Args:
+        timeout (int): Timeout in seconds
+        func (function): The function or coroutine function to sample
+        func_args (list): Arguments for the function
+        func_kwargs (dict): Keyword arguments for the function
+        min_sleep (float): Interval before the second sample
+        max_sleep (float): Maximal interval between samples
+        backoff (float): Multiplier of the interval after each sample
+        jitter (float): Maximal relative random deviation of the interval
+        wake_sources (list): Objects with add_listener and remove_listener
+            methods accepting callback, which is called on every change
+    """
+
+    def __init__(
+        self,
+        timeout,
+        func,
+        func_args=None,
+        func_kwargs=None,
+        min_sleep=1,
+        max_sleep=30,
+        backoff=2,
+        jitter=0.1,
+        wake_sources=None,
+    ):
+        if timeout < min_sleep:
+            raise ValueError("timeout should be larger than sleep time")
+        self.timeout = timeout
+        self.func = func
+        self.func_args = func_args or []
+        self.func_kwargs = func_kwargs or {}
+        self.min_sleep = min_sleep
+        self.max_sleep = max(max_sleep, min_sleep)
+        self.backoff = backoff
+        self.jitter = jitter
+        self.wake_sources = [source for source in wake_sources or [] if source]
+        self.timeout_exc_cls = TimeoutExpiredError
+        self.timeout_exc_args = [
+            timeout,
+            f"Timed out after {timeout}s running {getattr(func, '__name__', func)}",
+        ]
+        self._loop = None
+        self._wakeup_event = None
+
+    def wakeup(self):
+        """
+        Take the next sample immediately, safe to call from any thread
+        """
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wakeup_event.set)
+
+    async def _sample(self):
+        if asyncio.iscoroutinefunction(self.func):
+            return await self.func(*self.func_args, **self.func_kwargs)
+        return await asyncio.get_running_loop().run_in_executor(
+            None, lambda: self.func(*self.func_args, **self.func_kwargs)
+        )
+
+    async def __aiter__(self):
+        self._loop = asyncio.get_running_loop()
+        self._wakeup_event = asyncio.Event()
+        for source in self.wake_sources:
+            source.add_listener(self.wakeup)
+        start_time = time.time()
+        wait_count = 0
+        try:
+            while True:
+                if self.timeout <= time.time() - start_time:
+                    raise self.timeout_exc_cls(*self.timeout_exc_args)
+                try:
+                    yield await self._sample()
+                except Exception:
+                    log.debug(
+                        f"Exception raised during sampling of {self.func}",
+                        exc_info=True,
+                    )
+                remaining = self.timeout - (time.time() - start_time)
+                if remaining <= 0:
+                    raise self.timeout_exc_cls(*self.timeout_exc_args)
+                wait_count += 1
+                interval = min(
+                    remaining,
+                    adaptive_interval(
+                        wait_count,
+                        self.min_sleep,
+                        self.max_sleep,
+                        self.backoff,
+                        self.jitter,
+                    ),
+                )
+                try:
+                    await asyncio.wait_for(self._wakeup_event.wait(), interval)
+                    self._wakeup_event.clear()
+                    wait_count = 0
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            for source in self.wake_sources:
+                source.remove_listener(self.wakeup)
+            self._loop = None
+
+    async def wait_for_func_value(self, value):
+        """
+        Wait until func returns the given value
+
+        Args:
+            value: Expected return value of func we are waiting for.
+
+        Raises:
+            TimeoutExpiredError: if the value wasn't returned in time
+
+        """
+        samples = self.__aiter__()
+        try:
+            async for i_value in samples:
+                if i_value == value:
+                    return
+        except self.timeout_exc_cls:
+            log.error(
+                "function %s failed to return expected value %s "
+                "after multiple retries during %d second timeout",
+                getattr(self.func, "__name__", self.func),
+                value,
+                self.timeout,
+            )
+            raise
+        finally:
+            await samples.aclose()
+
+    async def wait_for_func_status(self, result):
+        """
+        Wait until func returns the given result
+
+        Args:
+            result (bool): Expected result from func.
+
+        Returns:
+            bool: True if the result was returned in time, False otherwise
+
+        """
+        try:
+            await self.wait_for_func_value(result)
+            return True
+        except self.timeout_exc_cls:
+            return False
+
+
 def get_random_str(size=13):
     """
     generates the random string of given size
@@ -2812,6 +3288,8 @@ def email_reports(session):
     move_summary_to_top(soup)
     add_info_about_mg_skips(soup)
     add_time_report_to_email(session, soup)
+    if call_profiler.is_call_profiler_enabled():
+        add_call_profile_to_email(soup)
     part1 = MIMEText(soup.decode(formatter="minimal"), "html")
     add_mem_stats(soup)
     msg.attach(part1)
@@ -3818,16 +4296,23 @@ def ceph_health_check_multi_storagecluster_external(tries=20, delay=30):
     """
     Check ceph health for multi-storagecluster external.
 
+    Args:
+        tries (int): Number of retries
+        delay (int): Delay in seconds between retries
+
+    Returns:
+        bool: True if cluster health is ok.
+
+    Raises:
+        CephHealthException: Incase ceph health is not ok.
+
     """
-    return retry(
-        (
-            CephHealthException,
-            CommandFailed,
-        ),
-        tries=tries,
-        delay=delay,
-        backoff=1,
-    )(ceph_health_multi_storagecluster_external_base)()
+    # Import here to avoid circular loop
+    from ocs_ci.ocs.health_orchestrator import ceph_health_check_clusters
+
+    return ceph_health_check_clusters(
+        tries=tries, delay=delay, indexes=[], include_external=True
+    )
 
 
 def get_rook_repo(branch="master", to_checkout=None):
@@ -6319,15 +6804,29 @@ def log_all_ceph_crash_details(toolbox_pod):
 
     total = len(crashes)
     log.error("Found %s Ceph crash(es); logging ``ceph crash info`` for each:", total)
-    for index, crash in enumerate(crashes, start=1):
+    crash_details = []
+    for crash in crashes:
         if isinstance(crash, dict):
-            crash_id = crash.get("crash_id", "unknown")
-            entity = crash.get("entity_name", "unknown")
-            timestamp = crash.get("timestamp", "unknown")
+            crash_details.append(
+                (
+                    crash.get("crash_id", "unknown"),
+                    crash.get("entity_name", "unknown"),
+                    crash.get("timestamp", "unknown"),
+                )
+            )
         else:
-            crash_id = str(crash)
-            entity = "unknown"
-            timestamp = "unknown"
+            crash_details.append((str(crash), "unknown", "unknown"))
+    # all the crash infos are fetched from the toolbox in one round trip
+    try:
+        crash_infos = toolbox_pod.exec_ceph_cmds(
+            [f"ceph crash info {crash_id}" for crash_id, _, _ in crash_details],
+            ignore_error=True,
+        )
+    except (CommandFailed, subprocess.TimeoutExpired) as ex:
+        crash_infos = [ex] * total
+    for index, ((crash_id, entity, timestamp), crash_info) in enumerate(
+        zip(crash_details, crash_infos), start=1
+    ):
         log.error(
             "Ceph crash %s/%s — ID: %s, Entity: %s, Time: %s",
             index,
@@ -6336,13 +6835,12 @@ def log_all_ceph_crash_details(toolbox_pod):
             entity,
             timestamp,
         )
-        try:
-            crash_info = toolbox_pod.exec_ceph_cmd(
-                f"ceph crash info {crash_id}", out_yaml_format=False
+        if isinstance(crash_info, Exception):
+            log.error("Failed to get ceph crash info for %s: %s", crash_id, crash_info)
+        else:
+            log.error(
+                "ceph crash info %s:\n%s", crash_id, json.dumps(crash_info, indent=4)
             )
-            log.error("ceph crash info %s:\n%s", crash_id, crash_info)
-        except (CommandFailed, subprocess.TimeoutExpired) as ex:
-            log.error("Failed to get ceph crash info for %s: %s", crash_id, ex)
     return crashes
 
 
@@ -6378,6 +6876,47 @@ def add_time_report_to_email(session, soup):
     summary_tag.insert_after(time_div)
 
 
+def add_call_profile_to_email(soup, top=10):
+    """
+    Add tables of the hottest calls to the cluster recorded by the call
+    profiler to the email report
+
+    Args:
+        soup (BeautifulSoup): the email report
+        top (int): Number of the rows per table
+
+    """
+    summary = call_profiler.get_summary(top=top)
+    if not summary["calls"]:
+        log.debug("No calls were recorded, skip Call Profile email reporting")
+        return
+    file_loader = FileSystemLoader(constants.HTML_REPORT_TEMPLATE_DIR)
+    env = Environment(loader=file_loader)
+    table_html_template = env.get_template("call_profile_table.html.j2")
+    latency_columns = ["count", "total", "avg", "p50", "p99", "max"]
+    tables = [
+        (
+            "Calls to the cluster by verb (latencies in seconds)",
+            ["source", "verb", "kind"] + latency_columns + ["failures"],
+            summary["verbs"],
+        ),
+        (
+            "Hottest calls to the cluster by test (latencies in seconds)",
+            ["test", "source", "verb", "kind", "namespace", "cluster"]
+            + latency_columns,
+            summary["calls"],
+        ),
+    ]
+    profile_div = soup.new_tag("div")
+    for caption, columns, entries in tables:
+        table_html = table_html_template.render(
+            caption=caption, columns=columns, entries=entries
+        )
+        profile_div.append(BeautifulSoup(table_html, "html.parser"))
+    summary_tag = soup.find("h2", string="Summary")
+    summary_tag.insert_after(profile_div)
+
+
 def get_oadp_version(namespace=constants.OADP_NAMESPACE):
     """
     Returns:
@@ -97,6 +97,10 @@ from ocs_ci.ocs.exceptions import (
     UnsupportedWorkloadError,
 )
 from ocs_ci.ocs.fill_pool_job import FillPoolJob
+from ocs_ci.ocs.health_orchestrator import (
+    ceph_health_check_clusters,
+    is_clusters_health_check,
+)
 from ocs_ci.ocs.mcg_workload import mcg_job_factory as mcg_job_factory_implementation
 from ocs_ci.ocs.node import get_node_objs, schedule_nodes
 from ocs_ci.ocs.ocp import OCP, get_all_resource_of_kind_containing_string
@@ -2176,9 +2180,12 @@ def health_checker(request, tier_marks_name, upgrade_marks_name):
     if "FailurePropagator" in str(node.cls):
         return
 
+    # multicluster runs and multi-storagecluster deployments check the health
+    # of all the clusters concurrently
+    clusters_health_check = is_clusters_health_check()
+
     def finalizer():
         if not skipped:
-            multi_storagecluster_external_health_passed = False
             try:
                 teardown = ocsci_config.RUN["cli_params"]["teardown"]
                 skip_ocs_deployment = ocsci_config.ENV_DATA["skip_ocs_deployment"]
@@ -2192,19 +2199,23 @@ def health_checker(request, tier_marks_name, upgrade_marks_name):
                     # We are allowing 20 re-tries for health check, to avoid teardown failures for cases like:
                     # "flip-flopping ceph health OK and warn because of:
                     # HEALTH_WARN Reduced data availability: 2 pgs peering
-                    ceph_health_check_with_toolbox_recovery(
-                        namespace=ocsci_config.ENV_DATA["cluster_namespace"],
-                        fix_ceph_health=True,
-                        update_jira=True,
-                        no_exception_if_jira_issue_updated=True,
-                    )
-                    log.info("Ceph health check passed at teardown!")
-                    if ocsci_config.DEPLOYMENT.get("multi_storagecluster"):
-                        ceph_health_check_multi_storagecluster_external()
+                    if clusters_health_check:
+                        ceph_health_check_clusters(
+                            fix_ceph_health=True,
+                            update_jira=True,
+                            no_exception_if_jira_issue_updated=True,
+                        )
                         log.info(
-                            "Ceph health check for multi-storagecluster external cluster passed at teardown!"
+                            "Ceph health check of all clusters passed at teardown!"
+                        )
+                    else:
+                        ceph_health_check_with_toolbox_recovery(
+                            namespace=ocsci_config.ENV_DATA["cluster_namespace"],
+                            fix_ceph_health=True,
+                            update_jira=True,
+                            no_exception_if_jira_issue_updated=True,
                         )
-                        multi_storagecluster_external_health_passed = True
+                        log.info("Ceph health check passed at teardown!")
 
             except CephHealthException:
                 if not ocsci_config.RUN["skip_reason_test_found"]:
@@ -2223,11 +2234,7 @@ def health_checker(request, tier_marks_name, upgrade_marks_name):
                 ceph_health_check_with_toolbox_recovery(
                     namespace=ocsci_config.ENV_DATA["cluster_namespace"]
                 )
-
-                if (
-                    not multi_storagecluster_external_health_passed
-                    and ocsci_config.DEPLOYMENT.get("multi_storagecluster")
-                ):
+                if ocsci_config.DEPLOYMENT.get("multi_storagecluster"):
                     ceph_health_check_multi_storagecluster_external()
                 raise
         if ceph_health_recovered_exception:
@@ -2251,8 +2258,19 @@ def health_checker(request, tier_marks_name, upgrade_marks_name):
             "cephcluster"
         ):
             log.info("Checking for Ceph Health OK ")
-            external_multi_storagecluster_status = False
             try:
+                if clusters_health_check:
+                    # all the clusters (and the multi-storagecluster external
+                    # cluster) are checked at once
+                    ceph_health_check_clusters(
+                        tries=10,
+                        delay=15,
+                        fix_ceph_health=True,
+                        update_jira=True,
+                        no_exception_if_jira_issue_updated=True,
+                    )
+                    log.info("Ceph health check of all clusters passed at setup")
+                    return
                 status = ceph_health_check_with_toolbox_recovery(
                     namespace=ocsci_config.ENV_DATA["cluster_namespace"],
                     tries=10,
@@ -2261,19 +2279,9 @@ def health_checker(request, tier_marks_name, upgrade_marks_name):
                     update_jira=True,
                     no_exception_if_jira_issue_updated=True,
                 )
-                if not ocsci_config.DEPLOYMENT.get("multi_storagecluster"):
-                    if status:
-                        log.info("Ceph health check passed at setup")
-                        return
-                else:
-                    external_multi_storagecluster_status = (
-                        ceph_health_check_multi_storagecluster_external()
-                    )
-                    if status and external_multi_storagecluster_status:
-                        log.info(
-                            "Ceph health check passed for internal and multi-storagecluster external at setup"
-                        )
-                        return
+                if status:
+                    log.info("Ceph health check passed at setup")
+                    return
             except (CephHealthException, CephHealthNotRecoveredException):
                 ocsci_config.RUN["skipped_tests_ceph_health"] += 1
                 skipped = True
@@ -10884,12 +10892,17 @@ def pytest_sessionfinish(session, exitstatus):
     Do some session finish teardown functionality
     """
     from ocs_ci.ocs import cluster_load
+    from ocs_ci.ocs.exec_pool import close_exec_sessions
+    from ocs_ci.ocs.informer import stop_informers
 
     try:
         cluster_load.finish_cluster_load()
     except Exception:
         log.exception("During finishing the Cluster load an exception was hit!")
 
+    stop_informers()
+    close_exec_sessions()
+
     # Handle dr workload teardown if its set
     if session._dr_workload_teardown:
         try: